@@ -7,9 +7,11 @@ from .cli_export import (
     CLIConfigWriter,
     CLIExportManager,
 )
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
 from .config_manager import ConfigManager
 from .config_paths import ConfigPaths
 from .config_validator import ConfigValidator
+from .config_schema import CompiledSchema, SchemaStore, get_schema_store
 from .data_types import (
     BackupInfo,
     BatchExportResult,
@@ -19,11 +21,19 @@ from .data_types import (
 )
 from .i18n import LanguageManager, tr
 from .import_service import ImportService
-from .model_registry import ModelRegistry
+from .model_catalog import CatalogEntry, ModelCatalog, get_model_catalog
+from .model_search import ModelSearchIndex, get_search_index
+from .model_index import ModelIndex, ModelSpec, get_model_index
+from .model_listing import ModelListingCache, build_model_list_urls, fetch_model_ids
+from .model_registry import ModelRegistry, RegistryDelta, get_model_registry
+from .model_refs import ModelRef, ModelRefIndex, get_model_ref_index
+from .monitor_feed import CoalescingResultQueue, MonitorFeed
+from .monitor_metrics import OPENMETRICS_CONTENT_TYPE, MonitorMetrics
 from .monitor_service import (
     MonitorResult,
     MonitorService,
     MonitorTarget,
+    ProbeScheduler,
     _build_chat_url,
     _extract_origin,
 )
@@ -37,6 +47,7 @@ from .native_providers import (
     _safe_base_url,
     get_native_provider,
 )
+from .probe_timing import DnsCache
 from .plugin_manager import PluginConfig, PluginManager
 from .skill_manager import (
     DiscoveredSkill,
@@ -61,7 +72,15 @@ __all__ = [
     "EnvVarDetector",
     "AgentGroupManager",
     "ConfigValidator",
+    "CompiledSchema",
+    "SchemaStore",
+    "get_schema_store",
     "ModelRegistry",
+    "RegistryDelta",
+    "get_model_registry",
+    "ModelRef",
+    "ModelRefIndex",
+    "get_model_ref_index",
     "ImportService",
     "CLIConfigWriter",
     "CLIBackupManager",
@@ -78,6 +97,25 @@ __all__ = [
     "MonitorTarget",
     "MonitorResult",
     "MonitorService",
+    "ProbeScheduler",
+    "DnsCache",
+    "ModelCatalog",
+    "CatalogEntry",
+    "get_model_catalog",
+    "ModelSearchIndex",
+    "get_search_index",
+    "ModelIndex",
+    "ModelSpec",
+    "get_model_index",
+    "ModelListingCache",
+    "build_model_list_urls",
+    "fetch_model_ids",
+    "MonitorMetrics",
+    "MonitorFeed",
+    "CoalescingResultQueue",
+    "OPENMETRICS_CONTENT_TYPE",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
     "LanguageManager",
     "ValidationResult",
     "ExportResult",
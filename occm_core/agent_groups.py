@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 
+# 使用日志超过该行数时，在下次记录时合并为每个分组一行
+USAGE_LOG_COMPACT_LINES = 500
+
+
 class AgentGroupManager:
     """Agent分组管理器
 
@@ -14,6 +19,11 @@ class AgentGroupManager:
     - 快速应用预设或自定义分组
     - 导入/导出分组配置
     - 使用统计追踪
+
+    使用统计不写回 agent-groups.json：每次应用分组只向
+    agent-groups-usage.jsonl 追加一行事件，内存中按分组聚合；
+    日志行数过多时合并为每个分组一行。分组文件中已有的 statistics
+    作为基数，与日志中的次数相加。
     """
 
     # 预设模板定义
@@ -149,7 +159,13 @@ class AgentGroupManager:
         self.config_dir = config_dir
         self.groups_file = config_dir / "agent-groups.json"
         self.backup_dir = config_dir / "backups"
+        self.usage_log_file = config_dir / "agent-groups-usage.jsonl"
         self.groups_data = {}
+        # 使用日志的聚合结果：分组ID → [次数, 最后使用时间]
+        self._usage: Dict[str, list] = {}
+        self._usage_log_lines = 0
+        self._usage_log_offset = 0
+        self._usage_log_id: Optional[Tuple[int, int]] = None
         self.load_groups()
 
     # ========== 数据加载/保存 ==========
@@ -643,24 +659,25 @@ class AgentGroupManager:
     # ========== 统计信息 ==========
 
     def update_usage_stats(self, group_id: str) -> None:
-        """更新分组使用统计
+        """记录一次分组使用（追加到使用日志，不改写分组文件）
 
         Args:
             group_id: 分组ID
         """
-        group = self.get_group(group_id)
-        if not group:
+        if not self.get_group(group_id):
             return
 
-        if "statistics" not in group:
-            group["statistics"] = {"usage_count": 0, "last_used": None}
-
-        group["statistics"]["usage_count"] = (
-            group["statistics"].get("usage_count", 0) + 1
-        )
-        group["statistics"]["last_used"] = datetime.now().isoformat()
-
-        self.save_groups()
+        event = {"id": group_id, "count": 1, "ts": datetime.now().isoformat()}
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.usage_log_file, "ab") as f:
+                line = json.dumps(event, ensure_ascii=False) + "\n"
+                f.write(line.encode("utf-8"))
+            self._sync_usage_log()
+            if self._usage_log_lines > USAGE_LOG_COMPACT_LINES:
+                self._compact_usage_log()
+        except OSError as e:
+            print(f"记录分组使用统计失败: {e}")
 
     def get_usage_stats(self, group_id: str) -> Dict:
         """获取分组使用统计
@@ -675,4 +692,85 @@ class AgentGroupManager:
         if not group:
             return {"usage_count": 0, "last_used": None}
 
-        return group.get("statistics", {"usage_count": 0, "last_used": None})
+        base = group.get("statistics") or {}
+        usage_count = base.get("usage_count", 0) or 0
+        last_used = base.get("last_used")
+
+        self._sync_usage_log()
+        logged = self._usage.get(group_id)
+        if logged:
+            usage_count += logged[0]
+            if not last_used or logged[1] > last_used:
+                last_used = logged[1]
+        return {"usage_count": usage_count, "last_used": last_used}
+
+    def _sync_usage_log(self) -> None:
+        """读取使用日志中新追加的行（其他实例写入的也会读到）
+
+        文件被合并替换或截断时从头重新聚合。
+        """
+        try:
+            st = os.stat(self.usage_log_file)
+        except OSError:
+            self._reset_usage()
+            return
+
+        file_id = (st.st_ino, st.st_dev)
+        if file_id != self._usage_log_id or st.st_size < self._usage_log_offset:
+            self._reset_usage()
+            self._usage_log_id = file_id
+        if st.st_size == self._usage_log_offset:
+            return
+
+        with open(self.usage_log_file, "rb") as f:
+            f.seek(self._usage_log_offset)
+            data = f.read()
+        # 只处理完整的行，写了一半的行留到下次
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                event = json.loads(line)
+                group_id = event["id"]
+                count = int(event.get("count", 1))
+                ts = event.get("ts") or ""
+            except (ValueError, KeyError, TypeError):
+                continue
+            entry = self._usage.setdefault(group_id, [0, ""])
+            entry[0] += count
+            if ts > entry[1]:
+                entry[1] = ts
+            self._usage_log_lines += 1
+        self._usage_log_offset += end
+
+    def _reset_usage(self) -> None:
+        self._usage = {}
+        self._usage_log_lines = 0
+        self._usage_log_offset = 0
+        self._usage_log_id = None
+
+    def _saved_group_ids(self) -> Optional[set]:
+        """分组文件中当前的分组ID；读取失败返回 None
+
+        其他实例可能新建过分组，不能以本实例内存中的分组列表为准。
+        """
+        try:
+            with open(self.groups_file, "r", encoding="utf-8") as f:
+                groups = json.load(f).get("groups", [])
+            return {g["id"] for g in groups if isinstance(g, dict) and "id" in g}
+        except (OSError, ValueError, AttributeError, TypeError):
+            return None
+
+    def _compact_usage_log(self) -> None:
+        """将日志合并为每个分组一行（分组文件中已删除的分组不再保留）"""
+        tmp_file = self.usage_log_file.with_name(self.usage_log_file.name + ".tmp")
+        saved_ids = self._saved_group_ids()
+        lines = [
+            json.dumps({"id": group_id, "count": count, "ts": ts}, ensure_ascii=False)
+            for group_id, (count, ts) in self._usage.items()
+            if saved_ids is None or group_id in saved_ids
+        ]
+        with open(tmp_file, "wb") as f:
+            f.write("".join(line + "\n" for line in lines).encode("utf-8"))
+        os.replace(tmp_file, self.usage_log_file)
+        self._reset_usage()
+        self._sync_usage_log()
@@ -4,7 +4,7 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 
 class AuthManager:
@@ -15,9 +15,22 @@ class AuthManager:
     - macOS/Linux: ~/.local/share/opencode/auth.json
     """
 
+    # 进程内所有实例写入 auth.json 后都会通知，回调参数为文件路径
+    _change_listeners: List[Callable[[Path], None]] = []
+
     def __init__(self):
         self._auth_path: Optional[Path] = None
 
+    @classmethod
+    def add_change_listener(cls, callback: Callable[[Path], None]) -> None:
+        if callback not in cls._change_listeners:
+            cls._change_listeners.append(callback)
+
+    @classmethod
+    def remove_change_listener(cls, callback: Callable[[Path], None]) -> None:
+        if callback in cls._change_listeners:
+            cls._change_listeners.remove(callback)
+
     @property
     def auth_path(self) -> Path:
         """获取 auth.json 路径（延迟初始化）"""
@@ -85,6 +98,11 @@ class AuthManager:
         self._ensure_parent_dir()
         with open(self.auth_path, "w", encoding="utf-8") as f:
             json.dump(auth_data, f, indent=2, ensure_ascii=False)
+        for callback in list(AuthManager._change_listeners):
+            try:
+                callback(self.auth_path)
+            except Exception:
+                pass
 
     def get_provider_auth(self, provider_id: str) -> Optional[Dict[str, Any]]:
         """获取指定 Provider 的认证信息
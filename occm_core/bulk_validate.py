@@ -0,0 +1,483 @@
+"""批量校验多个 opencode.json / oh-my-opencode.json
+
+    python -m occm_core.bulk_validate ~/projects/**/opencode.json
+    python -m occm_core.bulk_validate ./rollout --workers 8 --schema --json
+
+参数可以是文件、目录（递归查找配置文件）或 glob。文件在进程池中解析与
+校验（校验器是纯 Python、CPU 密集），每完成一个文件立即产生一条结果；
+结束后按问题类型汇总。
+
+结果按 (文件内容摘要, 配置类型, 校验器指纹) 缓存在磁盘上：重复运行时未
+修改的文件只需读取并计算摘要，不再进入进程池。
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config_manager import ConfigManager
+from .config_paths import ConfigPaths
+from .config_schema import KNOWN_SCHEMA_URLS, SCHEMA_CACHE_DIR, SchemaStore
+from .config_validator import ConfigValidator
+from .model_index import MODEL_PRESETS_FILE, get_model_index
+
+
+BULK_MAX_WORKERS = max(1, min(8, os.cpu_count() or 1))
+BULK_CACHE_FILE = "bulk_validate.json"
+# 是否按 Schema 校验的结果不同，两种模式各用一个缓存文件，交替运行互不覆盖
+BULK_SCHEMA_CACHE_FILE = "bulk_validate_schema.json"
+# 结果缓存最多保留的文件数（超出时淘汰最久未用的）
+BULK_CACHE_MAX_ENTRIES = 5000
+_BULK_CACHE_VERSION = 1
+
+KIND_OPENCODE = "opencode"
+KIND_OHMYOPENCODE = "oh-my-opencode"
+CONFIG_FILE_NAMES = (
+    "opencode.json",
+    "opencode.jsonc",
+    "oh-my-opencode.json",
+    "oh-my-opencode.jsonc",
+)
+
+_QUOTED_RE = re.compile(r"'[^']*'|\"[^\"]*\"")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+
+
+@dataclass
+class FileValidation:
+    """单个文件的校验结果"""
+
+    path: str
+    kind: str
+    issues: List[Dict] = field(default_factory=list)
+    # 文件无法读取或解析时的错误（此时 issues 为空）
+    error: str = ""
+    cached: bool = False
+    elapsed_ms: int = 0
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for i in self.issues if i.get("level") == "error") + (
+            1 if self.error else 0
+        )
+
+    @property
+    def warning_count(self) -> int:
+        return sum(1 for i in self.issues if i.get("level") == "warning")
+
+
+@dataclass
+class BulkProgress:
+    done: int
+    total: int
+    result: FileValidation
+
+
+@dataclass
+class IssueGroup:
+    """同一类问题（消息去掉具体名称与数字后相同）"""
+
+    level: str
+    kind: str
+    sample: str
+    count: int = 0
+    files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BulkReport:
+    results: List[FileValidation] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+
+    @property
+    def failed(self) -> List[FileValidation]:
+        return [r for r in self.results if r.error_count]
+
+    @property
+    def cached_count(self) -> int:
+        return sum(1 for r in self.results if r.cached)
+
+    def groups(self) -> List[IssueGroup]:
+        """按问题类型汇总，错误在前、出现次数多的在前"""
+        groups: Dict[Tuple[str, str, str], IssueGroup] = {}
+        for result in self.results:
+            entries = [
+                (
+                    issue.get("level", "error"),
+                    issue_type(issue),
+                    issue.get("message", ""),
+                )
+                for issue in result.issues
+            ]
+            if result.error:
+                entries.append(
+                    ("error", issue_type({"message": result.error}), result.error)
+                )
+            for level, key, message in entries:
+                group = groups.get((level, result.kind, key))
+                if group is None:
+                    group = groups[(level, result.kind, key)] = IssueGroup(
+                        level=level, kind=result.kind, sample=message
+                    )
+                group.count += 1
+                if not group.files or group.files[-1] != result.path:
+                    group.files.append(result.path)
+        return sorted(
+            groups.values(),
+            key=lambda g: (g.level != "error", -len(g.files), -g.count, g.sample),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "files": len(self.results),
+            "failed": len(self.failed),
+            "cached": self.cached_count,
+            "groups": [asdict(g) for g in self.groups()],
+            "results": [asdict(r) for r in self.results],
+        }
+
+    def format_text(self, max_files: int = 5) -> str:
+        lines = [
+            f"{len(self.results)} files in {self.elapsed_sec:.1f}s "
+            f"({self.cached_count} cached), {len(self.failed)} with errors"
+        ]
+        for group in self.groups():
+            marker = "ERROR" if group.level == "error" else "WARN "
+            lines.append(
+                f"  {marker} [{group.kind}] {group.sample} "
+                f"({group.count} in {len(group.files)} files)"
+            )
+            for path in group.files[:max_files]:
+                lines.append(f"      {path}")
+            if len(group.files) > max_files:
+                lines.append(f"      ... {len(group.files) - max_files} more")
+        return "\n".join(lines)
+
+
+def issue_type(issue: Dict) -> str:
+    """问题类型：去掉路径前缀、引号中的名称与数字后的消息"""
+    message = issue.get("message", "")
+    path = issue.get("path", "")
+    if path and message.startswith(f"{path}: "):
+        message = message[len(path) + 2 :]
+    message = _QUOTED_RE.sub("'*'", message)
+    return _NUMBER_RE.sub("N", message)
+
+
+def config_kind(path: Path) -> str:
+    return KIND_OHMYOPENCODE if "oh-my-opencode" in path.name else KIND_OPENCODE
+
+
+def expand_paths(patterns: Iterable[str]) -> List[Path]:
+    """文件 / 目录 / glob → 去重后的配置文件列表"""
+    found: Dict[str, Path] = {}
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        matches = (
+            glob.glob(pattern, recursive=True)
+            if glob.has_magic(pattern)
+            else [pattern]
+        )
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                candidates = [
+                    p
+                    for name in CONFIG_FILE_NAMES
+                    for p in path.rglob(name)
+                    if p.is_file()
+                ]
+            elif path.is_file():
+                candidates = [path]
+            else:
+                continue
+            for candidate in candidates:
+                found.setdefault(str(candidate.resolve()), candidate)
+    return [found[key] for key in sorted(found)]
+
+
+def _parse(text: str) -> Tuple[Optional[Any], str]:
+    try:
+        return json.loads(text), ""
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(ConfigManager.strip_jsonc_comments(text)), ""
+    except json.JSONDecodeError as e:
+        return None, f"JSON 解析失败: {e}"
+
+
+# ---- 工作进程 ----
+
+_worker_schema_store: Optional[SchemaStore] = None
+
+
+def _init_worker(schema_dir: Optional[str]) -> None:
+    global _worker_schema_store
+    if schema_dir:
+        # 工作进程只读缓存，不下载
+        _worker_schema_store = SchemaStore(Path(schema_dir), auto_fetch=False)
+
+
+def _validate_text(kind: str, text: str) -> Tuple[List[Dict], str]:
+    """在工作进程中解析并校验一个文件的内容"""
+    config, error = _parse(text)
+    if error:
+        return [], error
+    if kind == KIND_OHMYOPENCODE:
+        issues = ConfigValidator.validate_ohmyopencode_config(
+            config, schema_store=_worker_schema_store
+        )
+    else:
+        issues = ConfigValidator.validate_opencode_config(
+            config, model_index=get_model_index(), schema_store=_worker_schema_store
+        )
+    return issues, ""
+
+
+def _timed_validate(kind: str, text: str) -> Tuple[List[Dict], str, int]:
+    start = time.perf_counter()
+    issues, error = _validate_text(kind, text)
+    return issues, error, int((time.perf_counter() - start) * 1000)
+
+
+class BulkValidator:
+    """在进程池中批量校验配置文件，结果按内容摘要缓存"""
+
+    def __init__(
+        self,
+        max_workers: int = BULK_MAX_WORKERS,
+        cache_path: Optional[Path] = None,
+        schema_store: Optional[SchemaStore] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.schema_store = schema_store
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._fingerprint = self._validator_fingerprint()
+        self._load_cache()
+
+    def _validator_fingerprint(self) -> str:
+        """校验规则或 Schema 变化时，旧的缓存结果全部失效"""
+        digest = hashlib.sha256()
+        digest.update(b"schema" if self.schema_store is not None else b"plain")
+        sources = [
+            sys.modules[module.__module__].__file__ or ""
+            for module in (ConfigValidator, SchemaStore)
+        ]
+        sources.append(str(MODEL_PRESETS_FILE))
+        for source in sources:
+            try:
+                with open(source, "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(source.encode("utf-8"))
+        if self.schema_store is not None:
+            for url in KNOWN_SCHEMA_URLS:
+                path = self.schema_store.cache_file(url)
+                try:
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+                except (OSError, TypeError):
+                    digest.update(b"-")
+        return digest.hexdigest()[:16]
+
+    def _load_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("version") == _BULK_CACHE_VERSION
+            and data.get("fingerprint") == self._fingerprint
+        ):
+            self._cache = data.get("entries") or {}
+
+    def save(self) -> None:
+        if self.cache_path is None:
+            return
+        while len(self._cache) > BULK_CACHE_MAX_ENTRIES:
+            del self._cache[next(iter(self._cache))]
+        data = {
+            "version": _BULK_CACHE_VERSION,
+            "fingerprint": self._fingerprint,
+            "entries": self._cache,
+        }
+        tmp_path = self.cache_path.with_suffix(".json.tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def _read(self, path: Path) -> Tuple[str, str, str]:
+        """返回 (内容, 缓存键, 错误)"""
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            return "", "", str(e)
+        try:
+            text = raw.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            return "", "", f"编码错误: {e}"
+        key = f"{config_kind(path)}:{hashlib.sha256(raw).hexdigest()}"
+        return text, key, ""
+
+    def iter_validate(self, paths: List[Path]) -> Iterator[BulkProgress]:
+        """按完成顺序逐个产出结果；缓存命中的文件最先产出"""
+        total = len(paths)
+        done = 0
+        pending: List[Tuple[Path, str, str]] = []
+        for path in paths:
+            text, key, error = self._read(path)
+            cached = self._cache.pop(key, None) if key else None
+            if cached is not None:
+                self._cache[key] = cached  # 移到末尾，按最近使用淘汰
+            if error or cached is not None:
+                done += 1
+                result = FileValidation(
+                    path=str(path),
+                    kind=config_kind(path),
+                    issues=list(cached["issues"]) if cached else [],
+                    error=error or (cached or {}).get("error", ""),
+                    cached=cached is not None,
+                )
+                yield BulkProgress(done=done, total=total, result=result)
+            else:
+                pending.append((path, key, text))
+        if not pending:
+            return
+
+        schema_dir = None
+        if self.schema_store is not None and self.schema_store.cache_dir is not None:
+            schema_dir = str(self.schema_store.cache_dir)
+        workers = min(self.max_workers, len(pending))
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(schema_dir,),
+            ) as executor:
+                futures = {
+                    executor.submit(_timed_validate, config_kind(path), text): (
+                        path,
+                        key,
+                    )
+                    for path, key, text in pending
+                }
+                for future in as_completed(futures):
+                    path, key = futures[future]
+                    try:
+                        issues, error, elapsed_ms = future.result()
+                    except Exception as e:
+                        issues, error, elapsed_ms = [], str(e), 0
+                    else:
+                        self._cache[key] = {"issues": issues, "error": error}
+                    done += 1
+                    yield BulkProgress(
+                        done=done,
+                        total=total,
+                        result=FileValidation(
+                            path=str(path),
+                            kind=config_kind(path),
+                            issues=issues,
+                            error=error,
+                            elapsed_ms=elapsed_ms,
+                        ),
+                    )
+        finally:
+            self.save()
+
+    def validate_all(
+        self,
+        paths: List[Path],
+        on_progress: Optional[Callable[[BulkProgress], None]] = None,
+    ) -> BulkReport:
+        start = time.perf_counter()
+        report = BulkReport()
+        for progress in self.iter_validate(paths):
+            report.results.append(progress.result)
+            if on_progress is not None:
+                on_progress(progress)
+        report.results.sort(key=lambda r: r.path)
+        report.elapsed_sec = time.perf_counter() - start
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m occm_core.bulk_validate",
+        description="批量校验 opencode.json / oh-my-opencode.json 并按问题类型汇总",
+    )
+    parser.add_argument("paths", nargs="+", help="文件、目录或 glob（支持 **）")
+    parser.add_argument("--workers", type=int, default=BULK_MAX_WORKERS)
+    parser.add_argument(
+        "--schema", action="store_true", help="同时按缓存的 $schema 校验（缺失时先下载）"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="不读写结果缓存")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("未找到配置文件", file=sys.stderr)
+        return 2
+
+    schema_store = None
+    if args.schema:
+        schema_store = SchemaStore(
+            ConfigPaths.get_cache_dir() / SCHEMA_CACHE_DIR, auto_fetch=False
+        )
+        for url in KNOWN_SCHEMA_URLS:
+            if schema_store.get(url) is None:
+                schema_store.fetch(url)
+
+    cache_path = None
+    if not args.no_cache:
+        cache_file = BULK_SCHEMA_CACHE_FILE if args.schema else BULK_CACHE_FILE
+        cache_path = ConfigPaths.get_cache_dir() / cache_file
+    validator = BulkValidator(
+        max_workers=args.workers, cache_path=cache_path, schema_store=schema_store
+    )
+
+    def on_progress(progress: BulkProgress) -> None:
+        r = progress.result
+        if r.error:
+            status = f"ERROR {r.error}"
+        else:
+            status = f"{r.error_count} errors, {r.warning_count} warnings"
+        suffix = " (cached)" if r.cached else ""
+        print(
+            f"[{progress.done}/{progress.total}] {r.path}: {status}{suffix}",
+            file=sys.stderr,
+        )
+
+    report = validator.validate_all(paths, on_progress=on_progress)
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(report.format_text())
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT_SEC = 30.0
+BREAKER_MAX_RESET_TIMEOUT_SEC = 600.0
+
+
+class CircuitBreaker:
+    """三态熔断器（closed / open / half_open）
+
+    - closed: 正常放行，连续失败达到阈值后熔断
+    - open: 直接拒绝，冷却时间结束后转为 half_open
+    - half_open: 只放行一个试探请求，成功则恢复，失败则重新熔断并加倍冷却时间
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout_sec: float = BREAKER_RESET_TIMEOUT_SEC,
+        max_reset_timeout_sec: float = BREAKER_MAX_RESET_TIMEOUT_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_sec = reset_timeout_sec
+        self.max_reset_timeout_sec = max_reset_timeout_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._opened_at = 0.0
+        self._cooldown_sec = reset_timeout_sec
+        self._probe_in_flight = False
+        self.last_reason = ""
+
+    def _refresh_state(self) -> None:
+        if (
+            self._state == BREAKER_OPEN
+            and self._clock() - self._opened_at >= self._cooldown_sec
+        ):
+            self._state = BREAKER_HALF_OPEN
+            self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def retry_after(self) -> float:
+        """距离允许下一次试探的秒数（非 open 状态返回 0）"""
+        with self._lock:
+            self._refresh_state()
+            if self._state != BREAKER_OPEN:
+                return 0.0
+            return max(0.0, self._cooldown_sec - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """是否放行本次请求；half_open 状态下只有第一个调用者获得试探机会"""
+        with self._lock:
+            self._refresh_state()
+            if self._state == BREAKER_CLOSED:
+                return True
+            if self._state == BREAKER_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = BREAKER_CLOSED
+            self._failures = 0
+            self._trips = 0
+            self._cooldown_sec = self.reset_timeout_sec
+            self._probe_in_flight = False
+            self.last_reason = ""
+
+    def record_failure(self, reason: str = "", trip: bool = False) -> None:
+        """记录一次失败；trip=True 表示不可自愈的错误（如鉴权失败），立即熔断"""
+        with self._lock:
+            self._refresh_state()
+            self._failures += 1
+            self.last_reason = reason
+            if (
+                trip
+                or self._state == BREAKER_HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._trip()
+
+    def _trip(self) -> None:
+        self._cooldown_sec = min(
+            self.reset_timeout_sec * (2**self._trips), self.max_reset_timeout_sec
+        )
+        self._trips += 1
+        self._state = BREAKER_OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+class CircuitBreakerRegistry:
+    """按 (源站, API Key) 维度管理熔断器，同一 Provider 的所有模型共享一个熔断器"""
+
+    def __init__(self, factory: Optional[Callable[[], CircuitBreaker]] = None):
+        self._factory = factory or CircuitBreaker
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(origin: str, api_key: str) -> str:
+        """生成熔断器键，API Key 只保留摘要，避免明文驻留在键中"""
+        digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+        return f"{origin}#{digest}"
+
+    def get(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._factory()
+                self._breakers[key] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            items = list(self._breakers.items())
+        return {key: breaker.state for key, breaker in items}
+
+    def reset_all(self) -> None:
+        with self._lock:
+            items = list(self._breakers.values())
+        for breaker in items:
+            breaker.reset()
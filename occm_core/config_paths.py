@@ -164,6 +164,16 @@ class ConfigPaths:
             return cls._custom_backup_path
         return cls.get_config_base_dir() / "backups"
 
+    @classmethod
+    def get_monitor_history_dir(cls) -> Path:
+        """获取监控历史（原始结果与可用率汇总）目录"""
+        return cls.get_config_base_dir() / "occm-monitor"
+
+    @classmethod
+    def get_cache_dir(cls) -> Path:
+        """获取缓存目录（模型列表等可随时重建的数据）"""
+        return cls.get_config_base_dir() / "occm-cache"
+
     @classmethod
     def set_backup_dir(cls, path: Optional[Path]) -> None:
         """设置自定义备份目录"""
@@ -0,0 +1,684 @@
+"""基于 $schema 的配置校验
+
+opencode.json 与 oh-my-opencode.json 的 JSON Schema 下载后缓存到本地
+（离线时使用缓存），每份 Schema 只编译一次：编译时把 Schema 转成嵌套的
+校验闭包，校验时不再解释 Schema 字典，可在编辑时频繁调用。
+
+- 支持常用关键字：type / enum / const / properties / required /
+  additionalProperties / patternProperties / items / prefixItems /
+  min*/max* / pattern / allOf / anyOf / oneOf / not / if-then-else /
+  文档内 $ref（#/$defs/...、#/definitions/...）；其它关键字忽略
+- 只下载已知的 Schema 地址，配置中的其它 $schema 按配置类型回退到默认地址
+- 校验从不等待网络：没有缓存时返回空结果并在后台下载
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .config_paths import ConfigPaths
+
+
+OPENCODE_SCHEMA_URL = "https://opencode.ai/config.json"
+OHMYOPENCODE_SCHEMA_URL = "https://raw.githubusercontent.com/code-yeongyu/oh-my-opencode/master/assets/oh-my-opencode.schema.json"
+KNOWN_SCHEMA_URLS = (OPENCODE_SCHEMA_URL, OHMYOPENCODE_SCHEMA_URL)
+
+SCHEMA_TTL_SEC = 7 * 24 * 3600
+SCHEMA_TIMEOUT_SEC = 10
+# 下载失败后，在此时间内不再自动重试
+SCHEMA_RETRY_SEC = 300
+SCHEMA_CACHE_DIR = "schemas"
+# 单次校验最多报告的问题数
+MAX_SCHEMA_ISSUES = 50
+
+# 校验函数：(值, 路径, 问题列表) -> 是否通过
+_Check = Callable[[Any, str, List[Dict]], bool]
+
+_TYPE_NAMES = {
+    "object": "对象",
+    "array": "数组",
+    "string": "字符串",
+    "integer": "整数",
+    "number": "数字",
+    "boolean": "布尔值",
+    "null": "null",
+}
+
+
+# 与 JSON 类型一一对应、无需额外判断的 Python 类型
+_PYTHON_TYPES = {"object": dict, "array": list, "string": str}
+
+
+class _IssueLimit(Exception):
+    pass
+
+
+def _is_type(value: Any, type_name: str) -> bool:
+    if type_name == "object":
+        return isinstance(value, dict)
+    if type_name == "array":
+        return isinstance(value, list)
+    if type_name == "string":
+        return isinstance(value, str)
+    if type_name == "boolean":
+        return isinstance(value, bool)
+    if type_name == "null":
+        return value is None
+    if isinstance(value, bool):
+        return False
+    if type_name == "integer":
+        return isinstance(value, int) or (
+            isinstance(value, float) and value.is_integer()
+        )
+    if type_name == "number":
+        return isinstance(value, (int, float))
+    return True
+
+
+def _child(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+class CompiledSchema:
+    """编译后的 JSON Schema（只读，可被多个线程同时使用）"""
+
+    def __init__(self, schema: Any, url: str = ""):
+        self.url = url
+        self.schema = schema
+        self._refs: Dict[str, _Check] = {}
+        self._check = self._compile(schema)
+
+    def validate(
+        self, instance: Any, max_issues: int = MAX_SCHEMA_ISSUES
+    ) -> List[Dict]:
+        """返回与 ConfigValidator 相同格式的问题列表"""
+        issues: List[Dict] = []
+        sink = _LimitedIssues(issues, max_issues)
+        try:
+            self._check(instance, "", sink)
+        except _IssueLimit:
+            pass
+        for issue in issues:
+            issue["path"] = issue["path"] or "root"
+        return issues
+
+    def is_valid(self, instance: Any) -> bool:
+        try:
+            return self._check(instance, "", _LimitedIssues([], 0))
+        except _IssueLimit:
+            return False
+
+    # ---- 编译 ----
+
+    def _resolve(self, ref: str) -> Any:
+        if ref == "#":
+            return self.schema
+        if not ref.startswith("#/"):
+            return True  # 外部引用不下载，视为通过
+        node = self.schema
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if isinstance(node, dict) and part in node:
+                node = node[part]
+            elif isinstance(node, list) and part.isdigit() and int(part) < len(node):
+                node = node[int(part)]
+            else:
+                return True
+        return node
+
+    def _compile_ref(self, ref: str) -> _Check:
+        # 递归 Schema：首次调用时才编译目标，之后复用
+        def check(value: Any, path: str, issues: List[Dict]) -> bool:
+            target = self._refs.get(ref)
+            if target is None:
+                target = self._refs[ref] = self._compile(self._resolve(ref))
+            return target(value, path, issues)
+
+        return check
+
+    def _compile(self, schema: Any) -> _Check:
+        if schema is True or schema == {} or not isinstance(schema, (dict, bool)):
+            return lambda value, path, issues: True
+        if schema is False:
+
+            def reject(value: Any, path: str, issues: List[Dict]) -> bool:
+                issues.append(_issue(path, "不允许出现该字段"))
+                return False
+
+            return reject
+
+        checks: List[_Check] = []
+        if "$ref" in schema and isinstance(schema["$ref"], str):
+            checks.append(self._compile_ref(schema["$ref"]))
+        for keyword, compiler in _KEYWORDS:
+            if keyword in schema:
+                check = compiler(self, schema)
+                if check is not None:
+                    checks.append(check)
+        for keywords, compiler in _GROUPED_KEYWORDS:
+            if any(keyword in schema for keyword in keywords):
+                check = compiler(self, schema)
+                if check is not None:
+                    checks.append(check)
+
+        if not checks:
+            return lambda value, path, issues: True
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value: Any, path: str, issues: List[Dict]) -> bool:
+            ok = True
+            for check in checks:
+                if not check(value, path, issues):
+                    ok = False
+            return ok
+
+        return check_all
+
+
+class _LimitedIssues(list):
+    """达到上限后抛出 _IssueLimit，提前结束校验"""
+
+    def __init__(self, target: List[Dict], limit: int):
+        super().__init__()
+        self._target = target
+        self._limit = limit
+
+    def append(self, issue: Dict) -> None:
+        if self._limit <= 0:
+            raise _IssueLimit()
+        self._target.append(issue)
+        if len(self._target) >= self._limit:
+            raise _IssueLimit()
+
+
+class _Silent(list):
+    """anyOf / oneOf / not / if 的试探性校验：不收集问题"""
+
+    def append(self, issue: Dict) -> None:
+        pass
+
+
+_SILENT = _Silent()
+
+
+def _issue(path: str, message: str) -> Dict:
+    return {
+        "level": "error",
+        "path": path,
+        "message": f"{path or '配置根'}: {message}",
+    }
+
+
+def _type_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    expected = schema["type"]
+    types = [expected] if isinstance(expected, str) else list(expected or [])
+    if not types:
+        return None
+    names = "、".join(_TYPE_NAMES.get(t, t) for t in types)
+    message = f"应为{names}"
+    # 常见的单一类型直接用 isinstance 判断
+    python_type = _PYTHON_TYPES.get(types[0]) if len(types) == 1 else None
+
+    if python_type is not None:
+
+        def check_single(value: Any, path: str, issues: List[Dict]) -> bool:
+            if isinstance(value, python_type):
+                return True
+            issues.append(_issue(path, message))
+            return False
+
+        return check_single
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        for type_name in types:
+            if _is_type(value, type_name):
+                return True
+        issues.append(_issue(path, message))
+        return False
+
+    return check
+
+
+def _enum_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    options = schema["enum"]
+    if not isinstance(options, list):
+        return None
+    shown = ", ".join(json.dumps(o, ensure_ascii=False) for o in options[:8])
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        for option in options:
+            if value == option and type(value) is type(option):
+                return True
+        issues.append(_issue(path, f"取值应为 {shown}"))
+        return False
+
+    return check
+
+
+def _const_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    expected = schema["const"]
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        if value == expected and type(value) is type(expected):
+            return True
+        issues.append(
+            _issue(path, f"取值应为 {json.dumps(expected, ensure_ascii=False)}")
+        )
+        return False
+
+    return check
+
+
+def _object_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    properties = {
+        name: compiled._compile(sub)
+        for name, sub in (schema.get("properties") or {}).items()
+    }
+    required = [r for r in schema.get("required") or [] if isinstance(r, str)]
+    patterns = [
+        (re.compile(pattern), compiled._compile(sub))
+        for pattern, sub in (schema.get("patternProperties") or {}).items()
+    ]
+    additional = schema.get("additionalProperties", True)
+    additional_check = (
+        compiled._compile(additional) if isinstance(additional, dict) else None
+    )
+    min_props = schema.get("minProperties")
+    max_props = schema.get("maxProperties")
+
+    open_object = not patterns and additional is not False and additional_check is None
+    bounded = isinstance(min_props, int) or isinstance(max_props, int)
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        if not isinstance(value, dict):
+            return True
+        ok = True
+        for name in required:
+            if name not in value:
+                issues.append(_issue(path, f"缺少必需字段 '{name}'"))
+                ok = False
+        prefix = f"{path}." if path else ""
+        if open_object:
+            # 只需检查已声明的字段：按 Schema 的字段表查找，不遍历配置的全部键
+            for key, sub in properties.items():
+                if key in value and not sub(value[key], prefix + key, issues):
+                    ok = False
+        else:
+            for key, item in value.items():
+                child = prefix + str(key)
+                sub = properties.get(key)
+                matched = sub is not None
+                if sub is not None and not sub(item, child, issues):
+                    ok = False
+                for pattern, pattern_check in patterns:
+                    if pattern.search(key):
+                        matched = True
+                        if not pattern_check(item, child, issues):
+                            ok = False
+                if matched:
+                    continue
+                if additional is False:
+                    issues.append(_issue(child, "不是允许的字段"))
+                    ok = False
+                elif additional_check is not None and not additional_check(
+                    item, child, issues
+                ):
+                    ok = False
+        if bounded:
+            if isinstance(min_props, int) and len(value) < min_props:
+                issues.append(_issue(path, f"至少需要 {min_props} 个字段"))
+                ok = False
+            if isinstance(max_props, int) and len(value) > max_props:
+                issues.append(_issue(path, f"最多允许 {max_props} 个字段"))
+                ok = False
+        return ok
+
+    return check
+
+
+def _array_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    items = schema.get("items")
+    prefix = schema.get("prefixItems")
+    if isinstance(items, list):  # draft-07 元组形式
+        prefix, items = items, schema.get("additionalItems")
+    prefix_checks = [compiled._compile(sub) for sub in prefix or []]
+    item_check = compiled._compile(items) if items is not None else None
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        if not isinstance(value, list):
+            return True
+        ok = True
+        for i, item in enumerate(value):
+            if i < len(prefix_checks):
+                sub = prefix_checks[i]
+            elif item_check is not None:
+                sub = item_check
+            else:
+                break
+            if not sub(item, _child(path, i), issues):
+                ok = False
+        if isinstance(min_items, int) and len(value) < min_items:
+            issues.append(_issue(path, f"至少需要 {min_items} 项"))
+            ok = False
+        if isinstance(max_items, int) and len(value) > max_items:
+            issues.append(_issue(path, f"最多允许 {max_items} 项"))
+            ok = False
+        return ok
+
+    return check
+
+
+def _number_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    bounds = []
+    for keyword, op, text in (
+        ("minimum", lambda v, b: v >= b, "不能小于"),
+        ("maximum", lambda v, b: v <= b, "不能大于"),
+        ("exclusiveMinimum", lambda v, b: v > b, "必须大于"),
+        ("exclusiveMaximum", lambda v, b: v < b, "必须小于"),
+    ):
+        bound = schema.get(keyword)
+        if isinstance(bound, (int, float)) and not isinstance(bound, bool):
+            bounds.append((bound, op, text))
+    if not bounds:
+        return None
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return True
+        ok = True
+        for bound, op, text in bounds:
+            if not op(value, bound):
+                issues.append(_issue(path, f"{text} {bound}"))
+                ok = False
+        return ok
+
+    return check
+
+
+def _string_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = schema.get("pattern")
+    try:
+        regex = re.compile(pattern) if isinstance(pattern, str) else None
+    except re.error:
+        regex = None
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        if not isinstance(value, str):
+            return True
+        ok = True
+        if isinstance(min_length, int) and len(value) < min_length:
+            issues.append(
+                _issue(path, "不能为空" if min_length == 1 else f"长度至少为 {min_length}")
+            )
+            ok = False
+        if isinstance(max_length, int) and len(value) > max_length:
+            issues.append(_issue(path, f"长度不能超过 {max_length}"))
+            ok = False
+        if regex is not None and not regex.search(value):
+            issues.append(_issue(path, f"格式不符合 {pattern}"))
+            ok = False
+        return ok
+
+    return check
+
+
+def _all_of_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    subs = [compiled._compile(sub) for sub in schema["allOf"] or []]
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        ok = True
+        for sub in subs:
+            if not sub(value, path, issues):
+                ok = False
+        return ok
+
+    return check
+
+
+def _any_of_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    subs = [compiled._compile(sub) for sub in schema["anyOf"] or []]
+    if not subs:
+        return None
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        for sub in subs:
+            if sub(value, path, _SILENT):
+                return True
+        if len(subs) == 1:
+            return subs[0](value, path, issues)
+        issues.append(_issue(path, "不符合任何一种允许的格式"))
+        return False
+
+    return check
+
+
+def _one_of_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    subs = [compiled._compile(sub) for sub in schema["oneOf"] or []]
+    if not subs:
+        return None
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        matched = sum(1 for sub in subs if sub(value, path, _SILENT))
+        if matched == 1:
+            return True
+        if matched == 0 and len(subs) == 1:
+            return subs[0](value, path, issues)
+        issues.append(
+            _issue(
+                path,
+                "不符合任何一种允许的格式" if matched == 0 else "同时符合多种格式",
+            )
+        )
+        return False
+
+    return check
+
+
+def _not_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    sub = compiled._compile(schema["not"])
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        if sub(value, path, _SILENT):
+            issues.append(_issue(path, "不允许该取值"))
+            return False
+        return True
+
+    return check
+
+
+def _if_check(compiled: CompiledSchema, schema: Dict) -> Optional[_Check]:
+    condition = compiled._compile(schema["if"])
+    then_check = compiled._compile(schema["then"]) if "then" in schema else None
+    else_check = compiled._compile(schema["else"]) if "else" in schema else None
+
+    def check(value: Any, path: str, issues: List[Dict]) -> bool:
+        branch = then_check if condition(value, path, _SILENT) else else_check
+        return branch(value, path, issues) if branch is not None else True
+
+    return check
+
+
+# (关键字, 编译函数)；一组相关关键字由同一个编译函数一起处理
+_KEYWORDS = [
+    ("type", _type_check),
+    ("enum", _enum_check),
+    ("const", _const_check),
+    ("allOf", _all_of_check),
+    ("anyOf", _any_of_check),
+    ("oneOf", _one_of_check),
+    ("not", _not_check),
+    ("if", _if_check),
+]
+_GROUPED_KEYWORDS = [
+    (
+        (
+            "properties",
+            "required",
+            "patternProperties",
+            "additionalProperties",
+            "minProperties",
+            "maxProperties",
+        ),
+        _object_check,
+    ),
+    (("items", "prefixItems", "minItems", "maxItems"), _array_check),
+    (("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"), _number_check),
+    (("minLength", "maxLength", "pattern"), _string_check),
+]
+
+
+class SchemaStore:
+    """Schema 下载、磁盘缓存与编译结果缓存（线程安全）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_sec: float = SCHEMA_TTL_SEC,
+        timeout_sec: float = SCHEMA_TIMEOUT_SEC,
+        auto_fetch: bool = True,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.ttl_sec = ttl_sec
+        self.timeout_sec = timeout_sec
+        # False 时只使用已有缓存（如批量校验的工作进程）
+        self.auto_fetch = auto_fetch
+        self._compiled: Dict[str, CompiledSchema] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._fetching: Set[str] = set()
+        self._attempted_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def cache_file(self, url: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{digest}.json"
+
+    @staticmethod
+    def resolve_url(config: Any, default_url: str) -> str:
+        """配置中的 $schema 是已知地址时使用它，否则使用默认地址"""
+        url = config.get("$schema") if isinstance(config, dict) else None
+        return url if url in KNOWN_SCHEMA_URLS else default_url
+
+    def _load_cached(self, url: str) -> Optional[CompiledSchema]:
+        path = self.cache_file(url)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                schema = json.load(f)
+            mtime = path.stat().st_mtime
+        except (OSError, ValueError):
+            return None
+        compiled = CompiledSchema(schema, url)
+        with self._lock:
+            self._compiled[url] = compiled
+            self._loaded_at[url] = mtime
+        return compiled
+
+    def fetch(self, url: str) -> Optional[CompiledSchema]:
+        """同步下载并更新缓存；失败时保留已有缓存"""
+        if url not in KNOWN_SCHEMA_URLS:
+            return None
+        try:
+            req = urllib.request.Request(
+                url, headers={"User-Agent": "OpenCode-Config-Manager"}
+            )
+            with urllib.request.urlopen(req, timeout=self.timeout_sec) as response:
+                raw = response.read()
+            schema = json.loads(raw.decode("utf-8"))
+        except Exception:
+            with self._lock:
+                return self._compiled.get(url)
+        compiled = CompiledSchema(schema, url)
+        path = self.cache_file(url)
+        if path is not None:
+            tmp_path = path.with_suffix(".json.tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(raw)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+        with self._lock:
+            self._compiled[url] = compiled
+            self._loaded_at[url] = time.time()
+        return compiled
+
+    def fetch_async(self, url: str) -> None:
+        """后台下载；同一地址同时只有一个下载线程"""
+        if url not in KNOWN_SCHEMA_URLS:
+            return
+        with self._lock:
+            if url in self._fetching:
+                return
+            if time.time() - self._attempted_at.get(url, 0.0) < SCHEMA_RETRY_SEC:
+                return
+            self._fetching.add(url)
+            self._attempted_at[url] = time.time()
+
+        def run() -> None:
+            try:
+                self.fetch(url)
+            finally:
+                with self._lock:
+                    self._fetching.discard(url)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get(self, url: str) -> Optional[CompiledSchema]:
+        """返回已编译的 Schema（不等待网络）；缺失或过期时在后台下载"""
+        with self._lock:
+            compiled = self._compiled.get(url)
+            loaded_at = self._loaded_at.get(url, 0.0)
+        if compiled is None:
+            compiled = self._load_cached(url)
+            with self._lock:
+                loaded_at = self._loaded_at.get(url, 0.0)
+        if self.auto_fetch and (
+            compiled is None or time.time() - loaded_at >= self.ttl_sec
+        ):
+            self.fetch_async(url)
+        return compiled
+
+    def prefetch(self) -> None:
+        for url in KNOWN_SCHEMA_URLS:
+            self.get(url)
+
+    def validate(
+        self, config: Any, default_url: str, max_issues: int = MAX_SCHEMA_ISSUES
+    ) -> List[Dict]:
+        """按配置的 $schema 校验；Schema 尚不可用时返回空列表"""
+        compiled = self.get(self.resolve_url(config, default_url))
+        if compiled is None:
+            return []
+        return compiled.validate(config, max_issues)
+
+
+_shared_store: Optional[SchemaStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_schema_store() -> SchemaStore:
+    """进程内共享的 SchemaStore（缓存位于配置目录下）"""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = SchemaStore(ConfigPaths.get_cache_dir() / SCHEMA_CACHE_DIR)
+        return _shared_store
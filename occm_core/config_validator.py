@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .config_schema import OHMYOPENCODE_SCHEMA_URL, OPENCODE_SCHEMA_URL
 
 
 class ConfigValidator:
@@ -35,399 +38,527 @@ class ConfigValidator:
     ]
 
     @staticmethod
-    def validate_opencode_config(config: Dict) -> List[Dict]:
-        issues = []
+    def validate_opencode_config(
+        config: Dict, model_index=None, schema_store=None
+    ) -> List[Dict]:
+        """schema_store 不为空时先按 $schema 校验，再叠加下面的语义规则"""
+        return list(
+            ConfigValidator._iter_opencode(config, model_index, schema_store)
+        )
+
+    @staticmethod
+    def iter_opencode_issues(
+        config: Dict, model_index=None, schema_store=None, errors_only: bool = False
+    ) -> Iterator[Dict]:
+        """按严重程度逐个产出问题，调用方停止迭代后不再继续校验
+
+        例如只关心前 8 个错误：
+        ConfigValidator.first_errors(
+            ConfigValidator.iter_opencode_issues(config, errors_only=True), 8
+        )
+        """
+        return ConfigValidator.prioritize(
+            ConfigValidator._iter_opencode(config, model_index, schema_store),
+            errors_only,
+        )
+
+    @staticmethod
+    def _iter_opencode(config: Dict, model_index, schema_store) -> Iterator[Dict]:
+        rules = ConfigValidator._iter_opencode_rules(config, model_index)
+        if schema_store is not None and isinstance(config, dict) and config:
+            return ConfigValidator._merge_schema_issues(
+                schema_store.validate(config, OPENCODE_SCHEMA_URL), rules
+            )
+        return rules
 
+    @staticmethod
+    def prioritize(issues: Iterable[Dict], errors_only: bool = False) -> Iterator[Dict]:
+        """错误边校验边产出，警告暂存到遍历结束后再产出（errors_only 时直接丢弃）"""
+        warnings = []
+        for issue in issues:
+            if issue["level"] == "error":
+                yield issue
+            elif not errors_only:
+                warnings.append(issue)
+        yield from warnings
+
+    @staticmethod
+    def first_errors(issues: Iterable[Dict], limit: int = 1) -> List[Dict]:
+        """取问题流中的前 limit 个错误，取够即停止"""
+        return list(islice((i for i in issues if i["level"] == "error"), limit))
+
+    @staticmethod
+    def _merge_schema_issues(
+        schema_issues: List[Dict], issues: Iterable[Dict]
+    ) -> Iterator[Dict]:
+        """Schema 问题在前；同一路径已由 Schema 报告的错误不再重复"""
+        if not schema_issues:
+            yield from issues
+            return
+        yield from schema_issues
+        reported = {issue["path"] for issue in schema_issues}
+        for issue in issues:
+            if issue["level"] != "error" or issue["path"] not in reported:
+                yield issue
+
+    @staticmethod
+    def _iter_opencode_rules(config: Dict, model_index=None) -> Iterator[Dict]:
         if config is None:
+            yield {
+                "level": "error",
+                "path": "root",
+                "message": "配置文件无法解析或读取失败",
+            }
+            return
+
+        if not isinstance(config, dict):
+            yield {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
+            return
+
+        if not config or config == {}:
+            yield {
+                "level": "warning",
+                "path": "root",
+                "message": "配置为空，尚未添加任何Provider",
+            }
+            return
+
+        schema = config.get("$schema")
+        if schema != "https://opencode.ai/config.json":
+            yield {
+                "level": "warning",
+                "path": "$schema",
+                "message": "建议设置 $schema 为 https://opencode.ai/config.json",
+            }
+
+        providers = config.get("provider", {})
+        if not providers:
+            yield {
+                "level": "warning",
+                "path": "provider",
+                "message": "未配置任何 Provider",
+            }
+        if not isinstance(providers, dict):
+            yield {
+                "level": "error",
+                "path": "provider",
+                "message": "provider 必须是对象类型",
+            }
+            return
+
+        for provider_name, provider_data in providers.items():
+            yield from ConfigValidator.iter_provider_issues(
+                provider_name, provider_data, model_index
+            )
+
+        mcp = config.get("mcp", {})
+        if mcp and not isinstance(mcp, dict):
+            yield {"level": "error", "path": "mcp", "message": "mcp 必须是对象类型"}
+        elif isinstance(mcp, dict):
+            for mcp_name, mcp_data in mcp.items():
+                yield from ConfigValidator.validate_mcp_server(mcp_name, mcp_data)
+
+        agent = config.get("agent", {})
+        if agent and not isinstance(agent, dict):
+            yield {"level": "error", "path": "agent", "message": "agent 必须是对象类型"}
+
+    @staticmethod
+    def validate_provider(
+        provider_name: str, provider_data: Any, model_index=None
+    ) -> List[Dict]:
+        """校验单个 Provider 子树（含其全部模型），只依赖该子树本身"""
+        return list(
+            ConfigValidator.iter_provider_issues(
+                provider_name, provider_data, model_index
+            )
+        )
+
+    @staticmethod
+    def iter_provider_issues(
+        provider_name: str, provider_data: Any, model_index=None
+    ) -> Iterator[Dict]:
+        """按配置顺序逐个产出单个 Provider 子树的问题"""
+        provider_path = f"provider.{provider_name}"
+
+        if not isinstance(provider_data, dict):
+            yield {
+                "level": "error",
+                "path": provider_path,
+                "message": f"Provider '{provider_name}' 的值必须是对象，当前是 {type(provider_data).__name__}",
+            }
+            return
+
+        for field in ConfigValidator.PROVIDER_REQUIRED_FIELDS:
+            if field not in provider_data:
+                yield {
+                    "level": "error",
+                    "path": f"{provider_path}.{field}",
+                    "message": f"Provider '{provider_name}' 缺少必需字段 '{field}'",
+                }
+            elif ConfigValidator._is_blank(provider_data.get(field)):
+                yield {
+                    "level": "error",
+                    "path": f"{provider_path}.{field}",
+                    "message": f"Provider '{provider_name}' 的 '{field}' 为空",
+                }
+
+        npm = provider_data.get("npm", "")
+        if npm and npm not in ConfigValidator.VALID_NPM_PACKAGES:
+            yield {
+                "level": "warning",
+                "path": f"{provider_path}.npm",
+                "message": f"Provider '{provider_name}' 的 npm 包 '{npm}' 不在已知列表中",
+            }
+
+        options = provider_data.get("options", {})
+        if not isinstance(options, dict):
+            yield {
+                "level": "error",
+                "path": f"{provider_path}.options",
+                "message": f"Provider '{provider_name}' 的 options 必须是对象",
+            }
+        else:
+            for opt_field in ConfigValidator.PROVIDER_OPTIONS_REQUIRED:
+                if opt_field not in options:
+                    yield {
+                        "level": "warning",
+                        "path": f"{provider_path}.options.{opt_field}",
+                        "message": f"Provider '{provider_name}' 的 options 缺少 '{opt_field}'",
+                    }
+                elif ConfigValidator._is_blank(options.get(opt_field)):
+                    yield {
+                        "level": "warning",
+                        "path": f"{provider_path}.options.{opt_field}",
+                        "message": f"Provider '{provider_name}' 的 options.{opt_field} 为空",
+                    }
+
+        models = provider_data.get("models", {})
+        if not isinstance(models, dict):
+            yield {
+                "level": "error",
+                "path": f"{provider_path}.models",
+                "message": f"Provider '{provider_name}' 的 models 必须是对象",
+            }
+            return
+        if not models:
+            yield {
+                "level": "warning",
+                "path": f"{provider_path}.models",
+                "message": f"Provider '{provider_name}' 没有配置任何模型",
+            }
+        # 模型逐个校验，问题先攒在同一个小列表里，有问题时才产出并清空
+        check_model = ConfigValidator._check_model
+        pending: List[Dict] = []
+        for model_id, model_data in models.items():
+            check_model(provider_name, model_id, model_data, model_index, pending)
+            if pending:
+                yield from pending
+                pending.clear()
+
+    @staticmethod
+    def validate_model(
+        provider_name: str, model_id: str, model_data: Any, model_index=None
+    ) -> List[Dict]:
+        """校验单个模型条目"""
+        issues = []
+        ConfigValidator._check_model(
+            provider_name, model_id, model_data, model_index, issues
+        )
+        return issues
+
+    @staticmethod
+    def _check_model(
+        provider_name: str,
+        model_id: str,
+        model_data: Any,
+        model_index,
+        issues: List[Dict],
+    ) -> None:
+        # 追加到调用方的列表，Provider 逐个校验模型时不必为每个模型新建列表
+        model_path = f"provider.{provider_name}.models.{model_id}"
+        if ConfigValidator._is_blank(model_id):
             issues.append(
                 {
                     "level": "error",
-                    "path": "root",
-                    "message": "配置文件无法解析或读取失败",
+                    "path": model_path,
+                    "message": f"Provider '{provider_name}' 存在空模型ID",
                 }
             )
-            return issues
-
-        if not isinstance(config, dict):
+            return
+        if not isinstance(model_data, dict):
             issues.append(
-                {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
+                {
+                    "level": "error",
+                    "path": model_path,
+                    "message": f"Model '{model_id}' 的值必须是对象",
+                }
             )
-            return issues
+            return
 
-        if not config or config == {}:
+        limit = model_data.get("limit", {})
+        if not isinstance(limit, dict):
             issues.append(
                 {
                     "level": "warning",
-                    "path": "root",
-                    "message": "配置为空，尚未添加任何Provider",
+                    "path": f"{model_path}.limit",
+                    "message": f"Model '{model_id}' 的 limit 应该是对象",
                 }
             )
-            return issues
+        elif limit:
+            context = limit.get("context")
+            output = limit.get("output")
+            if context is not None and not isinstance(context, int):
+                issues.append(
+                    {
+                        "level": "warning",
+                        "path": f"{model_path}.limit.context",
+                        "message": f"Model '{model_id}' 的 context 应该是整数",
+                    }
+                )
+            if output is not None and not isinstance(output, int):
+                issues.append(
+                    {
+                        "level": "warning",
+                        "path": f"{model_path}.limit.output",
+                        "message": f"Model '{model_id}' 的 output 应该是整数",
+                    }
+                )
+            ConfigValidator._check_model_limit(
+                model_index, model_id, model_path, limit, issues
+            )
 
-        schema = config.get("$schema")
-        if schema != "https://opencode.ai/config.json":
+    @staticmethod
+    def validate_mcp_server(mcp_name: str, mcp_data: Any) -> List[Dict]:
+        """校验单个 MCP 条目"""
+        issues = []
+        mcp_path = f"mcp.{mcp_name}"
+        if not isinstance(mcp_data, dict):
             issues.append(
                 {
-                    "level": "warning",
-                    "path": "$schema",
-                    "message": "建议设置 $schema 为 https://opencode.ai/config.json",
+                    "level": "error",
+                    "path": mcp_path,
+                    "message": f"MCP '{mcp_name}' 的值必须是对象",
                 }
             )
+            return issues
 
-        providers = config.get("provider", {})
-        if not providers:
+        mcp_type = mcp_data.get("type")
+        if mcp_type == "local" and "command" not in mcp_data:
             issues.append(
                 {
                     "level": "warning",
-                    "path": "provider",
-                    "message": "未配置任何 Provider",
+                    "path": f"{mcp_path}.command",
+                    "message": f"Local MCP '{mcp_name}' 缺少 command 字段",
                 }
             )
-        if not isinstance(providers, dict):
+        elif mcp_type == "remote" and "url" not in mcp_data:
             issues.append(
                 {
-                    "level": "error",
-                    "path": "provider",
-                    "message": "provider 必须是对象类型",
+                    "level": "warning",
+                    "path": f"{mcp_path}.url",
+                    "message": f"Remote MCP '{mcp_name}' 缺少 url 字段",
                 }
             )
-            return issues
-
-        for provider_name, provider_data in providers.items():
-            provider_path = f"provider.{provider_name}"
+        return issues
 
-            if not isinstance(provider_data, dict):
+    @staticmethod
+    def _check_model_limit(
+        model_index, model_id: str, path: str, limit: Dict, issues: List[Dict]
+    ) -> None:
+        """预设中已知的模型，检查配置的 limit 是否超出其上限"""
+        if model_index is None:
+            return
+        spec = model_index.get(model_id)
+        if spec is None:
+            return
+        for key, known in (("context", spec.context), ("output", spec.output)):
+            value = limit.get(key)
+            if known and isinstance(value, int) and value > known:
                 issues.append(
                     {
-                        "level": "error",
-                        "path": provider_path,
-                        "message": f"Provider '{provider_name}' 的值必须是对象，当前是 {type(provider_data).__name__}",
+                        "level": "warning",
+                        "path": f"{path}.limit.{key}",
+                        "message": f"Model '{model_id}' 的 {key} ({value}) 超过已知上限 {known}",
                     }
                 )
-                continue
 
-            for field in ConfigValidator.PROVIDER_REQUIRED_FIELDS:
-                if field not in provider_data:
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": f"{provider_path}.{field}",
-                            "message": f"Provider '{provider_name}' 缺少必需字段 '{field}'",
-                        }
-                    )
-                elif ConfigValidator._is_blank(provider_data.get(field)):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": f"{provider_path}.{field}",
-                            "message": f"Provider '{provider_name}' 的 '{field}' 为空",
-                        }
-                    )
+    @staticmethod
+    def validate_ohmyopencode_config(config: Dict, schema_store=None) -> List[Dict]:
+        """模型引用是否悬空由 ModelRefIndex.dangling_issues 检查"""
+        return list(ConfigValidator._iter_ohmyopencode(config, schema_store))
 
-            npm = provider_data.get("npm", "")
-            if npm and npm not in ConfigValidator.VALID_NPM_PACKAGES:
-                issues.append(
-                    {
-                        "level": "warning",
-                        "path": f"{provider_path}.npm",
-                        "message": f"Provider '{provider_name}' 的 npm 包 '{npm}' 不在已知列表中",
-                    }
+    @staticmethod
+    def iter_ohmyopencode_issues(
+        config: Dict, schema_store=None, errors_only: bool = False
+    ) -> Iterator[Dict]:
+        """按严重程度逐个产出问题，用法同 iter_opencode_issues"""
+        return ConfigValidator.prioritize(
+            ConfigValidator._iter_ohmyopencode(config, schema_store),
+            errors_only,
+        )
+
+    @staticmethod
+    def _iter_ohmyopencode(config: Dict, schema_store) -> Iterator[Dict]:
+        rules = ConfigValidator._iter_ohmyopencode_rules(config)
+        if schema_store is not None and isinstance(config, dict) and config:
+            return ConfigValidator._merge_schema_issues(
+                schema_store.validate(config, OHMYOPENCODE_SCHEMA_URL), rules
+            )
+        return rules
+
+    @staticmethod
+    def _iter_ohmyopencode_rules(config: Dict) -> Iterator[Dict]:
+        if not config:
+            yield {"level": "error", "path": "root", "message": "配置文件为空或无法解析"}
+            return
+        if not isinstance(config, dict):
+            yield {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
+            return
+
+        agents = config.get("agents", {})
+        if not agents:
+            yield {"level": "warning", "path": "agents", "message": "未配置任何 Agent"}
+        if agents and not isinstance(agents, dict):
+            yield {"level": "error", "path": "agents", "message": "agents 必须是对象类型"}
+            return
+
+        if isinstance(agents, dict):
+            for agent_name, agent_data in agents.items():
+                yield from ConfigValidator.validate_agent(agent_name, agent_data)
+
+        categories = config.get("categories", {})
+        if not categories:
+            yield {
+                "level": "warning",
+                "path": "categories",
+                "message": "未配置任何 Category",
+            }
+        if categories and not isinstance(categories, dict):
+            yield {
+                "level": "error",
+                "path": "categories",
+                "message": "categories 必须是对象类型",
+            }
+            return
+
+        if isinstance(categories, dict):
+            for category_name, category_data in categories.items():
+                yield from ConfigValidator.validate_category(
+                    category_name, category_data
                 )
 
-            options = provider_data.get("options", {})
-            if not isinstance(options, dict):
+    @staticmethod
+    def validate_agent(agent_name: str, agent_data: Any) -> List[Dict]:
+        """校验单个 Agent 条目"""
+        issues = []
+        agent_path = f"agents.{agent_name}"
+        if ConfigValidator._is_blank(agent_name):
+            issues.append(
+                {
+                    "level": "error",
+                    "path": agent_path,
+                    "message": "Agent 名称为空",
+                }
+            )
+            return issues
+        if not isinstance(agent_data, dict):
+            issues.append(
+                {
+                    "level": "error",
+                    "path": agent_path,
+                    "message": f"Agent '{agent_name}' 的值必须是对象",
+                }
+            )
+            return issues
+        for field in ConfigValidator.OHMY_AGENT_REQUIRED_FIELDS:
+            if field not in agent_data:
                 issues.append(
                     {
                         "level": "error",
-                        "path": f"{provider_path}.options",
-                        "message": f"Provider '{provider_name}' 的 options 必须是对象",
+                        "path": f"{agent_path}.{field}",
+                        "message": f"Agent '{agent_name}' 缺少必需字段 '{field}'",
                     }
                 )
-            else:
-                for opt_field in ConfigValidator.PROVIDER_OPTIONS_REQUIRED:
-                    if opt_field not in options:
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{provider_path}.options.{opt_field}",
-                                "message": f"Provider '{provider_name}' 的 options 缺少 '{opt_field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(options.get(opt_field)):
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{provider_path}.options.{opt_field}",
-                                "message": f"Provider '{provider_name}' 的 options.{opt_field} 为空",
-                            }
-                        )
-
-            models = provider_data.get("models", {})
-            if not isinstance(models, dict):
+            elif ConfigValidator._is_blank(agent_data.get(field)):
                 issues.append(
                     {
                         "level": "error",
-                        "path": f"{provider_path}.models",
-                        "message": f"Provider '{provider_name}' 的 models 必须是对象",
+                        "path": f"{agent_path}.{field}",
+                        "message": f"Agent '{agent_name}' 的 '{field}' 为空",
                     }
                 )
-            else:
-                if not models:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{provider_path}.models",
-                            "message": f"Provider '{provider_name}' 没有配置任何模型",
-                        }
-                    )
-                for model_id, model_data in models.items():
-                    model_path = f"{provider_path}.models.{model_id}"
-                    if ConfigValidator._is_blank(model_id):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": model_path,
-                                "message": f"Provider '{provider_name}' 存在空模型ID",
-                            }
-                        )
-                        continue
-                    if not isinstance(model_data, dict):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": model_path,
-                                "message": f"Model '{model_id}' 的值必须是对象",
-                            }
-                        )
-                        continue
-
-                    limit = model_data.get("limit", {})
-                    if not isinstance(limit, dict):
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{model_path}.limit",
-                                "message": f"Model '{model_id}' 的 limit 应该是对象",
-                            }
-                        )
-                    elif limit:
-                        context = limit.get("context")
-                        output = limit.get("output")
-                        if context is not None and not isinstance(context, int):
-                            issues.append(
-                                {
-                                    "level": "warning",
-                                    "path": f"{model_path}.limit.context",
-                                    "message": f"Model '{model_id}' 的 context 应该是整数",
-                                }
-                            )
-                        if output is not None and not isinstance(output, int):
-                            issues.append(
-                                {
-                                    "level": "warning",
-                                    "path": f"{model_path}.limit.output",
-                                    "message": f"Model '{model_id}' 的 output 应该是整数",
-                                }
-                            )
-
-        mcp = config.get("mcp", {})
-        if mcp and not isinstance(mcp, dict):
-            issues.append(
-                {"level": "error", "path": "mcp", "message": "mcp 必须是对象类型"}
-            )
-        elif isinstance(mcp, dict):
-            for mcp_name, mcp_data in mcp.items():
-                mcp_path = f"mcp.{mcp_name}"
-                if not isinstance(mcp_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": mcp_path,
-                            "message": f"MCP '{mcp_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-
-                mcp_type = mcp_data.get("type")
-                if mcp_type == "local" and "command" not in mcp_data:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{mcp_path}.command",
-                            "message": f"Local MCP '{mcp_name}' 缺少 command 字段",
-                        }
-                    )
-                elif mcp_type == "remote" and "url" not in mcp_data:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{mcp_path}.url",
-                            "message": f"Remote MCP '{mcp_name}' 缺少 url 字段",
-                        }
-                    )
-
-        agent = config.get("agent", {})
-        if agent and not isinstance(agent, dict):
+        if "description" in agent_data and ConfigValidator._is_blank(
+            agent_data.get("description")
+        ):
             issues.append(
-                {"level": "error", "path": "agent", "message": "agent 必须是对象类型"}
+                {
+                    "level": "warning",
+                    "path": f"{agent_path}.description",
+                    "message": f"Agent '{agent_name}' 的 description 为空",
+                }
             )
-
         return issues
 
     @staticmethod
-    def validate_ohmyopencode_config(config: Dict) -> List[Dict]:
+    def validate_category(category_name: str, category_data: Any) -> List[Dict]:
+        """校验单个 Category 条目"""
         issues = []
-        if not config:
-            issues.append(
-                {"level": "error", "path": "root", "message": "配置文件为空或无法解析"}
-            )
-            return issues
-        if not isinstance(config, dict):
+        category_path = f"categories.{category_name}"
+        if ConfigValidator._is_blank(category_name):
             issues.append(
-                {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
+                {
+                    "level": "error",
+                    "path": category_path,
+                    "message": "Category 名称为空",
+                }
             )
             return issues
-
-        agents = config.get("agents", {})
-        if not agents:
+        if not isinstance(category_data, dict):
             issues.append(
-                {"level": "warning", "path": "agents", "message": "未配置任何 Agent"}
-            )
-        if agents and not isinstance(agents, dict):
-            issues.append(
-                {"level": "error", "path": "agents", "message": "agents 必须是对象类型"}
+                {
+                    "level": "error",
+                    "path": category_path,
+                    "message": f"Category '{category_name}' 的值必须是对象",
+                }
             )
             return issues
+        for field in ConfigValidator.OHMY_CATEGORY_REQUIRED_FIELDS:
+            if field not in category_data:
+                issues.append(
+                    {
+                        "level": "error",
+                        "path": f"{category_path}.{field}",
+                        "message": f"Category '{category_name}' 缺少必需字段 '{field}'",
+                    }
+                )
+            elif ConfigValidator._is_blank(category_data.get(field)):
+                issues.append(
+                    {
+                        "level": "error",
+                        "path": f"{category_path}.{field}",
+                        "message": f"Category '{category_name}' 的 '{field}' 为空",
+                    }
+                )
 
-        if isinstance(agents, dict):
-            for agent_name, agent_data in agents.items():
-                agent_path = f"agents.{agent_name}"
-                if ConfigValidator._is_blank(agent_name):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": agent_path,
-                            "message": "Agent 名称为空",
-                        }
-                    )
-                    continue
-                if not isinstance(agent_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": agent_path,
-                            "message": f"Agent '{agent_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-                for field in ConfigValidator.OHMY_AGENT_REQUIRED_FIELDS:
-                    if field not in agent_data:
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{agent_path}.{field}",
-                                "message": f"Agent '{agent_name}' 缺少必需字段 '{field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(agent_data.get(field)):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{agent_path}.{field}",
-                                "message": f"Agent '{agent_name}' 的 '{field}' 为空",
-                            }
-                        )
-                if "description" in agent_data and ConfigValidator._is_blank(
-                    agent_data.get("description")
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{agent_path}.description",
-                            "message": f"Agent '{agent_name}' 的 description 为空",
-                        }
-                    )
-
-        categories = config.get("categories", {})
-        if not categories:
+        temperature = category_data.get("temperature")
+        if temperature is not None and not isinstance(temperature, (int, float)):
             issues.append(
                 {
                     "level": "warning",
-                    "path": "categories",
-                    "message": "未配置任何 Category",
+                    "path": f"{category_path}.temperature",
+                    "message": f"Category '{category_name}' 的 temperature 应该是数字",
                 }
             )
-        if categories and not isinstance(categories, dict):
+        if "description" in category_data and ConfigValidator._is_blank(
+            category_data.get("description")
+        ):
             issues.append(
                 {
-                    "level": "error",
-                    "path": "categories",
-                    "message": "categories 必须是对象类型",
+                    "level": "warning",
+                    "path": f"{category_path}.description",
+                    "message": f"Category '{category_name}' 的 description 为空",
                 }
             )
-            return issues
-
-        if isinstance(categories, dict):
-            for category_name, category_data in categories.items():
-                category_path = f"categories.{category_name}"
-                if ConfigValidator._is_blank(category_name):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": category_path,
-                            "message": "Category 名称为空",
-                        }
-                    )
-                    continue
-                if not isinstance(category_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": category_path,
-                            "message": f"Category '{category_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-                for field in ConfigValidator.OHMY_CATEGORY_REQUIRED_FIELDS:
-                    if field not in category_data:
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{category_path}.{field}",
-                                "message": f"Category '{category_name}' 缺少必需字段 '{field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(category_data.get(field)):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{category_path}.{field}",
-                                "message": f"Category '{category_name}' 的 '{field}' 为空",
-                            }
-                        )
-
-                temperature = category_data.get("temperature")
-                if temperature is not None and not isinstance(
-                    temperature, (int, float)
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{category_path}.temperature",
-                            "message": f"Category '{category_name}' 的 temperature 应该是数字",
-                        }
-                    )
-                if "description" in category_data and ConfigValidator._is_blank(
-                    category_data.get("description")
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{category_path}.description",
-                            "message": f"Category '{category_name}' 的 description 为空",
-                        }
-                    )
-
         return issues
 
     @staticmethod
@@ -0,0 +1,361 @@
+"""Provider 压测：逐步提高并发，找出中转站可持续的吞吐与限流拐点
+
+    python -m occm_core.load_test --provider my-relay --model gpt-4o-mini \\
+        --start 1 --max 32 --step-duration 10
+
+    # 对内置模拟服务压测（无需真实中转站）
+    python -m occm_core.load_test --mock --mock-max-concurrency 8
+
+每一档并发持续 step_duration 秒，记录成功率、延迟分位数、429 数量与吞吐；
+拐点为最后一个"健康"档位：之后的档位出现限流、成功率下降、延迟明显
+上升或吞吐不再增长。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .config_manager import ConfigManager
+from .config_paths import ConfigPaths
+from .monitor_service import MonitorTarget, run_chat_probe, targets_from_config
+from .probe_timing import DnsCache
+
+
+# 拐点判定阈值
+KNEE_MIN_SUCCESS_RATE = 0.95
+KNEE_LATENCY_FACTOR = 2.0
+KNEE_MIN_THROUGHPUT_GAIN = 1.1
+
+
+def _percentile(sorted_values: List[int], q: float) -> Optional[float]:
+    """线性插值分位数，sorted_values 需已排序"""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    pos = (len(sorted_values) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    frac = pos - lower
+    value = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * frac
+    return round(value, 1)
+
+
+@dataclass
+class LoadTestStep:
+    concurrency: int
+    requests: int
+    successes: int
+    rate_limited: int
+    errors: int
+    duration_sec: float
+    success_rate: float
+    throughput_rps: float
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class LoadTestReport:
+    target_id: str
+    steps: List[LoadTestStep] = field(default_factory=list)
+    knee_concurrency: Optional[int] = None
+    knee_reason: str = ""
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def format_table(self) -> str:
+        lines = [
+            f"Target: {self.target_id}",
+            f"{'conc':>5} {'req':>6} {'ok%':>6} {'429':>5} {'err':>5} "
+            f"{'rps':>7} {'p50':>8} {'p90':>8} {'p99':>8}",
+        ]
+
+        def fmt(value: Optional[float]) -> str:
+            return f"{value:.0f}" if value is not None else "-"
+
+        for step in self.steps:
+            lines.append(
+                f"{step.concurrency:>5} {step.requests:>6} "
+                f"{step.success_rate * 100:>5.1f}% {step.rate_limited:>5} "
+                f"{step.errors:>5} {step.throughput_rps:>7.2f} "
+                f"{fmt(step.p50_ms):>8} {fmt(step.p90_ms):>8} {fmt(step.p99_ms):>8}"
+            )
+        if self.knee_concurrency is not None:
+            lines.append(f"Knee: {self.knee_concurrency} ({self.knee_reason})")
+        else:
+            lines.append(f"Knee: not reached ({self.knee_reason})")
+        return "\n".join(lines)
+
+
+class ProviderLoadTest:
+    """对单个 Provider/模型逐档加压
+
+    请求复用监控的 run_chat_probe（同一请求体与计时方式），但不经过
+    调度器与熔断器：压测需要观察的正是限流与失败本身。
+    """
+
+    def __init__(
+        self,
+        target: MonitorTarget,
+        start_concurrency: int = 1,
+        max_concurrency: int = 32,
+        step_factor: float = 2.0,
+        step_duration_sec: float = 10.0,
+        request_timeout_sec: float = 30.0,
+        stream: bool = False,
+        stop_after_knee: bool = True,
+    ):
+        self.target = target
+        self.start_concurrency = max(1, start_concurrency)
+        self.max_concurrency = max(self.start_concurrency, max_concurrency)
+        self.step_factor = max(step_factor, 1.01)
+        self.step_duration_sec = step_duration_sec
+        self.request_timeout_sec = request_timeout_sec
+        self.stream = stream
+        self.stop_after_knee = stop_after_knee
+        self._dns_cache = DnsCache()
+        self._stop_event = threading.Event()
+
+    def concurrency_levels(self) -> List[int]:
+        levels = []
+        level = self.start_concurrency
+        while level < self.max_concurrency:
+            levels.append(level)
+            level = max(level + 1, int(round(level * self.step_factor)))
+        levels.append(self.max_concurrency)
+        return levels
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run_step(self, concurrency: int) -> LoadTestStep:
+        """以固定并发持续发送请求 step_duration_sec 秒"""
+        latencies: List[int] = []
+        status_counts: Dict[str, int] = {}
+        counts = {"requests": 0, "successes": 0, "rate_limited": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + self.step_duration_sec
+
+        def worker() -> None:
+            while time.monotonic() < deadline and not self._stop_event.is_set():
+                probe = run_chat_probe(
+                    self.target,
+                    stream=self.stream,
+                    timeout_sec=self.request_timeout_sec,
+                    dns_cache=self._dns_cache,
+                )
+                with lock:
+                    counts["requests"] += 1
+                    key = str(probe.http_status) if probe.http_status else probe.status
+                    status_counts[key] = status_counts.get(key, 0) + 1
+                    if probe.status in ("operational", "degraded"):
+                        counts["successes"] += 1
+                        if probe.latency_ms is not None:
+                            latencies.append(probe.latency_ms)
+                    elif probe.http_status == 429:
+                        counts["rate_limited"] += 1
+                    else:
+                        counts["errors"] += 1
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+        duration = max(time.monotonic() - started, 1e-6)
+
+        latencies.sort()
+        requests = counts["requests"]
+        return LoadTestStep(
+            concurrency=concurrency,
+            requests=requests,
+            successes=counts["successes"],
+            rate_limited=counts["rate_limited"],
+            errors=counts["errors"],
+            duration_sec=round(duration, 2),
+            success_rate=round(counts["successes"] / requests, 4) if requests else 0.0,
+            throughput_rps=round(counts["successes"] / duration, 2),
+            p50_ms=_percentile(latencies, 0.50),
+            p90_ms=_percentile(latencies, 0.90),
+            p99_ms=_percentile(latencies, 0.99),
+            status_counts=status_counts,
+        )
+
+    @staticmethod
+    def _degradation(
+        step: LoadTestStep, baseline: LoadTestStep, previous: LoadTestStep
+    ) -> str:
+        """返回该档位相对健康档位的退化原因，未退化时返回空字符串"""
+        if step.rate_limited:
+            return f"{step.rate_limited} 个请求被限流 (429)"
+        if step.success_rate < KNEE_MIN_SUCCESS_RATE:
+            return f"成功率降至 {step.success_rate * 100:.1f}%"
+        if (
+            baseline.p90_ms
+            and step.p90_ms
+            and step.p90_ms > baseline.p90_ms * KNEE_LATENCY_FACTOR
+        ):
+            return f"P90 延迟 {step.p90_ms:.0f}ms，超过基线的 {KNEE_LATENCY_FACTOR:g} 倍"
+        if (
+            previous.throughput_rps > 0
+            and step.throughput_rps < previous.throughput_rps * KNEE_MIN_THROUGHPUT_GAIN
+        ):
+            return "吞吐不再随并发增长"
+        return ""
+
+    def run(
+        self, on_step: Optional[Callable[[LoadTestStep], None]] = None
+    ) -> LoadTestReport:
+        self._stop_event.clear()
+        report = LoadTestReport(target_id=self.target.target_id)
+        healthy: Optional[LoadTestStep] = None
+        baseline: Optional[LoadTestStep] = None
+
+        for concurrency in self.concurrency_levels():
+            if self._stop_event.is_set():
+                report.knee_reason = "已手动停止"
+                break
+            step = self.run_step(concurrency)
+            report.steps.append(step)
+            if on_step is not None:
+                on_step(step)
+
+            if baseline is None or healthy is None:
+                # 第一档即出现限流或失败时没有可用的健康档位
+                if step.rate_limited or step.success_rate < KNEE_MIN_SUCCESS_RATE:
+                    report.knee_reason = (
+                        f"起始并发 {concurrency} 即退化: "
+                        f"成功率 {step.success_rate * 100:.1f}%，429 {step.rate_limited} 次"
+                    )
+                    break
+                baseline = healthy = step
+                continue
+
+            reason = self._degradation(step, baseline, healthy)
+            if reason:
+                if report.knee_concurrency is None:
+                    report.knee_concurrency = healthy.concurrency
+                    report.knee_reason = reason
+                if self.stop_after_knee:
+                    break
+            else:
+                healthy = step
+
+        if report.knee_concurrency is None and not report.knee_reason:
+            report.knee_reason = f"最高并发 {self.max_concurrency} 仍未退化"
+        return report
+
+
+def _find_target(config: Dict, provider: str, model: str) -> Optional[MonitorTarget]:
+    for target in targets_from_config(config):
+        if target.provider_key == provider and (not model or target.model_id == model):
+            return target
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m occm_core.load_test",
+        description="逐档提高并发压测 Provider，报告成功率、延迟分位数、429 与拐点",
+    )
+    parser.add_argument("--config", default="", help="opencode.json 路径")
+    parser.add_argument("--provider", default="", help="Provider 键名")
+    parser.add_argument("--model", default="", help="模型 ID（默认取该 Provider 第一个）")
+    parser.add_argument("--start", type=int, default=1, help="起始并发")
+    parser.add_argument("--max", type=int, default=32, help="最高并发")
+    parser.add_argument("--factor", type=float, default=2.0, help="每档并发倍数")
+    parser.add_argument(
+        "--step-duration", type=float, default=10.0, help="每档持续秒数"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="单次请求超时")
+    parser.add_argument("--stream", action="store_true", help="使用流式请求")
+    parser.add_argument(
+        "--no-stop", action="store_true", help="到达拐点后继续压测剩余档位"
+    )
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    parser.add_argument(
+        "--mock", action="store_true", help="对内置模拟服务压测（忽略 --config）"
+    )
+    parser.add_argument("--mock-latency-ms", type=float, default=50)
+    parser.add_argument("--mock-max-concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    mock = None
+    if args.mock:
+        from .mock_provider import MockProviderServer
+
+        mock = MockProviderServer(
+            latency_ms=args.mock_latency_ms,
+            max_concurrency=args.mock_max_concurrency,
+        ).start()
+        target: Optional[MonitorTarget] = MonitorTarget(
+            provider_key="mock",
+            provider_name="Mock",
+            base_url=mock.base_url,
+            api_key="mock",
+            model_id=args.model or mock.models[0],
+            model_name=args.model or mock.models[0],
+        )
+    else:
+        config_path = (
+            Path(args.config).expanduser()
+            if args.config
+            else ConfigPaths.get_opencode_config()
+        )
+        config = ConfigManager.load_json(config_path) or {}
+        target = _find_target(config, args.provider, args.model)
+        if target is None:
+            print(f"未找到 Provider/模型: {args.provider}/{args.model}", file=sys.stderr)
+            return 2
+        if not target.base_url or not target.api_key:
+            print(f"{target.target_id} 未配置 baseURL 或 apiKey", file=sys.stderr)
+            return 2
+
+    test = ProviderLoadTest(
+        target,
+        start_concurrency=args.start,
+        max_concurrency=args.max,
+        step_factor=args.factor,
+        step_duration_sec=args.step_duration,
+        request_timeout_sec=args.timeout,
+        stream=args.stream,
+        stop_after_knee=not args.no_stop,
+    )
+
+    def progress(step: LoadTestStep) -> None:
+        print(
+            f"[{step.concurrency:>3}] {step.requests} req, "
+            f"ok {step.success_rate * 100:.1f}%, 429 {step.rate_limited}, "
+            f"{step.throughput_rps:.2f} rps",
+            file=sys.stderr,
+        )
+
+    try:
+        report = test.run(on_step=progress)
+    except KeyboardInterrupt:
+        test.stop()
+        return 130
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(report.format_table())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+"""本地 OpenAI 兼容模拟服务
+
+用于在不访问真实（付费）中转站的情况下测试监控与压测::
+
+    python -m occm_core.mock_provider --port 18080 --latency-ms 80 --max-concurrency 8
+    python -m occm_core.mock_provider --latency-dist lognormal --latency-jitter-ms 40 \\
+        --error-rate 0.02 --rate-limit-rate 0.05 --seed 1
+
+接口：
+- GET  /v1/models（带 ETag，支持 If-None-Match 返回 304）
+- POST /v1/chat/completions（支持 "stream": true）
+
+超过 max_concurrency 的并发请求返回 429，用于模拟中转站限流；
+error_rate / rate_limit_rate 按比例随机注入 500 / 429。
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+DEFAULT_MOCK_MODELS = ["mock-small", "mock-large"]
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+def mock_model_ids(count: int) -> List[str]:
+    """基准测试使用的批量模型名"""
+    return [f"mock-{i:04d}" for i in range(count)]
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_MockHTTPServer"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send_json(self, code: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _check_auth(self) -> bool:
+        api_key = self.server.provider.api_key
+        if api_key and self.headers.get("Authorization") != f"Bearer {api_key}":
+            self._send_json(401, {"error": {"message": "invalid api key"}})
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") not in ("/v1/models", "/models"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        if not self._check_auth():
+            return
+        provider = self.server.provider
+        provider._count("model_lists")
+        models = list(provider.models)
+        # 列表内容不变时 ETag 不变，便于测试条件请求
+        etag = '"' + hashlib.sha1("\n".join(models).encode("utf-8")).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            provider._count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(
+            {
+                "object": "list",
+                "data": [
+                    {"id": m, "object": "model", "created": 0, "owned_by": "mock"}
+                    for m in models
+                ],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        if not self._check_auth():
+            return
+        try:
+            request = json.loads(raw or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid json"}})
+            return
+        model = request.get("model", "")
+        if model not in self.server.provider.models:
+            self._send_json(404, {"error": {"message": f"model {model} not found"}})
+            return
+
+        provider = self.server.provider
+        fault = provider._draw_fault()
+        if fault == "rate_limited" or not provider._acquire_slot():
+            provider._count("rate_limited")
+            self._send_rate_limited()
+            return
+        try:
+            time.sleep(provider.sample_latency_ms() / 1000.0)
+            if fault == "error":
+                provider._count("errors")
+                self._send_json(500, {"error": {"message": "injected upstream error"}})
+                return
+            if request.get("stream"):
+                self._stream_reply(model, int(request.get("max_tokens") or 16))
+            else:
+                self._send_json(
+                    200,
+                    {
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion",
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": "ok"},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": 1,
+                            "completion_tokens": 1,
+                            "total_tokens": 2,
+                        },
+                    },
+                )
+            provider._count("ok")
+        finally:
+            provider._release_slot()
+
+    def _send_rate_limited(self) -> None:
+        self.send_response(429)
+        self.send_header("Retry-After", "1")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _stream_reply(self, model: str, max_tokens: int) -> None:
+        provider = self.server.provider
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        interval = 1.0 / provider.tokens_per_sec if provider.tokens_per_sec > 0 else 0
+        tokens = max(1, min(max_tokens, 20))
+        for i in range(tokens):
+            event = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": f"{i + 1} "}}],
+            }
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if interval and i < tokens - 1:
+                time.sleep(interval)
+        usage = {"choices": [], "usage": {"completion_tokens": tokens}}
+        self.wfile.write(f"data: {json.dumps(usage)}\n\ndata: [DONE]\n\n".encode())
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 默认的 listen 积压只有 5，高并发基准下会触发 SYN 重传（约 1 秒）
+    request_queue_size = 256
+
+    def __init__(self, address, provider: "MockProviderServer"):
+        self.provider = provider
+        super().__init__(address, _MockHandler)
+
+
+class MockProviderServer:
+    """可在进程内启动的模拟中转站
+
+    Args:
+        latency_ms: 每个对话请求的处理延迟（分布的均值 / 中位数）
+        max_concurrency: 同时处理的请求上限，超出部分返回 429（None 表示不限）
+        tokens_per_sec: 流式回复的输出速度
+        api_key: 设置后校验 Authorization 头
+        latency_dist: 延迟分布，见 LATENCY_DISTRIBUTIONS
+        latency_jitter_ms: uniform 为 ±半宽，normal / lognormal 为标准差
+        error_rate: 随机返回 500 的比例
+        rate_limit_rate: 随机返回 429 的比例（与并发上限无关）
+        seed: 随机种子，便于复现基准结果
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        models: Optional[List[str]] = None,
+        latency_ms: float = 50,
+        max_concurrency: Optional[int] = None,
+        tokens_per_sec: float = 200,
+        api_key: str = "",
+        latency_dist: str = "fixed",
+        latency_jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"未知的延迟分布: {latency_dist}")
+        self.host = host
+        self.port = port
+        self.models = list(models or DEFAULT_MOCK_MODELS)
+        self.latency_ms = latency_ms
+        self.max_concurrency = max_concurrency
+        self.tokens_per_sec = tokens_per_sec
+        self.api_key = api_key
+        self.latency_dist = latency_dist
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.stats = {"ok": 0, "rate_limited": 0, "errors": 0}
+        self._rng = random.Random(seed)
+        self._active = 0
+        self._lock = threading.Lock()
+        self._httpd: Optional[_MockHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def sample_latency_ms(self) -> float:
+        """按配置的分布抽取一次处理延迟（不小于 0）"""
+        mean = self.latency_ms
+        jitter = self.latency_jitter_ms
+        with self._lock:
+            rng = self._rng
+            if self.latency_dist == "uniform":
+                value = rng.uniform(mean - jitter, mean + jitter)
+            elif self.latency_dist == "normal":
+                value = rng.gauss(mean, jitter)
+            elif self.latency_dist == "lognormal" and mean > 0:
+                # 中位数为 latency_ms，长尾由 jitter 相对均值的比例决定
+                sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2))
+                value = mean * rng.lognormvariate(0, sigma)
+            elif self.latency_dist == "exponential" and mean > 0:
+                value = rng.expovariate(1.0 / mean)
+            else:
+                value = mean
+        return max(0.0, value)
+
+    def _draw_fault(self) -> str:
+        """按比例抽取本次请求注入的故障：'rate_limited' / 'error' / ''"""
+        if not self.error_rate and not self.rate_limit_rate:
+            return ""
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return ""
+
+    def _acquire_slot(self) -> bool:
+        with self._lock:
+            if self.max_concurrency is not None and self._active >= self.max_concurrency:
+                return False
+            self._active += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def start(self) -> "MockProviderServer":
+        self._httpd = _MockHTTPServer((self.host, self.port), self)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def serve_forever(self) -> None:
+        if self._httpd is None:
+            self.start()
+        try:
+            while self._thread is not None and self._thread.is_alive():
+                self._thread.join(0.5)
+        finally:
+            self.stop()
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m occm_core.mock_provider",
+        description="本地 OpenAI 兼容模拟服务（/v1/models, /v1/chat/completions）",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument(
+        "--models", default=",".join(DEFAULT_MOCK_MODELS), help="逗号分隔的模型列表"
+    )
+    parser.add_argument(
+        "--model-count",
+        type=int,
+        default=0,
+        help="生成 mock-0000 ~ mock-{N-1} 共 N 个模型（覆盖 --models，用于基准测试）",
+    )
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument(
+        "--max-concurrency", type=int, default=None, help="超过此并发返回 429"
+    )
+    parser.add_argument("--tokens-per-sec", type=float, default=200)
+    parser.add_argument("--api-key", default="", help="设置后校验 Bearer Token")
+    parser.add_argument(
+        "--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed"
+    )
+    parser.add_argument(
+        "--latency-jitter-ms", type=float, default=0, help="延迟分布的离散程度"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机 500 比例")
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="随机 429 比例"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = MockProviderServer(
+        host=args.host,
+        port=args.port,
+        models=mock_model_ids(args.model_count)
+        if args.model_count > 0
+        else [m.strip() for m in args.models.split(",") if m.strip()],
+        latency_ms=args.latency_ms,
+        max_concurrency=args.max_concurrency,
+        tokens_per_sec=args.tokens_per_sec,
+        api_key=args.api_key,
+        latency_dist=args.latency_dist,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    # 先绑定端口再输出地址，--port 0 时调用方可从这一行读取实际端口
+    server.start()
+    print(f"Mock provider listening on {server.base_url}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""共享的模型列表目录（/v1/models 结果缓存）
+
+GUI 获取模型、Web 模型页与监控列表模式共用同一个 ModelCatalog：
+
+- 每个 (baseURL, apiKey) 的模型列表持久化到磁盘，带 TTL
+- 重新验证时携带 If-None-Match / If-Modified-Since，304 时只刷新时间戳
+- get() 采用 stale-while-revalidate：有缓存就立即返回，过期的缓存在后台
+  重新验证；只有从未获取过时才同步请求
+- 请求失败时保留上一次成功的列表（记录错误），避免把可用数据清空
+
+缓存文件不保存 apiKey，只以其摘要区分同一地址下的不同密钥。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config_paths import ConfigPaths
+from .model_listing import LISTING_TIMEOUT_SEC, build_model_list_urls, extract_model_ids
+
+
+CATALOG_TTL_SEC = 6 * 3600
+# 重新验证失败后，在此时间内不再自动重试
+CATALOG_ERROR_RETRY_SEC = 60
+CATALOG_MAX_WORKERS = 4
+# 监控列表模式的刷新合并写盘：同一间隔内的多次刷新只写一次缓存文件
+CATALOG_SAVE_DELAY_SEC = 30
+CATALOG_FILE = "model_catalog.json"
+_CATALOG_VERSION = 1
+
+
+@dataclass
+class CatalogEntry:
+    """某个 Provider 的模型列表缓存"""
+
+    base_url: str
+    model_ids: List[str] = field(default_factory=list)
+    fetched_at: float = 0.0
+    checked_at: float = 0.0
+    url: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    error: str = ""
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.fetched_at
+
+
+def catalog_key(base_url: str, api_key: str) -> str:
+    digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+    return f"{(base_url or '').strip().rstrip('/')}#{digest}"
+
+
+class ModelCatalog:
+    """带磁盘缓存与条件请求的模型列表服务（线程安全）"""
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        ttl_sec: float = CATALOG_TTL_SEC,
+        timeout_sec: float = LISTING_TIMEOUT_SEC,
+        max_workers: int = CATALOG_MAX_WORKERS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl_sec = ttl_sec
+        self.timeout_sec = timeout_sec
+        self.max_workers = max_workers
+        self._clock = clock
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._revalidating: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._listeners: List[Callable[[str, CatalogEntry], None]] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._save_timer: Optional[threading.Timer] = None
+
+    # ---- 缓存读写 ----
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if self.cache_path is None:
+                return
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return
+            if not isinstance(data, dict) or data.get("version") != _CATALOG_VERSION:
+                return
+            for key, raw in (data.get("entries") or {}).items():
+                try:
+                    self._entries[key] = CatalogEntry(**raw)
+                except TypeError:
+                    continue
+
+    def save(self) -> None:
+        if self.cache_path is None:
+            return
+        with self._lock:
+            data = {
+                "version": _CATALOG_VERSION,
+                "entries": {k: asdict(v) for k, v in self._entries.items()},
+            }
+        tmp_path = self.cache_path.with_suffix(".json.tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def save_later(self, delay_sec: float = CATALOG_SAVE_DELAY_SEC) -> None:
+        """延迟写盘；已有待执行的写盘时不重复安排"""
+        if self.cache_path is None:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            timer = threading.Timer(delay_sec, self._save_scheduled)
+            timer.daemon = True
+            self._save_timer = timer
+        timer.start()
+
+    def _save_scheduled(self) -> None:
+        with self._lock:
+            self._save_timer = None
+        self.save()
+
+    def add_listener(self, callback: Callable[[str, CatalogEntry], None]) -> None:
+        """列表内容发生变化时回调 (key, entry)，在工作线程中调用"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def cached(self, base_url: str, api_key: str = "") -> Optional[CatalogEntry]:
+        """只读缓存，不发起请求"""
+        self._ensure_loaded()
+        with self._lock:
+            return self._entries.get(catalog_key(base_url, api_key))
+
+    def is_fresh(self, entry: CatalogEntry, max_age: Optional[float] = None) -> bool:
+        ttl = self.ttl_sec if max_age is None else max_age
+        return bool(entry.fetched_at) and entry.age(self._clock()) < ttl
+
+    def invalidate(self, base_url: Optional[str] = None, api_key: str = "") -> None:
+        """让缓存过期（保留列表与校验信息，下次使用时条件请求重新验证）"""
+        self._ensure_loaded()
+        with self._lock:
+            if base_url is None:
+                entries = list(self._entries.values())
+            else:
+                entry = self._entries.get(catalog_key(base_url, api_key))
+                entries = [entry] if entry else []
+            for entry in entries:
+                entry.fetched_at = 0.0
+                entry.checked_at = 0.0
+
+    # ---- 请求 ----
+
+    def _request(
+        self, url: str, api_key: str, entry: Optional[CatalogEntry], timeout: float
+    ) -> Tuple[Optional[List[str]], str, str, str]:
+        """返回 (模型列表 | None 表示未修改, etag, last_modified, 错误)"""
+        headers = {"User-Agent": "OpenCode-Config-Manager"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        if entry is not None and entry.url == url and entry.model_ids:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        try:
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                data = json.loads(response.read().decode("utf-8"))
+                etag = response.headers.get("ETag") or ""
+                last_modified = response.headers.get("Last-Modified") or ""
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and entry is not None:
+                return (
+                    None,
+                    e.headers.get("ETag") or entry.etag,
+                    e.headers.get("Last-Modified") or entry.last_modified,
+                    "",
+                )
+            return [], "", "", str(e)
+        except Exception as e:
+            return [], "", "", str(e)
+        model_ids = extract_model_ids(data)
+        if not model_ids:
+            return [], "", "", "未返回可用模型列表"
+        return model_ids, etag, last_modified, ""
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def fetch(
+        self,
+        base_url: str,
+        api_key: str = "",
+        timeout: Optional[float] = None,
+        persist: bool = True,
+    ) -> CatalogEntry:
+        """同步请求（条件请求）并更新缓存
+
+        同一 Provider 的并发调用只发出一次请求，后到的调用直接使用其结果。
+        persist=False 时只更新内存，由调用方在批量操作结束后调用 save()。
+        """
+        self._ensure_loaded()
+        key = catalog_key(base_url, api_key)
+        started = self._clock()
+        with self._key_lock(key):
+            with self._lock:
+                previous = self._entries.get(key)
+            if previous is not None and previous.checked_at >= started:
+                return previous
+
+            urls = build_model_list_urls(base_url)
+            if previous is not None and previous.url in urls:
+                # 上次成功的地址优先，条件请求只对它有效
+                urls.remove(previous.url)
+                urls.insert(0, previous.url)
+
+            entry = CatalogEntry(base_url=base_url)
+            if previous is not None:
+                entry = CatalogEntry(**asdict(previous))
+            now = self._clock()
+            changed = False
+            error = "未配置模型列表地址" if not urls else ""
+            for url in urls:
+                model_ids, etag, last_modified, error = self._request(
+                    url, api_key, previous, timeout or self.timeout_sec
+                )
+                if error:
+                    continue
+                if model_ids is not None:
+                    changed = model_ids != entry.model_ids
+                    entry.model_ids = model_ids
+                entry.url = url
+                entry.etag = etag
+                entry.last_modified = last_modified
+                entry.fetched_at = now
+                break
+            entry.error = error or ""
+            # 以完成时间记录，等待同一把锁的并发调用据此复用本次结果
+            entry.checked_at = self._clock()
+
+            with self._lock:
+                self._entries[key] = entry
+        if persist:
+            self.save()
+        if changed:
+            for callback in list(self._listeners):
+                try:
+                    callback(key, entry)
+                except Exception:
+                    pass
+        return entry
+
+    def fetch_model_ids(
+        self, base_url: str, api_key: str = "", timeout: Optional[float] = None
+    ) -> Tuple[List[str], str]:
+        """与 model_listing.fetch_model_ids 相同的签名，供监控列表模式使用
+
+        监控线程按 Provider 逐个刷新，写盘合并到 save_later 中进行。
+        """
+        entry = self.fetch(base_url, api_key, timeout, persist=False)
+        self.save_later()
+        if entry.error:
+            return [], entry.error
+        return list(entry.model_ids), ""
+
+    def revalidate_async(self, base_url: str, api_key: str = "") -> Future:
+        """后台重新验证；同一 Provider 已在验证中时复用同一个 Future"""
+        key = catalog_key(base_url, api_key)
+        with self._lock:
+            future = self._revalidating.get(key)
+            if future is not None and not future.done():
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="model-catalog"
+                )
+            future = self._executor.submit(self.fetch, base_url, api_key)
+            self._revalidating[key] = future
+        return future
+
+    def get(
+        self,
+        base_url: str,
+        api_key: str = "",
+        max_age: Optional[float] = None,
+        allow_stale: bool = True,
+    ) -> CatalogEntry:
+        """stale-while-revalidate 读取
+
+        - 缓存新鲜：直接返回
+        - 缓存过期且 allow_stale：立即返回旧列表，同时后台重新验证
+        - 没有可用缓存：同步请求
+        """
+        entry = self.cached(base_url, api_key)
+        if entry is not None and entry.model_ids:
+            if self.is_fresh(entry, max_age):
+                return entry
+            if allow_stale:
+                if self._clock() - entry.checked_at >= CATALOG_ERROR_RETRY_SEC:
+                    self.revalidate_async(base_url, api_key)
+                return entry
+        return self.fetch(base_url, api_key)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            timer, self._save_timer = self._save_timer, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if timer is not None:
+            # 还有未写盘的刷新结果，立即写入
+            timer.cancel()
+            self.save()
+
+
+_shared_catalog: Optional[ModelCatalog] = None
+_shared_catalog_lock = threading.Lock()
+
+
+def get_model_catalog() -> ModelCatalog:
+    """进程内共享的 ModelCatalog（缓存位于配置目录下）"""
+    global _shared_catalog
+    with _shared_catalog_lock:
+        if _shared_catalog is None:
+            _shared_catalog = ModelCatalog(ConfigPaths.get_cache_dir() / CATALOG_FILE)
+        return _shared_catalog
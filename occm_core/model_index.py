@@ -0,0 +1,184 @@
+"""预设模型能力 / 限额索引
+
+预设模型、配置包与 SDK 兼容关系保存在 data/model_presets.json（紧凑 JSON），
+首次使用时才加载并建立索引，GUI、Web 与配置校验共用同一份：
+
+- 按模型 ID O(1) 查找能力与限额
+- 按系列 / SDK 的反向关系
+- 按上下文长度排序的数组，阈值查询用二分查找，例如
+  get_model_index().query(min_context=200000, sdk="@ai-sdk/anthropic")
+"""
+
+from __future__ import annotations
+
+import bisect
+import copy
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+MODEL_PRESETS_FILE = Path(__file__).parent / "data" / "model_presets.json"
+# 未知系列时使用的配置包名
+DEFAULT_PACK_NAME = "基础"
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """单个预设模型的能力与限额"""
+
+    model_id: str
+    series: str
+    sdk: str
+    name: str = ""
+    context: int = 0
+    output: int = 0
+    attachment: bool = False
+    input_modalities: Tuple[str, ...] = ("text",)
+    output_modalities: Tuple[str, ...] = ("text",)
+    description: str = ""
+
+
+class ModelIndex:
+    """只读的预设模型索引"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self._series: Dict[str, Dict[str, Any]] = data.get("series", {}) or {}
+        self._packs: Dict[str, Dict[str, Any]] = data.get("packs", {}) or {}
+        self._default_packs: Dict[str, str] = data.get("default_packs", {}) or {}
+        self.sdks: List[str] = list(data.get("sdks", []) or [])
+        self._sdk_series: Dict[str, List[str]] = (
+            data.get("sdk_compatibility", {}) or {}
+        )
+
+        self._specs: Dict[str, ModelSpec] = {}
+        for series, series_data in self._series.items():
+            sdk = series_data.get("sdk", "")
+            for model_id, cfg in (series_data.get("models") or {}).items():
+                limit = cfg.get("limit") or {}
+                modalities = cfg.get("modalities") or {}
+                self._specs[model_id] = ModelSpec(
+                    model_id=model_id,
+                    series=series,
+                    sdk=sdk,
+                    name=cfg.get("name", ""),
+                    context=int(limit.get("context") or 0),
+                    output=int(limit.get("output") or 0),
+                    attachment=bool(cfg.get("attachment")),
+                    input_modalities=tuple(modalities.get("input") or ("text",)),
+                    output_modalities=tuple(modalities.get("output") or ("text",)),
+                    description=cfg.get("description", ""),
+                )
+
+        # 系列 → 可用的 SDK（系列自身的 SDK 加上兼容表中的 SDK）
+        self._series_sdks: Dict[str, List[str]] = {}
+        for series, series_data in self._series.items():
+            sdk = series_data.get("sdk", "")
+            if sdk:
+                self._series_sdks.setdefault(series, []).append(sdk)
+        for sdk, series_list in self._sdk_series.items():
+            for series in series_list:
+                sdks = self._series_sdks.setdefault(series, [])
+                if sdk not in sdks:
+                    sdks.append(sdk)
+
+        by_context = sorted(self._specs.values(), key=lambda s: s.context)
+        self._by_context: List[ModelSpec] = by_context
+        self._contexts: List[int] = [s.context for s in by_context]
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "ModelIndex":
+        with open(path or MODEL_PRESETS_FILE, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    # ---- 系列与预设配置 ----
+
+    def series_names(self) -> List[str]:
+        return list(self._series.keys())
+
+    def series_sdk(self, series: str) -> str:
+        return (self._series.get(series) or {}).get("sdk", "")
+
+    def series_models(self, series: str) -> Dict[str, Dict[str, Any]]:
+        """系列下的预设模型配置（副本，可直接写入配置）"""
+        models = (self._series.get(series) or {}).get("models") or {}
+        return copy.deepcopy(models)
+
+    def preset_config(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """单个预设模型的完整配置副本"""
+        spec = self._specs.get(model_id)
+        if spec is None:
+            return None
+        return copy.deepcopy(self._series[spec.series]["models"][model_id])
+
+    def pack_names(self, series: str) -> List[str]:
+        return list((self._packs.get(series) or {}).keys())
+
+    def pack(self, series: str, pack_name: str) -> Optional[Dict[str, Any]]:
+        pack = (self._packs.get(series) or {}).get(pack_name)
+        return copy.deepcopy(pack) if pack is not None else None
+
+    def default_pack_name(self, series: str) -> str:
+        return self._default_packs.get(series, DEFAULT_PACK_NAME)
+
+    # ---- 能力查询 ----
+
+    def get(self, model_id: str) -> Optional[ModelSpec]:
+        return self._specs.get(model_id)
+
+    def series_for_sdk(self, sdk: str) -> List[str]:
+        return list(self._sdk_series.get(sdk, []))
+
+    def sdks_for_series(self, series: str) -> List[str]:
+        return list(self._series_sdks.get(series, []))
+
+    def is_compatible(self, model_id: str, sdk: str) -> Optional[bool]:
+        """模型是否与 SDK 兼容；未知模型返回 None"""
+        spec = self._specs.get(model_id)
+        if spec is None:
+            return None
+        return sdk in self._series_sdks.get(spec.series, ())
+
+    def query(
+        self,
+        min_context: int = 0,
+        min_output: int = 0,
+        sdk: Optional[str] = None,
+        attachment: Optional[bool] = None,
+        input_modality: Optional[str] = None,
+    ) -> List[ModelSpec]:
+        """按条件筛选预设模型，结果按上下文长度从大到小排列"""
+        start = bisect.bisect_left(self._contexts, min_context) if min_context else 0
+        results = []
+        for spec in reversed(self._by_context[start:]):
+            if min_output and spec.output < min_output:
+                continue
+            if sdk is not None and sdk not in self._series_sdks.get(spec.series, ()):
+                continue
+            if attachment is not None and spec.attachment != attachment:
+                continue
+            if input_modality and input_modality not in spec.input_modalities:
+                continue
+            results.append(spec)
+        return results
+
+
+_shared_index: Optional[ModelIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_model_index() -> ModelIndex:
+    """进程内共享的预设模型索引（首次调用时从数据文件加载）"""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            try:
+                _shared_index = ModelIndex.load()
+            except (OSError, ValueError):
+                _shared_index = ModelIndex({})
+        return _shared_index
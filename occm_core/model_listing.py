@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+# 列表模式下每个 Provider 每轮实际发送对话请求的模型数
+LISTING_SAMPLE_SIZE = 2
+LISTING_TIMEOUT_SEC = 10
+
+
+def build_model_list_urls(base_url: str) -> List[str]:
+    """模型列表候选地址（与 GUI 获取模型列表的规则一致）
+
+    baseURL 以 /v1 结尾时只尝试 {baseURL}/models，否则依次尝试
+    {baseURL}/v1/models 与 {baseURL}/models。
+    """
+    base_url = (base_url or "").strip()
+    urls: List[str] = []
+
+    if not base_url:
+        return urls
+
+    if base_url.rstrip("/").endswith("/v1"):
+        urls.append(base_url.rstrip("/") + "/models")
+        return urls
+
+    urls.append(base_url.rstrip("/") + "/v1/models")
+    urls.append(base_url.rstrip("/") + "/models")
+    return urls
+
+
+def extract_model_ids(data: Any) -> List[str]:
+    """从 OpenAI 兼容（及常见变体）的模型列表响应中提取模型 ID"""
+    items: Optional[List[Any]] = None
+    if isinstance(data, dict):
+        for key in ("data", "models", "result"):
+            if isinstance(data.get(key), list):
+                items = data[key]
+                break
+    elif isinstance(data, list):
+        items = data
+
+    model_ids: List[str] = []
+    for item in items or []:
+        if isinstance(item, dict):
+            model_id = item.get("id") or item.get("name") or ""
+            if model_id:
+                model_ids.append(str(model_id))
+        elif isinstance(item, str):
+            model_ids.append(item)
+    return model_ids
+
+
+def fetch_model_ids(
+    base_url: str, api_key: str = "", timeout: float = LISTING_TIMEOUT_SEC
+) -> Tuple[List[str], str]:
+    """请求模型列表，返回 (模型 ID 列表, 错误信息)；成功时错误信息为空"""
+    urls = build_model_list_urls(base_url)
+    if not urls:
+        return [], "未配置模型列表地址"
+
+    headers = {"User-Agent": "OpenCode-Config-Manager"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+
+    last_error = ""
+    for url in urls:
+        try:
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                data = json.loads(response.read().decode("utf-8"))
+            model_ids = extract_model_ids(data)
+            if model_ids:
+                return model_ids, ""
+            last_error = "未返回可用模型列表"
+        except Exception as e:
+            last_error = str(e)
+    return [], last_error or "获取失败"
+
+
+@dataclass
+class ProviderListing:
+    """某个 Provider 在一轮内的模型列表"""
+
+    model_ids: FrozenSet[str] = frozenset()
+    error: str = ""
+    fetched_at: float = 0.0
+    latency_ms: Optional[int] = None
+    cycle: int = 0
+
+
+@dataclass
+class _ProviderState:
+    base_url: str
+    api_key: str
+    configured: List[str] = field(default_factory=list)
+    listing: Optional[ProviderListing] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelListingCache:
+    """监控的列表模式：每个 Provider 每轮只请求一次 /v1/models
+
+    - 同一 Provider 下的所有目标共用一次列表结果（按 Provider 加锁，
+      并发探测时只有第一个线程真正发起请求）
+    - 每轮刷新列表时推进抽样窗口，已配置且存在的模型轮流进行真实对话探测
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float,
+        sample_size: int = LISTING_SAMPLE_SIZE,
+        timeout_sec: float = LISTING_TIMEOUT_SEC,
+        clock: Callable[[], float] = time.monotonic,
+        fetcher: Callable[[str, str, float], Tuple[List[str], str]] = fetch_model_ids,
+    ):
+        self.ttl_sec = ttl_sec
+        self.sample_size = max(1, sample_size)
+        self.timeout_sec = timeout_sec
+        self._clock = clock
+        self._fetcher = fetcher
+        self._providers: Dict[str, _ProviderState] = {}
+        self._lock = threading.Lock()
+
+    def set_targets(self, targets: Iterable[Any]) -> None:
+        """按 Provider 分组已配置的模型；baseURL 或 apiKey 变化时丢弃旧列表"""
+        grouped: Dict[str, _ProviderState] = {}
+        for target in targets:
+            state = grouped.get(target.provider_key)
+            if state is None:
+                state = grouped[target.provider_key] = _ProviderState(
+                    target.base_url, target.api_key
+                )
+            state.configured.append(target.model_id)
+        with self._lock:
+            for key, state in grouped.items():
+                state.configured.sort()
+                old = self._providers.get(key)
+                if (
+                    old is not None
+                    and old.base_url == state.base_url
+                    and old.api_key == state.api_key
+                ):
+                    state.listing = old.listing
+                    state.lock = old.lock
+            self._providers = grouped
+
+    def invalidate(self) -> None:
+        """下一次查询时重新请求所有列表（手动检测时调用）"""
+        with self._lock:
+            for state in self._providers.values():
+                if state.listing is not None:
+                    state.listing.fetched_at = float("-inf")
+
+    def listing_for(self, provider_key: str) -> Optional[ProviderListing]:
+        with self._lock:
+            state = self._providers.get(provider_key)
+        if state is None:
+            return None
+        with state.lock:
+            listing = state.listing
+            now = self._clock()
+            if listing is not None and now - listing.fetched_at < self.ttl_sec:
+                return listing
+            start = time.perf_counter()
+            model_ids, error = self._fetcher(
+                state.base_url, state.api_key, self.timeout_sec
+            )
+            state.listing = ProviderListing(
+                model_ids=frozenset(model_ids),
+                error=error,
+                fetched_at=now,
+                latency_ms=int((time.perf_counter() - start) * 1000),
+                cycle=listing.cycle + 1 if listing is not None else 0,
+            )
+            return state.listing
+
+    def sample_for(self, provider_key: str) -> List[str]:
+        """本轮需要真实探测的模型（仅在已配置且列表中存在的模型里轮换）"""
+        with self._lock:
+            state = self._providers.get(provider_key)
+        if state is None or state.listing is None:
+            return []
+        listing = state.listing
+        present = [m for m in state.configured if m in listing.model_ids]
+        if len(present) <= self.sample_size:
+            return present
+        start = (listing.cycle * self.sample_size) % len(present)
+        return [present[(start + i) % len(present)] for i in range(self.sample_size)]
@@ -0,0 +1,248 @@
+"""批量刷新所有 Provider 的模型列表
+
+    python -m occm_core.model_refresh                 # 刷新 opencode.json 中的全部 Provider
+    python -m occm_core.model_refresh --workers 16 --timeout 8 --json
+
+所有 Provider 在有界线程池中并发请求（经共享的 ModelCatalog，支持条件请求），
+每完成一个 Provider 立即产生一条进度事件；整体耗时接近最慢的那个 Provider，
+而不是所有 Provider 耗时之和。结束后汇总：
+- added / removed: 与上一次缓存的列表相比新增、消失的模型
+- missing: 已写入配置但当前列表中不存在的模型
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .config_manager import ConfigManager
+from .config_paths import ConfigPaths
+from .model_catalog import ModelCatalog, get_model_catalog
+from .model_listing import LISTING_TIMEOUT_SEC
+from .native_providers import _resolve_env_value, _safe_base_url
+
+
+REFRESH_MAX_WORKERS = 8
+
+
+@dataclass
+class RefreshTarget:
+    provider_key: str
+    base_url: str
+    api_key: str = ""
+    configured: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ProviderRefresh:
+    """单个 Provider 的刷新结果"""
+
+    provider_key: str
+    total: int = 0
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    error: str = ""
+    elapsed_ms: int = 0
+    # 刷新失败时，total 等统计基于上一次成功的缓存
+    stale: bool = False
+
+
+@dataclass
+class RefreshProgress:
+    done: int
+    total: int
+    result: ProviderRefresh
+
+
+@dataclass
+class RefreshReport:
+    results: List[ProviderRefresh] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+
+    @property
+    def failed(self) -> List[ProviderRefresh]:
+        return [r for r in self.results if r.error]
+
+    @property
+    def added_count(self) -> int:
+        return sum(len(r.added) for r in self.results)
+
+    @property
+    def removed_count(self) -> int:
+        return sum(len(r.removed) for r in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "providers": len(self.results),
+            "failed": len(self.failed),
+            "added": self.added_count,
+            "removed": self.removed_count,
+            "results": [asdict(r) for r in self.results],
+        }
+
+    def format_text(self) -> str:
+        lines = [
+            f"{len(self.results)} providers in {self.elapsed_sec:.1f}s, "
+            f"{len(self.failed)} failed, +{self.added_count} / -{self.removed_count} models"
+        ]
+        for r in self.results:
+            status = f"ERROR {r.error}" if r.error else f"{r.total} models"
+            lines.append(f"  {r.provider_key:<30} {status} ({r.elapsed_ms} ms)")
+            for model_id in r.added:
+                lines.append(f"      + {model_id}")
+            for model_id in r.removed:
+                lines.append(f"      - {model_id}")
+            for model_id in r.missing:
+                lines.append(f"      ! {model_id} (configured, not listed)")
+        return "\n".join(lines)
+
+
+def refresh_targets_from_config(config: Optional[Dict]) -> List[RefreshTarget]:
+    """从 opencode 配置中提取配置了 baseURL 的 Provider"""
+    targets: List[RefreshTarget] = []
+    providers = (config or {}).get("provider", {})
+    if not isinstance(providers, dict):
+        return targets
+    for provider_key, provider_data in providers.items():
+        if not isinstance(provider_data, dict):
+            continue
+        options = provider_data.get("options", {})
+        if not isinstance(options, dict):
+            options = {}
+        base_url = _safe_base_url(
+            options.get("baseURL", "") or provider_data.get("baseURL", "")
+        )
+        if not base_url:
+            continue
+        api_key_raw = options.get("apiKey", "") or provider_data.get("apiKey", "")
+        models = provider_data.get("models", {})
+        targets.append(
+            RefreshTarget(
+                provider_key=provider_key,
+                base_url=base_url,
+                api_key=_resolve_env_value(api_key_raw) if api_key_raw else "",
+                configured=list(models) if isinstance(models, dict) else [],
+            )
+        )
+    return targets
+
+
+class ModelRefresher:
+    """并发刷新多个 Provider 的模型列表"""
+
+    def __init__(
+        self,
+        catalog: Optional[ModelCatalog] = None,
+        max_workers: int = REFRESH_MAX_WORKERS,
+        timeout_sec: float = LISTING_TIMEOUT_SEC,
+    ):
+        self.catalog = catalog or get_model_catalog()
+        self.max_workers = max(1, max_workers)
+        self.timeout_sec = timeout_sec
+
+    def _refresh_one(self, target: RefreshTarget) -> ProviderRefresh:
+        start = time.perf_counter()
+        previous = self.catalog.cached(target.base_url, target.api_key)
+        before = set(previous.model_ids) if previous is not None else set()
+        entry = self.catalog.fetch(
+            target.base_url, target.api_key, timeout=self.timeout_sec, persist=False
+        )
+        after = set(entry.model_ids)
+        result = ProviderRefresh(
+            provider_key=target.provider_key,
+            total=len(entry.model_ids),
+            error=entry.error,
+            stale=bool(entry.error and entry.model_ids),
+            elapsed_ms=int((time.perf_counter() - start) * 1000),
+        )
+        if not entry.error:
+            if previous is not None and previous.model_ids:
+                result.added = sorted(after - before)
+                result.removed = sorted(before - after)
+            result.missing = sorted(m for m in target.configured if m not in after)
+        return result
+
+    def iter_refresh(self, targets: List[RefreshTarget]) -> Iterator[RefreshProgress]:
+        """按完成顺序逐个产出进度；迭代结束时缓存已写入磁盘"""
+        if not targets:
+            return
+        workers = min(self.max_workers, len(targets))
+        done = 0
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="model-refresh"
+            ) as executor:
+                futures = {executor.submit(self._refresh_one, t): t for t in targets}
+                for future in as_completed(futures):
+                    target = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = ProviderRefresh(target.provider_key, error=str(e))
+                    done += 1
+                    yield RefreshProgress(done=done, total=len(targets), result=result)
+        finally:
+            # 批量期间只更新内存，结束后统一写一次缓存文件
+            self.catalog.save()
+
+    def refresh_all(
+        self,
+        targets: List[RefreshTarget],
+        on_progress: Optional[Callable[[RefreshProgress], None]] = None,
+    ) -> RefreshReport:
+        start = time.perf_counter()
+        report = RefreshReport()
+        for progress in self.iter_refresh(targets):
+            report.results.append(progress.result)
+            if on_progress is not None:
+                on_progress(progress)
+        report.results.sort(key=lambda r: r.provider_key)
+        report.elapsed_sec = time.perf_counter() - start
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m occm_core.model_refresh",
+        description="并发刷新所有 Provider 的模型列表并输出新增 / 移除报告",
+    )
+    parser.add_argument("--config", default="", help="opencode.json 路径")
+    parser.add_argument("--workers", type=int, default=REFRESH_MAX_WORKERS)
+    parser.add_argument(
+        "--timeout", type=float, default=LISTING_TIMEOUT_SEC, help="单个请求超时（秒）"
+    )
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    args = parser.parse_args(argv)
+
+    config_path = (
+        Path(args.config).expanduser() if args.config else ConfigPaths.get_opencode_config()
+    )
+    targets = refresh_targets_from_config(ConfigManager.load_json(config_path))
+    refresher = ModelRefresher(max_workers=args.workers, timeout_sec=args.timeout)
+
+    def on_progress(progress: RefreshProgress) -> None:
+        r = progress.result
+        status = r.error or f"{r.total} models"
+        print(
+            f"[{progress.done}/{progress.total}] {r.provider_key}: {status}",
+            file=sys.stderr,
+        )
+
+    report = refresher.refresh_all(targets, on_progress=on_progress)
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(report.format_text())
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
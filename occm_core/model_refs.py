@@ -0,0 +1,248 @@
+"""模型引用索引
+
+opencode 配置的 model / small_model / agent.*.model，以及 oh-my-opencode 的
+agents.*.model / categories.*.model 都以 "provider/model" 字符串引用 opencode
+配置 provider 中定义的模型。ModelRefIndex 对每个配置版本只构建一次：
+
+- 每个引用位置 → 定义位置（provider.<p>.models.<m>）
+- 反向的"查找引用"：模型 / Provider → 引用位置列表
+- 悬空引用、未被引用的 Provider 与模型
+
+构建时只遍历一次引用位置，查询均为字典查找。
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .config_paths import ConfigPaths
+from .native_providers import get_native_provider
+
+
+SOURCE_OPENCODE = "opencode"
+SOURCE_OHMYOPENCODE = "ohmyopencode"
+
+# 悬空原因
+DANGLING_MISSING_MODEL = "missing_model"  # Provider 已配置，但没有该模型
+DANGLING_UNKNOWN_PROVIDER = "unknown_provider"  # Provider 未配置且不是原生 Provider
+DANGLING_INVALID = "invalid"  # 不是 provider/model 格式
+
+
+@dataclass(frozen=True)
+class ModelRef:
+    """一个引用位置"""
+
+    source: str  # SOURCE_OPENCODE / SOURCE_OHMYOPENCODE
+    path: str  # 所在配置中的路径，如 agents.oracle.model
+    owner: str  # 展示用，如 "Agent 'oracle'"
+    ref: str  # 原始引用字符串
+    provider: str = ""
+    model: str = ""
+
+    @property
+    def definition_path(self) -> str:
+        return f"provider.{self.provider}.models.{self.model}"
+
+
+def _split_ref(ref: str) -> Tuple[str, str]:
+    if "/" not in ref:
+        return "", ""
+    provider, model = ref.split("/", 1)
+    return provider, model
+
+
+class ModelRefIndex:
+    """只读的模型引用索引"""
+
+    def __init__(
+        self,
+        opencode_config: Optional[Dict[str, Any]],
+        ohmy_config: Optional[Dict[str, Any]] = None,
+    ):
+        providers = (
+            opencode_config.get("provider") if isinstance(opencode_config, dict) else None
+        )
+        # Provider → 其 models 字典（直接引用配置，不复制）
+        self._models: Dict[str, Dict[str, Any]] = {}
+        if isinstance(providers, dict):
+            for provider_name, provider_data in providers.items():
+                models = (
+                    provider_data.get("models")
+                    if isinstance(provider_data, dict)
+                    else None
+                )
+                self._models[provider_name] = models if isinstance(models, dict) else {}
+
+        self.refs: List[ModelRef] = []
+        self._by_ref: Dict[str, List[ModelRef]] = {}
+        self._by_provider: Dict[str, List[ModelRef]] = {}
+        self._dangling: List[Tuple[ModelRef, str]] = []
+        self._collect_opencode(opencode_config)
+        self._collect_ohmy(ohmy_config)
+
+    # ---- 构建 ----
+
+    def _add(self, source: str, path: str, owner: str, ref: Any) -> None:
+        if not isinstance(ref, str) or not ref.strip():
+            return
+        provider, model = _split_ref(ref)
+        site = ModelRef(source, path, owner, ref, provider, model)
+        self.refs.append(site)
+        if not provider or not model:
+            self._dangling.append((site, DANGLING_INVALID))
+            return
+        self._by_ref.setdefault(ref, []).append(site)
+        self._by_provider.setdefault(provider, []).append(site)
+        models = self._models.get(provider)
+        if models is not None:
+            if model not in models:
+                self._dangling.append((site, DANGLING_MISSING_MODEL))
+        elif get_native_provider(provider) is None:
+            self._dangling.append((site, DANGLING_UNKNOWN_PROVIDER))
+
+    def _collect_opencode(self, config: Optional[Dict[str, Any]]) -> None:
+        if not isinstance(config, dict):
+            return
+        for key in ("model", "small_model"):
+            self._add(SOURCE_OPENCODE, key, key, config.get(key))
+        agents = config.get("agent")
+        if isinstance(agents, dict):
+            for name, data in agents.items():
+                if isinstance(data, dict):
+                    self._add(
+                        SOURCE_OPENCODE,
+                        f"agent.{name}.model",
+                        f"Agent '{name}'",
+                        data.get("model"),
+                    )
+
+    def _collect_ohmy(self, config: Optional[Dict[str, Any]]) -> None:
+        if not isinstance(config, dict):
+            return
+        for section, label in (("agents", "Agent"), ("categories", "Category")):
+            entries = config.get(section)
+            if not isinstance(entries, dict):
+                continue
+            for name, data in entries.items():
+                if isinstance(data, dict):
+                    self._add(
+                        SOURCE_OHMYOPENCODE,
+                        f"{section}.{name}.model",
+                        f"{label} '{name}'",
+                        data.get("model"),
+                    )
+
+    # ---- 查找引用 ----
+
+    def usages(self, model_ref: str) -> List[ModelRef]:
+        """引用 "provider/model" 的全部位置"""
+        return list(self._by_ref.get(model_ref, ()))
+
+    def provider_usages(self, provider_name: str) -> List[ModelRef]:
+        """引用该 Provider 下任意模型的全部位置"""
+        return list(self._by_provider.get(provider_name, ()))
+
+    def usage_counts(self) -> Dict[str, int]:
+        """"provider/model" → 被引用次数（只含被引用过的）"""
+        return {ref: len(sites) for ref, sites in self._by_ref.items()}
+
+    # ---- 报告 ----
+
+    def dangling(self, source: Optional[str] = None) -> List[Tuple[ModelRef, str]]:
+        """悬空引用及原因（DANGLING_*）"""
+        if source is None:
+            return list(self._dangling)
+        return [item for item in self._dangling if item[0].source == source]
+
+    def unused_providers(self) -> List[str]:
+        """没有任何模型被引用的 Provider（按配置顺序）"""
+        return [p for p in self._models if p not in self._by_provider]
+
+    def unused_models(self) -> List[str]:
+        """未被任何位置引用的 "provider/model"（按配置顺序）"""
+        by_ref = self._by_ref
+        return [
+            ref
+            for provider, models in self._models.items()
+            for ref in (f"{provider}/{model}" for model in models)
+            if ref not in by_ref
+        ]
+
+    def dangling_issues(self, source: Optional[str] = None) -> List[Dict]:
+        """悬空引用转换为 ConfigValidator 的问题格式（均为警告）"""
+        issues = []
+        for site, reason in self.dangling(source):
+            if reason == DANGLING_MISSING_MODEL:
+                message = f"{site.owner} 引用的模型 '{site.ref}' 未在 Provider '{site.provider}' 中配置"
+            elif reason == DANGLING_UNKNOWN_PROVIDER:
+                message = f"{site.owner} 引用的 Provider '{site.provider}' 未配置，也不是已知的原生 Provider"
+            else:
+                message = f"{site.owner} 的模型 '{site.ref}' 不是 provider/model 格式"
+            issues.append({"level": "warning", "path": site.path, "message": message})
+        return issues
+
+    def unused_issues(self) -> List[Dict]:
+        """未被引用的 Provider 与模型转换为提示级问题（路径相对 opencode 配置）
+
+        整个 Provider 未被引用时只报告 Provider，不再逐个列出其模型。
+        """
+        unused_providers = self.unused_providers()
+        issues = [
+            {
+                "level": "info",
+                "path": f"provider.{provider}",
+                "message": f"Provider '{provider}' 的模型未被任何位置引用",
+            }
+            for provider in unused_providers
+        ]
+        skipped = set(unused_providers)
+        for ref in self.unused_models():
+            provider, model = _split_ref(ref)
+            if provider in skipped:
+                continue
+            issues.append(
+                {
+                    "level": "info",
+                    "path": f"provider.{provider}.models.{model}",
+                    "message": f"模型 '{ref}' 未被任何位置引用",
+                }
+            )
+        return issues
+
+
+def config_files_version() -> Tuple[Any, ...]:
+    """两个配置文件的 (mtime_ns, size)，供按文件读取配置的调用方作为版本号"""
+    version = []
+    for path in (
+        ConfigPaths.get_opencode_config(),
+        ConfigPaths.get_ohmyopencode_config(),
+    ):
+        try:
+            st = path.stat()
+        except OSError:
+            version.append(None)
+        else:
+            version.append((st.st_mtime_ns, st.st_size))
+    return tuple(version)
+
+
+_shared_index: Optional[Tuple[Hashable, ModelRefIndex]] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_model_ref_index(
+    opencode_config: Optional[Dict[str, Any]],
+    ohmy_config: Optional[Dict[str, Any]],
+    version: Hashable,
+) -> ModelRefIndex:
+    """同一配置版本复用已构建的索引；version 由调用方维护（计数器或文件状态）"""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is not None and _shared_index[0] == version:
+            return _shared_index[1]
+    index = ModelRefIndex(opencode_config, ohmy_config)
+    with _shared_index_lock:
+        _shared_index = (version, index)
+    return index
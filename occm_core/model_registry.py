@@ -1,10 +1,61 @@
+"""模型注册表
+
+增量维护已配置模型与原生 Provider 认证状态，并提供 O(1) 反向索引：
+
+- provider → models、model → providers（同一模型 ID 可挂在多个 Provider 下）
+- npm SDK → providers
+- 原生 Provider → 是否已配置认证
+
+update_config / update_auth 只对发生变化的 Provider 重建索引条目；
+auth.json 按 (mtime, size) 判断是否需要重新读取。同一进程写入 auth.json
+时 AuthManager 会主动通知，外部修改由节流后的文件状态检查发现。
+"""
+
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from .auth_manager import AuthManager
 
 
+# 两次检查 auth.json 文件状态的最小间隔（秒）
+AUTH_CHECK_INTERVAL_SEC = 1.0
+
+
+@dataclass
+class RegistryDelta:
+    """一次更新带来的变化"""
+
+    added_models: List[str] = field(default_factory=list)
+    removed_models: List[str] = field(default_factory=list)
+    changed_providers: List[str] = field(default_factory=list)
+    configured_natives: List[str] = field(default_factory=list)
+    unconfigured_natives: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.added_models
+            or self.removed_models
+            or self.changed_providers
+            or self.configured_natives
+            or self.unconfigured_natives
+        )
+
+
+def _provider_signature(provider_data: Any) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """决定索引内容的部分：npm 与模型 ID 序列"""
+    if not isinstance(provider_data, dict):
+        return None
+    models = provider_data.get("models", {})
+    model_ids = tuple(models.keys()) if isinstance(models, dict) else ()
+    npm = provider_data.get("npm", "")
+    return (npm if isinstance(npm, str) else "", model_ids)
+
+
 class ModelRegistry:
     """模型注册表 - 管理所有已配置的模型"""
 
@@ -12,41 +63,233 @@ class ModelRegistry:
         self,
         opencode_config: Optional[Dict],
         auth_manager: Optional[AuthManager] = None,
+        watch_auth: bool = False,
     ):
         self.config = opencode_config or {}
         self.auth_manager = auth_manager or AuthManager()
+        # "provider/model" → True，用于 O(1) 成员判断
         self.models: Dict[str, bool] = {}
         self.native_providers: Dict[str, bool] = {}  # 已配置的原生 Provider
+        self.provider_models: Dict[str, List[str]] = {}
+        self.model_providers: Dict[str, Set[str]] = {}
+        self.npm_providers: Dict[str, Set[str]] = {}
+        self._signatures: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self._auth_stat: Optional[Tuple[int, int]] = None
+        self._auth_checked_at = 0.0
+        self._listeners: List[Callable[[RegistryDelta], None]] = []
+        self._lock = threading.RLock()
         self.refresh()
+        if watch_auth:
+            AuthManager.add_change_listener(self._on_auth_written)
+
+    # ---- 全量 / 增量更新 ----
 
     def refresh(self):
-        self.models = {}
-        self.native_providers = {}
+        """全量重建（首次构建或需要强制同步时）"""
+        with self._lock:
+            self.models = {}
+            self.provider_models = {}
+            self.model_providers = {}
+            self.npm_providers = {}
+            self._signatures = {}
+            self.native_providers = {}
+            self._auth_stat = None
+        self.update_config(self.config)
+        self.update_auth(force=True)
+
+    def update_config(self, opencode_config: Optional[Dict]) -> RegistryDelta:
+        """应用新的配置，只重建发生变化的 Provider"""
+        delta = RegistryDelta()
+        with self._lock:
+            self.config = opencode_config or {}
+            providers = self.config.get("provider", {})
+            if not isinstance(providers, dict):
+                providers = {}
+
+            for provider_name in list(self._signatures):
+                if provider_name not in providers or (
+                    _provider_signature(providers[provider_name]) is None
+                ):
+                    self._replace_provider(provider_name, None, delta)
 
-        providers = self.config.get("provider", {})
-        for provider_name, provider_data in providers.items():
-            if not isinstance(provider_data, dict):
+            for provider_name, provider_data in providers.items():
+                signature = _provider_signature(provider_data)
+                if signature is None:
+                    continue
+                if self._signatures.get(provider_name) != signature:
+                    self._replace_provider(provider_name, signature, delta)
+        if delta:
+            self._notify(delta)
+        return delta
+
+    def _replace_provider(
+        self,
+        provider_name: str,
+        signature: Optional[Tuple[str, Tuple[str, ...]]],
+        delta: RegistryDelta,
+    ) -> None:
+        """按新旧签名的差集更新单个 Provider 的索引条目（signature=None 表示移除）"""
+        old_npm, old_ids = self._signatures.get(provider_name, ("", ()))
+        new_npm, new_ids = signature or ("", ())
+        old_set, new_set = set(old_ids), set(new_ids)
+
+        for model_id in old_ids:
+            if model_id in new_set:
                 continue
-            models = provider_data.get("models", {})
-            for model_id in models.keys():
-                full_ref = f"{provider_name}/{model_id}"
-                self.models[full_ref] = True
+            ref = f"{provider_name}/{model_id}"
+            self.models.pop(ref, None)
+            delta.removed_models.append(ref)
+            owners = self.model_providers.get(model_id)
+            if owners is not None:
+                owners.discard(provider_name)
+                if not owners:
+                    del self.model_providers[model_id]
+        for model_id in new_ids:
+            if model_id in old_set:
+                continue
+            ref = f"{provider_name}/{model_id}"
+            self.models[ref] = True
+            delta.added_models.append(ref)
+            self.model_providers.setdefault(model_id, set()).add(provider_name)
+
+        if old_npm != new_npm:
+            owners = self.npm_providers.get(old_npm)
+            if owners is not None:
+                owners.discard(provider_name)
+                if not owners:
+                    del self.npm_providers[old_npm]
+            if new_npm:
+                self.npm_providers.setdefault(new_npm, set()).add(provider_name)
 
+        if signature is None:
+            self._signatures.pop(provider_name, None)
+            self.provider_models.pop(provider_name, None)
+        else:
+            self._signatures[provider_name] = signature
+            # 已有的 Provider 保持原位置，新 Provider 追加在末尾
+            self.provider_models[provider_name] = list(new_ids)
+        delta.changed_providers.append(provider_name)
+
+    def _read_auth_stat(self) -> Optional[Tuple[int, int]]:
         try:
-            auth_data = self.auth_manager.read_auth()
-            for provider_id in auth_data:
-                if auth_data[provider_id]:
-                    self.native_providers[provider_id] = True
-        except Exception:
-            pass
+            st = os.stat(self.auth_manager.auth_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def update_auth(
+        self, auth_data: Optional[Dict[str, Any]] = None, force: bool = False
+    ) -> RegistryDelta:
+        """同步原生 Provider 认证状态
+
+        传入 auth_data 时直接使用；否则仅在 auth.json 的 (mtime, size)
+        变化（或 force）时重新读取。
+        """
+        delta = RegistryDelta()
+        with self._lock:
+            self._auth_checked_at = time.monotonic()
+            if auth_data is None:
+                stat = self._read_auth_stat()
+                if not force and stat == self._auth_stat:
+                    return delta
+                try:
+                    auth_data = self.auth_manager.read_auth()
+                except Exception:
+                    auth_data = {}
+                self._auth_stat = stat
+            configured = {
+                provider_id: True
+                for provider_id, value in (auth_data or {}).items()
+                if value
+            }
+            delta.configured_natives = [
+                p for p in configured if p not in self.native_providers
+            ]
+            delta.unconfigured_natives = [
+                p for p in self.native_providers if p not in configured
+            ]
+            self.native_providers = configured
+        if delta:
+            self._notify(delta)
+        return delta
+
+    def _maybe_check_auth(self) -> None:
+        if time.monotonic() - self._auth_checked_at >= AUTH_CHECK_INTERVAL_SEC:
+            self.update_auth()
+
+    def _on_auth_written(self, auth_path) -> None:
+        if str(auth_path) == str(self.auth_manager.auth_path):
+            self.update_auth(force=True)
+
+    # ---- 订阅 ----
+
+    def add_listener(self, callback: Callable[[RegistryDelta], None]) -> None:
+        """索引发生变化时回调 RegistryDelta"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[RegistryDelta], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, delta: RegistryDelta) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(delta)
+            except Exception:
+                pass
+
+    # ---- 查询 ----
 
     def get_all_models(self) -> List[str]:
-        return list(self.models.keys())
+        """按 Provider、模型在配置中的顺序返回 "provider/model" 列表"""
+        return [
+            f"{provider_name}/{model_id}"
+            for provider_name, model_ids in self.provider_models.items()
+            for model_id in model_ids
+        ]
+
+    def has_model(self, model_ref: str) -> bool:
+        """"provider/model" 形式的引用是否指向已配置模型"""
+        return model_ref in self.models
+
+    def has_provider(self, provider_name: str) -> bool:
+        return provider_name in self.provider_models
+
+    def models_for_provider(self, provider_name: str) -> List[str]:
+        return list(self.provider_models.get(provider_name, ()))
+
+    def providers_for_model(self, model_id: str) -> List[str]:
+        return sorted(self.model_providers.get(model_id, ()))
+
+    def providers_for_npm(self, npm: str) -> List[str]:
+        return sorted(self.npm_providers.get(npm, ()))
 
     def get_configured_native_providers(self) -> List[str]:
         """获取已配置的原生 Provider ID 列表"""
+        self._maybe_check_auth()
         return list(self.native_providers.keys())
 
     def is_native_provider_configured(self, provider_id: str) -> bool:
         """检查原生 Provider 是否已配置"""
+        self._maybe_check_auth()
         return provider_id in self.native_providers
+
+    def close(self) -> None:
+        AuthManager.remove_change_listener(self._on_auth_written)
+
+
+_shared_registry: Optional[ModelRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_model_registry(opencode_config: Optional[Dict] = None) -> ModelRegistry:
+    """进程内共享的 ModelRegistry；传入配置时按差量更新索引"""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = ModelRegistry(opencode_config, watch_auth=True)
+            return _shared_registry
+    if opencode_config is not None:
+        _shared_registry.update_config(opencode_config)
+    return _shared_registry
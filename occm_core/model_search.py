@@ -0,0 +1,264 @@
+"""模型列表搜索索引
+
+模型 ID、名称与分类构成的三元组（trigram）倒排索引，构建一次后按
+模型列表内容复用（get_search_index 以列表指纹缓存）：
+
+- 有文档按字面包含全部查询词时只返回这些文档（在拼接文本上一次扫描）
+- 否则走模糊匹配：查询的三元组命中比例达到阈值即为候选，可容忍少量错字；
+  三元组也没有结果时退化为按顺序的字符匹配（子序列）
+- 排序：ID 完全相等 > ID 前缀 > ID 子串 > 名称/分类子串 > 三元组命中率，
+  同分时较短的 ID 优先
+- 前缀模式走排序数组二分查找，不再逐个比较
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+SEARCH_MODE_FUZZY = "fuzzy"
+SEARCH_MODE_PREFIX = "prefix"
+SEARCH_MODE_REGEX = "regex"
+
+# 三元组命中比例低于该值的文档不作为模糊匹配结果
+FUZZY_MIN_RATIO = 0.6
+INDEX_CACHE_SIZE = 8
+
+_SPLIT_RE = re.compile(r"\s+")
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f" {text} "
+    return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+
+class ModelSearchIndex:
+    """只读的模型搜索索引（构建后可被多个线程同时查询）"""
+
+    def __init__(
+        self,
+        model_ids: Sequence[str],
+        names: Optional[Dict[str, str]] = None,
+        categories: Optional[Dict[str, Iterable[str]]] = None,
+    ):
+        self.model_ids: List[str] = list(dict.fromkeys(model_ids))
+        names = names or {}
+        categories = categories or {}
+        self._ids_lower: List[str] = [m.lower() for m in self.model_ids]
+        texts: List[str] = []
+        for model_id, lower in zip(self.model_ids, self._ids_lower):
+            parts = [lower]
+            name = names.get(model_id)
+            if name and name.lower() != lower:
+                parts.append(name.lower())
+            parts.extend(c.lower() for c in categories.get(model_id, ()) if c)
+            texts.append(" ".join(parts))
+        self._texts = texts
+        # 子序列兜底在整段文本上一次扫描，按行首偏移映射回文档号
+        self._joined = "\n".join(texts)
+        self._offsets: List[int] = []
+        offset = 0
+        for text in texts:
+            self._offsets.append(offset)
+            offset += len(text) + 1
+
+        postings: Dict[str, List[int]] = {}
+        for doc, text in enumerate(texts):
+            for gram in set(_trigrams(text)):
+                postings.setdefault(gram, []).append(doc)
+        self._postings: Dict[str, Tuple[int, ...]] = {
+            gram: tuple(docs) for gram, docs in postings.items()
+        }
+        # 前缀查询：按小写 ID 排序的 (id, 文档号) 数组
+        self._sorted = sorted(
+            (lower, doc) for doc, lower in enumerate(self._ids_lower)
+        )
+        self._sorted_keys = [key for key, _ in self._sorted]
+        # 同档次内的次序（较短的 ID 优先）预先算好，排序时只比较整数
+        self._order: List[int] = [0] * len(self.model_ids)
+        by_length = sorted(
+            range(len(self.model_ids)),
+            key=lambda doc: (len(self._ids_lower[doc]), self._ids_lower[doc]),
+        )
+        for position, doc in enumerate(by_length):
+            self._order[doc] = position
+
+    def __len__(self) -> int:
+        return len(self.model_ids)
+
+    def _literal(self, token: str) -> Dict[int, float]:
+        """字面包含该词的文档"""
+        return {doc: 1.0 for doc, text in enumerate(self._texts) if token in text}
+
+    def _candidates(self, token: str) -> Dict[int, float]:
+        """单个查询词的模糊候选文档及其分数"""
+        if len(token) < 3:
+            return self._literal(token)
+        grams = set(_trigrams(token))
+        # 查询首尾的填充三元组只在词边界命中，不计入模糊匹配的分母
+        core = [g for g in grams if not g.startswith(" ") and not g.endswith(" ")]
+        if not core:
+            core = list(grams)
+        hits: Dict[int, int] = {}
+        for gram in core:
+            for doc in self._postings.get(gram, ()):
+                hits[doc] = hits.get(doc, 0) + 1
+        needed = max(1, int(len(core) * FUZZY_MIN_RATIO + 0.999))
+        scores: Dict[int, float] = {}
+        for doc, count in hits.items():
+            if count >= needed:
+                scores[doc] = count / len(core)
+        if not scores:
+            scores = self._subsequence(token)
+        return scores
+
+    def _subsequence(self, token: str) -> Dict[int, float]:
+        """三元组无结果时的兜底：字符按顺序出现即可（如 gpt4o -> gpt-4o）
+
+        分数为查询长度与匹配跨度之比，跨度越紧凑越靠前。
+        """
+        # 形如 g[^\np]*p[^\nt]*t：每段只排除下一个字符，避免惰性匹配的回溯
+        parts = [re.escape(token[0])]
+        for ch in token[1:]:
+            parts.append(f"[^\\n{re.escape(ch)}]*{re.escape(ch)}")
+        pattern = re.compile("".join(parts))
+        scores: Dict[int, float] = {}
+        for match in pattern.finditer(self._joined):
+            doc = bisect.bisect_right(self._offsets, match.start()) - 1
+            if doc not in scores:
+                scores[doc] = len(token) / (match.end() - match.start())
+        return scores
+
+    def _ranked(
+        self, scores: Dict[int, float], query: str, tokens: List[str]
+    ) -> List[int]:
+        """按 (档次, -分数, 预排序位置) 排序；先分桶，桶内只比较整数位置"""
+        ids_lower = self._ids_lower
+        texts = self._texts
+        buckets: List[List[int]] = [[], [], [], [], []]
+        # 单个查询词（最常见）时省去 all() 生成器的开销
+        single = tokens[0] if len(tokens) == 1 else None
+        for doc in scores:
+            lower = ids_lower[doc]
+            if lower == query:
+                tier = 0
+            elif lower.startswith(query):
+                tier = 1
+            elif (
+                single in lower
+                if single is not None
+                else all(t in lower for t in tokens)
+            ):
+                tier = 2
+            elif (
+                single in texts[doc]
+                if single is not None
+                else all(t in texts[doc] for t in tokens)
+            ):
+                tier = 3
+            else:
+                tier = 4
+            buckets[tier].append(doc)
+        order = self._order
+        uniform = len(set(scores.values())) <= 1
+        ranked: List[int] = []
+        for bucket in buckets:
+            if uniform:
+                bucket.sort(key=order.__getitem__)
+            else:
+                bucket.sort(key=lambda doc: (-scores[doc], order[doc]))
+            ranked.extend(bucket)
+        return ranked
+
+    def search(
+        self,
+        query: str,
+        mode: str = SEARCH_MODE_FUZZY,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """返回匹配的模型 ID；空查询返回全部（保持原顺序）"""
+        query = (query or "").strip().lower()
+        if not query:
+            return self.model_ids[:limit] if limit else list(self.model_ids)
+
+        if mode == SEARCH_MODE_PREFIX:
+            start = bisect.bisect_left(self._sorted_keys, query)
+            end = bisect.bisect_left(self._sorted_keys, query + "￿", lo=start)
+            docs = sorted(doc for _, doc in self._sorted[start:end])
+            ids = [self.model_ids[doc] for doc in docs]
+            return ids[:limit] if limit else ids
+
+        if mode == SEARCH_MODE_REGEX:
+            try:
+                pattern = re.compile(query, re.IGNORECASE)
+            except re.error:
+                return []
+            ids = [m for m in self.model_ids if pattern.search(m)]
+            return ids[:limit] if limit else ids
+
+        tokens = [t for t in _SPLIT_RE.split(query) if t]
+        scores = self._intersect(tokens, self._literal)
+        if not scores:
+            scores = self._intersect(tokens, self._candidates)
+        if not scores:
+            return []
+        query = " ".join(tokens)
+        model_ids = self.model_ids
+        ids = [model_ids[doc] for doc in self._ranked(scores, query, tokens)]
+        return ids[:limit] if limit else ids
+
+    @staticmethod
+    def _intersect(tokens: List[str], lookup) -> Dict[int, float]:
+        """多个查询词须同时命中，分数累加"""
+        scores: Optional[Dict[int, float]] = None
+        for token in tokens:
+            token_scores = lookup(token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    doc: score + token_scores[doc]
+                    for doc, score in scores.items()
+                    if doc in token_scores
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+
+_index_cache: "OrderedDict[str, ModelSearchIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_search_index(
+    model_ids: Sequence[str],
+    names: Optional[Dict[str, str]] = None,
+    categories: Optional[Dict[str, Iterable[str]]] = None,
+) -> ModelSearchIndex:
+    """按列表内容复用索引：同一份模型列表（同一目录版本）只构建一次"""
+    digest = hashlib.sha1()
+    for model_id in model_ids:
+        digest.update(model_id.encode("utf-8"))
+        digest.update(b"\0")
+        if names and model_id in names:
+            digest.update(names[model_id].encode("utf-8"))
+        if categories and model_id in categories:
+            digest.update("\x01".join(categories[model_id]).encode("utf-8"))
+        digest.update(b"\n")
+    key = digest.hexdigest()
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+    index = ModelSearchIndex(model_ids, names, categories)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
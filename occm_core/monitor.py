@@ -0,0 +1,238 @@
+"""无界面监控守护进程
+
+以 JSONL 形式持续输出 MonitorService 的探测结果，不依赖 Qt / NiceGUI，
+适合在构建服务器上作为 systemd 服务运行::
+
+    python -m occm_core.monitor --config ~/.config/opencode/opencode.json \\
+        --output /var/log/occm/monitor.jsonl
+
+    # /etc/systemd/system/occm-monitor.service
+    [Service]
+    ExecStart=/usr/bin/python3 -m occm_core.monitor --output /var/log/occm/monitor.jsonl
+    ExecReload=/bin/kill -HUP $MAINPID
+    Restart=on-failure
+
+信号：
+- SIGHUP: 重新读取配置文件并同步监控目标
+- SIGTERM / SIGINT: 停止调度并退出
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import logging.handlers
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from .config_manager import ConfigManager
+from .config_paths import ConfigPaths
+from .model_listing import LISTING_SAMPLE_SIZE
+from .monitor_history import MonitorHistoryStore
+from .monitor_service import MONITOR_POLL_INTERVAL_MS, MonitorResult, MonitorService
+
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+logger = logging.getLogger("occm_core.monitor")
+
+
+def _build_result_logger(
+    output: str, max_bytes: int, backup_count: int
+) -> logging.Logger:
+    """结果输出通道：'-' 为标准输出，否则为按大小滚动的文件"""
+    result_logger = logging.getLogger("occm_core.monitor.results")
+    result_logger.setLevel(logging.INFO)
+    result_logger.propagate = False
+    result_logger.handlers.clear()
+    if output == "-":
+        handler: logging.Handler = logging.StreamHandler(sys.stdout)
+    else:
+        path = Path(output).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    result_logger.addHandler(handler)
+    return result_logger
+
+
+class MonitorDaemon:
+    """把 MonitorService 包装为长期运行的进程"""
+
+    def __init__(
+        self,
+        service: MonitorService,
+        config_path: Path,
+        result_logger: logging.Logger,
+    ):
+        self.service = service
+        self.config_path = config_path
+        self.result_logger = result_logger
+        self._stop_event = threading.Event()
+        self._reload_event = threading.Event()
+        self.service.add_result_callback(self._write_result)
+        self.service.add_error_callback(lambda msg: logger.error("调度异常: %s", msg))
+        self.history: Optional[MonitorHistoryStore] = None
+
+    def attach_history(self, store: MonitorHistoryStore) -> None:
+        """同时持久化结果并维护可用率汇总（供 SLA 报表使用）"""
+        self.history = store
+        store.load()
+        self.service.add_result_callback(store.append)
+
+    def _write_result(self, result: MonitorResult) -> None:
+        self.result_logger.info(
+            json.dumps(result.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        )
+
+    def reload(self) -> int:
+        """重新读取配置并同步目标，返回目标数量"""
+        config = ConfigManager.load_json(self.config_path)
+        if config is None:
+            logger.warning("配置读取失败，保留现有目标: %s", self.config_path)
+            return len(self.service.get_targets())
+        targets = self.service.load_targets_from_config(config)
+        logger.info("已加载 %d 个监控目标: %s", len(targets), self.config_path)
+        return len(targets)
+
+    def request_reload(self, *_: object) -> None:
+        self._reload_event.set()
+
+    def request_stop(self, *_: object) -> None:
+        self._stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self.request_reload)
+
+    def run(self) -> None:
+        self.reload()
+        self.service.start_polling()
+        try:
+            # 信号处理函数只置位事件，实际的重载在主线程完成
+            while not self._stop_event.wait(0.5):
+                if self._reload_event.is_set():
+                    self._reload_event.clear()
+                    self.reload()
+        finally:
+            self.service.shutdown()
+            if self.history is not None:
+                self.history.close()
+            logger.info("监控已停止")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m occm_core.monitor",
+        description="OCCM 无界面监控：按调度探测 opencode.json 中的模型，结果以 JSONL 输出",
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="",
+        help="opencode.json 路径 (默认 ~/.config/opencode/opencode.json)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="-",
+        help="JSONL 输出文件，'-' 表示标准输出 (默认 -)",
+    )
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--backup-count", type=int, default=DEFAULT_BACKUP_COUNT)
+    parser.add_argument(
+        "--interval-ms",
+        type=int,
+        default=MONITOR_POLL_INTERVAL_MS,
+        help="基础探测间隔（毫秒）",
+    )
+    parser.add_argument("--workers", type=int, default=6, help="并发探测线程数")
+    parser.add_argument("--timeout", type=int, default=15, help="单次请求超时（秒）")
+    parser.add_argument(
+        "--ping-only",
+        action="store_true",
+        help="只做 Ping 检测，不发送对话请求",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="使用流式对话探测，记录 TTFT 与 tokens/s",
+    )
+    parser.add_argument(
+        "--listing",
+        action="store_true",
+        help="列表模式：每个 Provider 每轮只请求一次 /v1/models，对话探测轮换抽样",
+    )
+    parser.add_argument(
+        "--sample-size",
+        type=int,
+        default=LISTING_SAMPLE_SIZE,
+        help="列表模式下每个 Provider 每轮实际对话探测的模型数",
+    )
+    parser.add_argument(
+        "--history",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIR",
+        help=(
+            "持久化结果并维护可用率汇总（不指定目录时使用默认监控历史目录；"
+            "目录已被其他进程写入时拒绝启动）"
+        ),
+    )
+    parser.add_argument("--verbose", action="store_true", help="输出调试日志到 stderr")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        stream=sys.stderr,
+    )
+
+    config_path = (
+        Path(args.config).expanduser() if args.config else ConfigPaths.get_opencode_config()
+    )
+    service = MonitorService(
+        poll_interval_ms=args.interval_ms,
+        request_timeout_sec=args.timeout,
+        max_workers=args.workers,
+    )
+    service.set_chat_test_enabled(not args.ping_only)
+    service.set_stream_probe_enabled(args.stream)
+    service.set_listing_mode(args.listing, sample_size=args.sample_size)
+
+    daemon = MonitorDaemon(
+        service,
+        config_path,
+        _build_result_logger(args.output, args.max_bytes, args.backup_count),
+    )
+    if args.history is not None:
+        history_dir = (
+            Path(args.history).expanduser()
+            if args.history
+            else ConfigPaths.get_monitor_history_dir()
+        )
+        store = MonitorHistoryStore(history_dir)
+        if not store.acquire_writer():
+            logger.error(
+                "监控历史目录已被其他进程写入，请指定其他目录: %s", history_dir
+            )
+            return 2
+        daemon.attach_history(store)
+        logger.info("监控历史目录: %s", history_dir)
+    daemon.install_signal_handlers()
+    daemon.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""MonitorService 基准测试（离线运行，使用本地模拟服务）
+
+    python -m occm_core.monitor_bench                         # 10 / 100 / 1000 个目标
+    python -m occm_core.monitor_bench --targets 100,500 --cycles 5 --workers 16
+    python -m occm_core.monitor_bench --mock-latency-dist lognormal \\
+        --mock-latency-jitter-ms 30 --mock-error-rate 0.02 --json
+
+模拟服务默认在子进程中运行，本进程统计的 CPU 时间与内存只包含监控服务
+本身。每个规模依次测量：
+- 每轮耗时：所有目标各完成一次探测（首轮为启动调度，之后为手动检测）
+- 吞吐：每秒完成的探测数
+- CPU 时间与内存：tracemalloc 统计的常驻增量与峰值（--no-memory 关闭，
+  关闭后吞吐数字更接近真实值）
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .load_test import _percentile
+from .mock_provider import LATENCY_DISTRIBUTIONS, mock_model_ids
+from .monitor_service import MonitorResult, MonitorService
+
+
+DEFAULT_TARGET_COUNTS = (10, 100, 1000)
+MODELS_PER_PROVIDER = 10
+BENCH_POLL_INTERVAL_MS = 3600 * 1000
+MOCK_START_TIMEOUT_SEC = 10
+
+
+def build_bench_config(
+    base_url: str, target_count: int, models_per_provider: int = MODELS_PER_PROVIDER
+) -> Dict[str, Any]:
+    """生成指向模拟服务的 opencode 配置
+
+    每个 Provider 使用不同的 apiKey，使熔断器按 Provider 独立，
+    与真实多中转站的场景一致。
+    """
+    providers: Dict[str, Any] = {}
+    for index, model_id in enumerate(mock_model_ids(target_count)):
+        provider_key = f"bench-{index // models_per_provider:03d}"
+        provider = providers.setdefault(
+            provider_key,
+            {
+                "name": provider_key,
+                "options": {"baseURL": base_url, "apiKey": f"key-{provider_key}"},
+                "models": {},
+            },
+        )
+        provider["models"][model_id] = {"name": model_id}
+    return {"provider": providers}
+
+
+@dataclass
+class BenchmarkResult:
+    targets: int
+    workers: int
+    cycle_sec: List[float] = field(default_factory=list)
+    completed: bool = True
+    throughput_per_sec: float = 0.0
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    statuses: Dict[str, int] = field(default_factory=dict)
+    cpu_sec: float = 0.0
+    mem_retained_kb: Optional[float] = None
+    mem_peak_kb: Optional[float] = None
+
+    @property
+    def mean_cycle_sec(self) -> float:
+        return sum(self.cycle_sec) / len(self.cycle_sec) if self.cycle_sec else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["mean_cycle_sec"] = round(self.mean_cycle_sec, 3)
+        return data
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    def cell(value: Any) -> str:
+        return "-" if value is None else str(value)
+
+    header = (
+        f"{'targets':>8} {'workers':>8} {'cycle_s':>8} {'probe/s':>8} "
+        f"{'p50_ms':>8} {'p95_ms':>8} {'cpu_s':>7} {'mem_kb':>9} {'peak_kb':>9}  statuses"
+    )
+    lines = [header]
+    for r in results:
+        statuses = ",".join(f"{k}={v}" for k, v in sorted(r.statuses.items()))
+        lines.append(
+            f"{r.targets:>8} {r.workers:>8} {r.mean_cycle_sec:>8.3f} "
+            f"{r.throughput_per_sec:>8.1f} {cell(r.latency_p50_ms):>8} "
+            f"{cell(r.latency_p95_ms):>8} {r.cpu_sec:>7.2f} "
+            f"{cell(r.mem_retained_kb):>9} {cell(r.mem_peak_kb):>9}  {statuses}"
+            + ("" if r.completed else "  (timeout)")
+        )
+    return "\n".join(lines)
+
+
+class MonitorBenchmark:
+    """对给定规模的目标运行若干轮完整探测并统计耗时、吞吐与内存"""
+
+    def __init__(
+        self,
+        base_url: str,
+        target_count: int,
+        workers: int = 16,
+        cycles: int = 3,
+        request_timeout_sec: int = 10,
+        cycle_timeout_sec: float = 300,
+        stream: bool = False,
+        listing: bool = False,
+        measure_memory: bool = True,
+    ):
+        self.base_url = base_url
+        self.target_count = target_count
+        self.workers = workers
+        self.cycles = max(1, cycles)
+        self.request_timeout_sec = request_timeout_sec
+        self.cycle_timeout_sec = cycle_timeout_sec
+        self.stream = stream
+        self.listing = listing
+        self.measure_memory = measure_memory
+        self._cond = threading.Condition()
+        self._received = 0
+        self._latencies: List[int] = []
+        self._statuses: Dict[str, int] = {}
+
+    def _on_result(self, result: MonitorResult) -> None:
+        with self._cond:
+            self._received += 1
+            self._statuses[result.status] = self._statuses.get(result.status, 0) + 1
+            if result.latency_ms is not None:
+                self._latencies.append(result.latency_ms)
+            if self._received >= self.target_count:
+                self._cond.notify_all()
+
+    def _run_cycle(self, service: MonitorService, trigger) -> Optional[float]:
+        """触发一轮探测并等待所有目标返回结果，超时返回 None"""
+        with self._cond:
+            self._received = 0
+        start = time.perf_counter()
+        deadline = start + self.cycle_timeout_sec
+        trigger()
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._received >= self.target_count, self.cycle_timeout_sec
+            ):
+                return None
+        elapsed = time.perf_counter() - start
+        # 结果回调早于释放探测中标记，等待调度器完全空闲后再开始下一轮
+        while not service.is_idle():
+            if time.perf_counter() > deadline:
+                return None
+            time.sleep(0.001)
+        return elapsed
+
+    def run(self) -> BenchmarkResult:
+        result = BenchmarkResult(targets=self.target_count, workers=self.workers)
+        config = build_bench_config(self.base_url, self.target_count)
+
+        if self.measure_memory:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0] if self.measure_memory else 0
+        cpu_start = time.process_time()
+
+        service = MonitorService(
+            poll_interval_ms=BENCH_POLL_INTERVAL_MS,
+            request_timeout_sec=self.request_timeout_sec,
+            max_workers=self.workers,
+            jitter_ratio=0,
+        )
+        service.set_chat_test_enabled(True)
+        service.set_stream_probe_enabled(self.stream)
+        service.add_result_callback(self._on_result)
+        service.load_targets_from_config(config)
+        service.set_listing_mode(self.listing)
+        try:
+            for cycle in range(self.cycles):
+                # 新目标加入后立即到期：首轮由启动调度触发，之后用手动检测
+                trigger = service.start_polling if cycle == 0 else service.check_now
+                elapsed = self._run_cycle(service, trigger)
+                if elapsed is None:
+                    result.completed = False
+                    break
+                result.cycle_sec.append(round(elapsed, 3))
+        finally:
+            service.shutdown()
+            result.cpu_sec = round(time.process_time() - cpu_start, 3)
+            if self.measure_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                result.mem_retained_kb = round((current - baseline) / 1024, 1)
+                result.mem_peak_kb = round((peak - baseline) / 1024, 1)
+
+        total = sum(result.cycle_sec)
+        if total > 0:
+            result.throughput_per_sec = round(
+                self.target_count * len(result.cycle_sec) / total, 1
+            )
+        latencies = sorted(self._latencies)
+        result.latency_p50_ms = _percentile(latencies, 0.5)
+        result.latency_p95_ms = _percentile(latencies, 0.95)
+        result.statuses = dict(self._statuses)
+        return result
+
+
+class MockProcess:
+    """在子进程中运行 occm_core.mock_provider，读取其实际监听地址"""
+
+    def __init__(self, model_count: int, extra_args: Optional[List[str]] = None):
+        self.model_count = model_count
+        self.extra_args = list(extra_args or [])
+        self.base_url = ""
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self) -> "MockProcess":
+        command = [
+            sys.executable,
+            "-m",
+            "occm_core.mock_provider",
+            "--port",
+            "0",
+            "--model-count",
+            str(self.model_count),
+        ] + self.extra_args
+        self._process = subprocess.Popen(
+            command, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True
+        )
+        line = ""
+        timer = threading.Timer(MOCK_START_TIMEOUT_SEC, self._process.kill)
+        timer.start()
+        try:
+            assert self._process.stderr is not None
+            # 跳过启动警告等其他输出，直到出现监听地址或进程退出
+            for line in self._process.stderr:
+                if "listening on " in line:
+                    break
+        finally:
+            timer.cancel()
+        if "listening on " not in line:
+            self.stop()
+            raise RuntimeError(f"模拟服务启动失败: {line.strip() or '无输出'}")
+        self.base_url = line.rsplit("listening on ", 1)[1].strip()
+        return self
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+    def __enter__(self) -> "MockProcess":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m occm_core.monitor_bench",
+        description="离线测量 MonitorService 在不同目标规模下的吞吐、每轮耗时与内存",
+    )
+    parser.add_argument(
+        "--targets",
+        default=",".join(str(n) for n in DEFAULT_TARGET_COUNTS),
+        help="逗号分隔的目标规模",
+    )
+    parser.add_argument("--cycles", type=int, default=3, help="每个规模的探测轮数")
+    parser.add_argument("--workers", type=int, default=16, help="并发探测线程数")
+    parser.add_argument("--timeout", type=int, default=10, help="单次请求超时（秒）")
+    parser.add_argument("--cycle-timeout", type=float, default=300)
+    parser.add_argument("--stream", action="store_true", help="使用流式对话探测")
+    parser.add_argument("--listing", action="store_true", help="启用列表模式")
+    parser.add_argument("--no-memory", action="store_true", help="不统计内存")
+    parser.add_argument(
+        "--mock-url", default="", help="使用已运行的模拟服务（需包含 mock-0000 等模型）"
+    )
+    parser.add_argument("--mock-latency-ms", type=float, default=20)
+    parser.add_argument(
+        "--mock-latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed"
+    )
+    parser.add_argument("--mock-latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--mock-error-rate", type=float, default=0.0)
+    parser.add_argument("--mock-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--mock-max-concurrency", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args(argv)
+
+    counts = [int(n) for n in args.targets.split(",") if n.strip()]
+    mock_args = [
+        "--latency-ms",
+        str(args.mock_latency_ms),
+        "--latency-dist",
+        args.mock_latency_dist,
+        "--latency-jitter-ms",
+        str(args.mock_latency_jitter_ms),
+        "--error-rate",
+        str(args.mock_error_rate),
+        "--rate-limit-rate",
+        str(args.mock_rate_limit_rate),
+        "--seed",
+        str(args.seed),
+    ]
+    if args.mock_max_concurrency:
+        mock_args += ["--max-concurrency", str(args.mock_max_concurrency)]
+
+    mock: Optional[MockProcess] = None
+    base_url = args.mock_url
+    if not base_url:
+        mock = MockProcess(max(counts), mock_args).start()
+        base_url = mock.base_url
+
+    results: List[BenchmarkResult] = []
+    try:
+        for count in counts:
+            bench = MonitorBenchmark(
+                base_url,
+                count,
+                workers=args.workers,
+                cycles=args.cycles,
+                request_timeout_sec=args.timeout,
+                cycle_timeout_sec=args.cycle_timeout,
+                stream=args.stream,
+                listing=args.listing,
+                measure_memory=not args.no_memory,
+            )
+            results.append(bench.run())
+            if not args.json:
+                print(format_results(results[-1:]).splitlines()[-1], file=sys.stderr)
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    if args.json:
+        print(json.dumps([r.to_dict() for r in results], ensure_ascii=False, indent=2))
+    else:
+        print(format_results(results))
+    return 0 if all(r.completed for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from .monitor_service import MonitorResult, MonitorService
+
+
+class CoalescingResultQueue:
+    """按 target_id 合并的结果缓冲区
+
+    同一目标在两次取出之间的多次更新只保留最新一次，因此缓冲区大小
+    不会超过目标数量；取出顺序为各目标首次进入缓冲区的顺序。
+    """
+
+    def __init__(self) -> None:
+        self._pending: "OrderedDict[str, MonitorResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def push(self, result: MonitorResult) -> None:
+        with self._lock:
+            # 已在队列中的目标保留原位置，只替换为最新结果
+            self._pending[result.target_id] = result
+
+    def drain(self, limit: Optional[int] = None) -> List[MonitorResult]:
+        """取出最多 limit 条结果（None 表示全部）"""
+        with self._lock:
+            if limit is None or limit >= len(self._pending):
+                items = list(self._pending.values())
+                self._pending.clear()
+                return items
+            items = []
+            for _ in range(max(0, limit)):
+                _, result = self._pending.popitem(last=False)
+                items.append(result)
+            return items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+
+class MonitorFeed:
+    """把一个 MonitorService 的结果分发给多个订阅者
+
+    服务只注册一个回调；每个订阅者拥有独立的合并缓冲区，由各自的 UI
+    按帧节奏取出，慢订阅者不会阻塞探测线程，也不会无限堆积。
+    """
+
+    def __init__(self, service: MonitorService) -> None:
+        self.service = service
+        self._subscribers: List[CoalescingResultQueue] = []
+        self._lock = threading.Lock()
+        service.add_result_callback(self._publish)
+
+    def _publish(self, result: MonitorResult) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for queue in subscribers:
+            queue.push(result)
+
+    def subscribe(self) -> CoalescingResultQueue:
+        queue = CoalescingResultQueue()
+        with self._lock:
+            self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: CoalescingResultQueue) -> None:
+        with self._lock:
+            if queue in self._subscribers:
+                self._subscribers.remove(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
@@ -0,0 +1,654 @@
+"""监控结果持久化与可用率 / SLA 汇总
+
+- MonitorRollup: 按目标、按小时增量维护的汇总桶，收到结果时 O(1) 更新，
+  报表只遍历时间窗口内的桶，与原始样本数量无关
+- MonitorHistoryStore: 原始结果追加写入 JSONL，汇总定期快照；启动时
+  读取快照后只重放快照之后追加的结果；同一目录只允许一个进程写入
+
+可用率与降级时间按时间加权：每个样本的状态持续到该目标的下一个样本，
+单段最长计 MAX_SAMPLE_SPAN_SEC（监控停止期间不计入任何状态）。
+
+命令行报表::
+
+    python -m occm_core.monitor_history --days 30 --slo 0.999 --format csv
+    python -m occm_core.monitor_history --ingest /var/log/occm/monitor.jsonl --days 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config_paths import ConfigPaths
+from .monitor_service import MonitorResult
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+ROLLUP_BUCKET_SEC = 3600
+MAX_SAMPLE_SPAN_SEC = 15 * 60
+ROLLUP_RETENTION_DAYS = 400
+DEFAULT_SLO = 0.995
+
+UP_STATUSES = ("operational", "degraded")
+DOWN_STATUSES = ("failed", "error")
+
+# 汇总桶字段顺序（快照中以数组保存以减小体积）
+_BUCKET_FIELDS = (
+    "samples",
+    "up_samples",
+    "up_sec",
+    "degraded_sec",
+    "down_sec",
+    "latency_sum",
+    "latency_count",
+    "incidents",
+    "repair_sec",
+)
+
+
+@dataclass
+class _Bucket:
+    samples: int = 0
+    up_samples: int = 0
+    up_sec: float = 0.0
+    degraded_sec: float = 0.0
+    down_sec: float = 0.0
+    latency_sum: float = 0.0
+    latency_count: int = 0
+    incidents: int = 0
+    repair_sec: float = 0.0
+
+    def merge(self, other: "_Bucket") -> None:
+        # 报表的热点路径，逐字段展开比 getattr/setattr 循环快数倍
+        self.samples += other.samples
+        self.up_samples += other.up_samples
+        self.up_sec += other.up_sec
+        self.degraded_sec += other.degraded_sec
+        self.down_sec += other.down_sec
+        self.latency_sum += other.latency_sum
+        self.latency_count += other.latency_count
+        self.incidents += other.incidents
+        self.repair_sec += other.repair_sec
+
+    def to_list(self) -> List[float]:
+        return [getattr(self, name) for name in _BUCKET_FIELDS]
+
+    @classmethod
+    def from_list(cls, values: List[float]) -> "_Bucket":
+        return cls(**dict(zip(_BUCKET_FIELDS, values)))
+
+
+@dataclass
+class _TargetState:
+    last_ts: Optional[float] = None
+    last_status: str = ""
+    down_since: Optional[float] = None
+
+
+@dataclass
+class SlaRow:
+    key: str
+    samples: int
+    availability_pct: Optional[float]
+    degraded_pct: Optional[float]
+    error_budget_burn: Optional[float]
+    incidents: int
+    mttr_sec: Optional[float]
+    avg_latency_ms: Optional[float]
+    met_slo: Optional[bool]
+
+
+@dataclass
+class SlaReport:
+    start: datetime
+    end: datetime
+    slo: float
+    targets: List[SlaRow] = field(default_factory=list)
+    providers: List[SlaRow] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start.isoformat(timespec="seconds"),
+            "end": self.end.isoformat(timespec="seconds"),
+            "slo": self.slo,
+            "targets": [asdict(row) for row in self.targets],
+            "providers": [asdict(row) for row in self.providers],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_csv(self) -> str:
+        output = io.StringIO()
+        writer = csv.writer(output)
+        columns = [name for name in SlaRow.__dataclass_fields__]
+        writer.writerow(["scope"] + columns)
+        for scope, rows in (("provider", self.providers), ("target", self.targets)):
+            for row in rows:
+                values = asdict(row)
+                writer.writerow(
+                    [scope] + ["" if values[c] is None else values[c] for c in columns]
+                )
+        return output.getvalue()
+
+
+def _provider_of(target_id: str) -> str:
+    return target_id.partition("/")[0]
+
+
+class MonitorRollup:
+    """按目标、按小时增量维护的监控汇总"""
+
+    def __init__(
+        self,
+        bucket_sec: int = ROLLUP_BUCKET_SEC,
+        max_span_sec: float = MAX_SAMPLE_SPAN_SEC,
+        retention_days: int = ROLLUP_RETENTION_DAYS,
+    ):
+        self.bucket_sec = bucket_sec
+        self.max_span_sec = max_span_sec
+        self.retention_sec = retention_days * 86400
+        self._buckets: Dict[str, Dict[int, _Bucket]] = {}
+        self._states: Dict[str, _TargetState] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, target_id: str, ts: float) -> _Bucket:
+        start = int(ts // self.bucket_sec) * self.bucket_sec
+        buckets = self._buckets.get(target_id)
+        if buckets is None:
+            buckets = self._buckets[target_id] = {}
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = _Bucket()
+        return bucket
+
+    def _add_span(self, target_id: str, status: str, start: float, end: float) -> None:
+        """把 [start, end) 内的状态时长按桶边界拆分累加"""
+        while start < end:
+            boundary = (int(start // self.bucket_sec) + 1) * self.bucket_sec
+            stop = min(end, boundary)
+            bucket = self._bucket(target_id, start)
+            span = stop - start
+            if status in UP_STATUSES:
+                bucket.up_sec += span
+                if status == "degraded":
+                    bucket.degraded_sec += span
+            elif status in DOWN_STATUSES:
+                bucket.down_sec += span
+            start = stop
+
+    def observe(self, result: MonitorResult) -> None:
+        """结果回调：可直接注册为 MonitorService.add_result_callback"""
+        self.observe_values(
+            result.target_id,
+            result.status,
+            result.checked_at.timestamp(),
+            result.latency_ms,
+        )
+
+    def observe_dict(self, data: Dict[str, Any]) -> bool:
+        """接收 MonitorResult.to_dict() 格式（守护进程 JSONL 的一行）"""
+        try:
+            ts = datetime.fromisoformat(data["checked_at"]).timestamp()
+            self.observe_values(
+                str(data["target_id"]), str(data["status"]), ts, data.get("latency_ms")
+            )
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def observe_values(
+        self, target_id: str, status: str, ts: float, latency_ms: Optional[float]
+    ) -> None:
+        if status not in UP_STATUSES and status not in DOWN_STATUSES:
+            # no_config 等状态既不算可用也不算故障
+            return
+        with self._lock:
+            state = self._states.get(target_id)
+            if state is None:
+                state = self._states[target_id] = _TargetState()
+
+            bucket = self._bucket(target_id, ts)
+            bucket.samples += 1
+            if status in UP_STATUSES:
+                bucket.up_samples += 1
+                if latency_ms is not None:
+                    bucket.latency_sum += latency_ms
+                    bucket.latency_count += 1
+
+            if state.last_ts is not None and ts <= state.last_ts:
+                # 乱序或重复样本只计数，不参与时间加权与故障区间
+                return
+
+            if state.last_ts is not None:
+                span_end = min(ts, state.last_ts + self.max_span_sec)
+                self._add_span(target_id, state.last_status, state.last_ts, span_end)
+                if ts - state.last_ts > self.max_span_sec and state.down_since:
+                    # 监控中断期间无法确认恢复时间，放弃该故障区间
+                    state.down_since = None
+
+            if status in DOWN_STATUSES:
+                if state.down_since is None:
+                    state.down_since = ts
+            elif state.down_since is not None:
+                bucket.incidents += 1
+                bucket.repair_sec += ts - state.down_since
+                state.down_since = None
+
+            state.last_ts = ts
+            state.last_status = status
+
+    def prune(self, now: Optional[float] = None) -> None:
+        """删除超过保留期的汇总桶"""
+        cutoff = (now or datetime.now().timestamp()) - self.retention_sec
+        with self._lock:
+            for target_id in list(self._buckets):
+                buckets = self._buckets[target_id]
+                for start in [s for s in buckets if s < cutoff]:
+                    del buckets[start]
+                if not buckets:
+                    del self._buckets[target_id]
+
+    def _window(
+        self, start_ts: float, end_ts: float
+    ) -> Tuple[Dict[str, _Bucket], Dict[str, _Bucket]]:
+        per_target: Dict[str, _Bucket] = {}
+        per_provider: Dict[str, _Bucket] = {}
+        # 与窗口有重叠的桶都计入（窗口起点向前对齐到整点）
+        start_ts = (start_ts // self.bucket_sec) * self.bucket_sec
+        with self._lock:
+            for target_id, buckets in self._buckets.items():
+                total = _Bucket()
+                for bucket_start, bucket in buckets.items():
+                    if start_ts <= bucket_start < end_ts:
+                        total.merge(bucket)
+                if not total.samples:
+                    continue
+                per_target[target_id] = total
+                provider = per_provider.setdefault(_provider_of(target_id), _Bucket())
+                provider.merge(total)
+        return per_target, per_provider
+
+    @staticmethod
+    def _row(key: str, bucket: _Bucket, slo: float) -> SlaRow:
+        observed = bucket.up_sec + bucket.down_sec
+        if observed > 0:
+            availability = bucket.up_sec / observed
+            degraded_pct: Optional[float] = round(
+                bucket.degraded_sec * 100.0 / observed, 3
+            )
+        elif bucket.samples:
+            # 只有单个样本时退化为按样本计算
+            availability = bucket.up_samples / bucket.samples
+            degraded_pct = None
+        else:
+            availability = None
+            degraded_pct = None
+
+        burn: Optional[float] = None
+        if availability is not None and slo < 1:
+            burn = round((1 - availability) / (1 - slo), 3)
+        return SlaRow(
+            key=key,
+            samples=bucket.samples,
+            availability_pct=round(availability * 100, 3)
+            if availability is not None
+            else None,
+            degraded_pct=degraded_pct,
+            error_budget_burn=burn,
+            incidents=bucket.incidents,
+            mttr_sec=round(bucket.repair_sec / bucket.incidents, 1)
+            if bucket.incidents
+            else None,
+            avg_latency_ms=round(bucket.latency_sum / bucket.latency_count, 1)
+            if bucket.latency_count
+            else None,
+            met_slo=availability >= slo if availability is not None else None,
+        )
+
+    def report(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        slo: float = DEFAULT_SLO,
+    ) -> SlaReport:
+        """生成 [start, end) 窗口的报表（按小时桶对齐）"""
+        end = end or datetime.now()
+        per_target, per_provider = self._window(start.timestamp(), end.timestamp())
+        report = SlaReport(start=start, end=end, slo=slo)
+        report.targets = [
+            self._row(key, bucket, slo) for key, bucket in sorted(per_target.items())
+        ]
+        report.providers = [
+            self._row(key, bucket, slo) for key, bucket in sorted(per_provider.items())
+        ]
+        return report
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "bucket_sec": self.bucket_sec,
+                "buckets": {
+                    target_id: {
+                        str(start): bucket.to_list()
+                        for start, bucket in buckets.items()
+                    }
+                    for target_id, buckets in self._buckets.items()
+                },
+                "states": {
+                    target_id: asdict(state)
+                    for target_id, state in self._states.items()
+                },
+            }
+
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        if data.get("bucket_sec") != self.bucket_sec:
+            return
+        with self._lock:
+            self._buckets = {
+                target_id: {
+                    int(start): _Bucket.from_list(values)
+                    for start, values in buckets.items()
+                }
+                for target_id, buckets in (data.get("buckets") or {}).items()
+            }
+            self._states = {
+                target_id: _TargetState(**state)
+                for target_id, state in (data.get("states") or {}).items()
+            }
+
+
+class MonitorHistoryStore:
+    """监控结果的持久化存储
+
+    目录结构::
+
+        results.jsonl     原始结果（MonitorResult.to_dict，每行一条）
+        results.jsonl.1   上一次滚动的原始结果
+        rollup.json       汇总快照，记录已汇总到 results.jsonl 的字节偏移
+        writer.lock       写入锁，持有者所在进程是该目录唯一的写入方
+
+    快照偏移覆盖整个 results.jsonl，多个进程同时追加会让汇总重复或遗漏，
+    因此写入前必须通过 acquire_writer() 独占目录；未取得写入锁时
+    append()/snapshot() 不写任何文件，只能读取报表。
+    append() 可直接注册为 MonitorService.add_result_callback。
+    """
+
+    RESULTS_FILE = "results.jsonl"
+    ROLLUP_FILE = "rollup.json"
+    LOCK_FILE = "writer.lock"
+
+    def __init__(
+        self,
+        directory: Path,
+        snapshot_every: int = 500,
+        max_results_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.directory = Path(directory)
+        self.snapshot_every = snapshot_every
+        self.max_results_bytes = max_results_bytes
+        self.rollup = MonitorRollup()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._loaded = False
+        # 只读时记录上次读取的文件状态，文件变化后重新读取
+        self._loaded_state: Optional[Tuple[Any, ...]] = None
+        self._lock_file: Optional[io.TextIOWrapper] = None
+        self._refused = False
+
+    @property
+    def results_path(self) -> Path:
+        return self.directory / self.RESULTS_FILE
+
+    @property
+    def rollup_path(self) -> Path:
+        return self.directory / self.ROLLUP_FILE
+
+    @property
+    def is_writer(self) -> bool:
+        return self._lock_file is not None
+
+    def acquire_writer(self) -> bool:
+        """独占目录的写入权（非阻塞）；目录已被其他写入方占用时返回 False"""
+        with self._lock:
+            if self._lock_file is not None:
+                return True
+            if self._refused:
+                return False
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                f = open(self.directory / self.LOCK_FILE, "a+", encoding="utf-8")
+            except OSError:
+                self._refused = True
+                return False
+            try:
+                if os.name == "nt":
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                self._refused = True
+                return False
+            # 记录持有者 PID，便于排查目录被谁占用
+            f.seek(0)
+            f.truncate()
+            f.write(f"{os.getpid()}\n")
+            f.flush()
+            self._lock_file = f
+            # 只读期间其他写入方可能追加过结果，成为写入方后重新读取一次
+            self._loaded = False
+            return True
+
+    def close(self) -> None:
+        """写入最终快照并释放写入锁"""
+        with self._lock:
+            if self._lock_file is None:
+                return
+            self._snapshot_locked()
+            # 关闭文件即释放锁；锁文件本身保留，删除会与新的写入方竞争
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _files_state(self) -> Tuple[Any, ...]:
+        state: List[Any] = []
+        for path in (self.rollup_path, self.results_path):
+            try:
+                st = path.stat()
+            except OSError:
+                state.append(None)
+            else:
+                state.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        return tuple(state)
+
+    def load(self) -> None:
+        """读取汇总快照并重放快照之后追加的原始结果
+
+        写入方只读取一次，之后由 append() 增量维护；只读方在快照或原始结果
+        文件变化后重新读取，以看到写入方追加的结果。
+        """
+        with self._lock:
+            if self._lock_file is not None:
+                if self._loaded:
+                    return
+            else:
+                state = self._files_state()
+                if self._loaded and state == self._loaded_state:
+                    return
+                self._loaded_state = state
+                if self._loaded:
+                    self.rollup = MonitorRollup()
+            self._loaded = True
+            offset = 0
+            try:
+                with open(self.rollup_path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                self.rollup.load_dict(snapshot.get("rollup") or {})
+                offset = int(snapshot.get("offset") or 0)
+            except (OSError, ValueError):
+                offset = 0
+            try:
+                with open(self.results_path, "rb") as f:
+                    if offset > os.fstat(f.fileno()).st_size:
+                        offset = 0
+                    f.seek(offset)
+                    for line in f:
+                        try:
+                            self.rollup.observe_dict(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                pass
+
+    def append(self, result: MonitorResult) -> None:
+        if not self.acquire_writer():
+            return
+        self.load()
+        line = json.dumps(result.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            # 写入与汇总在同一把锁内完成，快照偏移与汇总内容保持一致
+            self.rollup.observe(result)
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with open(self.results_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                return
+            self._pending += 1
+            if self._pending >= self.snapshot_every:
+                self._snapshot_locked()
+
+    def snapshot(self) -> None:
+        with self._lock:
+            if self._lock_file is not None:
+                self._snapshot_locked()
+
+    def _snapshot_locked(self) -> None:
+        self._pending = 0
+        try:
+            offset = self.results_path.stat().st_size
+        except OSError:
+            offset = 0
+        if offset > self.max_results_bytes:
+            # 汇总已包含全部原始结果，滚动后从新文件开头继续
+            os.replace(self.results_path, self.results_path.with_suffix(".jsonl.1"))
+            offset = 0
+        self.rollup.prune()
+        data = {"offset": offset, "rollup": self.rollup.to_dict()}
+        tmp_path = self.rollup_path.with_suffix(".json.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.rollup_path)
+        except OSError:
+            pass
+
+    def report(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        slo: float = DEFAULT_SLO,
+    ) -> SlaReport:
+        self.load()
+        return self.rollup.report(start, end, slo)
+
+
+def _format_table(report: SlaReport) -> str:
+    def cell(value: Any) -> str:
+        return "-" if value is None else str(value)
+
+    header = ("key", "samples", "avail%", "degr%", "burn", "incid", "mttr_s", "avg_ms")
+    lines = [
+        f"{report.start:%Y-%m-%d %H:%M} ~ {report.end:%Y-%m-%d %H:%M}  "
+        f"SLO {report.slo * 100:g}%",
+        "  ".join(f"{h:>8}" if i else f"{h:<40}" for i, h in enumerate(header)),
+    ]
+    for rows in (report.providers, report.targets):
+        for row in rows:
+            values = (
+                row.samples,
+                row.availability_pct,
+                row.degraded_pct,
+                row.error_budget_burn,
+                row.incidents,
+                row.mttr_sec,
+                row.avg_latency_ms,
+            )
+            mark = "" if row.met_slo is not False else "  !"
+            lines.append(
+                f"{row.key:<40}  "
+                + "  ".join(f"{cell(v):>8}" for v in values)
+                + mark
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m occm_core.monitor_history",
+        description="根据持久化的监控结果输出可用率 / SLA 报表",
+    )
+    parser.add_argument(
+        "--dir", default="", help="监控历史目录（默认为配置目录下的 occm-monitor）"
+    )
+    parser.add_argument(
+        "--ingest",
+        nargs="*",
+        default=None,
+        metavar="JSONL",
+        help="改为直接汇总守护进程输出的 JSONL 文件（不读写历史目录）",
+    )
+    parser.add_argument("--days", type=float, default=30, help="报表时间窗口（天）")
+    parser.add_argument("--slo", type=float, default=DEFAULT_SLO, help="可用率目标")
+    parser.add_argument(
+        "--format", choices=("table", "csv", "json"), default="table"
+    )
+    args = parser.parse_args(argv)
+
+    end = datetime.now()
+    start = end - timedelta(days=args.days)
+    if args.ingest is not None:
+        rollup = MonitorRollup()
+        for path in args.ingest:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rollup.observe_dict(json.loads(line))
+                    except ValueError:
+                        continue
+        report = rollup.report(start, end, args.slo)
+    else:
+        directory = (
+            Path(args.dir).expanduser()
+            if args.dir
+            else ConfigPaths.get_monitor_history_dir()
+        )
+        report = MonitorHistoryStore(directory).report(start, end, args.slo)
+
+    if args.format == "csv":
+        sys.stdout.write(report.to_csv())
+    elif args.format == "json":
+        print(report.to_json())
+    else:
+        print(_format_table(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
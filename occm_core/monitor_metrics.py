@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from .monitor_service import MonitorResult, MonitorTarget
+
+
+OPENMETRICS_CONTENT_TYPE = (
+    "application/openmetrics-text; version=1.0.0; charset=utf-8"
+)
+
+# 探测延迟直方图桶（秒）
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PING_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 3.0)
+
+STATUS_CODES = {
+    "operational": 0,
+    "degraded": 1,
+    "failed": 2,
+    "error": 3,
+    "no_config": 4,
+}
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(round(value, 6))
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+    def render(self, name: str, labels: str) -> str:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}\n')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.total}\n')
+        lines.append(f"{name}_count{{{labels}}} {self.total}\n")
+        lines.append(f"{name}_sum{{{labels}}} {_format_value(self.sum)}\n")
+        return "".join(lines)
+
+
+class MonitorMetrics:
+    """把 MonitorService 的结果汇总为 OpenMetrics 文本
+
+    - 每个目标的仪表值在收到结果时即渲染成文本片段并缓存，抓取时只做拼接
+    - 直方图与计数器按 Provider 聚合，序列数量不随模型数增长
+    - 两次抓取之间没有新结果时直接返回上次的渲染结果
+    """
+
+    GAUGES = (
+        ("occm_monitor_up", "1 if the last probe succeeded (operational or degraded)"),
+        (
+            "occm_monitor_status_code",
+            "Last probe status: 0=operational 1=degraded 2=failed 3=error 4=no_config",
+        ),
+        ("occm_monitor_latency_seconds", "Last chat probe round-trip time"),
+        ("occm_monitor_ping_seconds", "Last TCP connect time to the provider origin"),
+        ("occm_monitor_ttft_seconds", "Last streaming probe time to first token"),
+        (
+            "occm_monitor_output_tokens_per_second",
+            "Last streaming probe output token rate",
+        ),
+        ("occm_monitor_breaker_open", "1 if the provider circuit breaker is not closed"),
+        ("occm_monitor_last_check_timestamp_seconds", "Unix time of the last probe"),
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._targets: Dict[str, Tuple[str, str]] = {}
+        # 每个指标族: target_id -> 已渲染的样本行
+        self._gauge_lines: Dict[str, Dict[str, str]] = {
+            name: {} for name, _ in self.GAUGES
+        }
+        self._latency_hist: Dict[str, _Histogram] = {}
+        self._ping_hist: Dict[str, _Histogram] = {}
+        self._probe_counts: Dict[Tuple[str, str], int] = {}
+        self._cached: Optional[str] = None
+
+    def set_targets(self, targets: List[MonitorTarget]) -> None:
+        """同步目标列表，已移除目标的仪表序列随之删除"""
+        with self._lock:
+            self._targets = {
+                t.target_id: (t.provider_key, t.model_id) for t in targets
+            }
+            for lines in self._gauge_lines.values():
+                for target_id in list(lines):
+                    if target_id not in self._targets:
+                        del lines[target_id]
+            self._cached = None
+
+    def observe(self, result: MonitorResult) -> None:
+        """结果回调：可直接注册为 MonitorService.add_result_callback"""
+        with self._lock:
+            meta = self._targets.get(result.target_id)
+            if meta is None:
+                provider, _, model = result.target_id.partition("/")
+            else:
+                provider, model = meta
+            labels = (
+                f'target="{_escape_label(result.target_id)}",'
+                f'provider="{_escape_label(provider)}",'
+                f'model="{_escape_label(model)}"'
+            )
+            values: Dict[str, Optional[float]] = {
+                "occm_monitor_up": 1.0
+                if result.status in ("operational", "degraded")
+                else 0.0,
+                "occm_monitor_status_code": float(STATUS_CODES.get(result.status, 3)),
+                "occm_monitor_latency_seconds": result.latency_ms / 1000.0
+                if result.latency_ms is not None
+                else None,
+                "occm_monitor_ping_seconds": result.ping_ms / 1000.0
+                if result.ping_ms is not None
+                else None,
+                "occm_monitor_ttft_seconds": result.ttft_ms / 1000.0
+                if result.ttft_ms is not None
+                else None,
+                "occm_monitor_output_tokens_per_second": result.tokens_per_sec,
+                "occm_monitor_breaker_open": 0.0
+                if result.breaker_state == "closed"
+                else 1.0,
+                "occm_monitor_last_check_timestamp_seconds": result.checked_at.timestamp(),
+            }
+            for name, value in values.items():
+                lines = self._gauge_lines[name]
+                if value is None:
+                    lines.pop(result.target_id, None)
+                else:
+                    lines[result.target_id] = (
+                        f"{name}{{{labels}}} {_format_value(value)}\n"
+                    )
+
+            if result.latency_ms is not None:
+                hist = self._latency_hist.get(provider)
+                if hist is None:
+                    hist = self._latency_hist[provider] = _Histogram(LATENCY_BUCKETS)
+                hist.observe(result.latency_ms / 1000.0)
+            if result.ping_ms is not None:
+                hist = self._ping_hist.get(provider)
+                if hist is None:
+                    hist = self._ping_hist[provider] = _Histogram(PING_BUCKETS)
+                hist.observe(result.ping_ms / 1000.0)
+            key = (provider, result.status)
+            self._probe_counts[key] = self._probe_counts.get(key, 0) + 1
+            self._cached = None
+
+    def render(self) -> str:
+        """渲染 OpenMetrics 文本；无变化时复用缓存"""
+        with self._lock:
+            if self._cached is not None:
+                return self._cached
+            parts: List[str] = []
+            for name, help_text in self.GAUGES:
+                parts.append(f"# TYPE {name} gauge\n# HELP {name} {help_text}\n")
+                parts.extend(self._gauge_lines[name].values())
+
+            for name, help_text, hists in (
+                (
+                    "occm_monitor_probe_latency_seconds",
+                    "Chat probe latency per provider",
+                    self._latency_hist,
+                ),
+                (
+                    "occm_monitor_probe_ping_seconds",
+                    "TCP connect time per provider",
+                    self._ping_hist,
+                ),
+            ):
+                parts.append(f"# TYPE {name} histogram\n# HELP {name} {help_text}\n")
+                for provider, hist in hists.items():
+                    parts.append(
+                        hist.render(name, f'provider="{_escape_label(provider)}"')
+                    )
+
+            parts.append(
+                "# TYPE occm_monitor_probes counter\n"
+                "# HELP occm_monitor_probes Completed probes per provider and status\n"
+            )
+            for (provider, status), count in self._probe_counts.items():
+                parts.append(
+                    f'occm_monitor_probes_total{{provider="{_escape_label(provider)}",'
+                    f'status="{_escape_label(status)}"}} {count}\n'
+                )
+            parts.append("# EOF\n")
+            self._cached = "".join(parts)
+            return self._cached
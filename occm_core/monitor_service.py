@@ -1,25 +1,55 @@
 from __future__ import annotations
 
+import heapq
 import json
+import random
 import socket
 import threading
 import time
 import urllib.error
 import urllib.request
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import Callable, Deque, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
+from .circuit_breaker import (
+    BREAKER_CLOSED,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+from .model_catalog import get_model_catalog
+from .model_listing import LISTING_SAMPLE_SIZE, ModelListingCache
 from .native_providers import _resolve_env_value, _safe_base_url
+from .probe_timing import (
+    PHASE_CONNECT,
+    PHASE_DNS,
+    DnsCache,
+    timed_connect,
+    timed_request,
+    uses_proxy,
+)
 
 
 MONITOR_POLL_INTERVAL_MS = 60000
 MONITOR_HISTORY_LIMIT = 60
 DEGRADED_THRESHOLD_MS = 6000
 
+# 调度参数：健康目标间隔逐步拉长，失败目标指数退避
+MONITOR_MAX_INTERVAL_FACTOR = 5
+MONITOR_BACKOFF_MAX_FACTOR = 15
+MONITOR_HEALTHY_STRETCH = 1.5
+MONITOR_JITTER_RATIO = 0.25
+MONITOR_LOOP_MAX_WAIT_SEC = 1.0
+
+# 流式探测：固定的小提示词，输出长度可控，便于横向比较 tokens/s
+STREAM_PROBE_PROMPT = "Count from 1 to 20, separated by spaces."
+STREAM_PROBE_MAX_TOKENS = 48
+
 
 def _build_chat_url(base_url: str) -> str:
     """根据 baseURL 生成 chat/completions 地址"""
@@ -43,21 +73,94 @@ def _extract_origin(base_url: str) -> str:
     return base_url
 
 
-def _measure_ping(origin: str, timeout_sec: float = 3.0) -> Optional[int]:
+def _measure_ping(
+    origin: str, timeout_sec: float = 3.0, dns_cache: Optional[DnsCache] = None
+) -> Tuple[Optional[int], Dict[str, float]]:
+    """测量 TCP 建连时间，返回 (建连 ms, {dns, connect} 阶段耗时)
+
+    DNS 解析单独计时，不再计入 Ping；失败时返回 (None, {})。
+    """
     if not origin:
-        return None
+        return None, {}
     parsed = urlparse(origin)
     host = parsed.hostname
     if not host:
-        return None
+        return None, {}
     port = parsed.port or (443 if parsed.scheme == "https" else 80)
-    start = time.time()
     try:
-        sock = socket.create_connection((host, port), timeout=timeout_sec)
+        sock, phases = timed_connect(host, port, timeout_sec, dns_cache)
         sock.close()
     except Exception:
-        return None
-    return int((time.time() - start) * 1000)
+        return None, {}
+    return int(phases[PHASE_CONNECT]), phases
+
+
+def _read_sse_stream(
+    resp, start: float
+) -> Tuple[Optional[int], Optional[float], Optional[float]]:
+    """增量解析 chat/completions 的 SSE 流
+
+    Args:
+        resp: 已建立的 HTTP 响应（逐行读取，不等待完整响应体）
+        start: 请求发出时刻（time.perf_counter）
+
+    Returns:
+        (首 token 时间 ms, 平均 token 间隔 ms, 输出 tokens/s)，未收到任何内容时均为 None
+    """
+    first_at: Optional[float] = None
+    last_at: Optional[float] = None
+    chunks = 0
+    usage_tokens: Optional[int] = None
+
+    while True:
+        line = resp.readline()
+        if not line:
+            break
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            break
+        try:
+            event = json.loads(data)
+        except ValueError:
+            continue
+        if not isinstance(event, dict):
+            continue
+        usage = event.get("usage")
+        if isinstance(usage, dict) and usage.get("completion_tokens"):
+            usage_tokens = int(usage["completion_tokens"])
+        for choice in event.get("choices") or []:
+            if not isinstance(choice, dict):
+                continue
+            delta = choice.get("delta") or {}
+            text = (
+                delta.get("content")
+                or delta.get("reasoning_content")
+                or choice.get("text")
+            )
+            if text:
+                now = time.perf_counter()
+                if first_at is None:
+                    first_at = now
+                last_at = now
+                chunks += 1
+
+    if first_at is None or last_at is None:
+        return None, None, None
+
+    ttft_ms = int((first_at - start) * 1000)
+    # 优先使用服务端统计的 token 数，否则按内容块数估算
+    tokens = usage_tokens or chunks
+    span = last_at - first_at
+    itl_ms: Optional[float] = None
+    tokens_per_sec: Optional[float] = None
+    if chunks > 1 and span > 0:
+        itl_ms = round(span * 1000 / (chunks - 1), 1)
+        if tokens > 1:
+            tokens_per_sec = round((tokens - 1) / span, 1)
+    return ttft_ms, itl_ms, tokens_per_sec
 
 
 @dataclass
@@ -82,6 +185,378 @@ class MonitorResult:
     ping_ms: Optional[int]
     checked_at: datetime
     message: str
+    breaker_state: str = BREAKER_CLOSED
+    ttft_ms: Optional[int] = None
+    itl_ms: Optional[float] = None
+    tokens_per_sec: Optional[float] = None
+    # 分阶段耗时 ms：dns / connect / tls / send / ttfb（Ping 模式只有前两项）
+    phases: Optional[Dict[str, float]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典（checked_at 为 ISO 8601 字符串）"""
+        data = asdict(self)
+        data["checked_at"] = self.checked_at.isoformat(timespec="milliseconds")
+        return data
+
+
+@dataclass
+class ChatProbe:
+    """单次对话请求的结果（不含 Ping 与熔断判断）"""
+
+    status: str
+    message: str
+    latency_ms: Optional[int] = None
+    ttft_ms: Optional[int] = None
+    itl_ms: Optional[float] = None
+    tokens_per_sec: Optional[float] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+    http_status: Optional[int] = None
+
+
+def _read_probe_body(
+    resp, start: float, stream: bool
+) -> Tuple[Optional[int], Optional[float], Optional[float]]:
+    """读取响应体；流式模式下同时返回 (TTFT, ITL, tokens/s)"""
+    if stream:
+        return _read_sse_stream(resp, start)
+    resp.read()
+    return None, None, None
+
+
+def run_chat_probe(
+    target: MonitorTarget,
+    stream: bool = False,
+    timeout_sec: float = 15,
+    dns_cache: Optional[DnsCache] = None,
+) -> ChatProbe:
+    """向目标发送一次最小对话请求并计时
+
+    监控探测与压测共用此函数；调用方需保证 base_url 与 api_key 已配置。
+    """
+    try:
+        url = _build_chat_url(target.base_url)
+        if not url:
+            raise ValueError("baseURL 无效")
+        if stream:
+            body = {
+                "model": target.model_id,
+                "messages": [{"role": "user", "content": STREAM_PROBE_PROMPT}],
+                "max_tokens": STREAM_PROBE_MAX_TOKENS,
+                "stream": True,
+            }
+        else:
+            body = {
+                "model": target.model_id,
+                "messages": [{"role": "user", "content": "hi"}],
+                "max_tokens": 1,
+            }
+        data = json.dumps(body).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {target.api_key}",
+        }
+        phases: Dict[str, float] = {}
+        start = time.perf_counter()
+        if uses_proxy(url):
+            # 经代理时无法在本地拆分阶段
+            req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+            with urllib.request.urlopen(req, timeout=timeout_sec) as resp:
+                ttft_ms, itl_ms, tokens_per_sec = _read_probe_body(resp, start, stream)
+                http_status = resp.status
+        else:
+            with timed_request(
+                url, data, headers, timeout_sec, dns_cache=dns_cache
+            ) as (resp, phases):
+                ttft_ms, itl_ms, tokens_per_sec = _read_probe_body(resp, start, stream)
+                http_status = resp.status
+        latency_ms = int((time.perf_counter() - start) * 1000)
+    except urllib.error.HTTPError as e:
+        if e.code in (401, 403):
+            message = "鉴权失败"
+        elif 300 <= e.code < 400:
+            message = f"HTTP {e.code} 重定向，请检查 baseURL"
+        else:
+            message = f"HTTP {e.code}"
+        return ChatProbe("failed", message, http_status=e.code)
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, socket.timeout):
+            return ChatProbe("error", "请求超时")
+        return ChatProbe("error", f"连接失败: {e.reason}")
+    except socket.timeout:
+        return ChatProbe("error", "请求超时")
+    except Exception as e:
+        return ChatProbe("error", str(e)[:50])
+
+    # 流式模式以首 token 时间衡量响应性，普通模式以完整往返时间衡量
+    judged_ms = ttft_ms if ttft_ms is not None else latency_ms
+    if judged_ms <= DEGRADED_THRESHOLD_MS:
+        status = "operational"
+        message = "正常"
+    else:
+        status = "degraded"
+        message = f"延迟较高 ({judged_ms}ms)"
+    if stream and ttft_ms is None:
+        message += " (未收到流式内容)"
+    return ChatProbe(
+        status,
+        message,
+        latency_ms=latency_ms,
+        ttft_ms=ttft_ms,
+        itl_ms=itl_ms,
+        tokens_per_sec=tokens_per_sec,
+        phases=phases,
+        http_status=http_status,
+    )
+
+
+def targets_from_config(opencode_config: Optional[Dict]) -> List[MonitorTarget]:
+    """从 opencode 配置解析监控目标（每个 Provider 下的每个模型一个）"""
+    targets: List[MonitorTarget] = []
+    config = opencode_config or {}
+    providers = config.get("provider", {})
+
+    for provider_key, provider_data in providers.items():
+        if not isinstance(provider_data, dict):
+            continue
+        provider_name = provider_data.get("name", provider_key)
+        options = provider_data.get("options", {})
+        base_url = _safe_base_url(
+            options.get("baseURL", "") or provider_data.get("baseURL", "")
+        )
+        api_key_raw = options.get("apiKey", "") or provider_data.get("apiKey", "")
+        api_key = _resolve_env_value(api_key_raw) if api_key_raw else ""
+
+        models = provider_data.get("models", {})
+        for model_id, model_data in models.items():
+            if not isinstance(model_data, dict):
+                continue
+            model_name = model_data.get("name", model_id)
+            target = MonitorTarget(
+                provider_key=provider_key,
+                provider_name=provider_name,
+                base_url=base_url,
+                api_key=api_key,
+                model_id=model_id,
+                model_name=model_name,
+            )
+            targets.append(target)
+    return targets
+
+
+def _target_fingerprint(target: MonitorTarget) -> Tuple[str, str, str]:
+    """影响探测结果的字段，变化后需要重新优先探测"""
+    return (target.base_url, target.api_key, target.model_id)
+
+
+@dataclass
+class _ScheduleEntry:
+    fingerprint: Tuple[str, str, str]
+    interval_ms: float
+    due_at: float = 0.0
+    failures: int = 0
+    version: int = 0
+    in_flight: bool = False
+    dirty: bool = False
+
+
+class ProbeScheduler:
+    """按目标独立排期的探测调度器（最小堆）
+
+    - 新增或配置变更的目标立即到期，按加入顺序优先探测
+    - 健康目标的间隔逐步拉长，直至 max_interval_ms
+    - 失败目标按指数退避，直至 backoff_max_ms
+    - 每次排期叠加 ±jitter_ratio 的随机抖动，让各目标相位错开
+    """
+
+    HEALTHY_STATUSES = ("operational",)
+    FAILING_STATUSES = ("failed", "error")
+
+    def __init__(
+        self,
+        base_interval_ms: float,
+        max_interval_ms: Optional[float] = None,
+        backoff_max_ms: Optional[float] = None,
+        jitter_ratio: float = MONITOR_JITTER_RATIO,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.base_interval_ms = float(base_interval_ms)
+        self.max_interval_ms = float(
+            max_interval_ms or base_interval_ms * MONITOR_MAX_INTERVAL_FACTOR
+        )
+        self.backoff_max_ms = float(
+            backoff_max_ms or base_interval_ms * MONITOR_BACKOFF_MAX_FACTOR
+        )
+        self.jitter_ratio = max(0.0, min(jitter_ratio, 1.0))
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._entries: Dict[str, _ScheduleEntry] = {}
+        # 堆元素: (到期时间, 序号, target_id, 版本)，版本不一致的元素视为已失效
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, target_id: object) -> bool:
+        return target_id in self._entries
+
+    def _push(self, target_id: str, entry: _ScheduleEntry) -> None:
+        entry.version += 1
+        self._seq += 1
+        heapq.heappush(
+            self._heap, (entry.due_at, self._seq, target_id, entry.version)
+        )
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def _compact(self) -> None:
+        """清理失效的堆元素，避免反复重排期导致堆膨胀"""
+        live: List[Tuple[float, int, str, int]] = []
+        for item in self._heap:
+            entry = self._entries.get(item[2])
+            if entry is not None and entry.version == item[3] and not entry.in_flight:
+                live.append(item)
+        heapq.heapify(live)
+        self._heap = live
+
+    def _jittered(self, interval_ms: float) -> float:
+        if not self.jitter_ratio:
+            return interval_ms
+        spread = self._rng.uniform(-self.jitter_ratio, self.jitter_ratio)
+        return interval_ms * (1.0 + spread)
+
+    def sync(self, targets: Iterable[MonitorTarget]) -> None:
+        """同步目标列表：新增/变更的目标立即到期，已删除的目标移除"""
+        seen: Set[str] = set()
+        for target in targets:
+            target_id = target.target_id
+            seen.add(target_id)
+            fingerprint = _target_fingerprint(target)
+            entry = self._entries.get(target_id)
+            if entry is not None and entry.fingerprint == fingerprint:
+                continue
+            if entry is None:
+                entry = _ScheduleEntry(
+                    fingerprint=fingerprint, interval_ms=self.base_interval_ms
+                )
+                self._entries[target_id] = entry
+            else:
+                entry.fingerprint = fingerprint
+                entry.interval_ms = self.base_interval_ms
+                entry.failures = 0
+            # 到期时间 0 早于任何单调时钟读数，保证排在所有存量目标之前
+            entry.due_at = 0.0
+            if entry.in_flight:
+                entry.dirty = True
+            else:
+                self._push(target_id, entry)
+
+        for target_id in list(self._entries):
+            if target_id not in seen:
+                del self._entries[target_id]
+
+    def pop_due(self, limit: int, now: Optional[float] = None) -> List[str]:
+        """取出最多 limit 个已到期的目标，并标记为探测中"""
+        if limit <= 0:
+            return []
+        now = self._clock() if now is None else now
+        due: List[str] = []
+        while self._heap and len(due) < limit:
+            due_at, _, target_id, version = self._heap[0]
+            entry = self._entries.get(target_id)
+            if entry is None or entry.version != version or entry.in_flight:
+                heapq.heappop(self._heap)
+                continue
+            if due_at > now:
+                break
+            heapq.heappop(self._heap)
+            entry.in_flight = True
+            due.append(target_id)
+        return due
+
+    def record(
+        self, target_id: str, status: str, now: Optional[float] = None
+    ) -> Optional[float]:
+        """记录探测结果并排期下一次探测，返回本次采用的间隔（毫秒）"""
+        entry = self._entries.get(target_id)
+        if entry is None:
+            return None
+        now = self._clock() if now is None else now
+        entry.in_flight = False
+
+        if entry.dirty:
+            # 探测期间配置发生变化，结果作废，立即重新探测
+            entry.dirty = False
+            entry.due_at = 0.0
+            self._push(target_id, entry)
+            return 0.0
+
+        if status in self.HEALTHY_STATUSES:
+            entry.failures = 0
+            if entry.interval_ms < self.base_interval_ms:
+                entry.interval_ms = self.base_interval_ms
+            else:
+                entry.interval_ms = min(
+                    entry.interval_ms * MONITOR_HEALTHY_STRETCH, self.max_interval_ms
+                )
+        elif status in self.FAILING_STATUSES:
+            entry.failures += 1
+            entry.interval_ms = min(
+                self.base_interval_ms * (2 ** min(entry.failures, 16)),
+                self.backoff_max_ms,
+            )
+        elif status == "no_config":
+            # 未配置的目标在配置变更前不会有变化，按最长间隔复查
+            entry.failures = 0
+            entry.interval_ms = self.max_interval_ms
+        else:
+            # degraded 等中间状态保持基础间隔，便于尽快观察恢复
+            entry.failures = 0
+            entry.interval_ms = self.base_interval_ms
+
+        interval = self._jittered(entry.interval_ms)
+        entry.due_at = now + interval / 1000.0
+        self._push(target_id, entry)
+        return interval
+
+    def release(self, target_id: str) -> None:
+        """探测被放弃（未产生结果）时，立即重新排期"""
+        entry = self._entries.get(target_id)
+        if entry is None or not entry.in_flight:
+            return
+        entry.in_flight = False
+        entry.dirty = False
+        entry.due_at = 0.0
+        self._push(target_id, entry)
+
+    def mark_all_due(self) -> None:
+        """手动检测：所有空闲目标立即到期（不改变已积累的间隔）"""
+        for target_id, entry in self._entries.items():
+            if entry.in_flight:
+                continue
+            entry.due_at = 0.0
+            self._push(target_id, entry)
+
+    def seconds_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """距离最近一个到期目标的秒数；没有待排期目标时返回 None"""
+        now = self._clock() if now is None else now
+        while self._heap:
+            due_at, _, target_id, version = self._heap[0]
+            entry = self._entries.get(target_id)
+            if entry is None or entry.version != version or entry.in_flight:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, due_at - now)
+        return None
+
+    def get_interval_ms(self, target_id: str) -> Optional[float]:
+        entry = self._entries.get(target_id)
+        return entry.interval_ms if entry else None
+
+    def get_failures(self, target_id: str) -> int:
+        entry = self._entries.get(target_id)
+        return entry.failures if entry else 0
 
 
 class MonitorService:
@@ -92,13 +567,28 @@ class MonitorService:
         poll_interval_ms: int = MONITOR_POLL_INTERVAL_MS,
         request_timeout_sec: int = 15,
         max_workers: int = 6,
+        max_interval_ms: Optional[int] = None,
+        backoff_max_ms: Optional[int] = None,
+        jitter_ratio: float = MONITOR_JITTER_RATIO,
     ):
         self.poll_interval_ms = poll_interval_ms
         self.request_timeout_sec = request_timeout_sec
+        self.max_workers = max_workers
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._scheduler = ProbeScheduler(
+            poll_interval_ms,
+            max_interval_ms=max_interval_ms,
+            backoff_max_ms=backoff_max_ms,
+            jitter_ratio=jitter_ratio,
+        )
 
         self._targets: List[MonitorTarget] = []
+        self._target_map: Dict[str, MonitorTarget] = {}
+        self._in_flight: Set[str] = set()
         self._history: Dict[str, Deque[MonitorResult]] = {}
+        self._breakers = CircuitBreakerRegistry()
+        # 同一轮探测内同源模型共用解析结果
+        self._dns_cache = DnsCache()
 
         self._callbacks: List[Callable[[MonitorResult], None]] = []
         self._poll_done_callbacks: List[Callable[[], None]] = []
@@ -106,7 +596,11 @@ class MonitorService:
 
         self._is_polling = False
         self._chat_test_enabled = False
+        self._stream_probe_enabled = False
+        # 列表模式：按 Provider 每轮请求一次模型列表，只对少量轮换抽样的模型发对话请求
+        self._listing: Optional[ModelListingCache] = None
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
         self._loop_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
 
@@ -125,48 +619,55 @@ class MonitorService:
     def set_chat_test_enabled(self, enabled: bool) -> None:
         self._chat_test_enabled = enabled
 
+    def set_stream_probe_enabled(self, enabled: bool) -> None:
+        """启用后对话测试改为流式请求，额外记录 TTFT / token 间隔 / tokens/s"""
+        self._stream_probe_enabled = enabled
+
+    def is_stream_probe_enabled(self) -> bool:
+        return self._stream_probe_enabled
+
+    def set_listing_mode(
+        self, enabled: bool, sample_size: int = LISTING_SAMPLE_SIZE
+    ) -> None:
+        """启用后每个 Provider 每轮只请求一次 /v1/models 判定模型是否存在，
+        对话请求只发给每轮轮换的 sample_size 个模型"""
+        if not enabled:
+            self._listing = None
+            return
+        # 列表经共享的 ModelCatalog 获取：每轮只发条件请求，结果同时供 GUI / Web 使用
+        listing = ModelListingCache(
+            ttl_sec=self.poll_interval_ms / 1000.0,
+            sample_size=sample_size,
+            fetcher=get_model_catalog().fetch_model_ids,
+        )
+        listing.set_targets(self.get_targets())
+        self._listing = listing
+
+    def is_listing_mode_enabled(self) -> bool:
+        return self._listing is not None
+
     def set_targets(self, targets: List[MonitorTarget]) -> None:
         with self._lock:
             self._targets = list(targets)
+            self._target_map = {t.target_id: t for t in self._targets}
+            self._scheduler.sync(self._targets)
+            if self._listing is not None:
+                self._listing.set_targets(self._targets)
             for target in targets:
                 if target.target_id not in self._history:
                     self._history[target.target_id] = deque(
                         maxlen=MONITOR_HISTORY_LIMIT
                     )
+        self._wake_event.set()
+
+    def get_targets(self) -> List[MonitorTarget]:
+        with self._lock:
+            return list(self._targets)
 
     def load_targets_from_config(
         self, opencode_config: Optional[Dict]
     ) -> List[MonitorTarget]:
-        targets: List[MonitorTarget] = []
-        config = opencode_config or {}
-        providers = config.get("provider", {})
-
-        for provider_key, provider_data in providers.items():
-            if not isinstance(provider_data, dict):
-                continue
-            provider_name = provider_data.get("name", provider_key)
-            options = provider_data.get("options", {})
-            base_url = _safe_base_url(
-                options.get("baseURL", "") or provider_data.get("baseURL", "")
-            )
-            api_key_raw = options.get("apiKey", "") or provider_data.get("apiKey", "")
-            api_key = _resolve_env_value(api_key_raw) if api_key_raw else ""
-
-            models = provider_data.get("models", {})
-            for model_id, model_data in models.items():
-                if not isinstance(model_data, dict):
-                    continue
-                model_name = model_data.get("name", model_id)
-                target = MonitorTarget(
-                    provider_key=provider_key,
-                    provider_name=provider_name,
-                    base_url=base_url,
-                    api_key=api_key,
-                    model_id=model_id,
-                    model_name=model_name,
-                )
-                targets.append(target)
-
+        targets = targets_from_config(opencode_config)
         self.set_targets(targets)
         return targets
 
@@ -179,23 +680,102 @@ class MonitorService:
 
     def stop_polling(self) -> None:
         self._stop_event.set()
+        self._wake_event.set()
         if self._loop_thread and self._loop_thread.is_alive():
             self._loop_thread.join(timeout=1.0)
 
+    def shutdown(self) -> None:
+        """停止调度并关闭工作线程池（服务不可再次启动）"""
+        self.stop_polling()
+        self._executor.shutdown(wait=False)
+
+    def is_idle(self) -> bool:
+        """当前没有正在进行的探测"""
+        with self._lock:
+            return not self._in_flight
+
+    def check_now(self) -> None:
+        """手动检测：让所有空闲目标立即到期，由调度循环按并发上限派发"""
+        self._dns_cache.clear()
+        if self._listing is not None:
+            self._listing.invalidate()
+        with self._lock:
+            self._scheduler.mark_all_due()
+        self._wake_event.set()
+
     def _poll_loop(self) -> None:
         while not self._stop_event.is_set():
+            wait_sec: Optional[float] = None
             try:
-                self._do_poll()
+                wait_sec = self._dispatch_due()
             except Exception as e:
                 self._notify_error(str(e))
-            self._stop_event.wait(self.poll_interval_ms / 1000.0)
+            if wait_sec is None or wait_sec > MONITOR_LOOP_MAX_WAIT_SEC:
+                wait_sec = MONITOR_LOOP_MAX_WAIT_SEC
+            if wait_sec > 0:
+                self._wake_event.wait(wait_sec)
+            self._wake_event.clear()
+
+    def _dispatch_due(self) -> Optional[float]:
+        """派发已到期的目标，返回距离下一次需要派发的秒数"""
+        with self._lock:
+            free = self.max_workers - len(self._in_flight)
+            if free <= 0:
+                # 工作线程已满，等待探测完成时的唤醒
+                return None
+            batch = []
+            for target_id in self._scheduler.pop_due(free):
+                target = self._target_map.get(target_id)
+                if target is None:
+                    self._scheduler.release(target_id)
+                    continue
+                self._in_flight.add(target_id)
+                batch.append(target)
+
+        for target in batch:
+            try:
+                future = self._executor.submit(self.check_target, target)
+            except RuntimeError:
+                # 执行器已关闭
+                with self._lock:
+                    self._in_flight.discard(target.target_id)
+                    self._scheduler.release(target.target_id)
+                return None
+            future.add_done_callback(partial(self._on_probe_done, target))
+
+        with self._lock:
+            if len(self._in_flight) >= self.max_workers:
+                return None
+            return self._scheduler.seconds_until_next()
+
+    def _on_probe_done(self, target: MonitorTarget, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            result = MonitorResult(
+                target_id=target.target_id,
+                status="error",
+                latency_ms=None,
+                ping_ms=None,
+                checked_at=datetime.now(),
+                message=str(e)[:50],
+            )
+        self._record_result(result)
+        with self._lock:
+            self._in_flight.discard(target.target_id)
+            drained = not self._in_flight
+        self._wake_event.set()
+        if drained:
+            self._notify_poll_done()
 
     def _do_poll(self) -> None:
+        """同步执行一轮全量探测（不经过调度器排期）"""
         with self._lock:
             if self._is_polling:
                 return
             targets = list(self._targets)
             self._is_polling = True
+        self._dns_cache.clear()
 
         try:
             if not targets:
@@ -252,9 +832,35 @@ class MonitorService:
         checked_at = datetime.now()
         origin = _extract_origin(target.base_url)
 
-        ping_ms = _measure_ping(origin) if origin else None
+        if self._chat_test_enabled and target.base_url and target.api_key:
+            breaker = self._breakers.get(
+                CircuitBreakerRegistry.key_for(origin, target.api_key)
+            )
+            if not breaker.allow_request():
+                # 熔断中：不发起任何网络请求（包括 Ping），立即释放工作线程
+                reason = breaker.last_reason or "连续失败"
+                return MonitorResult(
+                    target_id=target.target_id,
+                    status="failed" if reason == "鉴权失败" else "error",
+                    latency_ms=None,
+                    ping_ms=None,
+                    checked_at=checked_at,
+                    message=f"已熔断: {reason} ({int(breaker.retry_after())}s 后重试)",
+                    breaker_state=BREAKER_OPEN,
+                )
+        else:
+            breaker = None
+
+        ping_ms, phases = _measure_ping(origin, dns_cache=self._dns_cache)
+
+        listing_outcome: Optional[Tuple[str, str]] = None
+        if breaker is not None:
+            listing_outcome = self._listing_outcome(target)
 
         latency_ms: Optional[int] = None
+        ttft_ms: Optional[int] = None
+        itl_ms: Optional[float] = None
+        tokens_per_sec: Optional[float] = None
         status = "no_config"
         message = ""
 
@@ -274,46 +880,33 @@ class MonitorService:
             message = "未配置 baseURL"
         elif not target.api_key:
             message = "未配置 apiKey"
+        elif listing_outcome is not None:
+            status, message = listing_outcome
         else:
-            try:
-                url = _build_chat_url(target.base_url)
-                if not url:
-                    raise ValueError("baseURL 无效")
-                payload = json.dumps(
-                    {
-                        "model": target.model_id,
-                        "messages": [{"role": "user", "content": "hi"}],
-                        "max_tokens": 1,
-                    }
-                ).encode("utf-8")
-                req = urllib.request.Request(
-                    url,
-                    data=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {target.api_key}",
-                    },
-                    method="POST",
+            probe = run_chat_probe(
+                target,
+                stream=self._stream_probe_enabled,
+                timeout_sec=self.request_timeout_sec,
+                dns_cache=self._dns_cache,
+            )
+            status = probe.status
+            message = probe.message
+            latency_ms = probe.latency_ms
+            ttft_ms = probe.ttft_ms
+            itl_ms = probe.itl_ms
+            tokens_per_sec = probe.tokens_per_sec
+            if probe.phases:
+                # 本次探测的解析已在 Ping 时完成，对话请求命中缓存
+                request_phases = dict(probe.phases)
+                request_phases[PHASE_DNS] = phases.get(
+                    PHASE_DNS, request_phases[PHASE_DNS]
                 )
-                start = time.time()
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    resp.read()
-                latency_ms = int((time.time() - start) * 1000)
-                if latency_ms <= DEGRADED_THRESHOLD_MS:
-                    status = "operational"
-                    message = "正常"
-                else:
-                    status = "degraded"
-                    message = f"延迟较高 ({latency_ms}ms)"
-            except urllib.error.HTTPError as e:
-                status = "failed"
-                message = "鉴权失败" if e.code in (401, 403) else f"HTTP {e.code}"
-            except urllib.error.URLError as e:
-                status = "error"
-                message = f"连接失败: {e.reason}"
-            except Exception as e:
-                status = "error"
-                message = str(e)[:50]
+                phases = request_phases
+
+        breaker_state = BREAKER_CLOSED
+        if breaker is not None:
+            self._update_breaker(breaker, status, message)
+            breaker_state = breaker.state
 
         return MonitorResult(
             target_id=target.target_id,
@@ -322,9 +915,51 @@ class MonitorService:
             ping_ms=ping_ms,
             checked_at=checked_at,
             message=message,
+            breaker_state=breaker_state,
+            ttft_ms=ttft_ms,
+            itl_ms=itl_ms,
+            tokens_per_sec=tokens_per_sec,
+            phases=phases or None,
         )
 
+    def _listing_outcome(self, target: MonitorTarget) -> Optional[Tuple[str, str]]:
+        """列表模式下无需对话请求即可得出的 (状态, 说明)；需要真实探测时返回 None"""
+        listing_cache = self._listing
+        if listing_cache is None:
+            return None
+        listing = listing_cache.listing_for(target.provider_key)
+        if listing is None or listing.error:
+            # 不支持模型列表的中转站退回逐个对话探测
+            return None
+        if target.model_id not in listing.model_ids:
+            return "failed", "模型列表中不存在"
+        if target.model_id in listing_cache.sample_for(target.provider_key):
+            return None
+        return "operational", f"模型列表中存在 (列表 {listing.latency_ms}ms，本轮未抽样)"
+
+    @staticmethod
+    def _update_breaker(breaker: CircuitBreaker, status: str, message: str) -> None:
+        """只把源站/凭证层面的故障计入熔断器，单个模型的 4xx 不影响同源其他模型"""
+        if status in ("operational", "degraded"):
+            breaker.record_success()
+        elif message == "鉴权失败":
+            breaker.record_failure(message, trip=True)
+        elif status == "error" or message == "HTTP 429" or message.startswith("HTTP 5"):
+            breaker.record_failure(message)
+        else:
+            # 源站已正常响应（如 400/404 模型不存在），说明源站与凭证可用
+            breaker.record_success()
+
+    def get_breaker_states(self) -> Dict[str, str]:
+        """返回各 (源站, API Key 摘要) 熔断器的当前状态"""
+        return self._breakers.states()
+
+    def reset_breakers(self) -> None:
+        self._breakers.reset_all()
+
     def _record_result(self, result: MonitorResult) -> None:
+        with self._lock:
+            self._scheduler.record(result.target_id, result.status)
         history = self._history.get(result.target_id)
         if history is None:
             history = deque(maxlen=MONITOR_HISTORY_LIMIT)
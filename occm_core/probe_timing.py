@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# 探测请求的耗时阶段（按发生顺序）
+PHASE_DNS = "dns"
+PHASE_CONNECT = "connect"
+PHASE_TLS = "tls"
+PHASE_SEND = "send"
+PHASE_TTFB = "ttfb"
+PHASES = (PHASE_DNS, PHASE_CONNECT, PHASE_TLS, PHASE_SEND, PHASE_TTFB)
+
+DNS_CACHE_TTL_SEC = 30.0
+
+_AddrInfo = Tuple[int, int, int, str, tuple]
+
+_ssl_context: Optional[ssl.SSLContext] = None
+_ssl_context_lock = threading.Lock()
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _default_ssl_context() -> ssl.SSLContext:
+    # 加载系统证书较慢，所有探测共用一个上下文
+    global _ssl_context
+    with _ssl_context_lock:
+        if _ssl_context is None:
+            _ssl_context = ssl.create_default_context()
+        return _ssl_context
+
+
+class DnsCache:
+    """按 (host, port) 缓存解析结果
+
+    同一轮探测中同源的多个模型只解析一次；命中缓存时 DNS 阶段记为 0，
+    因此结果中的 DNS 耗时反映的是本次探测实际付出的解析时间。
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float = DNS_CACHE_TTL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_sec = ttl_sec
+        self._clock = clock
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[_AddrInfo]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> Tuple[List[_AddrInfo], float]:
+        """返回 (地址列表, 解析耗时 ms)；解析失败时抛出 socket.gaierror"""
+        key = (host, port)
+        now = self._clock()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and now - cached[0] < self.ttl_sec:
+                return cached[1], 0.0
+        start = time.perf_counter()
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        elapsed = _elapsed_ms(start)
+        with self._lock:
+            self._entries[key] = (self._clock(), infos)
+        return infos, elapsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _split_host_port(url: str) -> Tuple[str, str, int]:
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    return parsed.scheme, host, port
+
+
+def timed_connect(
+    host: str,
+    port: int,
+    timeout: float,
+    dns_cache: Optional[DnsCache] = None,
+) -> Tuple[socket.socket, Dict[str, float]]:
+    """解析并建立 TCP 连接，返回 (socket, {dns, connect})
+
+    与 socket.create_connection 相同，依次尝试各个地址直到成功。
+    """
+    if dns_cache is not None:
+        infos, dns_ms = dns_cache.resolve(host, port)
+    else:
+        start = time.perf_counter()
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        dns_ms = _elapsed_ms(start)
+
+    last_error: Optional[OSError] = None
+    start = time.perf_counter()
+    for family, socktype, proto, _, sockaddr in infos:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(sockaddr)
+        except OSError as e:
+            sock.close()
+            last_error = e
+            continue
+        return sock, {PHASE_DNS: dns_ms, PHASE_CONNECT: _elapsed_ms(start)}
+    raise last_error or OSError(f"无法解析主机: {host}")
+
+
+def uses_proxy(url: str) -> bool:
+    """请求是否会经由环境变量配置的代理（此时无法在本地拆分各阶段）"""
+    scheme, host, _ = _split_host_port(url)
+    proxies = urllib.request.getproxies()
+    if scheme not in proxies:
+        return False
+    return not urllib.request.proxy_bypass(host)
+
+
+@contextmanager
+def timed_request(
+    url: str,
+    data: bytes,
+    headers: Dict[str, str],
+    timeout: float,
+    dns_cache: Optional[DnsCache] = None,
+    method: str = "POST",
+) -> Iterator[Tuple[http.client.HTTPResponse, Dict[str, float]]]:
+    """发送请求并记录各阶段耗时，产出 (响应, 阶段耗时 ms)
+
+    响应只读取到状态行与响应头为止，响应体由调用方按需读取（流式探测
+    可以逐行读取）。错误与 urllib 保持一致：连接阶段的 OSError 包装为
+    URLError，HTTP 4xx/5xx 抛出 HTTPError，便于调用方共用异常处理。
+    不跟随重定向：3xx 同样抛出 HTTPError（探测请求是 POST，重定向通常
+    说明 baseURL 配置有误，不能当作成功响应）。
+    """
+    scheme, host, port = _split_host_port(url)
+    if scheme not in ("http", "https") or not host:
+        raise ValueError("baseURL 无效")
+
+    try:
+        sock, phases = timed_connect(host, port, timeout, dns_cache)
+    except OSError as e:
+        raise urllib.error.URLError(e)
+
+    conn: http.client.HTTPConnection
+    try:
+        if scheme == "https":
+            context = _default_ssl_context()
+            start = time.perf_counter()
+            try:
+                sock = context.wrap_socket(sock, server_hostname=host)
+            except OSError as e:
+                raise urllib.error.URLError(e)
+            phases[PHASE_TLS] = _elapsed_ms(start)
+            conn = http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=context
+            )
+        else:
+            phases[PHASE_TLS] = 0.0
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        # 已建立的连接直接交给 http.client，不再触发其内部的 connect()
+        conn.sock = sock
+
+        parsed = urlparse(url)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        start = time.perf_counter()
+        conn.request(method, path, body=data, headers=headers)
+        phases[PHASE_SEND] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        resp = conn.getresponse()
+        phases[PHASE_TTFB] = _elapsed_ms(start)
+    except BaseException:
+        sock.close()
+        raise
+
+    try:
+        if resp.status >= 300:
+            raise urllib.error.HTTPError(
+                url, resp.status, resp.reason, resp.headers, None
+            )
+        yield resp, phases
+    finally:
+        resp.close()
+        conn.close()
@@ -33,6 +33,11 @@ if not _is_mp_child:
         action="store_true",
         help="启动时不自动打开浏览器",
     )
+    _parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="启动后台监控并在 /metrics 暴露 OpenMetrics 指标",
+    )
     _args = _parser.parse_args()
     os.environ["_OCCM_MP_CHILD"] = "1"
     os.environ["_OCCM_HOST"] = _args.host
@@ -40,6 +45,7 @@ if not _is_mp_child:
     os.environ["_OCCM_NO_AUTH"] = "1" if _args.no_auth else ""
     os.environ["_OCCM_DEBUG"] = "1" if _args.debug else ""
     os.environ["_OCCM_NO_BROWSER"] = "1" if _args.no_browser else ""
+    os.environ["_OCCM_METRICS"] = "1" if _args.metrics else ""
     # --config-dir > 环境变量 OPENCODE_CONFIG_DIR > 默认
     _cfg_dir = _args.config_dir or os.environ.get("OPENCODE_CONFIG_DIR", "")
     os.environ["_OCCM_CONFIG_DIR"] = _cfg_dir
@@ -50,6 +56,7 @@ _port = int(os.environ.get("_OCCM_PORT", "8080"))
 _no_auth = bool(os.environ.get("_OCCM_NO_AUTH"))
 _debug = bool(os.environ.get("_OCCM_DEBUG"))
 _no_browser = bool(os.environ.get("_OCCM_NO_BROWSER"))
+_metrics = bool(os.environ.get("_OCCM_METRICS"))
 _cfg_dir = os.environ.get("_OCCM_CONFIG_DIR", "")
 
 # 应用自定义配置路径
@@ -62,7 +69,7 @@ if _cfg_dir:
     ConfigPaths.set_ohmyopencode_config(p / "oh-my-opencode.json")
     ConfigPaths.set_backup_dir(p / "backups")
 
-auth_manager = configure_app(no_auth=_no_auth, debug=_debug)
+auth_manager = configure_app(no_auth=_no_auth, debug=_debug, metrics=_metrics)
 
 if not _is_mp_child and auth_manager is not None:
     generated_password = auth_manager.ensure_admin_password()
@@ -75,6 +82,8 @@ if not _is_mp_child:
 
     print(f"[OCCM Web] 配置目录: {_CP.get_config_base_dir()}")
     print(f"[OCCM Web] 访问地址: http://{_host}:{_port}")
+    if _metrics:
+        print(f"[OCCM Web] 监控指标: http://{_host}:{_port}/metrics")
 
 # 自动打开浏览器
 if not _is_mp_child and not _no_browser:
@@ -10,6 +10,7 @@ from nicegui import app
 from starlette.responses import JSONResponse
 
 from .auth import AuthManager, register_auth_api, register_login_pages
+from .monitor_hub import register_metrics_api, register_monitor_lifecycle
 from .pages import register_all_pages
 
 
@@ -33,9 +34,15 @@ def _register_exception_handler(debug: bool) -> None:
         return JSONResponse({"ok": False, "error": str(exc)}, status_code=500)
 
 
-def configure_app(no_auth: bool = False, debug: bool = False) -> AuthManager | None:
+def configure_app(
+    no_auth: bool = False, debug: bool = False, metrics: bool = False
+) -> AuthManager | None:
     _register_middlewares()
     _register_exception_handler(debug=debug)
+    register_monitor_lifecycle()
+    if metrics:
+        # /metrics 供 Prometheus 抓取，不走页面登录鉴权（可用 OCCM_METRICS_TOKEN 保护）
+        register_metrics_api()
 
     auth_manager: AuthManager | None = None
     if not no_auth:
@@ -0,0 +1,167 @@
+"""应用级监控服务 - 整个 Web 进程共享一个 MonitorService"""
+
+from __future__ import annotations
+
+# pyright: reportMissingImports=false
+
+import hmac
+import os
+import threading
+
+from fastapi import Request
+from nicegui import app
+from starlette.responses import PlainTextResponse, Response
+
+from occm_core import (
+    OPENMETRICS_CONTENT_TYPE,
+    ConfigManager,
+    ConfigPaths,
+    MonitorFeed,
+    MonitorMetrics,
+    MonitorService,
+    MonitorTarget,
+)
+from occm_core.monitor_history import MonitorHistoryStore
+
+
+APP_MONITOR_POLL_INTERVAL_MS = 10000
+# 设置后 /metrics 需要携带 Authorization: Bearer <token>
+METRICS_TOKEN_ENV = "OCCM_METRICS_TOKEN"
+
+
+class AppMonitor:
+    """进程内唯一的监控实例
+
+    - 所有页面共享同一个 MonitorService，每个目标只探测一次，与打开的标签页数量无关
+    - 页面通过 acquire()/release() 引用计数控制调度：有持有者或被 /metrics 固定时运行
+    - 页面通过 feed.subscribe() 获取各自的增量结果缓冲区
+    """
+
+    def __init__(self, poll_interval_ms: int = APP_MONITOR_POLL_INTERVAL_MS) -> None:
+        self.service = MonitorService(poll_interval_ms=poll_interval_ms)
+        self.service.set_chat_test_enabled(True)
+        self.metrics = MonitorMetrics()
+        self.service.add_result_callback(self.metrics.observe)
+        # 持久化结果并维护可用率汇总，供 SLA 报表使用（页面关闭后数据仍保留）；
+        # 目录已被监控守护进程占用时只读取其报表，不再重复写入
+        self.history = MonitorHistoryStore(ConfigPaths.get_monitor_history_dir())
+        if self.history.acquire_writer():
+            self.service.add_result_callback(self.history.append)
+        self.feed = MonitorFeed(self.service)
+        self._lock = threading.Lock()
+        self._holders = 0
+        self._pinned = False
+        self._running = False
+        self._closed = False
+        self._targets: list[MonitorTarget] = []
+        self._targets_version = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def holders(self) -> int:
+        return self._holders
+
+    @property
+    def targets(self) -> list[MonitorTarget]:
+        return list(self._targets)
+
+    @property
+    def targets_version(self) -> int:
+        """目标列表版本号，页面据此判断是否需要整表重建"""
+        return self._targets_version
+
+    def reload_targets(self) -> list[MonitorTarget]:
+        """从当前 opencode.json 重新加载监控目标（对所有页面生效）"""
+        config = ConfigManager.load_json(ConfigPaths.get_opencode_config()) or {}
+        if not isinstance(config, dict):
+            config = {}
+        targets = self.service.load_targets_from_config(config)
+        self.metrics.set_targets(targets)
+        with self._lock:
+            self._targets = targets
+            self._targets_version += 1
+        return list(targets)
+
+    def ensure_targets(self) -> list[MonitorTarget]:
+        if not self._targets_version:
+            return self.reload_targets()
+        return self.targets
+
+    def _sync_running(self) -> None:
+        should_run = (self._holders > 0 or self._pinned) and not self._closed
+        if should_run and not self._running:
+            self.service.start_polling()
+            self._running = True
+        elif not should_run and self._running:
+            self.service.stop_polling()
+            self._running = False
+
+    def acquire(self) -> None:
+        """页面请求开始监控（引用计数 +1）"""
+        self.ensure_targets()
+        with self._lock:
+            self._holders += 1
+            self._sync_running()
+
+    def release(self) -> None:
+        """页面停止监控或断开连接（引用计数 -1）"""
+        with self._lock:
+            self._holders = max(0, self._holders - 1)
+            self._sync_running()
+
+    def pin(self) -> None:
+        """不依赖页面持续运行（用于 /metrics 导出）"""
+        self.ensure_targets()
+        with self._lock:
+            self._pinned = True
+            self._sync_running()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._running = False
+            self.service.shutdown()
+        self.history.close()
+
+
+_app_monitor: AppMonitor | None = None
+_app_monitor_lock = threading.Lock()
+
+
+def get_app_monitor() -> AppMonitor:
+    global _app_monitor
+    with _app_monitor_lock:
+        if _app_monitor is None:
+            _app_monitor = AppMonitor()
+        return _app_monitor
+
+
+def _shutdown_app_monitor() -> None:
+    with _app_monitor_lock:
+        monitor = _app_monitor
+    if monitor is not None:
+        monitor.shutdown()
+
+
+def register_metrics_api() -> None:
+    """注册 /metrics（OpenMetrics 格式），并在应用启动时开始监控"""
+
+    @app.get("/metrics")
+    async def metrics(request: Request) -> Response:
+        token = os.environ.get(METRICS_TOKEN_ENV, "")
+        if token:
+            supplied = request.headers.get("authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {token}"):
+                return PlainTextResponse("unauthorized", status_code=401)
+        body = get_app_monitor().metrics.render()
+        return Response(content=body, media_type=OPENMETRICS_CONTENT_TYPE)
+
+    app.on_startup(lambda: get_app_monitor().pin())
+
+
+def register_monitor_lifecycle() -> None:
+    """应用关闭时停止调度并释放工作线程（页面不再各自创建服务，无需逐个清理）"""
+    app.on_shutdown(_shutdown_app_monitor)
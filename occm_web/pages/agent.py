@@ -15,6 +15,7 @@ _occm_core = importlib.import_module("occm_core")
 ConfigPaths = _occm_core.ConfigPaths
 ConfigManager = _occm_core.ConfigManager
 BackupManager = _occm_core.BackupManager
+get_model_registry = _occm_core.get_model_registry
 
 
 def _load_oc() -> dict:
@@ -271,33 +272,19 @@ def register_page(auth: WebAuth | None):
         if not isinstance(agents, dict):
             agents = {}
 
-        # 从 opencode.json 读取 provider 和 model 列表供下拉选择
-        oc_cfg = _load_oc()
-        _providers_map = oc_cfg.get("provider", {})
-        if not isinstance(_providers_map, dict):
-            _providers_map = {}
+        # 从 opencode.json 读取 provider 和 model 列表供下拉选择（共享注册表按差量更新）
+        registry = get_model_registry(_load_oc())
 
         def _provider_options() -> list[str]:
-            return sorted(_providers_map.keys())
+            return sorted(registry.provider_models.keys())
 
         def _model_options(provider_key: str) -> list[str]:
-            pdata = _providers_map.get(provider_key, {})
-            if not isinstance(pdata, dict):
-                return []
-            models = pdata.get("models", {})
-            if not isinstance(models, dict):
-                return []
-            return sorted(models.keys())
+            return sorted(registry.models_for_provider(provider_key))
 
         def _all_model_options() -> list[str]:
             result: list[str] = []
-            for pkey, pdata in _providers_map.items():
-                if not isinstance(pdata, dict):
-                    continue
-                models = pdata.get("models", {})
-                if not isinstance(models, dict):
-                    continue
-                result.extend(sorted(models.keys()))
+            for pkey in registry.provider_models:
+                result.extend(sorted(registry.models_for_provider(pkey)))
             return result
 
         def content():
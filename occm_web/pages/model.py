@@ -7,13 +7,21 @@ from __future__ import annotations
 import json
 
 from fastapi import Request
-from nicegui import ui
+from nicegui import run, ui
 
 from ..auth import AuthManager as WebAuth, require_auth
 from ..i18n_web import tr
 from ..layout import render_layout
 
 from occm_core import ConfigPaths, ConfigManager, BackupManager
+from occm_core.model_catalog import get_model_catalog
+from occm_core.model_index import get_model_index
+from occm_core.native_providers import _resolve_env_value, _safe_base_url
+from occm_core.model_refs import (
+    SOURCE_OHMYOPENCODE,
+    config_files_version,
+    get_model_ref_index,
+)
 
 
 def _load_config() -> dict:
@@ -33,6 +41,10 @@ def register_page(auth: WebAuth | None):
     @dec
     async def model_page(request: Request):
         config = _load_config()
+        omo = ConfigManager.load_json(ConfigPaths.get_ohmyopencode_config()) or {}
+        # 以配置文件状态为版本号，文件未变时复用已构建的引用索引
+        ref_index = get_model_ref_index(config, omo, config_files_version())
+        usage_counts = ref_index.usage_counts()
 
         def content():
             # 中文：当前选中的行（单选）
@@ -68,6 +80,7 @@ def register_page(auth: WebAuth | None):
                                 "output": limit.get("output", ""),
                                 "has_options": "✓" if mval.get("options") else "",
                                 "has_variants": "✓" if mval.get("variants") else "",
+                                "usages": usage_counts.get(f"{pkey}/{mkey}", 0),
                             }
                         )
                 rows.sort(
@@ -95,8 +108,27 @@ def register_page(auth: WebAuth | None):
                 {"name": "output", "label": "Output", "field": "output"},
                 {"name": "has_options", "label": "Options", "field": "has_options"},
                 {"name": "has_variants", "label": "Variants", "field": "has_variants"},
+                {
+                    "name": "usages",
+                    "label": tr("model.usages"),
+                    "field": "usages",
+                    "sortable": True,
+                },
             ]
 
+            unused_providers = ref_index.unused_providers()
+            unused_models = ref_index.unused_models()
+            if unused_providers or unused_models:
+                ui.label(
+                    tr(
+                        "model.unused_summary",
+                        provider_count=len(unused_providers),
+                        model_count=len(unused_models),
+                    )
+                ).classes("text-sm opacity-70").tooltip(
+                    ", ".join(unused_providers + unused_models)
+                )
+
             # 中文：表格开启单选能力，点击行后可用于编辑/删除
             table = ui.table(
                 columns=columns,
@@ -116,6 +148,9 @@ def register_page(auth: WebAuth | None):
                 ui.button(
                     tr("common.delete"), on_click=lambda: delete_selected()
                 ).props("outline color=negative icon=delete")
+                ui.button(
+                    tr("model.find_usages"), on_click=lambda: show_usages()
+                ).props("outline icon=search")
                 ui.button(
                     tr("common.refresh"), on_click=lambda: ui.navigate.to("/model")
                 ).props("outline icon=refresh")
@@ -196,8 +231,58 @@ def register_page(auth: WebAuth | None):
                         value=provider_options[0] if provider_options else "",
                     ).classes("w-full")
                     d_model_id = ui.input(
-                        label="Model ID", placeholder="claude-sonnet-4-5-20250929"
+                        label="Model ID",
+                        placeholder="claude-sonnet-4-5-20250929",
+                        on_change=lambda e: apply_known_limits(e.value),
                     ).classes("w-full")
+                    with ui.row().classes("w-full items-center gap-2 no-wrap"):
+                        d_available = ui.select(
+                            label=tr("web.available_models"),
+                            options=[],
+                            with_input=True,
+                            on_change=lambda e: d_model_id.set_value(e.value or ""),
+                        ).classes("flex-grow")
+                        ui.button(
+                            tr("provider.fetch_models"),
+                            icon="cloud_download",
+                            on_click=lambda: fetch_models(),
+                        ).props("outline")
+
+                    async def fetch_models() -> None:
+                        provider_cfg = _providers_map().get(str(d_provider.value or ""))
+                        options = (
+                            provider_cfg.get("options", {})
+                            if isinstance(provider_cfg, dict)
+                            else {}
+                        )
+                        if not isinstance(options, dict):
+                            options = {}
+                        # 与监控 / 批量刷新相同的规范化，保证共享缓存的键一致
+                        base_url = _safe_base_url(str(options.get("baseURL") or ""))
+                        api_key_raw = str(options.get("apiKey") or "")
+                        api_key = (
+                            _resolve_env_value(api_key_raw) if api_key_raw else ""
+                        )
+                        if not base_url:
+                            ui.notify(tr("provider.no_base_url"), type="warning")
+                            return
+                        # 与 GUI / 监控共用模型列表缓存：有缓存时立即返回，过期的在后台刷新
+                        entry = await run.io_bound(
+                            get_model_catalog().get, base_url, api_key
+                        )
+                        if not entry.model_ids:
+                            ui.notify(
+                                tr("provider.fetch_failed", error=entry.error)
+                                if entry.error
+                                else tr("provider.no_models_found"),
+                                type="warning",
+                            )
+                            return
+                        existing = provider_cfg.get("models", {}) or {}
+                        d_available.set_options(
+                            [m for m in entry.model_ids if m not in existing]
+                        )
+
                     d_context = ui.number(label="Context Window", value=0).classes(
                         "w-full"
                     )
@@ -215,6 +300,28 @@ def register_page(auth: WebAuth | None):
                         label="Budget Tokens", value=16000
                     ).classes("w-full")
 
+                    def apply_known_limits(model_id: str | None) -> None:
+                        # 中文：预设中已知的模型，自动填入未填写的上下文 / 输出上限与思考配置
+                        mid = str(model_id or "").strip()
+                        model_index = get_model_index()
+                        spec = model_index.get(mid)
+                        if spec is None:
+                            return
+                        if not d_context.value and spec.context:
+                            d_context.set_value(spec.context)
+                        if not d_output.value and spec.output:
+                            d_output.set_value(spec.output)
+                        preset = model_index.preset_config(mid) or {}
+                        options = preset.get("options", {})
+                        thinking = (
+                            options.get("thinking") if isinstance(options, dict) else None
+                        )
+                        if isinstance(thinking, dict) and not d_thinking_type.value:
+                            if thinking.get("type") in ("enabled", "disabled"):
+                                d_thinking_type.set_value(thinking["type"])
+                            if isinstance(thinking.get("budgetTokens"), int):
+                                d_thinking_budget.set_value(thinking["budgetTokens"])
+
                     def do_add() -> None:
                         pkey = str(d_provider.value or "").strip()
                         mid = str(d_model_id.value or "").strip()
@@ -475,6 +582,47 @@ def register_page(auth: WebAuth | None):
 
                 del_dlg.open()
 
+            def show_usages() -> None:
+                selected = _get_selected(require=True)
+                if not selected:
+                    return
+                model_ref = f"{selected.get('provider')}/{selected.get('model')}"
+                usages = ref_index.usages(model_ref)
+                if not usages:
+                    ui.notify(tr("model.usages_none", name=model_ref), type="info")
+                    return
+
+                with ui.dialog() as ref_dlg, ui.card().classes("w-[560px] max-w-full"):
+                    ui.label(
+                        tr("model.usages_title", name=model_ref, count=len(usages))
+                    ).classes("text-lg font-bold")
+                    ui.table(
+                        columns=[
+                            {"name": "source", "label": "Config", "field": "source"},
+                            {"name": "owner", "label": "Owner", "field": "owner"},
+                            {"name": "path", "label": "Path", "field": "path"},
+                        ],
+                        rows=[
+                            {
+                                "source": (
+                                    "oh-my-opencode"
+                                    if site.source == SOURCE_OHMYOPENCODE
+                                    else "opencode"
+                                ),
+                                "owner": site.owner,
+                                "path": site.path,
+                            }
+                            for site in usages
+                        ],
+                        row_key="path",
+                    ).classes("w-full")
+                    with ui.row().classes("w-full justify-end mt-2"):
+                        ui.button(tr("common.close"), on_click=ref_dlg.close).props(
+                            "flat"
+                        )
+
+                ref_dlg.open()
+
             def on_select(_: dict) -> None:
                 selected = table.selected or []
                 selected_row["value"] = (
@@ -4,22 +4,21 @@ from __future__ import annotations
 
 # pyright: reportMissingImports=false
 
+import json
+from datetime import datetime, timedelta
 from typing import Any
 
 from fastapi import Request
-from nicegui import ui
+from nicegui import context, run, ui
 
-from occm_core import (
-    ConfigManager,
-    ConfigPaths,
-    MonitorResult,
-    MonitorService,
-    MonitorTarget,
-)
+from occm_core import MonitorResult, MonitorTarget
+from occm_core.monitor_history import SlaReport
+from occm_core.probe_timing import PHASES
 
 from ..auth import AuthManager as WebAuth, require_auth
 from ..i18n_web import tr
 from ..layout import render_layout
+from ..monitor_hub import get_app_monitor
 
 
 def _status_text(status: str) -> str:
@@ -33,6 +32,75 @@ def _status_text(status: str) -> str:
     return mapping.get(status, status)
 
 
+# 增量推送节奏：每帧最多下发 MAX_UPDATES_PER_FRAME 行，其余留到下一帧
+FRAME_INTERVAL_SEC = 0.25
+MAX_UPDATES_PER_FRAME = 50
+
+
+# 分阶段耗时堆叠条：宽度按本行总耗时的占比，颜色见 style.css 中的 .occm-phase-*
+PHASE_BAR_SLOT = r"""
+<q-td :props="props">
+  <div v-if="props.row.phases.length" class="occm-phase-cell">
+    <div class="occm-phase-bar">
+      <div v-for="seg in props.row.phases" :key="seg.name"
+           :class="'occm-phase occm-phase-' + seg.name"
+           :style="{ width: seg.pct + '%' }"
+           :title="seg.name + ': ' + seg.ms + ' ms'"></div>
+    </div>
+    <span class="occm-phase-total">{{ props.row.phase_total }} ms</span>
+  </div>
+  <span v-else>-</span>
+</q-td>
+"""
+
+
+def _cell(value: Any) -> Any:
+    return "-" if value is None else value
+
+
+def _phase_segments(
+    phases: dict[str, float] | None,
+) -> tuple[list[dict[str, Any]], float]:
+    """把阶段耗时转换为堆叠条片段，返回 (片段列表, 总耗时 ms)"""
+    if not phases:
+        return [], 0.0
+    total = sum(phases.get(name, 0.0) for name in PHASES)
+    segments = []
+    for name in PHASES:
+        if name not in phases:
+            continue
+        ms = phases[name]
+        pct = round(ms * 100.0 / total, 2) if total > 0 else 0.0
+        segments.append({"name": name, "ms": ms, "pct": pct})
+    return segments, round(total, 1)
+
+
+def _result_row(target: MonitorTarget, latest: MonitorResult | None) -> dict[str, Any]:
+    """生成表格行；latest 为空时表示尚未检测"""
+    segments, phase_total = _phase_segments(latest.phases if latest else None)
+    return {
+        "target_id": target.target_id,
+        "provider": target.provider_name,
+        "model": target.model_name,
+        "status": _status_text(latest.status) if latest else tr("web.pending_check"),
+        "latency_ms": latest.latency_ms
+        if latest and latest.latency_ms is not None
+        else -1,
+        "ping_ms": latest.ping_ms if latest and latest.ping_ms is not None else -1,
+        "ttft_ms": latest.ttft_ms if latest and latest.ttft_ms is not None else -1,
+        "itl_ms": latest.itl_ms if latest and latest.itl_ms is not None else -1,
+        "tokens_per_sec": latest.tokens_per_sec
+        if latest and latest.tokens_per_sec is not None
+        else -1,
+        "phases": segments,
+        "phase_total": phase_total,
+        "checked_at": latest.checked_at.strftime("%Y-%m-%d %H:%M:%S")
+        if latest
+        else "-",
+        "message": latest.message if latest else tr("web.no_monitor_result"),
+    }
+
+
 def register_page(auth: WebAuth | None):
     auth_enabled = auth is not None
     dec = require_auth(auth) if auth else lambda f: f
@@ -40,21 +108,32 @@ def register_page(auth: WebAuth | None):
     @ui.page("/monitor")
     @dec
     async def monitor_page(request: Request):
-        config = ConfigManager.load_json(ConfigPaths.get_opencode_config()) or {}
-        if not isinstance(config, dict):
-            config = {}
-
-        service = MonitorService(poll_interval_ms=10000)
-        service.set_chat_test_enabled(True)
+        # 所有标签页共享应用级监控服务；本页只持有订阅与引用计数
+        monitor = get_app_monitor()
+        service = monitor.service
 
         def content():
             running = {"value": False}
-            poll_done_flag = {"value": False}
             targets_cache: list = []
+            target_map: dict[str, MonitorTarget] = {}
+            rows_by_id: dict[str, dict[str, Any]] = {}
+            shown_version = {"value": -1}
+            updates = monitor.feed.subscribe()
 
-            status_label = ui.label(tr("web.monitor_not_started")).classes(
-                "text-gray-500"
-            )
+            def on_disconnect() -> None:
+                monitor.feed.unsubscribe(updates)
+                if running["value"]:
+                    running["value"] = False
+                    monitor.release()
+
+            context.client.on_disconnect(on_disconnect)
+            ui.add_head_html('<script src="/static/monitor.js"></script>')
+
+            status_label = ui.label(
+                tr("web.monitor_running")
+                if monitor.running
+                else tr("web.monitor_not_started")
+            ).classes("text-positive" if monitor.running else "text-gray-500")
 
             with ui.row().classes("occm-toolbar"):
                 ui.button(
@@ -72,6 +151,16 @@ def register_page(auth: WebAuth | None):
                     icon="stop",
                     on_click=lambda: stop_monitor(),
                 ).props("outline")
+                ui.switch(
+                    tr("web.stream_probe"),
+                    value=service.is_stream_probe_enabled(),
+                    on_change=lambda e: service.set_stream_probe_enabled(e.value),
+                )
+                ui.switch(
+                    tr("web.listing_mode"),
+                    value=service.is_listing_mode_enabled(),
+                    on_change=lambda e: service.set_listing_mode(e.value),
+                ).tooltip(tr("monitor.listing_mode_tooltip"))
 
             result_table = ui.table(
                 columns=[
@@ -96,6 +185,30 @@ def register_page(auth: WebAuth | None):
                         "field": "ping_ms",
                         "sortable": True,
                     },
+                    {
+                        "name": "ttft_ms",
+                        "label": tr("web.ttft_ms"),
+                        "field": "ttft_ms",
+                        "sortable": True,
+                    },
+                    {
+                        "name": "itl_ms",
+                        "label": tr("web.itl_ms"),
+                        "field": "itl_ms",
+                        "sortable": True,
+                    },
+                    {
+                        "name": "tokens_per_sec",
+                        "label": tr("web.tokens_per_sec"),
+                        "field": "tokens_per_sec",
+                        "sortable": True,
+                    },
+                    {
+                        "name": "phases",
+                        "label": tr("web.latency_phases"),
+                        "field": "phase_total",
+                        "sortable": True,
+                    },
                     {
                         "name": "checked_at",
                         "label": tr("web.check_time"),
@@ -112,42 +225,31 @@ def register_page(auth: WebAuth | None):
                 row_key="target_id",
                 pagination=10,
             ).classes("w-full occm-table")
+            result_table.add_slot("body-cell-phases", PHASE_BAR_SLOT)
 
             def refresh_targets() -> None:
+                monitor.reload_targets()
+                sync_targets()
+
+            def sync_targets() -> None:
+                """从共享服务同步目标列表（其他页面刷新目标后也会触发）"""
                 targets_cache.clear()
-                targets_cache.extend(service.load_targets_from_config(config))
+                targets_cache.extend(monitor.ensure_targets())
+                shown_version["value"] = monitor.targets_version
                 refresh_results()
 
             def refresh_results() -> None:
+                """整表重建：仅在目标列表变化时使用，结果更新走增量推送"""
+                updates.clear()
+                target_map.clear()
                 rows: list[dict[str, Any]] = []
                 for t in targets_cache:
-                    history = list(service.get_history(t.target_id))
-                    latest: MonitorResult | None = history[-1] if history else None
-                    rows.append(
-                        {
-                            "target_id": t.target_id,
-                            "provider": t.provider_name,
-                            "model": t.model_name,
-                            "status": _status_text(latest.status)
-                            if latest
-                            else tr("web.pending_check"),
-                            "latency_ms": latest.latency_ms
-                            if latest and latest.latency_ms is not None
-                            else -1,
-                            "ping_ms": latest.ping_ms
-                            if latest and latest.ping_ms is not None
-                            else -1,
-                            "checked_at": latest.checked_at.strftime(
-                                "%Y-%m-%d %H:%M:%S"
-                            )
-                            if latest
-                            else "-",
-                            "message": latest.message
-                            if latest
-                            else tr("web.no_monitor_result"),
-                        }
-                    )
+                    target_map[t.target_id] = t
+                    history = service.get_history(t.target_id)
+                    rows.append(_result_row(t, history[-1] if history else None))
                 rows.sort(key=lambda r: r["target_id"])
+                rows_by_id.clear()
+                rows_by_id.update({r["target_id"]: r for r in rows})
                 result_table.rows = rows
                 result_table.update()
 
@@ -159,7 +261,7 @@ def register_page(auth: WebAuth | None):
                 if not targets_cache:
                     ui.notify(tr("web.no_monitor_targets"), type="warning")
                     return
-                service.start_polling()
+                monitor.acquire()
                 running["value"] = True
                 status_label.set_text(tr("web.monitor_running"))
                 status_label.classes(remove="text-gray-500")
@@ -168,26 +270,187 @@ def register_page(auth: WebAuth | None):
             def stop_monitor() -> None:
                 if not running["value"]:
                     return
-                service.stop_polling()
+                monitor.release()
                 running["value"] = False
-                status_label.set_text(tr("web.monitor_stopped"))
+                # 其他页面仍在使用时，共享服务会继续运行
+                status_label.set_text(
+                    tr("web.monitor_running")
+                    if monitor.running
+                    else tr("web.monitor_stopped")
+                )
                 status_label.classes(remove="text-positive")
                 status_label.classes(add="text-gray-500")
 
-            # 监听一次轮询结束事件，配合定时器刷新
-            def on_poll_done() -> None:
-                poll_done_flag["value"] = True
+            def flush_updates() -> None:
+                """把本帧积累的结果以行补丁形式推送给浏览器"""
+                if shown_version["value"] != monitor.targets_version:
+                    sync_targets()
+                    return
+                if not len(updates):
+                    return
+                patches = []
+                for result in updates.drain(MAX_UPDATES_PER_FRAME):
+                    target = target_map.get(result.target_id)
+                    if target is None:
+                        continue
+                    patches.append(_result_row(target, result))
+                if not patches:
+                    return
+                # 同步服务端行数据（不触发整表下发），保证后续重建时状态一致
+                for patch in patches:
+                    row = rows_by_id.get(patch["target_id"])
+                    if row is not None:
+                        row.update(patch)
+                ui.run_javascript(
+                    f"window.occmPatchRows && window.occmPatchRows("
+                    f"{result_table.id}, {json.dumps(patches, ensure_ascii=False)})"
+                )
+
+            ui.timer(FRAME_INTERVAL_SEC, flush_updates, active=True)
 
-            service.add_poll_done_callback(on_poll_done)
+            sync_targets()
 
-            def tick() -> None:
-                if poll_done_flag["value"] or running["value"]:
-                    poll_done_flag["value"] = False
-                    refresh_results()
+            with ui.expansion(tr("web.sla_report"), icon="assessment").classes(
+                "w-full mt-4"
+            ):
+                last_report: dict[str, SlaReport | None] = {"value": None}
+                with ui.row().classes("occm-toolbar items-center"):
+                    window_select = ui.select(
+                        {1: "24h", 7: "7d", 30: "30d"},
+                        value=7,
+                        label=tr("web.sla_window"),
+                    ).classes("w-32")
+                    slo_input = ui.number(
+                        label=tr("web.sla_slo"),
+                        value=99.5,
+                        min=0,
+                        max=100,
+                        step=0.1,
+                        format="%.2f",
+                    ).classes("w-32")
+                    ui.button(
+                        tr("web.sla_generate"),
+                        icon="assessment",
+                        on_click=lambda: generate_report(),
+                    ).props("unelevated")
+                    ui.button(
+                        tr("web.sla_export_csv"),
+                        icon="download",
+                        on_click=lambda: export_report("csv"),
+                    ).props("outline")
+                    ui.button(
+                        tr("web.sla_export_json"),
+                        icon="download",
+                        on_click=lambda: export_report("json"),
+                    ).props("outline")
 
-            ui.timer(2.0, tick, active=True)
+                sla_table = ui.table(
+                    columns=[
+                        {"name": "scope", "label": tr("web.sla_scope"), "field": "scope"},
+                        {
+                            "name": "key",
+                            "label": tr("web.target_id"),
+                            "field": "key",
+                            "sortable": True,
+                        },
+                        {
+                            "name": "samples",
+                            "label": tr("web.sla_samples"),
+                            "field": "samples",
+                            "sortable": True,
+                        },
+                        {
+                            "name": "availability_pct",
+                            "label": tr("web.sla_availability"),
+                            "field": "availability_pct",
+                            "sortable": True,
+                        },
+                        {
+                            "name": "degraded_pct",
+                            "label": tr("web.sla_degraded"),
+                            "field": "degraded_pct",
+                            "sortable": True,
+                        },
+                        {
+                            "name": "error_budget_burn",
+                            "label": tr("web.sla_burn"),
+                            "field": "error_budget_burn",
+                            "sortable": True,
+                        },
+                        {
+                            "name": "incidents",
+                            "label": tr("web.sla_incidents"),
+                            "field": "incidents",
+                            "sortable": True,
+                        },
+                        {
+                            "name": "mttr_sec",
+                            "label": tr("web.sla_mttr"),
+                            "field": "mttr_sec",
+                            "sortable": True,
+                        },
+                        {
+                            "name": "avg_latency_ms",
+                            "label": tr("web.sla_avg_latency"),
+                            "field": "avg_latency_ms",
+                            "sortable": True,
+                        },
+                        {"name": "met", "label": tr("web.sla_met"), "field": "met"},
+                    ],
+                    rows=[],
+                    row_key="row_id",
+                    pagination=20,
+                ).classes("w-full occm-table")
+
+                async def generate_report() -> SlaReport | None:
+                    days = int(window_select.value or 7)
+                    slo = float(slo_input.value or 99.5) / 100.0
+                    end = datetime.now()
+                    # 首次生成需要重放结果文件，放到工作线程避免阻塞事件循环
+                    report = await run.io_bound(
+                        monitor.history.report, end - timedelta(days=days), end, slo
+                    )
+                    last_report["value"] = report
+                    rows = []
+                    for scope, items in (
+                        ("provider", report.providers),
+                        ("target", report.targets),
+                    ):
+                        for item in items:
+                            rows.append(
+                                {
+                                    "row_id": f"{scope}:{item.key}",
+                                    "scope": scope,
+                                    "key": item.key,
+                                    "samples": item.samples,
+                                    "availability_pct": _cell(item.availability_pct),
+                                    "degraded_pct": _cell(item.degraded_pct),
+                                    "error_budget_burn": _cell(item.error_budget_burn),
+                                    "incidents": item.incidents,
+                                    "mttr_sec": _cell(item.mttr_sec),
+                                    "avg_latency_ms": _cell(item.avg_latency_ms),
+                                    "met": {True: "✅", False: "❌"}.get(
+                                        item.met_slo, "-"
+                                    ),
+                                }
+                            )
+                    sla_table.rows = rows
+                    sla_table.update()
+                    if not rows:
+                        ui.notify(tr("web.sla_no_data"), type="info")
+                    return report
 
-            refresh_targets()
+                async def export_report(fmt: str) -> None:
+                    report = last_report["value"] or await generate_report()
+                    if report is None:
+                        return
+                    stamp = report.end.strftime("%Y%m%d-%H%M")
+                    if fmt == "csv":
+                        # 带 BOM 便于 Excel 正确识别中文
+                        data = ("\ufeff" + report.to_csv()).encode("utf-8")
+                    else:
+                        data = report.to_json().encode("utf-8")
+                    ui.download(data, f"occm-sla-{stamp}.{fmt}")
 
         render_layout(
             request=request,
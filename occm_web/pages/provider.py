@@ -8,7 +8,7 @@ import json
 from typing import Any
 
 from fastapi import Request
-from nicegui import ui
+from nicegui import run, ui
 
 from occm_core import (
     AuthManager as CoreAuthManager,
@@ -19,6 +19,12 @@ from occm_core import (
     NATIVE_PROVIDERS,
 )
 
+from occm_core.model_refresh import (
+    ModelRefresher,
+    RefreshProgress,
+    refresh_targets_from_config,
+)
+
 from ..auth import AuthManager as WebAuth
 from ..auth import require_auth
 from ..i18n_web import tr
@@ -418,6 +424,11 @@ def register_page(auth: WebAuth | None) -> None:
                             icon="refresh",
                             on_click=lambda: do_refresh(),
                         ).props("outline")
+                        ui.button(
+                            tr("provider.refresh_all_models"),
+                            icon="cloud_sync",
+                            on_click=lambda: refresh_all_models(),
+                        ).props("outline")
                     if not providers:
                         ui.label(tr("common.no_data")).classes(
                             "text-gray-400 text-center w-full py-8"
@@ -614,6 +625,89 @@ def register_page(auth: WebAuth | None) -> None:
                         ).classes("w-full occm-table")
                         _refresh_env(env_tbl)
 
+            async def refresh_all_models() -> None:
+                """并发刷新所有 Provider 的模型列表，逐个显示进度，最后给出新增/移除报告"""
+                targets = refresh_targets_from_config(config)
+                if not targets:
+                    ui.notify(tr("provider.refresh_all_none"), type="warning")
+                    return
+                state: dict[str, Any] = {"done": 0, "total": len(targets)}
+
+                def on_progress(progress: RefreshProgress) -> None:
+                    # 工作线程中调用，只写入状态，由页面定时器读取
+                    state["done"] = progress.done
+
+                with (
+                    ui.dialog() as dlg,
+                    ui.card().classes("w-[760px] max-w-full occm-dialog"),
+                ):
+                    ui.label(tr("provider.refresh_all_title")).classes(
+                        "text-lg font-bold"
+                    )
+                    progress_label = ui.label(
+                        tr("provider.refresh_all_progress", done=0, total=len(targets))
+                    )
+                    progress_bar = ui.linear_progress(value=0, show_value=False)
+                    result_box = ui.column().classes("w-full")
+                    with ui.row().classes("w-full justify-end"):
+                        ui.button(tr("common.close"), on_click=dlg.close).props("flat")
+                dlg.open()
+
+                def show_progress() -> None:
+                    progress_label.set_text(
+                        tr(
+                            "provider.refresh_all_progress",
+                            done=state["done"],
+                            total=state["total"],
+                        )
+                    )
+                    progress_bar.set_value(state["done"] / state["total"])
+
+                timer = ui.timer(0.2, show_progress)
+                report = await run.io_bound(
+                    ModelRefresher().refresh_all, targets, on_progress=on_progress
+                )
+                timer.cancel()
+                show_progress()
+                progress_label.set_text(
+                    tr(
+                        "provider.refresh_all_summary",
+                        providers=len(report.results),
+                        seconds=f"{report.elapsed_sec:.1f}",
+                        failed=len(report.failed),
+                        added=report.added_count,
+                        removed=report.removed_count,
+                    )
+                )
+                with result_box:
+                    ui.table(
+                        columns=[
+                            {"name": "provider", "label": "Provider", "field": "provider"},
+                            {"name": "total", "label": "#", "field": "total"},
+                            {"name": "added", "label": "+", "field": "added"},
+                            {"name": "removed", "label": "-", "field": "removed"},
+                            {"name": "missing", "label": "!", "field": "missing"},
+                            {
+                                "name": "error",
+                                "label": tr("common.error"),
+                                "field": "error",
+                            },
+                        ],
+                        rows=[
+                            {
+                                "provider": r.provider_key,
+                                "total": r.total,
+                                "added": ", ".join(r.added),
+                                "removed": ", ".join(r.removed),
+                                "missing": ", ".join(r.missing),
+                                "error": r.error,
+                            }
+                            for r in report.results
+                        ],
+                        row_key="provider",
+                        pagination=10,
+                    ).classes("w-full occm-table")
+
             def do_refresh() -> None:
                 nonlocal config
                 config = load_config()
@@ -0,0 +1,31 @@
+// 监控页面：在浏览器端按 row-key 就地修改表格行，避免整表重新下发
+window.occmPatchRows = function (tableId, patches) {
+  // nicegui.js 以顶层 let 声明 mounted_app，不会挂到 window 上，只能读全局绑定
+  const app = typeof mounted_app !== "undefined" ? mounted_app : null;
+  const element = app && app.elements ? app.elements[tableId] : null;
+  if (!element || !element.props || !Array.isArray(element.props.rows)) {
+    return;
+  }
+  const rows = element.props.rows;
+  const key = element.props["row-key"] || "id";
+
+  // 行索引缓存：行数组被整体替换或行数变化时重建
+  let cache = element.__occmRowIndex;
+  if (!cache || cache.rows !== rows || cache.length !== rows.length) {
+    const index = new Map();
+    rows.forEach((row, i) => index.set(row[key], i));
+    cache = { rows: rows, length: rows.length, index: index };
+    element.__occmRowIndex = cache;
+  }
+
+  for (const patch of patches) {
+    const i = cache.index.get(patch[key]);
+    if (i === undefined) {
+      rows.push(patch);
+      cache.index.set(patch[key], rows.length - 1);
+      cache.length = rows.length;
+    } else {
+      Object.assign(rows[i], patch);
+    }
+  }
+};
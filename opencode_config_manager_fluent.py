@@ -113,15 +113,34 @@ import hashlib
 import copy
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple, Deque
+from typing import Dict, List, Optional, Any, Tuple
 from functools import partial
 from dataclasses import dataclass
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor
 import os
 import time
-import socket
-from urllib.parse import urlparse
+
+from occm_core import MonitorFeed, MonitorResult, MonitorService, MonitorTarget
+from occm_core.agent_groups import AgentGroupManager
+from occm_core.config_schema import get_schema_store
+from occm_core.config_validator import ConfigValidator
+from occm_core.model_catalog import get_model_catalog
+from occm_core.model_index import get_model_index
+from occm_core.model_refresh import ModelRefresher, refresh_targets_from_config
+from occm_core.model_refs import (
+    SOURCE_OHMYOPENCODE,
+    SOURCE_OPENCODE,
+    ModelRefIndex,
+    get_model_ref_index,
+)
+from occm_core.model_registry import get_model_registry
+from occm_core.model_search import (
+    SEARCH_MODE_FUZZY,
+    SEARCH_MODE_PREFIX,
+    SEARCH_MODE_REGEX,
+    get_search_index,
+)
+from occm_core.native_providers import _safe_base_url
+from occm_core.probe_timing import PHASES
 
 
 def _resolve_env_value(value: str) -> str:
@@ -134,57 +153,6 @@ def _resolve_env_value(value: str) -> str:
     return os.environ.get(match.group(1), "")
 
 
-def _safe_base_url(value: str) -> str:
-    """规范化 baseURL 字符串"""
-    return (value or "").strip().rstrip("/")
-
-
-def _build_chat_url(base_url: str) -> str:
-    """根据 baseURL 生成 chat/completions 地址"""
-    value = (base_url or "").strip()
-    if not value:
-        return ""
-    if value.endswith("/v1") or value.endswith("/v1/"):
-        return value.rstrip("/") + "/chat/completions"
-    if value.endswith("/"):
-        return value + "v1/chat/completions"
-    return value + "/v1/chat/completions"
-
-
-def _extract_origin(base_url: str) -> str:
-    """从 baseURL 提取可用于 Ping 的源站"""
-    if not base_url:
-        return ""
-    parsed = urlparse(base_url)
-    if parsed.scheme and parsed.netloc:
-        return f"{parsed.scheme}://{parsed.netloc}"
-    return base_url
-
-
-@dataclass
-class MonitorTarget:
-    provider_key: str
-    provider_name: str
-    base_url: str
-    api_key: str
-    model_id: str
-    model_name: str
-
-    @property
-    def target_id(self) -> str:
-        return f"{self.provider_key}/{self.model_id}"
-
-
-@dataclass
-class MonitorResult:
-    target_id: str
-    status: str
-    latency_ms: Optional[int]
-    ping_ms: Optional[int]
-    checked_at: datetime
-    message: str
-
-
 # ==================== CLI 导出模块数据类 ====================
 @dataclass
 class CLIToolStatus:
@@ -337,679 +305,6 @@ class RestoreError(CLIExportError):
         super().__init__(f"恢复备份失败 ({backup_path}): {reason}")
 
 
-# ==================== Agent 分组管理 ====================
-class AgentGroupManager:
-    """Agent分组管理器
-
-    管理OpenCode和Oh My OpenCode的Agent分组配置，支持：
-    - 创建、编辑、删除自定义分组
-    - 快速应用预设或自定义分组
-    - 导入/导出分组配置
-    - 使用统计追踪
-    """
-
-    # 预设模板定义
-    PRESETS = [
-        {
-            "id": "preset-minimal",
-            "name": "最小化配置",
-            "name_en": "Minimal",
-            "description": "仅启用核心Agent，适合简单任务",
-            "description_en": "Core agents only, for simple tasks",
-            "icon": "⚡",
-            "agents": {
-                "opencode": [{"agent_id": "build", "enabled": True, "config": {}}],
-                "oh_my_opencode": [{"agent_id": "sisyphus-junior", "enabled": True}],
-            },
-        },
-        {
-            "id": "preset-standard",
-            "name": "标准配置",
-            "name_en": "Standard",
-            "description": "平衡的Agent组合，适合大多数任务",
-            "description_en": "Balanced agent combination for most tasks",
-            "icon": "⚙️",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-full",
-            "name": "常用配置",
-            "name_en": "Common",
-            "description": "常用Agent组合，适合大多数复杂项目",
-            "description_en": "Common agent combination for most complex projects",
-            "icon": "🚀",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                    {"agent_id": "explore", "enabled": True, "config": {}},
-                    {"agent_id": "code-reviewer", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                    {"agent_id": "librarian", "enabled": True},
-                    {"agent_id": "explore", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-complete",
-            "name": "完整配置",
-            "name_en": "Complete",
-            "description": "启用所有Agent，最大化功能",
-            "description_en": "All agents enabled, maximum functionality",
-            "icon": "💎",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                    {"agent_id": "explore", "enabled": True, "config": {}},
-                    {"agent_id": "code-reviewer", "enabled": True, "config": {}},
-                    {"agent_id": "oracle", "enabled": True, "config": {}},
-                    {"agent_id": "librarian", "enabled": True, "config": {}},
-                    {"agent_id": "prometheus", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                    {"agent_id": "librarian", "enabled": True},
-                    {"agent_id": "explore", "enabled": True},
-                    {"agent_id": "atlas", "enabled": True},
-                    {"agent_id": "metis", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-frontend",
-            "name": "前端开发",
-            "name_en": "Frontend",
-            "description": "针对前端UI/UX开发优化",
-            "description_en": "Optimized for frontend UI/UX development",
-            "icon": "🎨",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-backend",
-            "name": "后端开发",
-            "name_en": "Backend",
-            "description": "针对后端API/数据库开发优化",
-            "description_en": "Optimized for backend API/database development",
-            "icon": "🔧",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                    {"agent_id": "explore", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                ],
-            },
-        },
-    ]
-
-    def __init__(self, config_dir: Path):
-        """初始化分组管理器
-
-        Args:
-            config_dir: 配置文件目录 (~/.config/opencode)
-        """
-        self.config_dir = config_dir
-        self.groups_file = config_dir / "agent-groups.json"
-        self.backup_dir = config_dir / "backups"
-        self.groups_data = {}
-        self.load_groups()
-
-    # ========== 数据加载/保存 ==========
-
-    def load_groups(self) -> None:
-        """从文件加载分组配置"""
-        if not self.groups_file.exists():
-            # 初始化默认配置
-            self.groups_data = {
-                "version": "1.0.0",
-                "groups": [],
-                "settings": {
-                    "auto_backup": True,
-                    "show_usage_stats": True,
-                    "default_group_id": None,
-                },
-            }
-            self.save_groups()
-            return
-
-        try:
-            with open(self.groups_file, "r", encoding="utf-8") as f:
-                self.groups_data = json.load(f)
-
-            # 确保必要的字段存在
-            if "groups" not in self.groups_data:
-                self.groups_data["groups"] = []
-            if "settings" not in self.groups_data:
-                self.groups_data["settings"] = {
-                    "auto_backup": True,
-                    "show_usage_stats": True,
-                    "default_group_id": None,
-                }
-        except Exception as e:
-            print(f"加载分组配置失败: {e}")
-            self.groups_data = {
-                "version": "1.0.0",
-                "groups": [],
-                "settings": {
-                    "auto_backup": True,
-                    "show_usage_stats": True,
-                    "default_group_id": None,
-                },
-            }
-
-    def save_groups(self) -> None:
-        """保存分组配置到文件"""
-        try:
-            # 确保目录存在
-            self.config_dir.mkdir(parents=True, exist_ok=True)
-
-            # 保存前备份
-            if self.groups_data.get("settings", {}).get("auto_backup", True):
-                if self.groups_file.exists():
-                    self.backup_groups()
-
-            # 保存配置
-            with open(self.groups_file, "w", encoding="utf-8") as f:
-                json.dump(self.groups_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"保存分组配置失败: {e}")
-            raise
-
-    def backup_groups(self) -> Optional[Path]:
-        """备份当前分组配置
-
-        Returns:
-            Path: 备份文件路径，失败返回None
-        """
-        try:
-            # 确保备份目录存在
-            self.backup_dir.mkdir(parents=True, exist_ok=True)
-
-            # 生成备份文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = self.backup_dir / f"agent-groups-backup-{timestamp}.json"
-
-            # 复制当前配置
-            if self.groups_file.exists():
-                import shutil
-
-                shutil.copy2(self.groups_file, backup_file)
-
-                # 清理旧备份（保留最近10个）
-                self._cleanup_old_backups()
-
-                return backup_file
-        except Exception as e:
-            print(f"备份分组配置失败: {e}")
-            return None
-
-    def _cleanup_old_backups(self, keep_count: int = 10) -> None:
-        """清理旧备份文件
-
-        Args:
-            keep_count: 保留的备份数量
-        """
-        try:
-            # 获取所有备份文件
-            backup_files = sorted(
-                self.backup_dir.glob("agent-groups-backup-*.json"),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True,
-            )
-
-            # 删除多余的备份
-            for backup_file in backup_files[keep_count:]:
-                backup_file.unlink()
-        except Exception as e:
-            print(f"清理旧备份失败: {e}")
-
-    # ========== 分组CRUD操作 ==========
-
-    def create_group(
-        self, name: str, description: str, agents: Dict, icon: str = "📁"
-    ) -> str:
-        """创建新分组
-
-        Args:
-            name: 分组名称
-            description: 分组描述
-            agents: Agent配置字典
-            icon: 分组图标
-
-        Returns:
-            str: 分组ID (UUID)
-        """
-        import uuid
-
-        group_id = f"group-{uuid.uuid4().hex[:8]}"
-        now = datetime.now().isoformat()
-
-        group = {
-            "id": group_id,
-            "name": name,
-            "description": description,
-            "type": "custom",
-            "icon": icon,
-            "created_at": now,
-            "updated_at": now,
-            "agents": agents,
-            "statistics": {"usage_count": 0, "last_used": None},
-        }
-
-        self.groups_data["groups"].append(group)
-        self.save_groups()
-
-        return group_id
-
-    def update_group(self, group_id: str, **kwargs) -> bool:
-        """更新分组配置
-
-        Args:
-            group_id: 分组ID
-            **kwargs: 要更新的字段
-
-        Returns:
-            bool: 是否成功
-        """
-        group = self.get_group(group_id)
-        if not group:
-            return False
-
-        # 更新字段
-        for key, value in kwargs.items():
-            if key in ["name", "description", "icon", "agents"]:
-                group[key] = value
-
-        # 更新时间戳
-        group["updated_at"] = datetime.now().isoformat()
-
-        self.save_groups()
-        return True
-
-    def delete_group(self, group_id: str) -> bool:
-        """删除分组
-
-        Args:
-            group_id: 分组ID
-
-        Returns:
-            bool: 是否成功
-        """
-        groups = self.groups_data["groups"]
-        original_len = len(groups)
-
-        self.groups_data["groups"] = [g for g in groups if g["id"] != group_id]
-
-        if len(self.groups_data["groups"]) < original_len:
-            self.save_groups()
-            return True
-
-        return False
-
-    def get_group(self, group_id: str) -> Optional[Dict]:
-        """获取分组配置
-
-        Args:
-            group_id: 分组ID
-
-        Returns:
-            Optional[Dict]: 分组配置，不存在返回None
-        """
-        for group in self.groups_data["groups"]:
-            if group["id"] == group_id:
-                return group
-        return None
-
-    def list_groups(self, include_presets: bool = False) -> List[Dict]:
-        """列出所有分组
-
-        Args:
-            include_presets: 是否包含预设模板
-
-        Returns:
-            List[Dict]: 分组列表
-        """
-        groups = self.groups_data["groups"].copy()
-
-        if include_presets:
-            # 添加预设模板（标记为preset类型）
-            for preset in self.PRESETS:
-                preset_copy = preset.copy()
-                preset_copy["type"] = "preset"
-                groups.append(preset_copy)
-
-        return groups
-
-    # ========== 分组应用 ==========
-
-    def apply_group(
-        self, group_id: str, opencode_config: Dict, omo_config: Dict
-    ) -> Tuple[Dict, Dict]:
-        """应用分组配置到OpenCode和Oh My OpenCode
-
-        Args:
-            group_id: 分组ID
-            opencode_config: 当前OpenCode配置
-            omo_config: 当前Oh My OpenCode配置
-
-        Returns:
-            Tuple[Dict, Dict]: 更新后的(opencode_config, omo_config)
-        """
-        # 获取分组配置（支持预设模板）
-        group = self.get_group(group_id)
-        if not group:
-            # 尝试从预设模板中查找
-            for preset in self.PRESETS:
-                if preset["id"] == group_id:
-                    group = preset
-                    break
-
-        if not group:
-            return opencode_config, omo_config
-
-        # 1. 更新OpenCode Agent配置
-        if "agent" not in opencode_config:
-            opencode_config["agent"] = {}
-
-        # 获取所有OpenCode Agent ID
-        all_opencode_agents = set()
-        for agent_cfg in group["agents"].get("opencode", []):
-            all_opencode_agents.add(agent_cfg["agent_id"])
-
-        # 应用分组配置
-        for agent_cfg in group["agents"].get("opencode", []):
-            agent_id = agent_cfg["agent_id"]
-            if agent_cfg["enabled"]:
-                # 启用Agent并应用配置
-                if agent_id not in opencode_config["agent"]:
-                    opencode_config["agent"][agent_id] = {}
-
-                # 合并配置
-                config = agent_cfg.get("config", {})
-                opencode_config["agent"][agent_id].update(config)
-
-                # 确保disable字段为False或不存在
-                if "disable" in opencode_config["agent"][agent_id]:
-                    opencode_config["agent"][agent_id]["disable"] = False
-            else:
-                # 禁用Agent
-                if agent_id in opencode_config["agent"]:
-                    opencode_config["agent"][agent_id]["disable"] = True
-
-        # 2. 更新Oh My OpenCode Agent配置
-        if "agents" not in omo_config:
-            omo_config["agents"] = {}
-
-        # 获取所有Oh My OpenCode Agent ID
-        all_omo_agents = set()
-        for agent_cfg in group["agents"].get("oh_my_opencode", []):
-            all_omo_agents.add(agent_cfg["agent_id"])
-
-        # 应用分组配置
-        for agent_cfg in group["agents"].get("oh_my_opencode", []):
-            agent_id = agent_cfg["agent_id"]
-            if agent_cfg["enabled"]:
-                # 启用Agent并应用配置
-                omo_config["agents"][agent_id] = {
-                    "provider": agent_cfg.get("provider", ""),
-                    "model": agent_cfg.get("model", ""),
-                }
-            else:
-                # 禁用Agent（从配置中移除）
-                if agent_id in omo_config["agents"]:
-                    del omo_config["agents"][agent_id]
-
-        # 3. 更新使用统计（仅对自定义分组）
-        if group.get("type") == "custom":
-            self.update_usage_stats(group_id)
-
-        return opencode_config, omo_config
-
-    def get_current_group_match(
-        self, opencode_config: Dict, omo_config: Dict
-    ) -> Optional[str]:
-        """检测当前配置是否匹配某个分组
-
-        Args:
-            opencode_config: 当前OpenCode配置
-            omo_config: 当前Oh My OpenCode配置
-
-        Returns:
-            Optional[str]: 匹配的分组ID，无匹配返回None
-        """
-        # 获取当前启用的Agent
-        current_opencode_agents = set()
-        for agent_id, config in opencode_config.get("agent", {}).items():
-            if not config.get("disable", False):
-                current_opencode_agents.add(agent_id)
-
-        current_omo_agents = set(omo_config.get("agents", {}).keys())
-
-        # 检查所有分组（包括预设）
-        all_groups = self.list_groups(include_presets=True)
-
-        for group in all_groups:
-            # 获取分组中启用的Agent
-            group_opencode_agents = set()
-            for agent_cfg in group["agents"].get("opencode", []):
-                if agent_cfg["enabled"]:
-                    group_opencode_agents.add(agent_cfg["agent_id"])
-
-            group_omo_agents = set()
-            for agent_cfg in group["agents"].get("oh_my_opencode", []):
-                if agent_cfg["enabled"]:
-                    group_omo_agents.add(agent_cfg["agent_id"])
-
-            # 检查是否匹配
-            if (
-                current_opencode_agents == group_opencode_agents
-                and current_omo_agents == group_omo_agents
-            ):
-                return group["id"]
-
-        return None
-
-    # ========== 预设模板 ==========
-
-    def get_presets(self) -> List[Dict]:
-        """获取所有预设模板
-
-        Returns:
-            List[Dict]: 预设模板列表
-        """
-        return self.PRESETS.copy()
-
-    def create_from_preset(
-        self, preset_id: str, name: str, description: Optional[str] = None
-    ) -> Optional[str]:
-        """从预设模板创建分组
-
-        Args:
-            preset_id: 预设模板ID
-            name: 新分组名称
-            description: 新分组描述（可选）
-
-        Returns:
-            Optional[str]: 新分组ID，失败返回None
-        """
-        # 查找预设模板
-        preset = None
-        for p in self.PRESETS:
-            if p["id"] == preset_id:
-                preset = p
-                break
-
-        if not preset:
-            return None
-
-        # 使用预设的描述（如果未提供）
-        if description is None:
-            description = preset["description"]
-
-        # 创建新分组
-        return self.create_group(
-            name=name,
-            description=description,
-            agents=preset["agents"],
-            icon=preset["icon"],
-        )
-
-    # ========== 导入/导出 ==========
-
-    def export_group(self, group_id: str, file_path: Path) -> bool:
-        """导出分组到文件
-
-        Args:
-            group_id: 分组ID
-            file_path: 导出文件路径
-
-        Returns:
-            bool: 是否成功
-        """
-        group = self.get_group(group_id)
-        if not group:
-            return False
-
-        try:
-            # 创建导出数据
-            export_data = {
-                "version": "1.0.0",
-                "exported_at": datetime.now().isoformat(),
-                "group": group,
-            }
-
-            # 写入文件
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-            return True
-        except Exception as e:
-            print(f"导出分组失败: {e}")
-            return False
-
-    def import_group(self, file_path: Path, overwrite: bool = False) -> Optional[str]:
-        """从文件导入分组
-
-        Args:
-            file_path: 导入文件路径
-            overwrite: 是否覆盖同名分组
-
-        Returns:
-            Optional[str]: 导入的分组ID，失败返回None
-        """
-        try:
-            # 读取文件
-            with open(file_path, "r", encoding="utf-8") as f:
-                import_data = json.load(f)
-
-            # 验证格式
-            if "group" not in import_data:
-                print("导入文件格式错误：缺少group字段")
-                return None
-
-            group = import_data["group"]
-
-            # 检查同名分组
-            existing_group = None
-            for g in self.groups_data["groups"]:
-                if g["name"] == group["name"]:
-                    existing_group = g
-                    break
-
-            if existing_group and not overwrite:
-                print(f"分组 '{group['name']}' 已存在")
-                return None
-
-            if existing_group and overwrite:
-                # 覆盖现有分组
-                group_id = existing_group["id"]
-                self.update_group(
-                    group_id,
-                    description=group["description"],
-                    icon=group.get("icon", "📁"),
-                    agents=group["agents"],
-                )
-                return group_id
-            else:
-                # 创建新分组
-                return self.create_group(
-                    name=group["name"],
-                    description=group["description"],
-                    agents=group["agents"],
-                    icon=group.get("icon", "📁"),
-                )
-        except Exception as e:
-            print(f"导入分组失败: {e}")
-            return None
-
-    # ========== 统计信息 ==========
-
-    def update_usage_stats(self, group_id: str) -> None:
-        """更新分组使用统计
-
-        Args:
-            group_id: 分组ID
-        """
-        group = self.get_group(group_id)
-        if not group:
-            return
-
-        if "statistics" not in group:
-            group["statistics"] = {"usage_count": 0, "last_used": None}
-
-        group["statistics"]["usage_count"] = (
-            group["statistics"].get("usage_count", 0) + 1
-        )
-        group["statistics"]["last_used"] = datetime.now().isoformat()
-
-        self.save_groups()
-
-    def get_usage_stats(self, group_id: str) -> Dict:
-        """获取分组使用统计
-
-        Args:
-            group_id: 分组ID
-
-        Returns:
-            Dict: 统计信息
-        """
-        group = self.get_group(group_id)
-        if not group:
-            return {"usage_count": 0, "last_used": None}
-
-        return group.get("statistics", {"usage_count": 0, "last_used": None})
-
-
 # ==================== 原生 Provider 认证管理 ====================
 class AuthManager:
     """认证凭证管理器 - 管理 auth.json 文件的读写操作
@@ -1684,11 +979,25 @@ STATUS_BG_COLORS = {
 }
 
 
+# 分阶段耗时堆叠条颜色（与 Web 端 style.css 中的 .occm-phase-* 一致）
+PHASE_COLORS = {
+    "dns": "#a371f7",
+    "connect": "#58a6ff",
+    "tls": "#3fb950",
+    "send": "#9aa4b2",
+    "ttfb": "#f0883e",
+}
+
+
 def _format_latency(value: Optional[int]) -> str:
     return f"{value} ms" if isinstance(value, int) else "—"
 
 
-def _calc_availability(history: Deque[MonitorResult]) -> Optional[float]:
+def _format_tps(value: Optional[float]) -> str:
+    return f"{value:.1f} t/s" if isinstance(value, (int, float)) else "—"
+
+
+def _calc_availability(history: List[MonitorResult]) -> Optional[float]:
     if not history:
         return None
     total = len(history)
@@ -1698,24 +1007,7 @@ def _calc_availability(history: Deque[MonitorResult]) -> Optional[float]:
     return ok * 100.0 / total
 
 
-def _measure_ping(origin: str, timeout_sec: float = 3.0) -> Optional[int]:
-    if not origin:
-        return None
-    parsed = urlparse(origin)
-    host = parsed.hostname
-    if not host:
-        return None
-    port = parsed.port or (443 if parsed.scheme == "https" else 80)
-    start = time.time()
-    try:
-        sock = socket.create_connection((host, port), timeout=timeout_sec)
-        sock.close()
-    except Exception:
-        return None
-    return int((time.time() - start) * 1000)
-
-
-def _safe_json_load(data: bytes) -> Optional[Dict[str, Any]]:
+def _safe_json_load(data: bytes) -> Optional[Dict[str, Any]]:
     try:
         return json.loads(data.decode("utf-8"))
     except Exception:
@@ -1734,6 +1026,8 @@ from PyQt5.QtCore import (
     Q_ARG,
     pyqtSlot,
     QSize,
+    QAbstractTableModel,
+    QModelIndex,
 )
 from PyQt5.QtGui import (
     QIcon,
@@ -1811,8 +1105,10 @@ from qfluentwidgets import (
     GroupHeaderCardWidget,
     CardWidget,
     TableWidget,
+    TableView,
     TreeWidget,
     ListWidget,
+    ListView,
     FlowLayout,
     ExpandLayout,
     Pivot,
@@ -2181,8 +1477,10 @@ AUTHOR_GITHUB = "https://github.com/icysaintdx"
 
 # 监控页面配置
 MONITOR_POLL_INTERVAL_MS = 60000
-MONITOR_HISTORY_LIMIT = 60
-DEGRADED_THRESHOLD_MS = 6000
+# 探测结果按帧合并后刷新表格（约 30 帧/秒）
+MONITOR_FRAME_INTERVAL_MS = 33
+# 模型选择对话框：输入停顿该时长后再执行搜索
+MODEL_SEARCH_DEBOUNCE_MS = 150
 
 # ==================== 版本检查配置 ====================
 STARTUP_VERSION_CHECK_ENABLED = True  # 启动时是否检查版本
@@ -2966,364 +2264,13 @@ def get_tooltip(key: str) -> str:
 
 
 # ==================== 预设常用模型（含完整配置） ====================
-# 根据 OpenCode 官方文档 (https://opencode.ai/docs/models/)
+# 预设模型、配置包与 SDK 兼容关系保存在 occm_core/data/model_presets.json，
+# 由 occm_core.model_index 首次使用时加载，与 Web 端、配置校验共用
 # - options: 模型的默认配置参数，每次调用都会使用
 # - variants: 可切换的变体配置，用户可通过 variant_cycle 快捷键切换
-PRESET_MODEL_CONFIGS = {
-    "Claude 系列": {
-        "sdk": "@ai-sdk/anthropic",
-        "models": {
-            "claude-opus-4-5-20251101": {
-                "name": "Claude Opus 4.5",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 32000},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinking": {"type": "enabled", "budgetTokens": 16000}},
-                "variants": {},
-                "description": "最强大的Claude模型，支持extended thinking模式\noptions.thinking.budgetTokens 控制思考预算",
-            },
-            "claude-sonnet-4-5-20250929": {
-                "name": "Claude Sonnet 4.5",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 16000},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinking": {"type": "enabled", "budgetTokens": 8000}},
-                "variants": {},
-                "description": "平衡性能与成本的Claude模型，支持thinking模式",
-            },
-            "claude-sonnet-4-20250514": {
-                "name": "Claude Sonnet 4",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 8192},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "Claude Sonnet 4基础版，不支持thinking",
-            },
-            "claude-haiku-4-5-20250514": {
-                "name": "Claude Haiku 4.5",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 8192},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "快速响应的轻量级Claude模型",
-            },
-        },
-    },
-    "OpenAI/Codex 系列": {
-        "sdk": "@ai-sdk/openai",
-        "models": {
-            "gpt-5": {
-                "name": "GPT-5",
-                "attachment": True,
-                "limit": {"context": 256000, "output": 32768},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {
-                    "reasoningEffort": "high",
-                    "textVerbosity": "low",
-                    "reasoningSummary": "auto",
-                },
-                "variants": {
-                    "high": {
-                        "reasoningEffort": "high",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                    "medium": {
-                        "reasoningEffort": "medium",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                    "low": {
-                        "reasoningEffort": "low",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                    "xhigh": {
-                        "reasoningEffort": "xhigh",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                },
-                "description": "OpenAI最新旗舰模型\noptions.reasoningEffort: high/medium/low/xhigh",
-            },
-            "gpt-5.1-codex": {
-                "name": "GPT-5.1 Codex",
-                "attachment": True,
-                "limit": {"context": 256000, "output": 65536},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"reasoningEffort": "high", "textVerbosity": "low"},
-                "variants": {
-                    "high": {"reasoningEffort": "high"},
-                    "medium": {"reasoningEffort": "medium"},
-                    "low": {"reasoningEffort": "low"},
-                },
-                "description": "OpenAI代码专用模型，针对编程任务优化",
-            },
-            "gpt-4o": {
-                "name": "GPT-4o",
-                "attachment": True,
-                "limit": {"context": 128000, "output": 16384},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "OpenAI多模态模型",
-            },
-            "o1-preview": {
-                "name": "o1 Preview",
-                "attachment": False,
-                "limit": {"context": 128000, "output": 32768},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {"reasoningEffort": "high"},
-                "variants": {
-                    "high": {"reasoningEffort": "high"},
-                    "medium": {"reasoningEffort": "medium"},
-                    "low": {"reasoningEffort": "low"},
-                },
-                "description": "OpenAI推理模型，支持reasoningEffort参数",
-            },
-            "o3-mini": {
-                "name": "o3 Mini",
-                "attachment": False,
-                "limit": {"context": 200000, "output": 100000},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {"reasoningEffort": "high"},
-                "variants": {
-                    "high": {"reasoningEffort": "high"},
-                    "medium": {"reasoningEffort": "medium"},
-                    "low": {"reasoningEffort": "low"},
-                },
-                "description": "OpenAI最新推理模型",
-            },
-        },
-    },
-    "Gemini 系列": {
-        "sdk": "@ai-sdk/google",
-        "models": {
-            "gemini-3-pro": {
-                "name": "Gemini 3 Pro",
-                "attachment": True,
-                "limit": {"context": 2097152, "output": 65536},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinkingConfig": {"thinkingBudget": 8000}},
-                "variants": {
-                    "low": {"thinkingConfig": {"thinkingBudget": 4000}},
-                    "high": {"thinkingConfig": {"thinkingBudget": 16000}},
-                    "max": {"thinkingConfig": {"thinkingBudget": 32000}},
-                },
-                "description": "Google最新Pro模型，支持thinking模式",
-            },
-            "gemini-2.0-flash": {
-                "name": "Gemini 2.0 Flash",
-                "attachment": True,
-                "limit": {"context": 1048576, "output": 8192},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinkingConfig": {"thinkingBudget": 4000}},
-                "variants": {
-                    "low": {"thinkingConfig": {"thinkingBudget": 2000}},
-                    "high": {"thinkingConfig": {"thinkingBudget": 8000}},
-                },
-                "description": "Google Flash模型，支持thinking模式",
-            },
-            "gemini-2.0-flash-thinking-exp": {
-                "name": "Gemini 2.0 Flash Thinking",
-                "attachment": True,
-                "limit": {"context": 1048576, "output": 65536},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinkingConfig": {"thinkingBudget": 10000}},
-                "variants": {},
-                "description": "Gemini专用thinking实验模型",
-            },
-            "gemini-1.5-pro": {
-                "name": "Gemini 1.5 Pro",
-                "attachment": True,
-                "limit": {"context": 2097152, "output": 8192},
-                "modalities": {
-                    "input": ["text", "image", "audio", "video"],
-                    "output": ["text"],
-                },
-                "options": {},
-                "variants": {},
-                "description": "超长上下文的Gemini Pro模型",
-            },
-        },
-    },
-    "其他模型": {
-        "sdk": "@ai-sdk/openai-compatible",
-        "models": {
-            "minimax-m2.1": {
-                "name": "Minimax M2.1",
-                "attachment": False,
-                "limit": {"context": 128000, "output": 16384},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "Minimax M2.1模型",
-            },
-            "deepseek-chat": {
-                "name": "DeepSeek Chat",
-                "attachment": False,
-                "limit": {"context": 64000, "output": 8192},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "DeepSeek对话模型",
-            },
-            "deepseek-reasoner": {
-                "name": "DeepSeek Reasoner",
-                "attachment": False,
-                "limit": {"context": 64000, "output": 8192},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "DeepSeek推理模型",
-            },
-            "qwen-max": {
-                "name": "Qwen Max",
-                "attachment": False,
-                "limit": {"context": 32000, "output": 8192},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "阿里通义千问Max模型",
-            },
-        },
-    },
-}
-
-# 简化的模型列表（用于下拉选择）
-PRESET_MODELS = {
-    category: list(data["models"].keys())
-    for category, data in PRESET_MODEL_CONFIGS.items()
-}
-
-PRESET_SDKS = [
-    "@ai-sdk/anthropic",
-    "@ai-sdk/openai",
-    "@ai-sdk/google",
-    "@ai-sdk/azure",
-    "@ai-sdk/openai-compatible",
-]
-
-# 模型配置包预设（用于批量添加时的可选模板）
-MODEL_PRESET_PACKS = {
-    "Claude 系列": {
-        "默认": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "enabled", "budgetTokens": 16000}},
-            "variants": {},
-        },
-        "高思考": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "enabled", "budgetTokens": 32000}},
-            "variants": {},
-        },
-        "最大思考": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "enabled", "budgetTokens": 64000}},
-            "variants": {},
-        },
-        "轻量": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "disabled"}},
-            "variants": {},
-        },
-    },
-    "OpenAI/Codex 系列": {
-        "基础": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {},
-            "variants": {},
-        },
-        "fast": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"reasoningEffort": "low"},
-            "variants": {},
-        },
-        "high": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"reasoningEffort": "high"},
-            "variants": {},
-        },
-        "xhigh": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"reasoningEffort": "xhigh"},
-            "variants": {},
-        },
-    },
-    "Gemini 系列": {
-        "默认": {
-            "attachment": True,
-            "modalities": {"input": ["text", "image"], "output": ["text"]},
-            "limit": {"context": 1048576, "output": 8192},
-            "options": {"thinkingConfig": {"thinkingBudget": 8000}},
-            "variants": {},
-        },
-        "16k": {
-            "attachment": True,
-            "modalities": {"input": ["text", "image"], "output": ["text"]},
-            "limit": {"context": 1048576, "output": 8192},
-            "options": {"thinkingConfig": {"thinkingBudget": 16000}},
-            "variants": {},
-        },
-        "高": {
-            "attachment": True,
-            "modalities": {"input": ["text", "image"], "output": ["text"]},
-            "limit": {"context": 1048576, "output": 8192},
-            "options": {"thinkingConfig": {"thinkingBudget": 32000}},
-            "variants": {},
-        },
-    },
-    "其他模型": {
-        "基础": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 64000, "output": 8192},
-            "options": {},
-            "variants": {},
-        }
-    },
-}
-
-MODEL_PRESET_DEFAULT = {
-    "Claude 系列": "默认",
-    "OpenAI/Codex 系列": "基础",
-    "Gemini 系列": "默认",
-    "其他模型": "基础",
-}
-
-MODEL_PRESET_CUSTOM = {
-    "Claude 系列": {},
-    "OpenAI/Codex 系列": {},
-    "Gemini 系列": {},
-    "其他模型": {},
-}
 
-# SDK与模型厂商的对应关系（用于提示）
-SDK_MODEL_COMPATIBILITY = {
-    "@ai-sdk/anthropic": ["Claude 系列"],
-    "@ai-sdk/openai": ["OpenAI/Codex 系列", "其他模型"],
-    "@ai-sdk/google": ["Gemini 系列"],
-    "@ai-sdk/azure": ["OpenAI/Codex 系列"],
-    "@ai-sdk/openai-compatible": ["其他模型"],
-}
+# 用户自定义的配置包（系列 → {包名: 配置}，运行期可修改）
+MODEL_PRESET_CUSTOM: Dict[str, Dict[str, Any]] = {}
 
 # Oh My OpenCode Agent 预设
 PRESET_AGENTS = {
@@ -4903,755 +3850,128 @@ class CLIExportManager:
         """
         results = []
 
-        for cli_type in targets:
-            model = models.get(cli_type, "")
-
-            try:
-                if cli_type == "claude":
-                    result = self.export_to_claude(provider, model)
-                elif cli_type == "codex":
-                    result = self.export_to_codex(provider, model)
-                elif cli_type == "gemini":
-                    result = self.export_to_gemini(provider, model)
-                else:
-                    result = ExportResult.fail(cli_type, f"未知的 CLI 类型: {cli_type}")
-            except Exception as e:
-                result = ExportResult.fail(cli_type, f"导出异常: {e}")
-
-            results.append(result)
-
-        successful = sum(1 for r in results if r.success)
-        failed = len(results) - successful
-
-        return BatchExportResult(
-            total=len(results), successful=successful, failed=failed, results=results
-        )
-
-    def validate_exported_config(self, cli_type: str) -> ValidationResult:
-        """验证导出后的配置
-
-        Args:
-            cli_type: CLI 类型
-
-        Returns:
-            ValidationResult
-        """
-        errors = []
-        warnings = []
-
-        cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
-
-        if cli_type == "claude":
-            settings_path = cli_dir / "settings.json"
-            if not settings_path.exists():
-                errors.append("settings.json 文件不存在")
-            else:
-                try:
-                    with open(settings_path, "r", encoding="utf-8") as f:
-                        config = json.load(f)
-                    if "env" not in config:
-                        errors.append("settings.json 缺少 env 字段")
-                    else:
-                        env = config["env"]
-                        if "ANTHROPIC_BASE_URL" not in env:
-                            errors.append("缺少 ANTHROPIC_BASE_URL")
-                        if "ANTHROPIC_AUTH_TOKEN" not in env:
-                            errors.append("缺少 ANTHROPIC_AUTH_TOKEN")
-                except json.JSONDecodeError as e:
-                    errors.append(f"settings.json 格式错误: {e}")
-                except Exception as e:
-                    errors.append(f"读取 settings.json 失败: {e}")
-
-        elif cli_type == "codex":
-            auth_path = cli_dir / "auth.json"
-            config_path = cli_dir / "config.toml"
-
-            if not auth_path.exists():
-                errors.append("auth.json 文件不存在")
-            else:
-                try:
-                    with open(auth_path, "r", encoding="utf-8") as f:
-                        auth = json.load(f)
-                    if "OPENAI_API_KEY" not in auth:
-                        errors.append("auth.json 缺少 OPENAI_API_KEY")
-                except json.JSONDecodeError as e:
-                    errors.append(f"auth.json 格式错误: {e}")
-                except Exception as e:
-                    errors.append(f"读取 auth.json 失败: {e}")
-
-            if not config_path.exists():
-                errors.append("config.toml 文件不存在")
-            else:
-                try:
-                    with open(config_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    if "model_provider" not in content:
-                        errors.append("config.toml 缺少 model_provider")
-                    if "model =" not in content:
-                        errors.append("config.toml 缺少 model")
-                except Exception as e:
-                    errors.append(f"读取 config.toml 失败: {e}")
-
-        elif cli_type == "gemini":
-            env_path = cli_dir / ".env"
-            settings_path = cli_dir / "settings.json"
-
-            if not env_path.exists():
-                errors.append(".env 文件不存在")
-            else:
-                try:
-                    with open(env_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    if "GEMINI_API_KEY" not in content:
-                        errors.append(".env 缺少 GEMINI_API_KEY")
-                    if "GOOGLE_GEMINI_BASE_URL" not in content:
-                        errors.append(".env 缺少 GOOGLE_GEMINI_BASE_URL")
-                except Exception as e:
-                    errors.append(f"读取 .env 失败: {e}")
-
-            if not settings_path.exists():
-                warnings.append("settings.json 文件不存在")
-            else:
-                try:
-                    with open(settings_path, "r", encoding="utf-8") as f:
-                        config = json.load(f)
-                    if "security" not in config:
-                        warnings.append("settings.json 缺少 security 字段")
-                except json.JSONDecodeError as e:
-                    errors.append(f"settings.json 格式错误: {e}")
-                except Exception as e:
-                    errors.append(f"读取 settings.json 失败: {e}")
-
-        if errors:
-            return ValidationResult.failure(errors, warnings)
-        return ValidationResult(valid=True, errors=[], warnings=warnings)
-
-
-class ConfigValidator:
-    """配置文件验证器 - 检查 OpenCode 配置格式是否正确"""
-
-    @staticmethod
-    def _is_blank(value: Any) -> bool:
-        if value is None:
-            return True
-        if isinstance(value, str):
-            return value.strip() == ""
-        return False
-
-    # Provider 必需字段
-    PROVIDER_REQUIRED_FIELDS = ["npm", "options"]
-    # Provider options 必需字段
-    PROVIDER_OPTIONS_REQUIRED = ["baseURL", "apiKey"]
-    # Model 推荐字段
-    MODEL_RECOMMENDED_FIELDS = ["name", "limit"]
-    # Oh My OpenCode 必需字段
-    OHMY_AGENT_REQUIRED_FIELDS = ["model"]
-    OHMY_CATEGORY_REQUIRED_FIELDS = ["model"]
-    # 有效的 npm 包
-    VALID_NPM_PACKAGES = [
-        "@ai-sdk/anthropic",
-        "@ai-sdk/openai",
-        "@ai-sdk/openai-compatible",
-        "@ai-sdk/google",
-        "@ai-sdk/azure",
-        "@ai-sdk/amazon-bedrock",
-        "@ai-sdk/google-vertex",
-        "@ai-sdk/mistral",
-        "@ai-sdk/xai",
-        "@ai-sdk/togetherai",
-        "@ai-sdk/cohere",
-        "@ai-sdk/deepseek",
-    ]
-
-    @staticmethod
-    def validate_opencode_config(config: Dict) -> List[Dict]:
-        """
-        验证 OpenCode 配置文件
-        返回问题列表: [{"level": "error/warning", "path": "provider.xxx", "message": "..."}]
-        """
-        issues = []
-
-        # 区分 None 和空字典
-        if config is None:
-            issues.append(
-                {
-                    "level": "error",
-                    "path": "root",
-                    "message": "配置文件无法解析或读取失败",
-                }
-            )
-            return issues
-
-        if not isinstance(config, dict):
-            issues.append(
-                {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
-            )
-            return issues
-
-        # 空配置降级为警告（而非错误）
-        if not config or config == {}:
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "root",
-                    "message": "配置为空，尚未添加任何Provider",
-                }
-            )
-            return issues
-
-        # 验证 $schema
-        schema = config.get("$schema")
-        if schema != "https://opencode.ai/config.json":
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "$schema",
-                    "message": "建议设置 $schema 为 https://opencode.ai/config.json",
-                }
-            )
-
-        # 验证 provider 部分
-        providers = config.get("provider", {})
-        if not providers:
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "provider",
-                    "message": "未配置任何 Provider",
-                }
-            )
-        if not isinstance(providers, dict):
-            issues.append(
-                {
-                    "level": "error",
-                    "path": "provider",
-                    "message": "provider 必须是对象类型",
-                }
-            )
-            return issues
-
-        for provider_name, provider_data in providers.items():
-            provider_path = f"provider.{provider_name}"
-
-            # 检查 provider 值是否为字典
-            if not isinstance(provider_data, dict):
-                issues.append(
-                    {
-                        "level": "error",
-                        "path": provider_path,
-                        "message": f"Provider '{provider_name}' 的值必须是对象，当前是 {type(provider_data).__name__}",
-                    }
-                )
-                continue
-
-            # 检查必需字段
-            for field in ConfigValidator.PROVIDER_REQUIRED_FIELDS:
-                if field not in provider_data:
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": f"{provider_path}.{field}",
-                            "message": f"Provider '{provider_name}' 缺少必需字段 '{field}'",
-                        }
-                    )
-                elif ConfigValidator._is_blank(provider_data.get(field)):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": f"{provider_path}.{field}",
-                            "message": f"Provider '{provider_name}' 的 '{field}' 为空",
-                        }
-                    )
-
-            # 检查 npm 包是否有效
-            npm = provider_data.get("npm", "")
-            if npm and npm not in ConfigValidator.VALID_NPM_PACKAGES:
-                issues.append(
-                    {
-                        "level": "warning",
-                        "path": f"{provider_path}.npm",
-                        "message": f"Provider '{provider_name}' 的 npm 包 '{npm}' 不在已知列表中",
-                    }
-                )
-
-            # 检查 options
-            options = provider_data.get("options", {})
-            if not isinstance(options, dict):
-                issues.append(
-                    {
-                        "level": "error",
-                        "path": f"{provider_path}.options",
-                        "message": f"Provider '{provider_name}' 的 options 必须是对象",
-                    }
-                )
-            else:
-                for opt_field in ConfigValidator.PROVIDER_OPTIONS_REQUIRED:
-                    if opt_field not in options:
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{provider_path}.options.{opt_field}",
-                                "message": f"Provider '{provider_name}' 的 options 缺少 '{opt_field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(options.get(opt_field)):
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{provider_path}.options.{opt_field}",
-                                "message": f"Provider '{provider_name}' 的 options.{opt_field} 为空",
-                            }
-                        )
-
-            # 检查 models
-            models = provider_data.get("models", {})
-            if not isinstance(models, dict):
-                issues.append(
-                    {
-                        "level": "error",
-                        "path": f"{provider_path}.models",
-                        "message": f"Provider '{provider_name}' 的 models 必须是对象",
-                    }
-                )
-            else:
-                if not models:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{provider_path}.models",
-                            "message": f"Provider '{provider_name}' 没有配置任何模型",
-                        }
-                    )
-                for model_id, model_data in models.items():
-                    model_path = f"{provider_path}.models.{model_id}"
-                    if ConfigValidator._is_blank(model_id):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": model_path,
-                                "message": f"Provider '{provider_name}' 存在空模型ID",
-                            }
-                        )
-                        continue
-                    if not isinstance(model_data, dict):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": model_path,
-                                "message": f"Model '{model_id}' 的值必须是对象",
-                            }
-                        )
-                        continue
-
-                    # 检查 limit 字段
-                    limit = model_data.get("limit", {})
-                    if not isinstance(limit, dict):
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{model_path}.limit",
-                                "message": f"Model '{model_id}' 的 limit 应该是对象",
-                            }
-                        )
-                    elif limit:
-                        context = limit.get("context")
-                        output = limit.get("output")
-                        if context is not None and not isinstance(context, int):
-                            issues.append(
-                                {
-                                    "level": "warning",
-                                    "path": f"{model_path}.limit.context",
-                                    "message": f"Model '{model_id}' 的 context 应该是整数",
-                                }
-                            )
-                        if output is not None and not isinstance(output, int):
-                            issues.append(
-                                {
-                                    "level": "warning",
-                                    "path": f"{model_path}.limit.output",
-                                    "message": f"Model '{model_id}' 的 output 应该是整数",
-                                }
-                            )
-
-        # 验证 mcp 部分
-        mcp = config.get("mcp", {})
-        if mcp and not isinstance(mcp, dict):
-            issues.append(
-                {"level": "error", "path": "mcp", "message": "mcp 必须是对象类型"}
-            )
-        elif isinstance(mcp, dict):
-            for mcp_name, mcp_data in mcp.items():
-                mcp_path = f"mcp.{mcp_name}"
-                if not isinstance(mcp_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": mcp_path,
-                            "message": f"MCP '{mcp_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-
-                mcp_type = mcp_data.get("type")
-                if mcp_type == "local" and "command" not in mcp_data:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{mcp_path}.command",
-                            "message": f"Local MCP '{mcp_name}' 缺少 command 字段",
-                        }
-                    )
-                elif mcp_type == "remote" and "url" not in mcp_data:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{mcp_path}.url",
-                            "message": f"Remote MCP '{mcp_name}' 缺少 url 字段",
-                        }
-                    )
-
-        # 验证 agent 部分
-        agent = config.get("agent", {})
-        if agent and not isinstance(agent, dict):
-            issues.append(
-                {"level": "error", "path": "agent", "message": "agent 必须是对象类型"}
-            )
-
-        return issues
-
-    @staticmethod
-    def validate_ohmyopencode_config(config: Dict) -> List[Dict]:
-        """
-        验证 Oh My OpenCode 配置文件
-        返回问题列表: [{"level": "error/warning", "path": "agents.xxx", "message": "..."}]
-        """
-        issues = []
-        if not config:
-            issues.append(
-                {"level": "error", "path": "root", "message": "配置文件为空或无法解析"}
-            )
-            return issues
-        if not isinstance(config, dict):
-            issues.append(
-                {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
-            )
-            return issues
-
-        agents = config.get("agents", {})
-        if not agents:
-            issues.append(
-                {"level": "warning", "path": "agents", "message": "未配置任何 Agent"}
-            )
-        if agents and not isinstance(agents, dict):
-            issues.append(
-                {"level": "error", "path": "agents", "message": "agents 必须是对象类型"}
-            )
-            return issues
-
-        if isinstance(agents, dict):
-            for agent_name, agent_data in agents.items():
-                agent_path = f"agents.{agent_name}"
-                if ConfigValidator._is_blank(agent_name):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": agent_path,
-                            "message": "Agent 名称为空",
-                        }
-                    )
-                    continue
-                if not isinstance(agent_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": agent_path,
-                            "message": f"Agent '{agent_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-                for field in ConfigValidator.OHMY_AGENT_REQUIRED_FIELDS:
-                    if field not in agent_data:
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{agent_path}.{field}",
-                                "message": f"Agent '{agent_name}' 缺少必需字段 '{field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(agent_data.get(field)):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{agent_path}.{field}",
-                                "message": f"Agent '{agent_name}' 的 '{field}' 为空",
-                            }
-                        )
-                if "description" in agent_data and ConfigValidator._is_blank(
-                    agent_data.get("description")
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{agent_path}.description",
-                            "message": f"Agent '{agent_name}' 的 description 为空",
-                        }
-                    )
-
-        categories = config.get("categories", {})
-        if not categories:
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "categories",
-                    "message": "未配置任何 Category",
-                }
-            )
-        if categories and not isinstance(categories, dict):
-            issues.append(
-                {
-                    "level": "error",
-                    "path": "categories",
-                    "message": "categories 必须是对象类型",
-                }
-            )
-            return issues
-
-        if isinstance(categories, dict):
-            for category_name, category_data in categories.items():
-                category_path = f"categories.{category_name}"
-                if ConfigValidator._is_blank(category_name):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": category_path,
-                            "message": "Category 名称为空",
-                        }
-                    )
-                    continue
-                if not isinstance(category_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": category_path,
-                            "message": f"Category '{category_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-                for field in ConfigValidator.OHMY_CATEGORY_REQUIRED_FIELDS:
-                    if field not in category_data:
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{category_path}.{field}",
-                                "message": f"Category '{category_name}' 缺少必需字段 '{field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(category_data.get(field)):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{category_path}.{field}",
-                                "message": f"Category '{category_name}' 的 '{field}' 为空",
-                            }
-                        )
-
-                temperature = category_data.get("temperature")
-                if temperature is not None and not isinstance(
-                    temperature, (int, float)
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{category_path}.temperature",
-                            "message": f"Category '{category_name}' 的 temperature 应该是数字",
-                        }
-                    )
-                if "description" in category_data and ConfigValidator._is_blank(
-                    category_data.get("description")
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{category_path}.description",
-                            "message": f"Category '{category_name}' 的 description 为空",
-                        }
-                    )
-
-        return issues
-
-    @staticmethod
-    def fix_provider_structure(config: Dict) -> Tuple[Dict, List[str]]:
-        """
-        修复 Provider 结构问题
-        返回: (修复后的配置, 修复日志列表)
-        """
-        fixes = []
-        if not config:
-            return config, fixes
-
-        providers = config.get("provider", {})
-        if not isinstance(providers, dict):
-            return config, fixes
-
-        fixed_providers = {}
-        for provider_name, provider_data in providers.items():
-            if not isinstance(provider_data, dict):
-                fixes.append(f"跳过无效 Provider '{provider_name}' (值不是对象)")
-                continue
-
-            # 确保必需字段存在
-            fixed_provider = dict(provider_data)
-
-            # 确保 npm 字段存在
-            if "npm" not in fixed_provider:
-                fixed_provider["npm"] = "@ai-sdk/openai"
-                fixes.append(f"Provider '{provider_name}': 添加默认 npm 字段")
+        for cli_type in targets:
+            model = models.get(cli_type, "")
 
-            # 确保 options 字段存在且为对象
-            if "options" not in fixed_provider or not isinstance(
-                fixed_provider.get("options"), dict
-            ):
-                fixed_provider["options"] = fixed_provider.get("options", {})
-                if not isinstance(fixed_provider["options"], dict):
-                    fixed_provider["options"] = {}
-                fixes.append(f"Provider '{provider_name}': 修复 options 字段")
-
-            # 确保 options 中有 baseURL 和 apiKey
-            if "baseURL" not in fixed_provider["options"]:
-                fixed_provider["options"]["baseURL"] = ""
-                fixes.append(f"Provider '{provider_name}': 添加空 baseURL")
-            if "apiKey" not in fixed_provider["options"]:
-                fixed_provider["options"]["apiKey"] = ""
-                fixes.append(f"Provider '{provider_name}': 添加空 apiKey")
-
-            # 确保 models 字段存在且为对象
-            if "models" not in fixed_provider:
-                fixed_provider["models"] = {}
-                fixes.append(f"Provider '{provider_name}': 添加空 models 字段")
-            elif not isinstance(fixed_provider.get("models"), dict):
-                fixed_provider["models"] = {}
-                fixes.append(f"Provider '{provider_name}': 修复 models 字段为对象")
-
-            # 规范化 models.limit，避免写入 limit: {} 触发上游校验失败
-            for model_id, model_cfg in list(fixed_provider.get("models", {}).items()):
-                if not isinstance(model_cfg, dict):
-                    continue
-                if "limit" not in model_cfg:
-                    continue
+            try:
+                if cli_type == "claude":
+                    result = self.export_to_claude(provider, model)
+                elif cli_type == "codex":
+                    result = self.export_to_codex(provider, model)
+                elif cli_type == "gemini":
+                    result = self.export_to_gemini(provider, model)
+                else:
+                    result = ExportResult.fail(cli_type, f"未知的 CLI 类型: {cli_type}")
+            except Exception as e:
+                result = ExportResult.fail(cli_type, f"导出异常: {e}")
 
-                limit = model_cfg.get("limit")
-                if not isinstance(limit, dict):
-                    model_cfg.pop("limit", None)
-                    fixes.append(
-                        f"Provider '{provider_name}' Model '{model_id}': 移除无效 limit"
-                    )
-                    continue
+            results.append(result)
 
-                normalized_limit = {}
-                if isinstance(limit.get("context"), int):
-                    normalized_limit["context"] = limit["context"]
-                if isinstance(limit.get("output"), int):
-                    normalized_limit["output"] = limit["output"]
+        successful = sum(1 for r in results if r.success)
+        failed = len(results) - successful
 
-                if normalized_limit:
-                    model_cfg["limit"] = normalized_limit
-                else:
-                    model_cfg.pop("limit", None)
-                    fixes.append(
-                        f"Provider '{provider_name}' Model '{model_id}': 移除空 limit"
-                    )
+        return BatchExportResult(
+            total=len(results), successful=successful, failed=failed, results=results
+        )
 
-            # 规范化字段顺序: npm, name, options, models
-            ordered_provider = {}
-            if "npm" in fixed_provider:
-                ordered_provider["npm"] = fixed_provider["npm"]
-            if "name" in fixed_provider:
-                ordered_provider["name"] = fixed_provider["name"]
-            if "options" in fixed_provider:
-                ordered_provider["options"] = fixed_provider["options"]
-            if "models" in fixed_provider:
-                ordered_provider["models"] = fixed_provider["models"]
-            # 保留其他字段
-            for k, v in fixed_provider.items():
-                if k not in ordered_provider:
-                    ordered_provider[k] = v
-
-            fixed_providers[provider_name] = ordered_provider
-
-        config["provider"] = fixed_providers
-        return config, fixes
+    def validate_exported_config(self, cli_type: str) -> ValidationResult:
+        """验证导出后的配置
 
-    @staticmethod
-    def get_issues_summary(issues: List[Dict]) -> str:
-        """生成问题摘要"""
-        errors = [i for i in issues if i["level"] == "error"]
-        warnings = [i for i in issues if i["level"] == "warning"]
+        Args:
+            cli_type: CLI 类型
 
-        lines = []
-        if errors:
-            lines.append(f"❌ {len(errors)} 个错误:")
-            for e in errors[:5]:  # 最多显示5个
-                lines.append(f"  • {e['message']}")
-            if len(errors) > 5:
-                lines.append(f"  ... 还有 {len(errors) - 5} 个错误")
+        Returns:
+            ValidationResult
+        """
+        errors = []
+        warnings = []
 
-        if warnings:
-            lines.append(f"⚠️ {len(warnings)} 个警告:")
-            for w in warnings[:5]:
-                lines.append(f"  • {w['message']}")
-            if len(warnings) > 5:
-                lines.append(f"  ... 还有 {len(warnings) - 5} 个警告")
+        cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
 
-        return "\n".join(lines) if lines else "✅ 配置格式正确"
+        if cli_type == "claude":
+            settings_path = cli_dir / "settings.json"
+            if not settings_path.exists():
+                errors.append("settings.json 文件不存在")
+            else:
+                try:
+                    with open(settings_path, "r", encoding="utf-8") as f:
+                        config = json.load(f)
+                    if "env" not in config:
+                        errors.append("settings.json 缺少 env 字段")
+                    else:
+                        env = config["env"]
+                        if "ANTHROPIC_BASE_URL" not in env:
+                            errors.append("缺少 ANTHROPIC_BASE_URL")
+                        if "ANTHROPIC_AUTH_TOKEN" not in env:
+                            errors.append("缺少 ANTHROPIC_AUTH_TOKEN")
+                except json.JSONDecodeError as e:
+                    errors.append(f"settings.json 格式错误: {e}")
+                except Exception as e:
+                    errors.append(f"读取 settings.json 失败: {e}")
 
+        elif cli_type == "codex":
+            auth_path = cli_dir / "auth.json"
+            config_path = cli_dir / "config.toml"
 
-class ModelRegistry:
-    """模型注册表 - 管理所有已配置的模型"""
+            if not auth_path.exists():
+                errors.append("auth.json 文件不存在")
+            else:
+                try:
+                    with open(auth_path, "r", encoding="utf-8") as f:
+                        auth = json.load(f)
+                    if "OPENAI_API_KEY" not in auth:
+                        errors.append("auth.json 缺少 OPENAI_API_KEY")
+                except json.JSONDecodeError as e:
+                    errors.append(f"auth.json 格式错误: {e}")
+                except Exception as e:
+                    errors.append(f"读取 auth.json 失败: {e}")
 
-    def __init__(
-        self,
-        opencode_config: Optional[Dict],
-        auth_manager: Optional[AuthManager] = None,
-    ):
-        self.config = opencode_config or {}
-        self.auth_manager = auth_manager or AuthManager()
-        self.models: Dict[str, bool] = {}
-        self.native_providers: Dict[str, bool] = {}  # 已配置的原生 Provider
-        self.refresh()
-
-    def refresh(self):
-        self.models = {}
-        self.native_providers = {}
-
-        # 获取自定义 Provider 的模型
-        providers = self.config.get("provider", {})
-        for provider_name, provider_data in providers.items():
-            if not isinstance(provider_data, dict):
-                continue
-            models = provider_data.get("models", {})
-            for model_id in models.keys():
-                full_ref = f"{provider_name}/{model_id}"
-                self.models[full_ref] = True
+            if not config_path.exists():
+                errors.append("config.toml 文件不存在")
+            else:
+                try:
+                    with open(config_path, "r", encoding="utf-8") as f:
+                        content = f.read()
+                    if "model_provider" not in content:
+                        errors.append("config.toml 缺少 model_provider")
+                    if "model =" not in content:
+                        errors.append("config.toml 缺少 model")
+                except Exception as e:
+                    errors.append(f"读取 config.toml 失败: {e}")
 
-        # 获取已配置的原生 Provider
-        try:
-            auth_data = self.auth_manager.read_auth()
-            for provider_id in auth_data:
-                if auth_data[provider_id]:  # 有认证数据
-                    self.native_providers[provider_id] = True
-        except Exception:
-            pass
+        elif cli_type == "gemini":
+            env_path = cli_dir / ".env"
+            settings_path = cli_dir / "settings.json"
 
-    def get_all_models(self) -> List[str]:
-        return list(self.models.keys())
+            if not env_path.exists():
+                errors.append(".env 文件不存在")
+            else:
+                try:
+                    with open(env_path, "r", encoding="utf-8") as f:
+                        content = f.read()
+                    if "GEMINI_API_KEY" not in content:
+                        errors.append(".env 缺少 GEMINI_API_KEY")
+                    if "GOOGLE_GEMINI_BASE_URL" not in content:
+                        errors.append(".env 缺少 GOOGLE_GEMINI_BASE_URL")
+                except Exception as e:
+                    errors.append(f"读取 .env 失败: {e}")
 
-    def get_configured_native_providers(self) -> List[str]:
-        """获取已配置的原生 Provider ID 列表"""
-        return list(self.native_providers.keys())
+            if not settings_path.exists():
+                warnings.append("settings.json 文件不存在")
+            else:
+                try:
+                    with open(settings_path, "r", encoding="utf-8") as f:
+                        config = json.load(f)
+                    if "security" not in config:
+                        warnings.append("settings.json 缺少 security 字段")
+                except json.JSONDecodeError as e:
+                    errors.append(f"settings.json 格式错误: {e}")
+                except Exception as e:
+                    errors.append(f"读取 settings.json 失败: {e}")
 
-    def is_native_provider_configured(self, provider_id: str) -> bool:
-        """检查原生 Provider 是否已配置"""
-        return provider_id in self.native_providers
+        if errors:
+            return ValidationResult.failure(errors, warnings)
+        return ValidationResult(valid=True, errors=[], warnings=warnings)
 
 
 class ImportService:
@@ -6133,88 +4453,87 @@ class ImportService:
 
 
 class ModelFetchService(QObject):
-    """模型列表获取服务"""
+    """模型列表获取服务（基于 occm_core 共享的 ModelCatalog 缓存）
+
+    已缓存的列表立即返回（过期时在后台条件请求刷新，供下次使用）；
+    从未获取过或 force=True 时才等待网络请求。
+    """
 
     fetch_finished = pyqtSignal(str, list, str)  # provider_name, model_ids, error
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._catalog = get_model_catalog()
 
-    def fetch_async(self, provider_name: str, options: Dict[str, Any]) -> None:
-        thread = threading.Thread(
-            target=self._fetch_models, args=(provider_name, options), daemon=True
-        )
-        thread.start()
-
-    def _build_urls(self, options: Dict[str, Any]) -> List[str]:
-        base_url = (options.get("baseURL") or "").strip()
-        urls: List[str] = []
-
+    def fetch_async(
+        self, provider_name: str, options: Dict[str, Any], force: bool = False
+    ) -> None:
+        # 与监控 / 批量刷新相同的规范化，保证共享缓存的键一致
+        base_url = _safe_base_url(options.get("baseURL") or "")
+        api_key_raw = options.get("apiKey") or ""
+        api_key = _resolve_env_value(api_key_raw) if api_key_raw else ""
         if not base_url:
-            return urls
+            QTimer.singleShot(
+                0, lambda: self.fetch_finished.emit(provider_name, [], "未配置模型列表地址")
+            )
+            return
+        if not force:
+            entry = self._catalog.cached(base_url, api_key)
+            if entry is not None and entry.model_ids:
+                self._catalog.get(base_url, api_key)
+                model_ids = list(entry.model_ids)
+                # 延后到事件循环发出，与网络获取时的调用顺序保持一致
+                QTimer.singleShot(
+                    0, lambda: self.fetch_finished.emit(provider_name, model_ids, "")
+                )
+                return
+        future = self._catalog.revalidate_async(base_url, api_key)
+        future.add_done_callback(partial(self._on_fetch_done, provider_name))
 
-        if base_url.rstrip("/").endswith("/v1"):
-            urls.append(base_url.rstrip("/") + "/models")
-            return urls
+    def _on_fetch_done(self, provider_name: str, future) -> None:
+        try:
+            entry = future.result()
+        except Exception as e:
+            self.fetch_finished.emit(provider_name, [], str(e) or "获取失败")
+            return
+        if entry.model_ids:
+            # 刷新失败但有上一次成功的列表时继续使用旧列表
+            self.fetch_finished.emit(provider_name, list(entry.model_ids), "")
+        else:
+            self.fetch_finished.emit(provider_name, [], entry.error or "获取失败")
 
-        urls.append(base_url.rstrip("/") + "/v1/models")
-        urls.append(base_url.rstrip("/") + "/models")
-        return urls
 
-    def _extract_model_ids(self, data: Any) -> List[str]:
-        model_ids: List[str] = []
-        if isinstance(data, dict):
-            items = None
-            if isinstance(data.get("data"), list):
-                items = data.get("data")
-            elif isinstance(data.get("models"), list):
-                items = data.get("models")
-            elif isinstance(data.get("result"), list):
-                items = data.get("result")
-            if items is not None:
-                for item in items:
-                    if isinstance(item, dict):
-                        model_id = item.get("id") or item.get("name") or ""
-                        if model_id:
-                            model_ids.append(str(model_id))
-                    elif isinstance(item, str):
-                        model_ids.append(item)
-        elif isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict):
-                    model_id = item.get("id") or item.get("name") or ""
-                    if model_id:
-                        model_ids.append(str(model_id))
-                elif isinstance(item, str):
-                    model_ids.append(item)
-        return model_ids
-
-    def _fetch_models(self, provider_name: str, options: Dict[str, Any]) -> None:
-        urls = self._build_urls(options)
-        if not urls:
-            self.fetch_finished.emit(provider_name, [], "未配置模型列表地址")
-            return
+class ModelRefreshWorker(QObject):
+    """后台并发刷新所有 Provider 的模型列表，进度经信号回到主线程"""
 
-        api_key = (options.get("apiKey") or "").strip()
-        headers = {"User-Agent": "OpenCode-Config-Manager"}
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
+    progress = pyqtSignal(int, int, str)  # done, total, provider_key
+    finished = pyqtSignal(object)  # RefreshReport
 
-        last_error = ""
-        for url in urls:
-            try:
-                req = urllib.request.Request(url, headers=headers)
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    data = json.loads(response.read().decode("utf-8"))
-                model_ids = self._extract_model_ids(data)
-                if model_ids:
-                    self.fetch_finished.emit(provider_name, model_ids, "")
-                    return
-                last_error = "未返回可用模型列表"
-            except Exception as e:
-                last_error = str(e)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.running = False
 
-        self.fetch_finished.emit(provider_name, [], last_error or "获取失败")
+    def start(self, opencode_config: Optional[Dict[str, Any]]) -> int:
+        """开始刷新，返回 Provider 数量（为 0 时不启动）"""
+        targets = refresh_targets_from_config(opencode_config)
+        if not targets:
+            return 0
+        self.running = True
+        thread = threading.Thread(target=self._run, args=(targets,), daemon=True)
+        thread.start()
+        return len(targets)
+
+    def _run(self, targets) -> None:
+        try:
+            report = ModelRefresher().refresh_all(
+                targets,
+                on_progress=lambda p: self.progress.emit(
+                    p.done, p.total, p.result.provider_key
+                ),
+            )
+        finally:
+            self.running = False
+        self.finished.emit(report)
 
 
 class VersionChecker(QObject):
@@ -6308,6 +4627,252 @@ class VersionChecker(QObject):
             return False
 
 
+# ==================== 虚拟化列表 ====================
+@dataclass
+class TableCell:
+    """带提示 / 前景色的单元格；普通单元格直接用字符串"""
+
+    text: str
+    tooltip: str = ""
+    color: str = ""
+
+
+@dataclass
+class TableRecord:
+    """表格中的一行：key 唯一标识该行，data 为附带的对象（Qt.UserRole）"""
+
+    key: str
+    cells: List[Any]
+    data: Any = None
+
+
+class RecordTableModel(QAbstractTableModel):
+    """按 key 定位行的只读表格模型
+
+    视图只向模型请求可见单元格，不再为每行创建 QTableWidgetItem / 行控件。
+    set_records 在行的 key 序列不变时只对内容变化的行发出 dataChanged，
+    key 序列变化时才整体重置。checkable=True 时第 0 列带复选框，勾选状态
+    按 key 保存，筛选、重载后保持。
+    """
+
+    check_changed = pyqtSignal()
+
+    def __init__(self, headers: List[str], parent=None, checkable: bool = False):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._records: List[TableRecord] = []
+        self._rows: Dict[str, int] = {}
+        self.checkable = checkable
+        self.checked: set = set()
+
+    # ---- Qt 接口 ----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._records)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if (
+            role == Qt.DisplayRole
+            and orientation == Qt.Horizontal
+            and 0 <= section < len(self._headers)
+        ):
+            return self._headers[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        # 勾选由视图的点击统一切换，不经委托的 editorEvent，避免一次点击切换两次
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._records):
+            return None
+        record = self._records[index.row()]
+        column = index.column()
+        if role == Qt.UserRole:
+            return record.data if record.data is not None else record.key
+        if role == Qt.CheckStateRole:
+            if self.checkable and column == 0:
+                return Qt.Checked if record.key in self.checked else Qt.Unchecked
+            return None
+        cell = record.cells[column] if column < len(record.cells) else ""
+        if role == Qt.DisplayRole:
+            return cell.text if isinstance(cell, TableCell) else str(cell)
+        if isinstance(cell, TableCell):
+            if role == Qt.ToolTipRole and cell.tooltip:
+                return cell.tooltip
+            if role == Qt.ForegroundRole and cell.color:
+                return QColor(cell.color)
+        return None
+
+    # ---- 数据 ----
+
+    def set_records(self, records: List[TableRecord]) -> None:
+        if [r.key for r in records] == [r.key for r in self._records]:
+            old = self._records
+            self._records = list(records)
+            last = len(self._headers) - 1
+            start = None
+            # 连续变化的行合并为一次 dataChanged
+            for row, (before, after) in enumerate(zip(old, records)):
+                changed = before.cells != after.cells or before.data != after.data
+                if changed and start is None:
+                    start = row
+                elif not changed and start is not None:
+                    self.dataChanged.emit(
+                        self.index(start, 0), self.index(row - 1, last)
+                    )
+                    start = None
+            if start is not None:
+                self.dataChanged.emit(
+                    self.index(start, 0), self.index(len(records) - 1, last)
+                )
+            return
+        self.beginResetModel()
+        self._records = list(records)
+        self._rows = {r.key: row for row, r in enumerate(self._records)}
+        self.endResetModel()
+
+    def update_record(self, record: TableRecord) -> None:
+        row = self._rows.get(record.key)
+        if row is None:
+            return
+        self._records[row] = record
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self._headers) - 1)
+        )
+
+    def keys(self) -> List[str]:
+        return [r.key for r in self._records]
+
+    def key_at(self, row: int) -> Optional[str]:
+        if 0 <= row < len(self._records):
+            return self._records[row].key
+        return None
+
+    def record_at(self, row: int) -> Optional[TableRecord]:
+        if 0 <= row < len(self._records):
+            return self._records[row]
+        return None
+
+    def row_of(self, key: str) -> int:
+        return self._rows.get(key, -1)
+
+    def set_checked(self, keys, checked: bool) -> None:
+        """批量勾选 / 取消勾选，只对涉及的行发出 dataChanged"""
+        rows = []
+        for key in keys:
+            if checked == (key in self.checked):
+                continue
+            if checked:
+                self.checked.add(key)
+            else:
+                self.checked.discard(key)
+            row = self._rows.get(key)
+            if row is not None:
+                rows.append(row)
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows), 0),
+                self.index(max(rows), 0),
+                [Qt.CheckStateRole],
+            )
+        self.check_changed.emit()
+
+
+class RecordTableView(TableView):
+    """RecordTableModel 的表格视图：固定行高，只绘制可见行
+
+    提供 currentRow / current_key 等与 TableWidget 接近的便捷方法。
+    """
+
+    def __init__(self, headers: List[str], parent=None, checkable: bool = False):
+        super().__init__(parent)
+        self.record_model = RecordTableModel(headers, self, checkable)
+        self.setModel(self.record_model)
+        # 固定行高：滚动与布局时不再逐行计算尺寸
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().hide()
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setWordWrap(False)
+        if checkable:
+            self.clicked.connect(self._on_row_clicked)
+
+    def _on_row_clicked(self, index: QModelIndex) -> None:
+        # 点击行内任意位置（含复选框）切换勾选
+        key = self.record_model.key_at(index.row())
+        if key is not None:
+            self.record_model.set_checked(
+                [key], key not in self.record_model.checked
+            )
+
+    def set_records(self, records: List[TableRecord]) -> None:
+        self.record_model.set_records(records)
+
+    def rowCount(self) -> int:
+        return self.record_model.rowCount()
+
+    def currentRow(self) -> int:
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def current_key(self) -> Optional[str]:
+        return self.record_model.key_at(self.currentRow())
+
+    def current_data(self) -> Any:
+        record = self.record_model.record_at(self.currentRow())
+        return record.data if record is not None else None
+
+    def select_key(self, key: str) -> bool:
+        row = self.record_model.row_of(key)
+        if row < 0:
+            return False
+        self.select_row(row)
+        return True
+
+    def select_row(self, row: int) -> None:
+        self.selectRow(row)
+        self.setCurrentIndex(self.record_model.index(row, 0))
+
+
+class RecordListView(ListView):
+    """RecordTableModel 的单列列表视图（显示第 0 列，行高统一）"""
+
+    def __init__(self, parent=None, checkable: bool = False):
+        super().__init__(parent)
+        self.record_model = RecordTableModel([""], self, checkable)
+        self.setModel(self.record_model)
+        # 行高一致时视图不逐行测量尺寸，大列表也只布局可见区域
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        if checkable:
+            self.clicked.connect(self._on_row_clicked)
+
+    def _on_row_clicked(self, index: QModelIndex) -> None:
+        key = self.record_model.key_at(index.row())
+        if key is not None:
+            self.record_model.set_checked(
+                [key], key not in self.record_model.checked
+            )
+
+    def set_records(self, records: List[TableRecord]) -> None:
+        self.record_model.set_records(records)
+
+    def count(self) -> int:
+        return self.record_model.rowCount()
+
+    def current_data(self) -> Any:
+        index = self.currentIndex()
+        record = self.record_model.record_at(index.row() if index.isValid() else -1)
+        return record.data if record is not None else None
+
+
 # ==================== 基础页面类 ====================
 class BaseDialog(QDialog):
     """对话框基类 - 所有对话框继承此类，自动适配主题"""
@@ -6794,11 +5359,13 @@ class HomePage(BasePage):
             return tr("home.validation_no_issues")
         lines = []
         for index, issue in enumerate(issues, start=1):
-            level_label = (
-                tr("home.validation_error_label")
-                if issue.get("level") == "error"
-                else tr("home.validation_warning_label")
-            )
+            level = issue.get("level")
+            if level == "error":
+                level_label = tr("home.validation_error_label")
+            elif level == "info":
+                level_label = tr("home.validation_info_label")
+            else:
+                level_label = tr("home.validation_warning_label")
             path = issue.get("path", "")
             message = issue.get("message", "")
             lines.append(f"{index}. [{level_label}] {path} - {message}")
@@ -6807,11 +5374,20 @@ class HomePage(BasePage):
     def _on_validate_config(self):
         """手动配置检测"""
         oc_issues = ConfigValidator.validate_opencode_config(
-            self.main_window.opencode_config or {}
+            self.main_window.opencode_config or {},
+            model_index=get_model_index(),
+            schema_store=get_schema_store(),
         )
+        # 模型引用（含 opencode agent.*.model）由引用索引统一检查
         ohmy_issues = ConfigValidator.validate_ohmyopencode_config(
-            self.main_window.ohmyopencode_config or {}
-        )
+            self.main_window.ohmyopencode_config or {},
+            schema_store=get_schema_store(),
+        )
+        ref_index = self.main_window.model_ref_index()
+        oc_issues += ref_index.dangling_issues(SOURCE_OPENCODE)
+        ohmy_issues += ref_index.dangling_issues(SOURCE_OHMYOPENCODE)
+        # 未被引用的 Provider / 模型只作提示，列在详情末尾，不计入问题数
+        oc_issues += ref_index.unused_issues()
         issues = []
         for issue in oc_issues:
             issue_copy = dict(issue)
@@ -6821,10 +5397,11 @@ class HomePage(BasePage):
             issue_copy = dict(issue)
             issue_copy["path"] = f"OhMy.{issue_copy.get('path', '')}".rstrip(".")
             issues.append(issue_copy)
+        issues.sort(key=lambda i: i.get("level") == "info")
 
         errors = [i for i in issues if i.get("level") == "error"]
         warnings = [i for i in issues if i.get("level") == "warning"]
-        if not issues:
+        if not errors and not warnings:
             self.show_success(
                 tr("home.validation_complete"), tr("home.validation_no_issues_msg")
             )
@@ -7091,6 +5668,7 @@ class HomePage(BasePage):
                 # 重新加载配置
                 self.main_window.ohmyopencode_config = config_data
 
+            self.main_window.notify_config_changed()
             self._load_stats()
             self.show_success(
                 tr("common.success"), tr("home.switched_to_custom", filename=path.name)
@@ -7119,6 +5697,7 @@ class HomePage(BasePage):
                 ConfigManager.load_json(default_path) or {}
             )
 
+        self.main_window.notify_config_changed()
         self._load_stats()
         self.show_success(tr("common.success"), tr("home.reset_to_default"))
 
@@ -7214,6 +5793,7 @@ class HomePage(BasePage):
             self.main_window.ohmyopencode_config = {}
 
         self.main_window._refresh_file_hashes()
+        self.main_window.notify_config_changed()
         self._load_stats()
         self.show_success(tr("common.success"), tr("home.config_reloaded"))
 
@@ -7338,9 +5918,9 @@ class ProviderPage(BasePage):
         custom = MODEL_PRESET_CUSTOM.get(category, {})
         if preset_name in custom:
             return copy.deepcopy(custom[preset_name])
-        presets = MODEL_PRESET_PACKS.get(category, {})
-        if preset_name in presets:
-            return copy.deepcopy(presets[preset_name])
+        preset = get_model_index().pack(category, preset_name)
+        if preset is not None:
+            return preset
         return {
             "attachment": False,
             "modalities": {"input": ["text"], "output": ["text"]},
@@ -7375,7 +5955,7 @@ class ProviderPage(BasePage):
             return result
 
         base_preset = self._custom_get_preset_for_category(
-            category, MODEL_PRESET_DEFAULT.get(category, "基础")
+            category, get_model_index().default_pack_name(category)
         )
 
         for key in (
@@ -7525,6 +6105,12 @@ class ProviderPage(BasePage):
         self.custom_fetch_models_btn.clicked.connect(self._on_custom_fetch_models)
         toolbar.addWidget(self.custom_fetch_models_btn)
 
+        self.custom_refresh_all_btn = PushButton(
+            FIF.UPDATE, tr("provider.refresh_all_models"), widget
+        )
+        self.custom_refresh_all_btn.clicked.connect(self._on_custom_refresh_all_models)
+        toolbar.addWidget(self.custom_refresh_all_btn)
+
         self.custom_export_cli_btn = PushButton(
             FIF.SEND, tr("provider.export_to_cli"), widget
         )
@@ -7541,16 +6127,15 @@ class ProviderPage(BasePage):
         layout.addLayout(toolbar)
 
         # Provider 列表表格
-        self.custom_table = TableWidget(widget)
-        self.custom_table.setColumnCount(5)
-        self.custom_table.setHorizontalHeaderLabels(
+        self.custom_table = RecordTableView(
             [
                 tr("common.name"),
                 tr("provider.display_name"),
                 tr("provider.sdk_type"),
                 tr("provider.api_address"),
                 tr("provider.model_count"),
-            ]
+            ],
+            widget,
         )
 
         # 表格配置
@@ -7564,9 +6149,6 @@ class ProviderPage(BasePage):
         header.setSectionResizeMode(4, QHeaderView.Fixed)
         header.resizeSection(4, 60)
 
-        self.custom_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.custom_table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.custom_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.custom_table.doubleClicked.connect(self._on_custom_edit)
 
         layout.addWidget(self.custom_table)
@@ -7617,15 +6199,14 @@ class ProviderPage(BasePage):
         layout.addLayout(toolbar)
 
         # Provider 列表表格
-        self.native_table = TableWidget(widget)
-        self.native_table.setColumnCount(4)
-        self.native_table.setHorizontalHeaderLabels(
+        self.native_table = RecordTableView(
             [
                 tr("native_provider.provider_name"),
                 tr("provider.sdk_type"),
                 tr("native_provider.status"),
                 tr("native_provider.env_vars"),
-            ]
+            ],
+            widget,
         )
 
         # 表格配置
@@ -7637,9 +6218,6 @@ class ProviderPage(BasePage):
         header.resizeSection(2, 80)
         header.setSectionResizeMode(3, QHeaderView.Stretch)
 
-        self.native_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.native_table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.native_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.native_table.doubleClicked.connect(self._on_native_config)
 
         layout.addWidget(self.native_table)
@@ -7648,28 +6226,31 @@ class ProviderPage(BasePage):
 
     def _load_custom_data(self):
         """加载自定义Provider数据"""
-        self.custom_table.setRowCount(0)
         config = self.main_window.opencode_config or {}
         providers = config.get("provider", {})
 
+        records = []
         for name, data in providers.items():
             if not isinstance(data, dict):
                 continue
-            row = self.custom_table.rowCount()
-            self.custom_table.insertRow(row)
-            self.custom_table.setItem(row, 0, QTableWidgetItem(name))
-            self.custom_table.setItem(row, 1, QTableWidgetItem(data.get("name", "")))
-            self.custom_table.setItem(row, 2, QTableWidgetItem(data.get("npm", "")))
             # API地址添加tooltip显示全部
             api_url = data.get("options", {}).get("baseURL", "")
-            api_item = QTableWidgetItem(api_url)
-            api_item.setToolTip(
-                api_url if api_url else tr("provider.use_default_address")
-            )
-            self.custom_table.setItem(row, 3, api_item)
-            self.custom_table.setItem(
-                row, 4, QTableWidgetItem(str(len(data.get("models", {}))))
+            records.append(
+                TableRecord(
+                    name,
+                    [
+                        name,
+                        data.get("name", ""),
+                        data.get("npm", ""),
+                        TableCell(
+                            api_url,
+                            tooltip=api_url or tr("provider.use_default_address"),
+                        ),
+                        str(len(data.get("models", {}))),
+                    ],
+                )
             )
+        self.custom_table.set_records(records)
 
     def _on_custom_add(self):
         """添加 Provider"""
@@ -7685,7 +6266,7 @@ class ProviderPage(BasePage):
             self.show_warning(tr("common.info"), tr("provider.select_first"))
             return
 
-        name = self.custom_table.item(row, 0).text()
+        name = self.custom_table.record_model.key_at(row)
         dialog = ProviderDialog(self.main_window, provider_name=name, parent=self)
         if dialog.exec_():
             self._load_custom_data()
@@ -7698,7 +6279,7 @@ class ProviderPage(BasePage):
             self.show_warning(tr("common.info"), tr("provider.select_first"))
             return
 
-        name = self.custom_table.item(row, 0).text()
+        name = self.custom_table.record_model.key_at(row)
         w = FluentMessageBox(
             tr("provider.delete_confirm_title"),
             tr("provider.delete_confirm", name=name),
@@ -7721,7 +6302,7 @@ class ProviderPage(BasePage):
             self.show_warning(tr("common.info"), tr("provider.select_first"))
             return
 
-        provider_name = self.custom_table.item(row, 0).text()
+        provider_name = self.custom_table.record_model.key_at(row)
         config = self.main_window.opencode_config or {}
         provider = config.get("provider", {}).get(provider_name, {})
         options = provider.get("options", {}) if isinstance(provider, dict) else {}
@@ -7731,6 +6312,57 @@ class ProviderPage(BasePage):
 
         self._custom_fetch_models_for_provider(provider_name, options)
 
+    def _on_custom_refresh_all_models(self):
+        """并发刷新所有 Provider 的模型列表"""
+        if not hasattr(self, "_model_refresh_worker"):
+            self._model_refresh_worker = ModelRefreshWorker(self)
+            self._model_refresh_worker.progress.connect(
+                self._on_refresh_all_progress
+            )
+            self._model_refresh_worker.finished.connect(
+                self._on_refresh_all_finished
+            )
+        if self._model_refresh_worker.running:
+            return
+        total = self._model_refresh_worker.start(self.main_window.opencode_config)
+        if not total:
+            self.show_warning(tr("common.info"), tr("provider.refresh_all_none"))
+            return
+        self.custom_refresh_all_btn.setEnabled(False)
+        self._on_refresh_all_progress(0, total, "")
+
+    def _on_refresh_all_progress(self, done: int, total: int, provider_key: str):
+        self.custom_refresh_all_btn.setText(
+            tr("provider.refresh_all_progress", done=done, total=total)
+        )
+
+    def _on_refresh_all_finished(self, report):
+        self.custom_refresh_all_btn.setEnabled(True)
+        self.custom_refresh_all_btn.setText(tr("provider.refresh_all_models"))
+        summary = tr(
+            "provider.refresh_all_summary",
+            providers=len(report.results),
+            seconds=f"{report.elapsed_sec:.1f}",
+            failed=len(report.failed),
+            added=report.added_count,
+            removed=report.removed_count,
+        )
+        lines = [summary, ""]
+        for result in report.results:
+            if result.error:
+                lines.append(f"❌ {result.provider_key}: {result.error}")
+                continue
+            if not (result.added or result.removed or result.missing):
+                continue
+            lines.append(f"{result.provider_key} ({result.total})")
+            lines.extend(f"  + {m}" for m in result.added)
+            lines.extend(f"  - {m}" for m in result.removed)
+            lines.extend(f"  ! {m}" for m in result.missing)
+        w = FluentMessageBox(
+            tr("provider.refresh_all_title"), "\n".join(lines).strip(), self
+        )
+        w.exec_()
+
     def _custom_fetch_models_for_provider(
         self, provider_name: str, options: Dict[str, Any]
     ):
@@ -7752,7 +6384,7 @@ class ProviderPage(BasePage):
             self.show_warning(tr("common.info"), tr("provider.select_first"))
             return
 
-        provider_name = self.custom_table.item(row, 0).text()
+        provider_name = self.custom_table.record_model.key_at(row)
 
         # 切换到 CLI 导出页面
         if hasattr(self.main_window, "cli_export_page"):
@@ -7772,7 +6404,7 @@ class ProviderPage(BasePage):
             self.show_warning(tr("common.info"), tr("provider.select_first"))
             return
 
-        provider_name = self.custom_table.item(row, 0).text()
+        provider_name = self.custom_table.record_model.key_at(row)
         config = self.main_window.opencode_config or {}
         provider = config.get("provider", {}).get(provider_name, {})
 
@@ -8070,8 +6702,6 @@ class ProviderPage(BasePage):
 
     def _load_native_data(self):
         """加载原生Provider数据"""
-        self.native_table.setRowCount(0)
-
         # 读取已配置的认证
         auth_data = {}
         try:
@@ -8079,44 +6709,37 @@ class ProviderPage(BasePage):
         except Exception:
             pass
 
+        records = []
         for provider in NATIVE_PROVIDERS:
-            row = self.native_table.rowCount()
-            self.native_table.insertRow(row)
-
-            # Provider 名称
-            name_item = QTableWidgetItem(provider.name)
-            name_item.setData(Qt.UserRole, provider.id)
-            self.native_table.setItem(row, 0, name_item)
-
-            # SDK
-            self.native_table.setItem(row, 1, QTableWidgetItem(provider.sdk))
-
             # 状态
             is_configured = provider.id in auth_data and auth_data[provider.id]
-            status_text = (
+            status = TableCell(
                 tr("native_provider.configured")
                 if is_configured
-                else tr("native_provider.not_configured")
+                else tr("native_provider.not_configured"),
+                color="#4CAF50" if is_configured else "#9E9E9E",
             )
-            status_item = QTableWidgetItem(status_text)
-            if is_configured:
-                status_item.setForeground(QColor("#4CAF50"))
-            else:
-                status_item.setForeground(QColor("#9E9E9E"))
-            self.native_table.setItem(row, 2, status_item)
-
             # 环境变量
             env_vars = ", ".join(provider.env_vars) if provider.env_vars else "-"
-            env_item = QTableWidgetItem(env_vars)
-            env_item.setToolTip(env_vars)
-            self.native_table.setItem(row, 3, env_item)
+            records.append(
+                TableRecord(
+                    provider.id,
+                    [
+                        provider.name,
+                        provider.sdk,
+                        status,
+                        TableCell(env_vars, tooltip=env_vars),
+                    ],
+                )
+            )
+        self.native_table.set_records(records)
 
     def _get_selected_native_provider(self) -> Optional[NativeProviderConfig]:
         """获取当前选中的原生Provider"""
         row = self.native_table.currentRow()
         if row < 0:
             return None
-        provider_id = self.native_table.item(row, 0).data(Qt.UserRole)
+        provider_id = self.native_table.record_model.key_at(row)
         return get_native_provider(provider_id)
 
     def _on_native_config(self):
@@ -8704,10 +7327,10 @@ class ModelPresetCustomDialog(BaseDialog):
         self.model_list.clear()
         # 将显示名称转换回原始键
         original_key = self._series_map.get(series, series)
-        if original_key in PRESET_MODEL_CONFIGS:
-            models = PRESET_MODEL_CONFIGS[original_key]["models"]
-            for model_id, data in models.items():
-                self.model_list.addItem(f"{model_id} - {data.get('name', '')}")
+        model_index = get_model_index()
+        for model_id in model_index.series_models(original_key):
+            spec = model_index.get(model_id)
+            self.model_list.addItem(f"{model_id} - {spec.name}")
 
     def _on_add(self):
         selected = self.model_list.selectedItems()
@@ -8720,8 +7343,7 @@ class ModelPresetCustomDialog(BaseDialog):
         series = self.series_combo.currentText()
         # 将显示名称转换回原始键
         original_key = self._series_map.get(series, series)
-        series_data = PRESET_MODEL_CONFIGS.get(original_key, {})
-        models_data = series_data.get("models", {})
+        models_data = get_model_index().series_models(original_key)
 
         config = self.main_window.opencode_config
         if config is None:
@@ -8848,15 +7470,14 @@ class NativeProviderPage(BasePage):
         self._layout.addLayout(toolbar)
 
         # Provider 列表表格
-        self.table = TableWidget(self)
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(
+        self.table = RecordTableView(
             [
                 tr("native_provider.provider_name"),
                 tr("provider.sdk_type"),
                 tr("native_provider.status"),
                 tr("native_provider.env_vars"),
-            ]
+            ],
+            self,
         )
 
         header = self.table.horizontalHeader()
@@ -8867,16 +7488,11 @@ class NativeProviderPage(BasePage):
         header.resizeSection(2, 80)
         header.setSectionResizeMode(3, QHeaderView.Stretch)
 
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.doubleClicked.connect(self._on_config)
         self._layout.addWidget(self.table)
 
     def _load_data(self):
         """加载 Provider 数据"""
-        self.table.setRowCount(0)
-
         # 读取已配置的认证
         auth_data = {}
         try:
@@ -8884,18 +7500,8 @@ class NativeProviderPage(BasePage):
         except Exception:
             pass
 
+        records = []
         for provider in NATIVE_PROVIDERS:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            # Provider 名称
-            name_item = QTableWidgetItem(provider.name)
-            name_item.setData(Qt.UserRole, provider.id)
-            self.table.setItem(row, 0, name_item)
-
-            # SDK
-            self.table.setItem(row, 1, QTableWidgetItem(provider.sdk))
-
             # 状态 - 同时检查auth.json和环境变量
             has_auth = provider.id in auth_data and auth_data[provider.id]
             has_env = bool(self.env_detector.detect_env_vars(provider.id))
@@ -8922,24 +7528,29 @@ class NativeProviderPage(BasePage):
                 status_color = "#9E9E9E"  # 灰色
                 status_tooltip = ""
 
-            status_item = QTableWidgetItem(status_text)
-            status_item.setForeground(QColor(status_color))
-            if status_tooltip:
-                status_item.setToolTip(status_tooltip)
-            self.table.setItem(row, 2, status_item)
-
             # 环境变量
             env_vars = ", ".join(provider.env_vars) if provider.env_vars else "-"
-            env_item = QTableWidgetItem(env_vars)
-            env_item.setToolTip(env_vars)
-            self.table.setItem(row, 3, env_item)
+            records.append(
+                TableRecord(
+                    provider.id,
+                    [
+                        provider.name,
+                        provider.sdk,
+                        TableCell(
+                            status_text, tooltip=status_tooltip, color=status_color
+                        ),
+                        TableCell(env_vars, tooltip=env_vars),
+                    ],
+                )
+            )
+        self.table.set_records(records)
 
     def _get_selected_provider(self) -> Optional[NativeProviderConfig]:
         """获取当前选中的 Provider"""
         row = self.table.currentRow()
         if row < 0:
             return None
-        provider_id = self.table.item(row, 0).data(Qt.UserRole)
+        provider_id = self.table.record_model.key_at(row)
         return get_native_provider(provider_id)
 
     def _on_config(self):
@@ -9441,6 +8052,12 @@ class NativeProviderPage(BasePage):
 class ModelSelectDialog(BaseDialog):
     """模型选择对话框"""
 
+    # 搜索线程完成后回到主线程：(搜索序号, 匹配的模型 ID)
+    _search_finished = pyqtSignal(int, list)
+
+    # 与 match_mode_combo 的选项顺序一致
+    _SEARCH_MODES = (SEARCH_MODE_FUZZY, SEARCH_MODE_PREFIX, SEARCH_MODE_REGEX)
+
     def __init__(
         self, main_window, provider_name: str, model_ids: List[str], parent=None
     ):
@@ -9449,11 +8066,25 @@ class ModelSelectDialog(BaseDialog):
         self.provider_name = provider_name
         self.model_ids = list(dict.fromkeys(model_ids or []))
         self._selected: List[str] = []
-        self._items = []
-        self._row_widgets: Dict[str, Dict[str, Any]] = {}
         self._visible_model_ids: List[str] = []
         self._bulk_controls: Dict[str, Dict[str, Any]] = {}
         self._batch_config: Dict[str, Any] = {}
+        # 分组键按分组方式缓存，切换分类时不再逐个重新计算
+        self._group_key_cache: Dict[str, Dict[str, str]] = {}
+        # 同一份模型列表只建一次索引，厂商分类一并参与匹配
+        self._search_index = get_search_index(
+            self.model_ids,
+            categories={
+                model_id: [key]
+                for model_id, key in self._group_keys("厂商识别").items()
+            },
+        )
+        self._search_generation = 0
+        self._search_finished.connect(self._on_search_finished)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(MODEL_SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._start_search)
 
         self.setWindowTitle(tr("provider.model_select_title"))
         self.setMinimumSize(900, 560)
@@ -9519,10 +8150,12 @@ class ModelSelectDialog(BaseDialog):
         self.category_list.currentTextChanged.connect(self._on_category_list_changed)
         content_layout.addWidget(self.category_list)
 
-        self.model_list = ListWidget(self)
-        self.model_list.setSpacing(6)
-        self.model_list.setUniformItemSizes(True)
+        # 勾选状态保存在模型中（按模型 ID），筛选切换后保持
+        self.model_list = RecordListView(self, checkable=True)
         self.model_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.model_list.record_model.check_changed.connect(
+            self._on_model_check_changed
+        )
         content_layout.addWidget(self.model_list, 1)
 
         layout.addLayout(content_layout, 1)
@@ -9637,13 +8270,64 @@ class ModelSelectDialog(BaseDialog):
         self._update_batch_controls()
 
     def _on_filter_changed(self):
-        self._refresh_models()
+        # 连续输入只在停顿后搜索一次
+        self._search_timer.start()
 
     def _clear_filters(self):
         self.group_mode_combo.setCurrentIndex(0)
         self.match_mode_combo.setCurrentIndex(0)
         self.keyword_edit.clear()
 
+    def _search_params(self) -> Tuple[str, str, str, str]:
+        group = (
+            self.category_list.currentItem().text()
+            if self.category_list.currentItem()
+            else tr("provider.all_categories")
+        )
+        index = self.match_mode_combo.currentIndex()
+        mode = self._SEARCH_MODES[index] if 0 <= index < 3 else SEARCH_MODE_FUZZY
+        return (
+            self.keyword_edit.text().strip(),
+            mode,
+            group,
+            self.group_mode_combo.currentText(),
+        )
+
+    def _filtered_ids(
+        self, keyword: str, mode: str, group: str, group_mode: str
+    ) -> List[str]:
+        """按关键字（索引排序）与分类筛选，可在工作线程中调用"""
+        ids = self._search_index.search(keyword, mode)
+        if group != tr("provider.all_categories"):
+            keys = self._group_keys(group_mode)
+            ids = [model_id for model_id in ids if keys.get(model_id) == group]
+        return ids
+
+    def _start_search(self):
+        self._search_generation += 1
+        generation = self._search_generation
+        params = self._search_params()
+
+        def search_thread():
+            try:
+                ids = self._filtered_ids(*params)
+            except Exception:
+                ids = []
+            try:
+                self._search_finished.emit(generation, ids)
+            except RuntimeError:
+                # 对话框已关闭
+                pass
+
+        thread = threading.Thread(target=search_thread, daemon=True)
+        thread.start()
+
+    def _on_search_finished(self, generation: int, ids: List[str]):
+        # 期间又有新的输入时丢弃旧结果
+        if generation != self._search_generation:
+            return
+        self._populate_models(ids)
+
     def _rebuild_categories(self):
         self.category_list.blockSignals(True)
         self.category_list.clear()
@@ -9658,13 +8342,23 @@ class ModelSelectDialog(BaseDialog):
         self.category_list.blockSignals(False)
 
     def _group_models(self) -> Dict[str, List[str]]:
-        mode = self.group_mode_combo.currentText()
         groups: Dict[str, List[str]] = {}
-        for model_id in self.model_ids:
-            key = self._get_group_key(model_id, mode)
+        for model_id, key in self._group_keys(
+            self.group_mode_combo.currentText()
+        ).items():
             groups.setdefault(key, []).append(model_id)
         return groups
 
+    def _group_keys(self, mode: str) -> Dict[str, str]:
+        keys = self._group_key_cache.get(mode)
+        if keys is None:
+            keys = {
+                model_id: self._get_group_key(model_id, mode)
+                for model_id in self.model_ids
+            }
+            self._group_key_cache[mode] = keys
+        return keys
+
     def _get_group_key(self, model_id: str, mode: str) -> str:
         lower = model_id.lower()
         if mode == "前缀分组":
@@ -9691,14 +8385,14 @@ class ModelSelectDialog(BaseDialog):
         return
 
     def _get_preset_names(self, category: str) -> List[str]:
-        names = list(MODEL_PRESET_PACKS.get(category, {}).keys())
+        names = get_model_index().pack_names(category)
         names += list(MODEL_PRESET_CUSTOM.get(category, {}).keys())
         if not names:
             names.append("基础")
         return names
 
     def _get_default_preset_for_category(self, category: str) -> Dict[str, Any]:
-        preset_name = MODEL_PRESET_DEFAULT.get(category, "基础")
+        preset_name = get_model_index().default_pack_name(category)
         return self._get_preset(category, preset_name)
 
     def _get_bulk_category(self) -> str:
@@ -9748,9 +8442,9 @@ class ModelSelectDialog(BaseDialog):
     def _get_preset(self, category: str, preset_name: str) -> Dict[str, Any]:
         if preset_name in MODEL_PRESET_CUSTOM.get(category, {}):
             return MODEL_PRESET_CUSTOM[category][preset_name]
-        presets = MODEL_PRESET_PACKS.get(category, {})
-        if preset_name in presets:
-            return presets[preset_name]
+        preset = get_model_index().pack(category, preset_name)
+        if preset is not None:
+            return preset
         return {
             "attachment": False,
             "modalities": {"input": ["text"], "output": ["text"]},
@@ -9759,151 +8453,56 @@ class ModelSelectDialog(BaseDialog):
             "variants": {},
         }
 
-    def _on_model_check_changed(self, model_id: str, state: int):
-        if state == Qt.Checked:
-            if model_id not in self._selected:
-                self._selected.append(model_id)
-        else:
-            if model_id in self._selected:
-                self._selected.remove(model_id)
+    def _on_model_check_changed(self):
         self._update_count_label()
         self._sync_select_all_state()
 
-    def _toggle_model_check(self, model_id: str):
-        row = self._row_widgets.get(model_id)
-        if not row:
-            return
-        checkbox = row.get("checkbox")
-        if checkbox is None:
-            return
-        checkbox.setChecked(not checkbox.isChecked())
-
-    def _build_model_row(self, model_id: str):
-        row_widget = QWidget(self.model_list)
-        row_layout = QHBoxLayout(row_widget)
-        row_layout.setContentsMargins(6, 4, 6, 4)
-        row_layout.setSpacing(8)
-
-        check = CheckBox("", row_widget)
-        check.setChecked(model_id in self._selected)
-        check.stateChanged.connect(
-            lambda state, mid=model_id: self._on_model_check_changed(mid, state)
-        )
-        row_layout.addWidget(check)
-
-        name_label = BodyLabel(model_id, row_widget)
-        name_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        name_label.mousePressEvent = (
-            lambda event, mid=model_id: self._toggle_model_check(mid)
-        )
-        row_layout.addWidget(name_label, 1)
-
-        row_widget.mousePressEvent = (
-            lambda event, mid=model_id: self._toggle_model_check(mid)
-        )
-
-        item = QListWidgetItem(self.model_list)
-        item.setSizeHint(row_widget.sizeHint())
-        self.model_list.setItemWidget(item, row_widget)
-
-        self._row_widgets[model_id] = {
-            "item": item,
-            "checkbox": check,
-        }
-        self._items.append(model_id)
-
     def _refresh_models(self):
-        self.model_list.blockSignals(True)
-        self.model_list.clear()
-        self._items = []
-        self._visible_model_ids = []
-        self._row_widgets = {}
-        self.model_list.setFocusPolicy(Qt.NoFocus)
+        # 分组 / 分类切换：索引查询足够快，直接在主线程完成
+        self._search_timer.stop()
+        self._search_generation += 1
+        self._populate_models(self._filtered_ids(*self._search_params()))
 
-        group = (
-            self.category_list.currentItem().text()
-            if self.category_list.currentItem()
-            else tr("provider.all_categories")
+    def _populate_models(self, model_ids: List[str]):
+        self._visible_model_ids = list(model_ids)
+        # 只替换模型数据，视图按需绘制可见行
+        self.model_list.set_records(
+            [TableRecord(model_id, [model_id]) for model_id in model_ids]
         )
-        keyword = self.keyword_edit.text().strip()
-        match_mode = self.match_mode_combo.currentText()
-        pattern = keyword.lower()
-        regex = None
-        if pattern and match_mode == "正则":
-            try:
-                regex = re.compile(pattern, re.IGNORECASE)
-            except re.error:
-                regex = None
-
-        for model_id in self.model_ids:
-            if group != tr("provider.all_categories"):
-                if (
-                    self._get_group_key(model_id, self.group_mode_combo.currentText())
-                    != group
-                ):
-                    continue
-            if pattern:
-                if match_mode == "包含":
-                    if pattern not in model_id.lower():
-                        continue
-                elif match_mode == "前缀":
-                    if not model_id.lower().startswith(pattern):
-                        continue
-                elif match_mode == "正则":
-                    if not regex or not regex.search(model_id):
-                        continue
-            self._build_model_row(model_id)
-            self._visible_model_ids.append(model_id)
-
-        self.model_list.blockSignals(False)
         self._update_count_label()
         self._sync_select_all_state()
         self._update_batch_controls()
-
-        if not self._items:
-            self.empty_label.setVisible(True)
-        else:
-            self.empty_label.setVisible(False)
+        self.empty_label.setVisible(not self._visible_model_ids)
 
     def _on_select_all_changed(self, state):
-        if not self._items:
+        if not self._visible_model_ids:
             return
-        target_state = state == Qt.Checked
-        for model_id, row in self._row_widgets.items():
-            checkbox = row.get("checkbox")
-            if checkbox is None:
-                continue
-            checkbox.blockSignals(True)
-            checkbox.setChecked(target_state)
-            checkbox.blockSignals(False)
-            if target_state:
-                if model_id not in self._selected:
-                    self._selected.append(model_id)
-            else:
-                if model_id in self._selected:
-                    self._selected.remove(model_id)
-        self._update_count_label()
+        self.model_list.record_model.set_checked(
+            self._visible_model_ids, state == Qt.Checked
+        )
 
     def _sync_select_all_state(self):
-        if not self._items:
-            self.select_all_check.setChecked(False)
-            return
-        checked = sum(1 for model_id in self._items if model_id in self._selected)
-        if checked == len(self._items):
-            self.select_all_check.setChecked(True)
-        else:
-            self.select_all_check.setChecked(False)
+        checked = self.model_list.record_model.checked
+        all_checked = bool(self._visible_model_ids) and all(
+            model_id in checked for model_id in self._visible_model_ids
+        )
+        # 只同步显示，不触发对可见行的批量勾选 / 取消
+        self.select_all_check.blockSignals(True)
+        self.select_all_check.setChecked(all_checked)
+        self.select_all_check.blockSignals(False)
 
     def _update_count_label(self):
-        total = len(self._items)
-        selected = len(self._selected)
+        total = len(self._visible_model_ids)
+        selected = len(self.model_list.record_model.checked)
         self.count_label.setText(
             tr("provider.selected_count", selected=selected, total=total)
         )
 
     def _on_confirm(self):
-        selected = [model_id for model_id in self._items if model_id in self._selected]
-        self._selected = selected
+        checked = self.model_list.record_model.checked
+        self._selected = [
+            model_id for model_id in self._visible_model_ids if model_id in checked
+        ]
         self.accept()
 
     def get_selected_model_ids(self) -> List[str]:
@@ -9969,7 +8568,7 @@ class ProviderDialog(BaseDialog):
         sdk_label.setMinimumWidth(90)
         sdk_layout.addWidget(sdk_label)
         self.sdk_combo = ComboBox(self)
-        self.sdk_combo.addItems(PRESET_SDKS)
+        self.sdk_combo.addItems(get_model_index().sdks)
         self.sdk_combo.setToolTip(get_tooltip("provider_sdk"))
         self.sdk_combo.setMinimumHeight(36)
         sdk_layout.addWidget(self.sdk_combo)
@@ -10373,21 +8972,23 @@ class ModelPage(BasePage):
         self.delete_btn.clicked.connect(self._on_delete)
         toolbar.addWidget(self.delete_btn)
 
+        self.usages_btn = PushButton(FIF.SEARCH, tr("model.find_usages"), self)
+        self.usages_btn.clicked.connect(self._on_find_usages)
+        toolbar.addWidget(self.usages_btn)
+
         toolbar.addStretch()
         self._layout.addLayout(toolbar)
 
-        # Agent 列表
-        self.table = TableWidget(self)
-
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(
+        # 模型列表（虚拟化表格，只绘制可见行）
+        self.table = RecordTableView(
             [
                 tr("model.model_id"),
                 tr("model.model_name"),
                 tr("model.context"),
                 tr("model.output"),
                 tr("model.attachment"),
-            ]
+            ],
+            self,
         )
         # 调整列宽：模型ID和显示名称加宽，上下文/输出/附件各10字符(约80px)
         header = self.table.horizontalHeader()
@@ -10399,9 +9000,6 @@ class ModelPage(BasePage):
         header.resizeSection(3, 80)  # 输出 10字符
         header.setSectionResizeMode(4, QHeaderView.Fixed)
         header.resizeSection(4, 60)  # 附件 10字符
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.doubleClicked.connect(self._on_edit)
         self._layout.addWidget(self.table)
 
@@ -10445,27 +9043,29 @@ class ModelPage(BasePage):
 
     def _load_models(self, provider_name: str):
         """加载指定 Provider 的模型列表"""
-        self.table.setRowCount(0)
-        if not provider_name:
-            return
-
         config = self.main_window.opencode_config or {}
         provider = config.get("provider", {}).get(provider_name, {})
-        if not isinstance(provider, dict):
+        if not provider_name or not isinstance(provider, dict):
+            self.table.set_records([])
             return
         models = provider.get("models", {})
 
+        records = []
         for model_id, data in models.items():
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(model_id))
-            self.table.setItem(row, 1, QTableWidgetItem(data.get("name", "")))
             limit = data.get("limit", {})
-            self.table.setItem(row, 2, QTableWidgetItem(str(limit.get("context", ""))))
-            self.table.setItem(row, 3, QTableWidgetItem(str(limit.get("output", ""))))
-            self.table.setItem(
-                row, 4, QTableWidgetItem("✓" if data.get("attachment") else "")
+            records.append(
+                TableRecord(
+                    model_id,
+                    [
+                        model_id,
+                        data.get("name", ""),
+                        str(limit.get("context", "")),
+                        str(limit.get("output", "")),
+                        "✓" if data.get("attachment") else "",
+                    ],
+                )
             )
+        self.table.set_records(records)
 
     def _on_add(self):
         """添加模型"""
@@ -10496,7 +9096,7 @@ class ModelPage(BasePage):
         if row < 0:
             self.show_warning(tr("common.info"), tr("model.select_model_first"))
             return
-        model_id = self.table.item(row, 0).text()
+        model_id = self.table.record_model.key_at(row)
         dialog = ModelDialog(self.main_window, provider, model_id=model_id, parent=self)
         if dialog.exec_():
             self._load_models(provider)
@@ -10510,7 +9110,7 @@ class ModelPage(BasePage):
             self.show_warning(tr("common.info"), tr("model.select_model_first"))
             return
 
-        model_id = self.table.item(row, 0).text()
+        model_id = self.table.record_model.key_at(row)
         w = FluentMessageBox(
             tr("model.delete_confirm_title"),
             tr("model.delete_confirm", name=model_id),
@@ -10531,13 +9131,39 @@ class ModelPage(BasePage):
                         # 如果删除的不是最后一行，选中原位置的行（现在是下一行）
                         # 如果删除的是最后一行，选中新的最后一行
                         new_row = min(row, new_row_count - 1)
-                        self.table.selectRow(new_row)
-                        self.table.setCurrentCell(new_row, 0)
+                        self.table.select_row(new_row)
 
                     self.show_success(
                         tr("common.success"), tr("model.deleted_success", name=model_id)
                     )
 
+    def _on_find_usages(self):
+        """查找引用当前模型的 Agent / Category"""
+        provider = self.provider_combo.currentData()
+        row = self.table.currentRow()
+        if row < 0:
+            self.show_warning(tr("common.info"), tr("model.select_model_first"))
+            return
+        model_ref = f"{provider}/{self.table.record_model.key_at(row)}"
+        usages = self.main_window.model_ref_index().usages(model_ref)
+        if not usages:
+            self.show_warning(
+                tr("common.info"), tr("model.usages_none", name=model_ref)
+            )
+            return
+        lines = [
+            f"[{'OhMy' if site.source == SOURCE_OHMYOPENCODE else 'OpenCode'}] "
+            f"{site.owner} - {site.path}"
+            for site in usages
+        ]
+        w = FluentMessageBox(
+            tr("model.usages_title", name=model_ref, count=len(usages)),
+            "\n".join(lines),
+            self,
+        )
+        w.cancelButton.hide()
+        w.exec_()
+
     def _on_fetch_models(self):
         """从API获取模型列表"""
         provider_name = self.provider_combo.currentData()
@@ -11415,20 +10041,19 @@ class ModelDialog(BaseDialog):
             }
 
         # 保存前进行配置校验，避免写入错误结构
+        # 只校验本次修改的 Provider 子树，其它 Provider 不受影响
         temp_provider = dict(provider)
         temp_models = dict(temp_provider.get("models", {}))
         temp_models[model_id] = model_data
         temp_provider["models"] = temp_models
-        temp_config = dict(config)
-        temp_providers = dict(temp_config.get("provider", {}))
-        temp_providers[self.provider_name] = temp_provider
-        temp_config["provider"] = temp_providers
-        issues = ConfigValidator.validate_opencode_config(temp_config)
-        errors = [i for i in issues if i["level"] == "error"]
+        # 只展示前 8 个错误，多取一个用于判断是否还有更多
+        errors = ConfigValidator.first_errors(
+            ConfigValidator.iter_provider_issues(self.provider_name, temp_provider), 9
+        )
         if errors:
             msg = "\n".join(f"• {e['message']}" for e in errors[:8])
             if len(errors) > 8:
-                msg += f"\n... 还有 {len(errors) - 8} 个错误"
+                msg += "\n... 还有更多错误"
             InfoBar.error("错误", f"配置校验失败：\n{msg}", parent=self)
             return
 
@@ -11482,10 +10107,10 @@ class FetchedModelsDialog(BaseDialog):
         select_layout.addStretch()
         layout.addLayout(select_layout)
 
-        # 模型列表表格
-        self.table = TableWidget(self)
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["选择", "模型ID", "创建时间"])
+        # 模型列表表格（第 0 列为复选框，点击行切换勾选）
+        self.table = RecordTableView(
+            ["选择", "模型ID", "创建时间"], self, checkable=True
+        )
 
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Fixed)
@@ -11494,35 +10119,23 @@ class FetchedModelsDialog(BaseDialog):
         header.setSectionResizeMode(2, QHeaderView.Fixed)
         header.resizeSection(2, 150)
 
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-
         # 填充模型数据
-        for model in self.models:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            # 复选框
-            checkbox = CheckBox()
-            checkbox.setChecked(False)
-            checkbox_widget = QWidget()
-            checkbox_layout = QHBoxLayout(checkbox_widget)
-            checkbox_layout.addWidget(checkbox)
-            checkbox_layout.setAlignment(Qt.AlignCenter)
-            checkbox_layout.setContentsMargins(0, 0, 0, 0)
-            self.table.setCellWidget(row, 0, checkbox_widget)
+        from datetime import datetime
 
-            # 模型ID
+        records = []
+        seen = set()
+        for model in self.models:
             model_id = model.get("id", "") if isinstance(model, dict) else str(model)
-            self.table.setItem(row, 1, QTableWidgetItem(model_id))
+            if model_id in seen:
+                continue
+            seen.add(model_id)
 
             # 创建时间
             created = model.get("created", "") if isinstance(model, dict) else ""
             if isinstance(created, int):
-                from datetime import datetime
-
                 created = datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M")
-            self.table.setItem(row, 2, QTableWidgetItem(str(created)))
+            records.append(TableRecord(model_id, ["", model_id, str(created)]))
+        self.table.set_records(records)
 
         layout.addWidget(self.table)
 
@@ -11542,32 +10155,18 @@ class FetchedModelsDialog(BaseDialog):
 
     def _select_all(self):
         """全选"""
-        for row in range(self.table.rowCount()):
-            widget = self.table.cellWidget(row, 0)
-            if widget:
-                checkbox = widget.findChild(CheckBox)
-                if checkbox:
-                    checkbox.setChecked(True)
+        model = self.table.record_model
+        model.set_checked(model.keys(), True)
 
     def _deselect_all(self):
         """取消全选"""
-        for row in range(self.table.rowCount()):
-            widget = self.table.cellWidget(row, 0)
-            if widget:
-                checkbox = widget.findChild(CheckBox)
-                if checkbox:
-                    checkbox.setChecked(False)
+        model = self.table.record_model
+        model.set_checked(model.keys(), False)
 
     def _on_add(self):
         """添加选中的模型"""
-        selected_models = []
-        for row in range(self.table.rowCount()):
-            widget = self.table.cellWidget(row, 0)
-            if widget:
-                checkbox = widget.findChild(CheckBox)
-                if checkbox and checkbox.isChecked():
-                    model_id = self.table.item(row, 1).text()
-                    selected_models.append(model_id)
+        model = self.table.record_model
+        selected_models = [key for key in model.keys() if key in model.checked]
 
         if not selected_models:
             InfoBar.warning("提示", "请至少选择一个模型", parent=self)
@@ -11620,7 +10219,7 @@ class PresetModelDialog(BaseDialog):
         self.series_combo = ComboBox(self)
         # 添加翻译后的系列名称
         self._series_map = {}
-        for key in PRESET_MODEL_CONFIGS.keys():
+        for key in get_model_index().series_names():
             if key == "Claude 系列":
                 display_name = tr("provider.claude_series_short")
             elif key == "OpenAI/Codex 系列":
@@ -11669,10 +10268,10 @@ class PresetModelDialog(BaseDialog):
         self.model_list.clear()
         # 将显示名称转换回原始键
         original_key = self._series_map.get(series, series)
-        if original_key in PRESET_MODEL_CONFIGS:
-            models = PRESET_MODEL_CONFIGS[original_key]["models"]
-            for model_id, data in models.items():
-                self.model_list.addItem(f"{model_id} - {data.get('name', '')}")
+        model_index = get_model_index()
+        for model_id in model_index.series_models(original_key):
+            spec = model_index.get(model_id)
+            self.model_list.addItem(f"{model_id} - {spec.name}")
 
     def _on_add(self):
         selected = self.model_list.selectedItems()
@@ -11685,8 +10284,7 @@ class PresetModelDialog(BaseDialog):
         series = self.series_combo.currentText()
         # 将显示名称转换回原始键
         original_key = self._series_map.get(series, series)
-        series_data = PRESET_MODEL_CONFIGS.get(original_key, {})
-        models_data = series_data.get("models", {})
+        models_data = get_model_index().series_models(original_key)
 
         config = self.main_window.opencode_config
         if config is None:
@@ -11794,18 +10392,16 @@ class MCPPage(BasePage):
         toolbar.addStretch()
         self._layout.addLayout(toolbar)
 
-        # Agent 列表
-        self.table = TableWidget(self)
-
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(
+        # MCP 列表
+        self.table = RecordTableView(
             [
                 tr("mcp.server_name"),
                 tr("mcp.server_type"),
                 tr("mcp.enabled"),
                 tr("mcp.timeout"),
                 tr("mcp.command_url"),
-            ]
+            ],
+            self,
         )
         # 列宽设置: 名称自适应, 类型15字符(120px), 启用8字符(64px), 超时10字符(80px), 命令/URL自适应
         header = self.table.horizontalHeader()
@@ -11817,14 +10413,10 @@ class MCPPage(BasePage):
         header.setSectionResizeMode(3, QHeaderView.Fixed)
         header.resizeSection(3, 80)  # 超时 10字符
         header.setSectionResizeMode(4, QHeaderView.Stretch)  # 命令/URL
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.doubleClicked.connect(self._on_edit)
         self._layout.addWidget(self.table)
 
     def _load_data(self):
-        self.table.setRowCount(0)
         config = self.main_window.opencode_config or {}
         mcps = config.get("mcp", {})
 
@@ -11832,33 +10424,32 @@ class MCPPage(BasePage):
         if not isinstance(mcps, dict):
             mcps = {}
 
+        records = []
         for name, data in mcps.items():
             # 跳过非字典类型的值
             if not isinstance(data, dict):
                 continue
 
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(name))
-
             mcp_type = "remote" if "url" in data else "local"
-            self.table.setItem(row, 1, QTableWidgetItem(mcp_type))
-
             enabled = data.get("enabled", True)
-            self.table.setItem(row, 2, QTableWidgetItem("✓" if enabled else "✗"))
-            self.table.setItem(row, 3, QTableWidgetItem(str(data.get("timeout", 5000))))
-
             if mcp_type == "local":
                 cmd = data.get("command", [])
-                self.table.setItem(
-                    row,
-                    4,
-                    QTableWidgetItem(
-                        " ".join(cmd) if isinstance(cmd, list) else str(cmd)
-                    ),
-                )
+                target = " ".join(cmd) if isinstance(cmd, list) else str(cmd)
             else:
-                self.table.setItem(row, 4, QTableWidgetItem(data.get("url", "")))
+                target = data.get("url", "")
+            records.append(
+                TableRecord(
+                    name,
+                    [
+                        name,
+                        mcp_type,
+                        "✓" if enabled else "✗",
+                        str(data.get("timeout", 5000)),
+                        target,
+                    ],
+                )
+            )
+        self.table.set_records(records)
 
     def _open_awesome_mcp(self):
         webbrowser.open("https://github.com/punkpeye/awesome-mcp-servers")
@@ -11881,8 +10472,8 @@ class MCPPage(BasePage):
             self.show_warning(tr("common.info"), tr("mcp.select_first"))
             return
 
-        name = self.table.item(row, 0).text()
-        mcp_type = self.table.item(row, 1).text()
+        name = self.table.record_model.key_at(row)
+        mcp_type = self.table.record_model.record_at(row).cells[1]
         dialog = MCPDialog(
             self.main_window, mcp_name=name, mcp_type=mcp_type, parent=self
         )
@@ -11896,7 +10487,7 @@ class MCPPage(BasePage):
             self.show_warning(tr("common.info"), tr("mcp.select_first"))
             return
 
-        name = self.table.item(row, 0).text()
+        name = self.table.record_model.key_at(row)
         w = FluentMessageBox(
             tr("mcp.delete_confirm_title"), tr("mcp.delete_confirm", name=name), self
         )
@@ -13047,8 +11638,8 @@ class AgentGroupDialog(QDialog):
         info_layout.addWidget(desc_label)
 
         # 统计信息（仅自定义分组）
-        if not is_preset and "statistics" in group:
-            stats = group["statistics"]
+        if not is_preset:
+            stats = self.group_manager.get_usage_stats(group["id"])
             usage_count = stats.get("usage_count", 0)
             last_used = stats.get("last_used")
 
@@ -14910,10 +13501,18 @@ class MainWindow(FluentWindow):
         if self.ohmyopencode_config is None:
             self.ohmyopencode_config = {}
 
+        # 模型注册表：配置变更时按差量更新，各页面共享
+        self.model_registry = get_model_registry(self.opencode_config)
+        # 配置版本号：每次配置变更递增，模型引用索引按版本复用
+        self._config_version = 0
+        self._indexed_configs = (None, None)
+
         # 初始化文件指纹
         self._refresh_file_hashes()
 
         # 启动时验证配置
+        # 后台下载 / 加载配置 Schema，供手动配置检测使用
+        get_schema_store().prefetch()
         self._validate_config_on_startup()
 
         # 版本检查器
@@ -15292,8 +13891,25 @@ class MainWindow(FluentWindow):
 
     def notify_config_changed(self):
         """通知所有页面配置已变更"""
+        # 先同步模型注册表，页面在信号处理中读到的是最新索引
+        self.model_registry.update_config(self.opencode_config)
+        self._config_version += 1
         self.config_changed.emit()
 
+    def model_ref_index(self) -> ModelRefIndex:
+        """当前配置版本的模型引用索引（同一版本只构建一次）"""
+        # 配置对象被整体替换（重新加载、切换路径等）时也视为新版本
+        indexed_oc, indexed_ohmy = self._indexed_configs
+        if (
+            indexed_oc is not self.opencode_config
+            or indexed_ohmy is not self.ohmyopencode_config
+        ):
+            self._config_version += 1
+            self._indexed_configs = (self.opencode_config, self.ohmyopencode_config)
+        return get_model_ref_index(
+            self.opencode_config, self.ohmyopencode_config, self._config_version
+        )
+
     def _on_version_check(self, latest_version: str, release_url: str):
         """版本检查回调"""
         if VersionChecker.compare_versions(APP_VERSION, latest_version):
@@ -15424,12 +14040,15 @@ class MainWindow(FluentWindow):
             # 重新加载并刷新哈希
             if config_name == "OpenCode":
                 new_config = ConfigManager.load_json(path) or {}
-                issues = ConfigValidator.validate_opencode_config(new_config)
-                errors = [i for i in issues if i["level"] == "error"]
+                # 取够 9 个错误即停止校验（展示 8 个，第 9 个说明还有更多）
+                errors = ConfigValidator.first_errors(
+                    ConfigValidator.iter_opencode_issues(new_config, errors_only=True),
+                    9,
+                )
                 if errors:
                     msg = "\n".join(f"• {e['message']}" for e in errors[:8])
                     if len(errors) > 8:
-                        msg += f"\n... 还有 {len(errors) - 8} 个错误"
+                        msg += "\n... 还有更多错误"
                     InfoBar.error(
                         tr("common.error"),
                         tr("dialog.reload_failed", msg=msg),
@@ -15495,10 +14114,12 @@ class MainWindow(FluentWindow):
             pass
 
     def closeEvent(self, e):
-        """关闭窗口时停止主题监听器"""
+        """关闭窗口时停止主题监听器与监控调度"""
         if hasattr(self, "themeListener"):
             self.themeListener.terminate()
             self.themeListener.deleteLater()
+        if hasattr(self, "monitor_page"):
+            self.monitor_page.shutdown()
         super().closeEvent(e)
 
     def _check_config_conflicts(self):
@@ -15823,7 +14444,7 @@ class OhMyAgentPage(BasePage):
             self.table.setItem(row, 2, desc_item)
 
     def _get_available_models(self) -> List[str]:
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.model_registry
         return registry.get_all_models()
 
     def _refresh_bulk_model_combo(self, models: List[str]) -> None:
@@ -16043,7 +14664,7 @@ class OhMyAgentDialog(BaseDialog):
     def _load_models(self):
         """加载可用模型列表"""
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.model_registry
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -16137,7 +14758,7 @@ class PresetOhMyAgentDialog(BaseDialog):
 
     def _load_models(self):
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.model_registry
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -16296,7 +14917,7 @@ class CategoryPage(BasePage):
             self.table.setItem(row, 3, desc_item)
 
     def _get_available_models(self) -> List[str]:
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.model_registry
         return registry.get_all_models()
 
     def _refresh_bulk_model_combo(self, models: List[str]) -> None:
@@ -16477,7 +15098,7 @@ class CategoryDialog(BaseDialog):
 
     def _load_models(self):
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.model_registry
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -16576,7 +15197,7 @@ class PresetCategoryDialog(BaseDialog):
 
     def _load_models(self):
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.model_registry
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -18051,16 +16672,20 @@ class SkillPage(BasePage):
     def _refresh_skill_list(self):
         """刷新 Skill 列表"""
         if hasattr(self, "skill_list"):
-            self.skill_list.clear()
-            skills = SkillDiscovery.discover_all()
-            for skill in skills:
+            records = []
+            for skill in SkillDiscovery.discover_all():
                 source_key = self.SOURCE_LABELS.get(
                     skill.source, "skill.source_unknown"
                 )
                 source_label = tr(source_key)
-                item = QListWidgetItem(f"{skill.name} ({source_label})")
-                item.setData(Qt.UserRole, skill)
-                self.skill_list.addItem(item)
+                records.append(
+                    TableRecord(
+                        f"{skill.source}:{skill.path}",
+                        [f"{skill.name} ({source_label})"],
+                        data=skill,
+                    )
+                )
+            self.skill_list.set_records(records)
 
     def _load_permission_data(self):
         """加载权限数据"""
@@ -18124,8 +16749,8 @@ class SkillPage(BasePage):
         left_layout.addLayout(toolbar)
 
         # Skill 列表
-        self.skill_list = ListWidget(left_widget)
-        self.skill_list.itemClicked.connect(self._on_skill_selected)
+        self.skill_list = RecordListView(left_widget)
+        self.skill_list.clicked.connect(self._on_skill_selected)
         # 确保显示垂直滚动条
         self.skill_list.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         left_layout.addWidget(self.skill_list, 1)
@@ -19410,40 +18035,100 @@ class CompactionPage(BasePage):
 
 
 # ==================== 监控页面 ====================
+class MonitorSignalBridge(QObject):
+    """把 occm_core.MonitorService 的线程回调转换为 Qt 信号
+
+    探测线程只把结果写入按目标合并的缓冲区；界面线程每帧取出一次，
+    以一次 results_ready(list) 发出，同一目标在一帧内的多次结果只保留最新一次。
+    """
+
+    results_ready = pyqtSignal(list)
+    poll_finished = pyqtSignal()
+
+    def __init__(self, service: MonitorService, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self._feed = MonitorFeed(service)
+        self._queue = self._feed.subscribe()
+        self._poll_done = threading.Event()
+        service.add_poll_done_callback(self._poll_done.set)
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setInterval(MONITOR_FRAME_INTERVAL_MS)
+        self._frame_timer.timeout.connect(self._flush)
+        self._frame_timer.start()
+
+    def _flush(self) -> None:
+        # 先读取完成标记再取结果，保证完成信号之前的结果都在本帧内发出
+        poll_done = self._poll_done.is_set()
+        if poll_done:
+            self._poll_done.clear()
+        results = self._queue.drain()
+        if results:
+            self.results_ready.emit(results)
+        if poll_done:
+            self.poll_finished.emit()
+
+    def stop(self) -> None:
+        self._frame_timer.stop()
+        self._feed.unsubscribe(self._queue)
+
+
+class PhaseBar(QWidget):
+    """分阶段耗时堆叠条：各段宽度按本次探测总耗时的占比绘制"""
+
+    def __init__(self, phases: Optional[Dict[str, float]], parent=None):
+        super().__init__(parent)
+        self._phases = [
+            (name, phases[name]) for name in PHASES if phases and name in phases
+        ]
+        self._total = sum(ms for _, ms in self._phases)
+        self.setMinimumHeight(10)
+        if self._phases:
+            lines = [f"{name}: {ms:.1f} ms" for name, ms in self._phases]
+            lines.append(f"total: {self._total:.1f} ms")
+            self.setToolTip("\n".join(lines))
+
+    def paintEvent(self, event):
+        if not self._phases or self._total <= 0:
+            return
+        painter = QPainter(self)
+        painter.setPen(Qt.NoPen)
+        bar_height = 10
+        top = (self.height() - bar_height) // 2
+        width = self.width() - 8
+        x = 4.0
+        for name, ms in self._phases:
+            seg = width * ms / self._total
+            painter.setBrush(QColor(PHASE_COLORS.get(name, "#9AA4B2")))
+            painter.drawRect(int(x), top, max(1, int(round(seg))), bar_height)
+            x += seg
+        painter.end()
+
+
 class MonitorPage(BasePage):
     """站点/模型可用度与延迟监控页面"""
 
-    result_ready = pyqtSignal(object)
-
     def __init__(self, main_window, parent=None):
         super().__init__(tr("monitor.title"), parent)
         self.title_label.hide()
         self.main_window = main_window
-        # 监控数据存储: target_id -> deque[MonitorResult]
-        self._history: Dict[str, Deque[MonitorResult]] = {}
+        # 探测、调度、熔断与历史记录由 occm_core.MonitorService 负责
+        self._service = MonitorService(poll_interval_ms=MONITOR_POLL_INTERVAL_MS)
+        self._bridge = MonitorSignalBridge(self._service, self)
         # 监控目标列表
         self._targets: List[MonitorTarget] = []
-        # 轮询定时器
-        self._poll_timer: Optional[QTimer] = None
-        # 轮询状态
-        self._is_polling = False
         # 行索引映射
         self._row_index: Dict[str, int] = {}
-        # 线程池
-        self._executor = ThreadPoolExecutor(max_workers=6)
-        # 轮询超时控制
-        self._pending_targets: Dict[str, float] = {}
-        self._timeout_timer: Optional[QTimer] = None
-        self._request_timeout_sec = 15
         # 是否启用对话延迟测试 - 默认关闭，需要手动启动
         self._chat_test_enabled = False
         self._setup_ui()
         self._load_targets()
-        # 自动启动轮询（Ping 检测始终运行，对话延迟测试由按钮控制）
+        self._bridge.results_ready.connect(self._on_results)
+        self._bridge.poll_finished.connect(self._on_poll_done)
+        # 自动启动调度（Ping 检测始终运行，对话延迟测试由按钮控制）
         self._start_polling()
         # 连接配置变更信号
         self.main_window.config_changed.connect(self._on_config_changed)
-        self.result_ready.connect(self._on_single_result)
 
     def _on_config_changed(self):
         """配置变更时重新加载目标"""
@@ -19453,6 +18138,7 @@ class MonitorPage(BasePage):
     def _toggle_chat_test(self):
         """切换对话延迟测试状态 - 启动/停止按钮（只控制对话延迟，不影响其他监控）"""
         self._chat_test_enabled = not self._chat_test_enabled
+        self._service.set_chat_test_enabled(self._chat_test_enabled)
         if self._chat_test_enabled:
             # 启动对话延迟测试
             self.monitor_toggle_btn.setText(tr("monitor.stop_monitoring"))
@@ -19464,17 +18150,18 @@ class MonitorPage(BasePage):
             self.monitor_toggle_btn.setIcon(FIF.PLAY)
             self.monitor_toggle_btn.setToolTip(tr("monitor.start_tooltip"))
         # 立即执行一次检测以反映状态变化
-        self._do_poll()
+        self._check_now()
 
     def _stop_polling(self):
-        """停止轮询"""
-        if self._poll_timer:
-            self._poll_timer.stop()
-        if self._timeout_timer:
-            self._timeout_timer.stop()
-        self._is_polling = False
+        """停止调度"""
+        self._service.stop_polling()
         self.poll_status_label.setText("")
 
+    def shutdown(self):
+        """窗口关闭时停止调度并释放工作线程"""
+        self._bridge.stop()
+        self._service.shutdown()
+
     def _setup_ui(self):
         """构建监控页面 UI"""
         self._build_compact_summary()
@@ -19575,7 +18262,7 @@ class MonitorPage(BasePage):
             FIF.SYNC, tr("monitor.check"), wrapper
         )
         self.manual_check_btn.setFixedSize(80, 32)
-        self.manual_check_btn.clicked.connect(self._do_poll)
+        self.manual_check_btn.clicked.connect(self._check_now)
         stats_row.addWidget(self.manual_check_btn)
 
         # 启动/停止按钮 - 默认显示"启动"
@@ -19585,6 +18272,20 @@ class MonitorPage(BasePage):
         self.monitor_toggle_btn.clicked.connect(self._toggle_chat_test)
         stats_row.addWidget(self.monitor_toggle_btn)
 
+        self.stream_probe_check = CheckBox(tr("monitor.stream_probe"), wrapper)
+        self.stream_probe_check.setToolTip(tr("monitor.stream_probe_tooltip"))
+        self.stream_probe_check.stateChanged.connect(
+            lambda state: self._service.set_stream_probe_enabled(bool(state))
+        )
+        stats_row.addWidget(self.stream_probe_check)
+
+        self.listing_mode_check = CheckBox(tr("monitor.listing_mode"), wrapper)
+        self.listing_mode_check.setToolTip(tr("monitor.listing_mode_tooltip"))
+        self.listing_mode_check.stateChanged.connect(
+            lambda state: self._service.set_listing_mode(bool(state))
+        )
+        stats_row.addWidget(self.listing_mode_check)
+
         self.poll_status_label = CaptionLabel("", wrapper)
         self.poll_status_label.setStyleSheet("color: #f0883e; font-weight: bold;")
         self.poll_status_label.setMinimumWidth(50)
@@ -19599,7 +18300,7 @@ class MonitorPage(BasePage):
         self.detail_table = TableWidget(self)
         self.detail_table.setContentsMargins(0, 0, 0, 0)
         self.detail_table.setViewportMargins(0, 0, 0, 0)
-        self.detail_table.setColumnCount(7)
+        self.detail_table.setColumnCount(10)
         self.detail_table.setHorizontalHeaderLabels(
             [
                 tr("monitor.model_provider"),
@@ -19607,6 +18308,9 @@ class MonitorPage(BasePage):
                 tr("monitor.availability_rate"),
                 tr("monitor.chat_latency"),
                 tr("monitor.ping_latency"),
+                tr("monitor.ttft"),
+                tr("monitor.tokens_per_sec"),
+                tr("monitor.latency_phases"),
                 tr("monitor.last_check"),
                 tr("monitor.history"),
             ]
@@ -19622,9 +18326,18 @@ class MonitorPage(BasePage):
         header.setSectionResizeMode(4, QHeaderView.Fixed)
         header.resizeSection(4, 120)
         header.setSectionResizeMode(5, QHeaderView.Fixed)
-        header.resizeSection(5, 100)
+        header.resizeSection(5, 90)
         header.setSectionResizeMode(6, QHeaderView.Fixed)
-        header.resizeSection(6, 200)
+        header.resizeSection(6, 90)
+        header.setSectionResizeMode(7, QHeaderView.Fixed)
+        header.resizeSection(7, 130)
+        header.setSectionResizeMode(8, QHeaderView.Fixed)
+        header.resizeSection(8, 100)
+        header.setSectionResizeMode(9, QHeaderView.Fixed)
+        header.resizeSection(9, 200)
+        header_item = self.detail_table.horizontalHeaderItem(7)
+        if header_item is not None:
+            header_item.setToolTip(tr("monitor.latency_phases_tooltip"))
         self.detail_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.detail_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.detail_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -19632,156 +18345,39 @@ class MonitorPage(BasePage):
         self._layout.addWidget(self.detail_table, 1)
 
     def _load_targets(self):
-        """从配置加载监控目标"""
-        self._targets.clear()
-        config = self.main_window.opencode_config or {}
-        providers = config.get("provider", {})
-
-        for provider_key, provider_data in providers.items():
-            if not isinstance(provider_data, dict):
-                continue
-            provider_name = provider_data.get("name", provider_key)
-            options = provider_data.get("options", {})
-            base_url = _safe_base_url(
-                options.get("baseURL", "") or provider_data.get("baseURL", "")
-            )
-            api_key_raw = options.get("apiKey", "") or provider_data.get("apiKey", "")
-            api_key = _resolve_env_value(api_key_raw) if api_key_raw else ""
-
-            models = provider_data.get("models", {})
-            for model_id, model_data in models.items():
-                if not isinstance(model_data, dict):
-                    continue
-                model_name = model_data.get("name", model_id)
-                target = MonitorTarget(
-                    provider_key=provider_key,
-                    provider_name=provider_name,
-                    base_url=base_url,
-                    api_key=api_key,
-                    model_id=model_id,
-                    model_name=model_name,
-                )
-                self._targets.append(target)
-                # 初始化历史记录
-                if target.target_id not in self._history:
-                    self._history[target.target_id] = deque(
-                        maxlen=MONITOR_HISTORY_LIMIT
-                    )
-
+        """从配置加载监控目标（同步到服务，新增或变更的目标会被立即探测）"""
+        self._targets = self._service.load_targets_from_config(
+            self.main_window.opencode_config
+        )
         self._refresh_ui()
 
     def _start_polling(self):
-        """启动轮询定时器"""
-        if self._poll_timer is None:
-            self._poll_timer = QTimer(self)
-            self._poll_timer.timeout.connect(self._do_poll)
-        self._poll_timer.start(MONITOR_POLL_INTERVAL_MS)
-        # 立即执行一次
-        QTimer.singleShot(200, self._do_poll)
-
-    def _do_poll(self):
-        """执行一次轮询（并发请求）"""
-        if self._is_polling:
-            return
+        """启动调度"""
+        self._service.start_polling()
+
+    def _check_now(self):
+        """手动检测：所有空闲目标立即到期，由服务按并发上限派发"""
         if not self._targets:
             self.poll_status_label.setText(tr("monitor.no_targets"))
             return
-        self._is_polling = True
         self.poll_status_label.setText(tr("monitor.checking"))
         self._mark_all_pending()
-
-        self._pending_targets = {t.target_id: time.time() for t in self._targets}
-        self._start_timeout_timer()
-
-        remaining = len(self._targets)
-        if remaining == 0:
-            self._is_polling = False
-            self.poll_status_label.setText("")
-            return
-
-        def _done_callback(target_id: str, future):
-            nonlocal remaining
-            try:
-                result = future.result()
-            except Exception as e:
-                result = MonitorResult(
-                    target_id=target_id,
-                    status="error",
-                    latency_ms=None,
-                    ping_ms=None,
-                    checked_at=datetime.now(),
-                    message=str(e)[:50],
-                )
-            if target_id in self._pending_targets:
-                self._pending_targets.pop(target_id, None)
-            self.result_ready.emit(result)
-            remaining -= 1
-            if remaining == 0:
-                QTimer.singleShot(0, self._on_poll_done)
-
-        # 防止卡住
-        QTimer.singleShot(60000, self._on_poll_done)
-
-        for target in self._targets:
-            future = self._executor.submit(self._check_target, target)
-            future.add_done_callback(
-                lambda f, tid=target.target_id: _done_callback(tid, f)
-            )
+        self._service.check_now()
 
     def _on_poll_done(self):
-        """轮询结束"""
-        self._is_polling = False
+        """当前在途探测全部完成"""
         self.poll_status_label.setText("")
-        self._stop_timeout_timer()
         self._refresh_summary()
 
-    def _start_timeout_timer(self):
-        """启动超时检测定时器"""
-        if self._timeout_timer is None:
-            self._timeout_timer = QTimer(self)
-            self._timeout_timer.timeout.connect(self._check_pending_timeouts)
-        self._timeout_timer.start(1000)
-
-    def _stop_timeout_timer(self):
-        """停止超时检测定时器"""
-        if self._timeout_timer is not None:
-            self._timeout_timer.stop()
-
-    def _check_pending_timeouts(self):
-        """检查超时的请求并标记"""
-        if not self._pending_targets:
-            return
-        now_ts = time.time()
-        timed_out = [
-            tid
-            for tid, start_ts in self._pending_targets.items()
-            if now_ts - start_ts > self._request_timeout_sec
-        ]
-        for tid in timed_out:
-            self._pending_targets.pop(tid, None)
-            result = MonitorResult(
-                target_id=tid,
-                status="error",
-                latency_ms=None,
-                ping_ms=None,
-                checked_at=datetime.now(),
-                message="请求超时",
-            )
-            self._on_single_result(result)
-        if not self._pending_targets:
-            self._on_poll_done()
-
-    def _on_single_result(self, result: MonitorResult):
-        """处理单个结果并即时刷新行"""
-        history = self._history.get(result.target_id)
-        if history is not None:
-            history.append(result)
-        self._update_table_row(result.target_id)
+    def _on_results(self, results: List[MonitorResult]):
+        """每帧一批结果：只刷新涉及的行，整批完成后统一重绘"""
+        self._update_table_rows([result.target_id for result in results])
 
     def _mark_all_pending(self):
         """将所有行标记为检测中"""
-        for target in self._targets:
-            self._update_table_row(target.target_id, pending=True)
+        self._update_table_rows(
+            [target.target_id for target in self._targets], pending=True
+        )
 
     def _refresh_summary(self):
         """刷新统计摘要"""
@@ -19793,7 +18389,7 @@ class MonitorPage(BasePage):
         last_checked: Optional[datetime] = None
 
         for target in self._targets:
-            history = self._history.get(target.target_id, deque())
+            history = list(self._service.get_history(target.target_id))
             if history:
                 avail = _calc_availability(history)
                 if avail is not None:
@@ -19871,87 +18467,6 @@ class MonitorPage(BasePage):
         else:
             self.last_checked_value.setText("—")
 
-    def _check_target(self, target: MonitorTarget) -> MonitorResult:
-        """检查单个目标的可用性和延迟"""
-        checked_at = datetime.now()
-        origin = _extract_origin(target.base_url)
-
-        # Ping 检测
-        ping_ms = _measure_ping(origin) if origin else None
-
-        # Chat 延迟检测
-        latency_ms: Optional[int] = None
-        status = "no_config"
-        message = ""
-
-        if not getattr(self, "_chat_test_enabled", True):
-            # 对话测试已暂停，根据 Ping 结果判定状态
-            if not target.base_url:
-                message = "未配置 baseURL"
-            elif ping_ms is not None:
-                status = "operational"
-                message = "对话测试已暂停 (Ping 正常)"
-            elif origin:
-                status = "error"
-                message = "Ping 失败"
-            else:
-                status = "no_config"
-                message = "未配置有效的主机"
-        elif not target.base_url:
-            message = "未配置 baseURL"
-        elif not target.api_key:
-            message = "未配置 apiKey"
-        else:
-            # 发送最小请求
-            try:
-                url = _build_chat_url(target.base_url)
-                if not url:
-                    raise ValueError("baseURL 无效")
-                payload = json.dumps(
-                    {
-                        "model": target.model_id,
-                        "messages": [{"role": "user", "content": "hi"}],
-                        "max_tokens": 1,
-                    }
-                ).encode("utf-8")
-                req = urllib.request.Request(
-                    url,
-                    data=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {target.api_key}",
-                    },
-                    method="POST",
-                )
-                start = time.time()
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    resp.read()
-                latency_ms = int((time.time() - start) * 1000)
-                if latency_ms <= DEGRADED_THRESHOLD_MS:
-                    status = "operational"
-                    message = "正常"
-                else:
-                    status = "degraded"
-                    message = f"延迟较高 ({latency_ms}ms)"
-            except urllib.error.HTTPError as e:
-                status = "failed"
-                message = "鉴权失败" if e.code in (401, 403) else f"HTTP {e.code}"
-            except urllib.error.URLError as e:
-                status = "error"
-                message = f"连接失败: {e.reason}"
-            except Exception as e:
-                status = "error"
-                message = str(e)[:50]
-
-        return MonitorResult(
-            target_id=target.target_id,
-            status=status,
-            latency_ms=latency_ms,
-            ping_ms=ping_ms,
-            checked_at=checked_at,
-            message=message,
-        )
-
     def _apply_stat_card_theme(self):
         """应用统计卡片的主题样式"""
         if isDarkTheme():
@@ -19986,7 +18501,7 @@ class MonitorPage(BasePage):
         self._refresh_summary()
         self._update_table()
 
-    def _build_history_bar(self, history: Deque[MonitorResult]) -> QWidget:
+    def _build_history_bar(self, history: List[MonitorResult]) -> QWidget:
         """构建状态历史条带"""
         container = QWidget(self)
         layout = QHBoxLayout(container)
@@ -20018,11 +18533,12 @@ class MonitorPage(BasePage):
 
     def _update_table(self):
         """更新明细表格"""
+        self.detail_table.setUpdatesEnabled(False)
         self.detail_table.setRowCount(0)
 
         self._row_index.clear()
         for target in self._targets:
-            history = self._history.get(target.target_id, deque())
+            history = list(self._service.get_history(target.target_id))
             row = self.detail_table.rowCount()
             self.detail_table.insertRow(row)
             self._row_index[target.target_id] = row
@@ -20032,19 +18548,26 @@ class MonitorPage(BasePage):
             self.detail_table.setItem(row, 0, QTableWidgetItem(target_name))
 
             self._fill_row_from_history(row, history)
+        self.detail_table.setUpdatesEnabled(True)
 
-    def _update_table_row(self, target_id: str, pending: bool = False):
-        """根据 target_id 更新单行"""
-        row = self._row_index.get(target_id)
-        if row is None:
-            return
-        history = self._history.get(target_id, deque())
-        self._fill_row_from_history(row, history, pending=pending)
+    def _update_table_rows(self, target_ids: List[str], pending: bool = False):
+        """批量更新多行，期间暂停重绘，整批只触发一次刷新"""
+        self.detail_table.setUpdatesEnabled(False)
+        try:
+            for target_id in target_ids:
+                row = self._row_index.get(target_id)
+                if row is None:
+                    continue
+                # 复制一份快照，避免探测线程追加时迭代历史记录
+                history = list(self._service.get_history(target_id))
+                self._fill_row_from_history(row, history, pending=pending)
+        finally:
+            self.detail_table.setUpdatesEnabled(True)
 
     def _fill_row_from_history(
         self,
         row: int,
-        history: Deque[MonitorResult],
+        history: List[MonitorResult],
         pending: bool = False,
     ) -> None:
         """填充表格行"""
@@ -20056,8 +18579,10 @@ class MonitorPage(BasePage):
             self.detail_table.setItem(row, 3, QTableWidgetItem("—"))
             self.detail_table.setItem(row, 4, QTableWidgetItem("—"))
             self.detail_table.setItem(row, 5, QTableWidgetItem("—"))
-            self.detail_table.setCellWidget(row, 6, self._build_history_bar(history))
-            self.detail_table.update()
+            self.detail_table.setItem(row, 6, QTableWidgetItem("—"))
+            self.detail_table.setCellWidget(row, 7, PhaseBar(None))
+            self.detail_table.setItem(row, 8, QTableWidgetItem("—"))
+            self.detail_table.setCellWidget(row, 9, self._build_history_bar(history))
             return
 
         if history:
@@ -20109,13 +18634,24 @@ class MonitorPage(BasePage):
                     ping_item.setForeground(QColor("#f85149"))
             self.detail_table.setItem(row, 4, ping_item)
 
+            # 流式指标：首 Token 时间 / 输出速度（token 间隔放在提示中）
+            ttft_item = QTableWidgetItem(_format_latency(latest.ttft_ms))
+            tps_item = QTableWidgetItem(_format_tps(latest.tokens_per_sec))
+            if latest.itl_ms is not None:
+                tps_item.setToolTip(f"ITL: {latest.itl_ms:.1f} ms")
+            self.detail_table.setItem(row, 5, ttft_item)
+            self.detail_table.setItem(row, 6, tps_item)
+
+            # 分阶段耗时：DNS / TCP / TLS / 发送 / 首字节
+            self.detail_table.setCellWidget(row, 7, PhaseBar(latest.phases))
+
             # 最后检测
             self.detail_table.setItem(
-                row, 5, QTableWidgetItem(latest.checked_at.strftime("%H:%M:%S"))
+                row, 8, QTableWidgetItem(latest.checked_at.strftime("%H:%M:%S"))
             )
 
             # 历史条带
-            self.detail_table.setCellWidget(row, 6, self._build_history_bar(history))
+            self.detail_table.setCellWidget(row, 9, self._build_history_bar(history))
         else:
             # 无数据
             self.detail_table.setItem(row, 1, QTableWidgetItem("—"))
@@ -20123,9 +18659,10 @@ class MonitorPage(BasePage):
             self.detail_table.setItem(row, 3, QTableWidgetItem("—"))
             self.detail_table.setItem(row, 4, QTableWidgetItem("—"))
             self.detail_table.setItem(row, 5, QTableWidgetItem("—"))
-            self.detail_table.setCellWidget(row, 6, self._build_history_bar(deque()))
-
-        self.detail_table.update()
+            self.detail_table.setItem(row, 6, QTableWidgetItem("—"))
+            self.detail_table.setCellWidget(row, 7, PhaseBar(None))
+            self.detail_table.setItem(row, 8, QTableWidgetItem("—"))
+            self.detail_table.setCellWidget(row, 9, self._build_history_bar([]))
 
 
 class JsonTomlHighlighter(QSyntaxHighlighter):
@@ -22460,13 +20997,14 @@ class BackupDialog(BaseDialog):
                 )
                 # 重新加载配置
                 if target_path == ConfigPaths.get_opencode_config():
-                    self.main_window.opencode_config = ConfigManager.load_json(
-                        target_path
+                    self.main_window.opencode_config = (
+                        ConfigManager.load_json(target_path) or {}
                     )
                 else:
-                    self.main_window.ohmyopencode_config = ConfigManager.load_json(
-                        target_path
+                    self.main_window.ohmyopencode_config = (
+                        ConfigManager.load_json(target_path) or {}
                     )
+                self.main_window.notify_config_changed()
             else:
                 InfoBar.error(
                     tr("common.error"), tr("dialog.restore_failed"), parent=self
@@ -22915,6 +21453,7 @@ class PluginPage(BasePage):
         if ohmy_path.exists():
             self.main_window.ohmyopencode_config = ConfigManager.load_json(ohmy_path)
 
+        self.main_window.notify_config_changed()
         # 刷新显示
         self._load_ohmy_data()
         self.show_success("成功", "状态已刷新")
@@ -23117,7 +21656,7 @@ class PluginPage(BasePage):
 
     def _get_ohmy_available_models(self) -> List[str]:
         """获取可用的模型列表"""
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.model_registry
         return registry.get_all_models()
 
     def _on_ohmy_bulk_model_changed(self):